@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Framework overhead benchmark against a deterministic mock LLM.
+
+Runs canned agent tool loops (LLM turn -> tool call -> tool result -> next
+turn) through ``rev.llm.client`` and the tool registry, with the model
+replaced by ``MockProvider`` (or the Ollama provider talking HTTP to
+``MockLLMServer``). The synthetic model time is known exactly, so what
+remains is our own per-turn overhead. Also reports registry dispatch cost
+per tool call and retained memory growth per turn.
+
+Usage:
+    python benchmarks/llm_overhead_bench.py [--turns 40] [--repeat 3] [--transport inproc|http]
+                                            [--first-token-ms 0] [--tokens-per-second 0] [--json out.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rev import config  # noqa: E402
+from rev.cache import get_llm_cache  # noqa: E402
+from rev.llm import client, provider_factory  # noqa: E402
+from rev.llm.mock_server import MockLLMServer  # noqa: E402
+from rev.llm.providers.mock_provider import LatencyModel, MockProvider, MockResponder, MockScript  # noqa: E402
+from rev.tools import file_ops  # noqa: E402
+from rev.tools.registry import execute_tool, get_available_tools  # noqa: E402
+
+
+def _read_loop(turns: int) -> List[Dict[str, Any]]:
+    return [{"tool_calls": [{"name": "read_file", "arguments": {"path": f"src/mod_{i % 8}.py"}}]} for i in range(turns)]
+
+
+def _search_edit(turns: int) -> List[Dict[str, Any]]:
+    steps = []
+    for i in range(turns):
+        n = i % 8
+        if i % 3 == 0:
+            call = {"name": "search_code", "arguments": {"pattern": f"def handler_{n}", "include": "src/**/*.py"}}
+        elif i % 3 == 1:
+            call = {"name": "read_file", "arguments": {"path": f"src/mod_{n}.py"}}
+        else:
+            call = {"name": "replace_in_file", "arguments": {
+                "path": f"src/mod_{n}.py", "find": f"return {n}", "replace": f"return {n}  # checked",
+            }}
+        steps.append({"content": "Looking at the handler next.", "tool_calls": [call]})
+    return steps
+
+
+def _list_and_write(turns: int) -> List[Dict[str, Any]]:
+    steps = []
+    for i in range(turns):
+        if i % 2 == 0:
+            call = {"name": "list_dir", "arguments": {"pattern": "src/**/*.py"}}
+        else:
+            call = {"name": "write_file", "arguments": {"path": f"out/note_{i}.md", "content": "# Note\n" + "text " * 200}}
+        steps.append({"tool_calls": [call]})
+    return steps
+
+
+TASKS: Dict[str, Callable[[int], List[Dict[str, Any]]]] = {
+    "read_loop": _read_loop,
+    "search_edit": _search_edit,
+    "list_and_write": _list_and_write,
+}
+
+
+def _make_workspace(root: Path) -> None:
+    src = root / "src"
+    src.mkdir(parents=True)
+    for n in range(8):
+        body = "\n".join(f"    value_{k} = {k} * {n}" for k in range(60))
+        (src / f"mod_{n}.py").write_text(f"def handler_{n}(request):\n{body}\n    return {n}\n", encoding="utf-8")
+
+
+def _clear_llm_cache() -> None:
+    # Repeated loops send identical messages; cached responses would skip the provider.
+    cache = get_llm_cache()
+    if cache is not None:
+        cache.clear()
+
+
+def _tool_subset() -> List[Dict[str, Any]]:
+    names = {"read_file", "write_file", "replace_in_file", "list_dir", "search_code"}
+    return [t for t in get_available_tools() if t.get("function", {}).get("name") in names]
+
+
+def _run_loop(steps: List[Dict[str, Any]], responder: MockResponder, tools: List[Dict[str, Any]]) -> Dict[str, List[float]]:
+    """One agent loop; returns per-turn client overhead and tool times (seconds)."""
+    responder.script = MockScript(steps + [{"content": "All done."}])
+    messages: List[Dict[str, Any]] = [
+        {"role": "system", "content": "You are a coding agent. Use tools to complete the task."},
+        {"role": "user", "content": "Complete the canned benchmark task."},
+    ]
+    llm_overhead: List[float] = []
+    tool_times: List[float] = []
+    while True:
+        simulated_before = responder.simulated_seconds
+        start = time.perf_counter()
+        response = client.ollama_chat(messages, tools=tools, model="mock")
+        elapsed = time.perf_counter() - start
+        llm_overhead.append(elapsed - (responder.simulated_seconds - simulated_before))
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        message = response["message"]
+        messages.append(message)
+        calls = message.get("tool_calls") or []
+        if not calls:
+            break
+        for call in calls:
+            function = call["function"]
+            args = function["arguments"]
+            if isinstance(args, str):
+                args = json.loads(args)
+            start = time.perf_counter()
+            result = execute_tool(function["name"], args)
+            tool_times.append(time.perf_counter() - start)
+            messages.append({"role": "tool", "content": result})
+    return {"llm_overhead": llm_overhead, "tool": tool_times}
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _ms(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0}
+    return {
+        "mean_ms": round(statistics.fmean(values) * 1000, 3),
+        "p50_ms": round(_percentile(values, 50) * 1000, 3),
+        "p95_ms": round(_percentile(values, 95) * 1000, 3),
+    }
+
+
+def _dispatch_cost(iterations: int) -> Dict[str, float]:
+    """Registry dispatch vs calling the tool function directly."""
+    direct = time.perf_counter()
+    for i in range(iterations):
+        file_ops.read_file(f"src/mod_{i % 8}.py")
+    direct = time.perf_counter() - direct
+    registry = time.perf_counter()
+    for i in range(iterations):
+        execute_tool("read_file", {"path": f"src/mod_{i % 8}.py"})
+    registry = time.perf_counter() - registry
+    return {
+        "direct_us": round(direct / iterations * 1e6, 2),
+        "registry_us": round(registry / iterations * 1e6, 2),
+        "dispatch_overhead_us": round((registry - direct) / iterations * 1e6, 2),
+    }
+
+
+def run(
+    turns: int = 40,
+    repeat: int = 3,
+    transport: str = "inproc",
+    latency: LatencyModel = None,
+    dispatch_iterations: int = 500,
+) -> Dict[str, Any]:
+    responder = MockResponder(latency=latency or LatencyModel())
+    saved = (config.ROOT, config.LLM_PROVIDER, config.OLLAMA_BASE_URL)
+    server = None
+    with tempfile.TemporaryDirectory(prefix="rev_overhead_") as tmp:
+        workspace = Path(tmp)
+        _make_workspace(workspace)
+        config.set_workspace_root(workspace, allow_external=True)
+        provider_factory.clear_provider_cache()
+        if transport == "http":
+            server = MockLLMServer(responder).start()
+            config.LLM_PROVIDER = "ollama"
+            config.OLLAMA_BASE_URL = server.url
+        else:
+            config.LLM_PROVIDER = "mock"
+            provider_factory._provider_cache["mock"] = MockProvider(responder)
+        tools = _tool_subset()
+        results: Dict[str, Any] = {"transport": transport, "turns": turns, "tasks": {}}
+        try:
+            for name, make_steps in TASKS.items():
+                steps = make_steps(turns)
+                llm, tool = [], []
+                for _ in range(repeat):
+                    _clear_llm_cache()
+                    timings = _run_loop(steps, responder, tools)
+                    llm.extend(timings["llm_overhead"])
+                    tool.extend(timings["tool"])
+                results["tasks"][name] = {"llm_overhead": _ms(llm), "tool": _ms(tool)}
+
+            # Retained memory per turn, measured separately so tracing does not skew timings.
+            _clear_llm_cache()
+            _run_loop(_read_loop(turns), responder, tools)
+            tracemalloc.start()
+            before = tracemalloc.take_snapshot()
+            _run_loop(_read_loop(turns), responder, tools)
+            after = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            growth = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+            top = after.compare_to(before, "lineno")[:5]
+            results["memory"] = {
+                "retained_kb_per_turn": round(growth / 1024 / (turns + 1), 2),
+                "top_growth": [f"{stat.traceback[0].filename}:{stat.traceback[0].lineno} {stat.size_diff / 1024:+.1f} KB" for stat in top],
+            }
+
+            results["dispatch"] = _dispatch_cost(dispatch_iterations)
+        finally:
+            if server is not None:
+                server.stop()
+            config.set_workspace_root(saved[0], allow_external=True)
+            config.LLM_PROVIDER, config.OLLAMA_BASE_URL = saved[1], saved[2]
+            provider_factory.clear_provider_cache()
+    results["llm_requests"] = responder.requests
+    results["simulated_llm_seconds"] = round(responder.simulated_seconds, 3)
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=40, help="tool-calling turns per canned task")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--transport", choices=["inproc", "http"], default="inproc",
+                        help="in-process MockProvider, or the Ollama provider over HTTP to MockLLMServer")
+    parser.add_argument("--first-token-ms", type=float, default=0.0)
+    parser.add_argument("--tokens-per-second", type=float, default=0.0)
+    parser.add_argument("--json", type=Path, help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    latency = LatencyModel(first_token_ms=args.first_token_ms, tokens_per_second=args.tokens_per_second)
+    results = run(args.turns, args.repeat, args.transport, latency)
+    print(f"transport={results['transport']} turns/task={results['turns']} "
+          f"llm requests={results['llm_requests']} simulated model time={results['simulated_llm_seconds']}s")
+    print(f"{'task':<18}{'turn overhead mean/p95 ms':>28}{'tool mean/p95 ms':>22}")
+    for name, row in results["tasks"].items():
+        llm, tool = row["llm_overhead"], row["tool"]
+        print(f"{name:<18}{llm['mean_ms']:>18.3f} / {llm['p95_ms']:<7.3f}{tool['mean_ms']:>12.3f} / {tool['p95_ms']:<7.3f}")
+    dispatch = results["dispatch"]
+    print(f"tool dispatch: direct {dispatch['direct_us']}us, registry {dispatch['registry_us']}us "
+          f"(+{dispatch['dispatch_overhead_us']}us per call)")
+    print(f"memory: {results['memory']['retained_kb_per_turn']} KB retained per turn")
+    for line in results["memory"]["top_growth"]:
+        print(f"  {line}")
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
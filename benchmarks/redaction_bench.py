@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Micro-benchmark for artifact redaction throughput.
+
+Compares the prefiltered redaction engine with applying every rule
+sequentially (the previous implementation) over synthetic but realistic
+tool outputs, and reports MB/s.
+
+Usage:
+    python benchmarks/redaction_bench.py [--size-mb 4] [--repeat 5] [--json out.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rev.execution.redaction import _RULES, iter_redacted_text, redact_sensitive_text  # noqa: E402
+
+
+def sequential_redact(text: str) -> Tuple[str, bool]:
+    """Reference: every rule over the whole text, in order."""
+    changed = False
+    for rule in _RULES:
+        text, n = rule.pattern.subn(rule.replacement, text)
+        changed = changed or bool(n)
+    return text, changed
+
+
+def _pytest_log(rng: random.Random, size: int) -> str:
+    lines: List[str] = ["============================= test session starts =============================="]
+    i = 0
+    while sum(len(line) + 1 for line in lines) < size:
+        i += 1
+        roll = rng.random()
+        if roll < 0.85:
+            status = "PASSED" if rng.random() < 0.95 else "FAILED"
+            lines.append(f"tests/test_module_{i % 40}.py::test_case_{i} {status} [{i % 100:3d}%]")
+        elif roll < 0.97:
+            lines.extend([
+                "    def test_refresh(self):",
+                "        result = client.refresh(session)",
+                ">       assert result.status == 200",
+                "E       AssertionError: assert 401 == 200",
+                f"E        +  where 401 = <Response [{rng.randint(200, 500)}]>.status",
+                "tests/test_client.py:88: AssertionError",
+            ])
+        else:
+            lines.append("----------------------------- Captured stdout call -----------------------------")
+            lines.append("DEBUG refreshing credentials for user id=%d" % rng.randint(1, 10_000))
+    return "\n".join(lines) + "\n"
+
+
+def _git_diff(rng: random.Random, size: int) -> str:
+    lines: List[str] = []
+    n = 0
+    while sum(len(line) + 1 for line in lines) < size:
+        n += 1
+        lines.extend([
+            f"diff --git a/src/pkg/module_{n}.py b/src/pkg/module_{n}.py",
+            f"index {rng.getrandbits(28):07x}..{rng.getrandbits(28):07x} 100644",
+            f"--- a/src/pkg/module_{n}.py",
+            f"+++ b/src/pkg/module_{n}.py",
+            f"@@ -{n},7 +{n},8 @@ class Handler{n}:",
+            "     def handle(self, request):",
+            "-        data = request.json()",
+            "+        payload = request.get_json(silent=True) or {}",
+            "+        limit = int(payload.get('limit', 50))",
+            "         items = self.repo.fetch(limit=limit)",
+            "         return {'items': items, 'count': len(items)}",
+        ])
+    return "\n".join(lines) + "\n"
+
+
+def _cmd_output_with_secrets(rng: random.Random, size: int) -> str:
+    base = _pytest_log(rng, size)
+    lines = base.splitlines()
+    secrets = [
+        "export OPENAI_API_KEY=sk-" + "a1B2" * 6,
+        "Authorization: Bearer " + "abc.def-ghi_" * 3,
+        "GITHUB_TOKEN=ghp_" + "Z9y8" * 6,
+        "aws_access_key_id = AKIA" + "ABCDEFGHIJKLMNOP",
+        "password = 'hunter22hunter'",
+    ]
+    for secret in secrets:
+        lines.insert(rng.randrange(len(lines)), secret)
+    return "\n".join(lines) + "\n"
+
+
+CORPORA: Dict[str, Callable[[random.Random, int], str]] = {
+    "pytest_log": _pytest_log,
+    "git_diff": _git_diff,
+    "cmd_output_with_secrets": _cmd_output_with_secrets,
+}
+
+
+def _best_of(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(size_mb: float = 4.0, repeat: int = 5, seed: int = 0) -> Dict[str, Dict[str, float]]:
+    rng = random.Random(seed)
+    size = int(size_mb * 1024 * 1024)
+    results: Dict[str, Dict[str, float]] = {}
+    for name, make in CORPORA.items():
+        text = make(rng, size)
+        mb = len(text.encode("utf-8")) / (1024 * 1024)
+        expected = sequential_redact(text)
+        if redact_sensitive_text(text) != expected:
+            raise AssertionError(f"{name}: engine output differs from sequential rules")
+        streamed = "".join(piece for piece, _ in iter_redacted_text(text[i:i + 65536] for i in range(0, len(text), 65536)))
+        if streamed != expected[0]:
+            raise AssertionError(f"{name}: streaming output differs from sequential rules")
+
+        seq = _best_of(lambda: sequential_redact(text), repeat)
+        eng = _best_of(lambda: redact_sensitive_text(text), repeat)
+        results[name] = {
+            "mb": round(mb, 2),
+            "sequential_mb_s": round(mb / seq, 1),
+            "engine_mb_s": round(mb / eng, 1),
+            "speedup": round(seq / eng, 2),
+        }
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=4.0, help="approximate size of each corpus")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repetitions (best is reported)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    results = run(args.size_mb, args.repeat, args.seed)
+    print(f"{'corpus':<26}{'MB':>7}{'sequential MB/s':>18}{'engine MB/s':>14}{'speedup':>10}")
+    for name, row in results.items():
+        print(f"{name:<26}{row['mb']:>7}{row['sequential_mb_s']:>18}{row['engine_mb_s']:>14}{row['speedup']:>9}x")
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
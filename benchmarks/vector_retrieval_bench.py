@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Recall/latency benchmark: vector retrieval vs the lexical TF-IDF retriever.
+
+Queries are generated from the Python sources of the indexed tree. For each
+sampled function or class, two queries target the chunk holding its
+definition:
+
+- ``docstring``: the first line of its docstring (wording shared with the code)
+- ``name``: its identifier split into words, e.g. ``build index`` for
+  ``build_index`` (wording the lexical tokenizer does not split)
+
+Reports recall@1/5/10, MRR@10 and per-query latency for the lexical
+retriever, the vector retriever alone and the fused ranking, plus index
+build times and batched query throughput. Requires numpy.
+
+Usage:
+    python benchmarks/vector_retrieval_bench.py [--root .] [--queries 200] [--k 10]
+                                                [--embedder hashed] [--fusion-weight 0.8] [--json out.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rev.retrieval.simple_rag import SimpleCodeRetriever  # noqa: E402
+from rev.retrieval.vector_index import VectorCodeRetriever, get_embedder, split_identifier  # noqa: E402
+
+
+Target = Tuple[str, int]  # (relative path, definition line)
+
+
+def _definitions(root: Path, retriever: SimpleCodeRetriever) -> List[Tuple[str, str, Target]]:
+    """(name, docstring summary, target) for documented defs in indexed .py files."""
+    paths = sorted({chunk.path for chunk in retriever.chunks if chunk.path.endswith(".py")})
+    found = []
+    for rel in paths:
+        try:
+            tree = ast.parse((root / rel).read_text(encoding="utf-8", errors="ignore"))
+        except (SyntaxError, ValueError, OSError):
+            continue
+        for node in ast.walk(tree):
+            if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                continue
+            doc = ast.get_docstring(node)
+            words = split_identifier(node.name)
+            if not doc or len(words) < 2:
+                continue
+            summary = doc.strip().splitlines()[0].strip()
+            if len(summary.split()) >= 3:
+                found.append((node.name, summary, (rel, node.lineno)))
+    return found
+
+
+def _sample(items: List[Any], n: int) -> List[Any]:
+    if len(items) <= n:
+        return items
+    step = len(items) / n
+    return [items[int(i * step)] for i in range(n)]
+
+
+def _rank(results, target: Target) -> int:
+    path, line = target
+    for position, chunk in enumerate(results, start=1):
+        if chunk.path == path and chunk.start_line <= line <= chunk.end_line:
+            return position
+    return 0
+
+
+def _summarize(ranks: List[int], latencies: List[float]) -> Dict[str, float]:
+    n = len(ranks) or 1
+    ordered = sorted(latencies) or [0.0]
+    return {
+        "recall@1": round(sum(1 for r in ranks if r == 1) / n, 3),
+        "recall@5": round(sum(1 for r in ranks if 0 < r <= 5) / n, 3),
+        "recall@10": round(sum(1 for r in ranks if 0 < r <= 10) / n, 3),
+        "mrr@10": round(sum(1.0 / r for r in ranks if 0 < r <= 10) / n, 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))] * 1000, 3),
+    }
+
+
+def _timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def run(root: Path, queries: int = 200, k: int = 10, embedder: str = "hashed", fusion_weight: float = 0.8) -> Dict[str, Any]:
+    root = root.resolve()
+    lexical = SimpleCodeRetriever(root, enable_code_aware=False, verbose=False)
+    _, lexical_build = _timed(lexical.build_index)
+
+    vector = VectorCodeRetriever(root, embedder=get_embedder(embedder), lexical=lexical, verbose=False)
+    # First build embeds; the second reopens the persisted memmap.
+    _, vector_build = _timed(vector.build_index)
+    reopened = VectorCodeRetriever(root, embedder=vector.embedder, lexical=lexical, verbose=False)
+    _, vector_load = _timed(reopened.build_index)
+
+    definitions = _sample(_definitions(root, lexical), queries)
+    query_sets = {
+        "docstring": [(summary, target) for _, summary, target in definitions],
+        "name": [(" ".join(split_identifier(name)), target) for name, _, target in definitions],
+    }
+    systems = {
+        "lexical": lambda q: lexical.query(q, k),
+        "vector": lambda q: vector.search([q], k, fusion_weight=1.0)[0],
+        "fused": lambda q: vector.search([q], k, fusion_weight=fusion_weight)[0],
+    }
+
+    results: Dict[str, Any] = {
+        "root": str(root),
+        "chunks": len(lexical.chunks),
+        "queries_per_set": len(definitions),
+        "k": k,
+        "embedder": vector.embedder.name,
+        "fusion_weight": fusion_weight,
+        "build_s": {"lexical": round(lexical_build, 3), "vector_embed": round(vector_build, 3),
+                    "vector_reopen": round(vector_load, 3)},
+        "index": vector.get_index_stats(),
+        "sets": {},
+    }
+    for set_name, pairs in query_sets.items():
+        rows = {}
+        for system, answer in systems.items():
+            ranks, latencies = [], []
+            for question, target in pairs:
+                found, elapsed = _timed(answer, question)
+                ranks.append(_rank(found, target))
+                latencies.append(elapsed)
+            rows[system] = _summarize(ranks, latencies)
+        results["sets"][set_name] = rows
+
+    questions = [q for pairs in query_sets.values() for q, _ in pairs]
+    _, batch_elapsed = _timed(vector.search, questions, k, fusion_weight=1.0)
+    results["vector_batch"] = {
+        "queries": len(questions),
+        "per_query_ms": round(batch_elapsed / max(len(questions), 1) * 1000, 3),
+    }
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--root", type=Path, default=Path(__file__).resolve().parent.parent)
+    parser.add_argument("--queries", type=int, default=200, help="definitions sampled per query set")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--embedder", default="hashed", help='"hashed" or a sentence-transformers model name')
+    parser.add_argument("--fusion-weight", type=float, default=0.8)
+    parser.add_argument("--json", type=Path, help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    results = run(args.root, args.queries, args.k, args.embedder, args.fusion_weight)
+    build = results["build_s"]
+    print(f"{results['chunks']} chunks, {results['queries_per_set']} queries per set, embedder={results['embedder']}")
+    print(f"build: lexical {build['lexical']}s, vector embed {build['vector_embed']}s, "
+          f"vector reopen {build['vector_reopen']}s ({results['index']['matrix_mb']} MB matrix)")
+    print(f"{'set':<11}{'system':<9}{'R@1':>7}{'R@5':>7}{'R@10':>7}{'MRR':>7}{'mean ms':>10}{'p95 ms':>9}")
+    for set_name, rows in results["sets"].items():
+        for system, row in rows.items():
+            print(f"{set_name:<11}{system:<9}{row['recall@1']:>7.3f}{row['recall@5']:>7.3f}{row['recall@10']:>7.3f}"
+                  f"{row['mrr@10']:>7.3f}{row['mean_ms']:>10.3f}{row['p95_ms']:>9.3f}")
+    batch = results["vector_batch"]
+    print(f"vector batch: {batch['queries']} queries at {batch['per_query_ms']} ms/query")
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
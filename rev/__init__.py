@@ -6,146 +6,69 @@ from rev.versioning import get_version
 
 __version__ = get_version()
 
-# Configuration
-import rev.config as _config
-from rev.config import set_workspace_root
-from rev.workspace import get_workspace, Workspace
-
-# Core models
-from rev.models import (
-    Task,
-    TaskStatus,
-    RiskLevel,
-    ExecutionPlan,
-)
-
-# Cache classes
-from rev.cache import (
-    IntelligentCache,
-    FileContentCache,
-    LLMResponseCache,
-    RepoContextCache,
-    DependencyTreeCache,
-    initialize_caches,
-)
-
-# Terminal utilities
-from rev.terminal import (
-    get_input_with_escape,
-)
-
-# Tool functions - All functions from tools module
-from rev.tools import (
-    # File operations
-    read_file,
-    write_file,
-    list_dir,
-    search_code,
-    delete_file,
-    move_file,
-    append_to_file,
-    replace_in_file,
-    rewrite_python_imports,
-    rewrite_python_keyword_args,
-    rename_imported_symbols,
-    move_imported_symbols,
-    rewrite_python_function_parameters,
-    create_directory,
-    get_file_info,
-    copy_file,
-    file_exists,
-    read_file_lines,
-    tree_view,
-    # Git operations
-    git_diff,
-    apply_patch,
-    git_commit,
-    git_status,
-    git_log,
-    git_branch,
-    run_cmd,
-    run_tests,
-    get_repo_context,
-    # Code operations
-    remove_unused_imports,
-    extract_constants,
-    simplify_conditionals,
-    # Data conversion
-    convert_json_to_yaml,
-    convert_yaml_to_json,
-    convert_csv_to_json,
-    convert_json_to_csv,
-    convert_env_to_json,
-    # Dependency management
-    analyze_dependencies,
-    check_dependency_updates,
-    check_dependency_vulnerabilities,
-    update_dependencies,
-    scan_dependencies_vulnerabilities,
-    # Security tools
-    scan_security_issues,
-    detect_secrets,
-    check_license_compliance,
-    # Linting and type checks
-    run_linters,
-    run_type_checks,
-    # Test quality tools
-    run_property_tests,
-    generate_property_tests,
-    check_contracts,
-    detect_flaky_tests,
-    compare_behavior_with_baseline,
-    # Runtime analysis
-    analyze_runtime_logs,
-    analyze_performance_regression,
-    analyze_error_traces,
-    # Config / migrations
-    validate_ci_config,
-    verify_migrations,
-    # SSH operations
-    ssh_connect,
-    ssh_exec,
-    ssh_copy_to,
-    ssh_copy_from,
-    ssh_disconnect,
-    ssh_list_connections,
-    # Cache operations
-    set_cache_references,
-    get_cache_stats,
-    clear_caches,
-    persist_caches,
-    # Utilities
-    install_package,
-    web_fetch,
-    execute_python,
-    get_system_info,
-    # Registry
-    execute_tool,
-    get_available_tools,
-)
+from rev._lazy import exports_from, lazy_exports
 
+# Public names are resolved from their defining modules on first access so
+# that ``import rev`` (and ``rev --help``) stays cheap; see rev._lazy.
+_EXPORTS = exports_from({
+    # Configuration
+    "rev.config": ["set_workspace_root"],
+    "rev.workspace": ["get_workspace", "Workspace"],
+    # Core models
+    "rev.models": ["Task", "TaskStatus", "RiskLevel", "ExecutionPlan"],
+    # Cache classes
+    "rev.cache": [
+        "IntelligentCache",
+        "FileContentCache",
+        "LLMResponseCache",
+        "RepoContextCache",
+        "DependencyTreeCache",
+        "initialize_caches",
+    ],
+    # Terminal utilities
+    "rev.terminal.input": ["get_input_with_escape"],
+    # MCP operations
+    "rev.mcp.client": ["mcp_add_server", "mcp_list_servers", "mcp_call_tool"],
+    # Internal functions (for testing)
+    "rev.tools.file_ops": ["_safe_path"],
+})
+# Tool functions - everything re-exported by rev.tools
+_EXPORTS.update({
+    name: "rev.tools"
+    for name in (
+        "read_file", "write_file", "list_dir", "search_code", "delete_file", "move_file",
+        "append_to_file", "replace_in_file", "rewrite_python_imports", "rewrite_python_keyword_args",
+        "rename_imported_symbols", "move_imported_symbols", "rewrite_python_function_parameters",
+        "create_directory", "get_file_info", "copy_file", "file_exists", "read_file_lines", "tree_view",
+        "git_diff", "apply_patch", "git_commit", "git_status", "git_log", "git_branch", "run_cmd",
+        "run_tests", "get_repo_context", "remove_unused_imports", "extract_constants",
+        "simplify_conditionals", "convert_json_to_yaml", "convert_yaml_to_json", "convert_csv_to_json",
+        "convert_json_to_csv", "convert_env_to_json", "analyze_dependencies", "check_dependency_updates",
+        "check_dependency_vulnerabilities", "update_dependencies", "scan_dependencies_vulnerabilities",
+        "scan_security_issues", "detect_secrets", "check_license_compliance", "run_linters",
+        "run_type_checks", "run_property_tests", "generate_property_tests", "check_contracts",
+        "detect_flaky_tests", "compare_behavior_with_baseline", "analyze_runtime_logs",
+        "analyze_performance_regression", "analyze_error_traces", "validate_ci_config",
+        "verify_migrations", "ssh_connect", "ssh_exec", "ssh_copy_to", "ssh_copy_from",
+        "ssh_disconnect", "ssh_list_connections", "set_cache_references", "get_cache_stats",
+        "clear_caches", "persist_caches", "install_package", "web_fetch", "execute_python",
+        "get_system_info", "execute_tool", "get_available_tools",
+    )
+})
 # Aliases for backward compatibility
-scan_code_security = scan_security_issues
+_EXPORTS["scan_code_security"] = "rev.tools:scan_security_issues"
 
-# MCP operations
-from rev.mcp import (
-    mcp_add_server,
-    mcp_list_servers,
-    mcp_call_tool,
-)
-
-# Internal functions (for testing)
-from rev.tools.file_ops import _safe_path
+_lazy_getattr, __dir__ = lazy_exports(__name__, _EXPORTS, globals())
 
 
 def __getattr__(name: str):
     # Keep `rev.ROOT` consistent with the Workspace singleton even if the workspace root
     # is changed after import-time (common in tests).
     if name == "ROOT":
+        from rev import config as _config
+
         return _config.ROOT
-    if name == "scan_code_security":
-        return scan_security_issues
-    raise AttributeError(f"module 'rev' has no attribute {name!r}")
+    return _lazy_getattr(name)
 
 __all__ = [
     # Version
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Lazy re-exports for package ``__init__`` modules.
+
+Packages map public names to the submodule that defines them; the submodule
+is imported on first attribute access (PEP 562 module ``__getattr__``) and
+the value cached in the package namespace, so ``import rev`` no longer pays
+for every tool, cache and agent up front.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import Any, Callable, Dict, Iterable, List, Mapping, MutableMapping, Tuple
+
+
+def exports_from(modules: Mapping[str, Iterable[str]]) -> Dict[str, str]:
+    """Flatten ``{module: [names]}`` into ``{name: module}``."""
+    return {name: module for module, names in modules.items() for name in names}
+
+
+def lazy_exports(
+    package: str,
+    exports: Mapping[str, str],
+    namespace: MutableMapping[str, Any],
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Build ``__getattr__``/``__dir__`` for ``package``.
+
+    ``exports`` maps an attribute name to the module that defines it
+    (``"module"`` or ``"module:attr"`` when the names differ). Unknown names
+    fall back to importing ``package.<name>`` so ``pkg.submodule`` keeps
+    working without an explicit import.
+    """
+
+    def __getattr__(name: str) -> Any:
+        target = exports.get(name)
+        if target is not None:
+            module_name, _, attr = target.partition(":")
+            value = getattr(importlib.import_module(module_name), attr or name)
+            namespace[name] = value
+            return value
+        if name.startswith("__"):
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        qualified = f"{package}.{name}"
+        try:
+            return importlib.import_module(qualified)
+        except ModuleNotFoundError as e:
+            if e.name != qualified:
+                raise
+        raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
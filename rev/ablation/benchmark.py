@@ -3,14 +3,26 @@
 """Benchmark harness for ablation experiments.
 
 This module provides the infrastructure for running controlled
-experiments to measure the impact of different features.
+experiments to measure the impact of different features: each task runs
+in an isolated workspace and worker process, so runs can execute in
+parallel and their wall time, LLM calls, tokens and per-phase timings can
+be compared across feature configurations.
 """
 
 import json
+import os
+import re
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Sequence, Set
 
 from rev.ablation.feature_flags import Features, AblationConfig, FeatureRegistry
 from rev.debug_logger import get_logger
@@ -51,8 +63,8 @@ class BenchmarkResult:
     feature_config: Set[Features]
     success: bool
     time_seconds: float
-    iterations: int  # How many LLM calls
-    loops_avoided: int  # Detected retry loops
+    iterations: int  # Orchestrator iterations (planning steps)
+    loops_avoided: int  # Repeated actions the loop guards rewrote or blocked
     tokens_used: int
     artifacts_created: List[str]
     error_message: Optional[str] = None
@@ -93,21 +105,43 @@ class BenchmarkResult:
 class BenchmarkRunner:
     """Runner for benchmark experiments.
 
-    This class handles setting up tasks, running them with different
-    feature configurations, and collecting results.
+    Every (task, feature config) pair runs the orchestrator in its own worker
+    process (``rev.ablation.worker``) inside a fresh temporary workspace
+    materialized from the task's ``initial_files``. Up to ``pool_size`` runs
+    execute at once; each is killed after the task's ``timeout_seconds``.
+    Afterwards the workspace is checked against ``expected_files`` and
+    ``success_criteria``.
     """
 
-    def __init__(self, tasks: List[BenchmarkTask], output_dir: Optional[Path] = None):
+    def __init__(
+        self,
+        tasks: List[BenchmarkTask],
+        output_dir: Optional[Path] = None,
+        pool_size: int = 1,
+        keep_workspaces: bool = False,
+        worker_command: Optional[Sequence[str]] = None,
+        orchestrator_options: Optional[Dict] = None,
+    ):
         """Initialize benchmark runner.
 
         Args:
             tasks: List of tasks to run
             output_dir: Directory for results (default: ./benchmark_results)
+            pool_size: Number of runs executed concurrently
+            keep_workspaces: Keep task workspaces for inspection instead of deleting them
+            worker_command: Command that runs one task given a spec file
+                (default: ``python -m rev.ablation.worker``)
+            orchestrator_options: Extra keyword arguments for ``run_orchestrated``
         """
         self.tasks = tasks
         self.output_dir = output_dir or Path("benchmark_results")
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.results: List[BenchmarkResult] = []
+        self.pool_size = max(1, pool_size)
+        self.keep_workspaces = keep_workspaces
+        self.worker_command = list(worker_command or [sys.executable, "-m", "rev.ablation.worker"])
+        self.orchestrator_options = dict(orchestrator_options or {})
+        self._results_lock = threading.Lock()
 
     def run_ablation(
         self,
@@ -116,52 +150,30 @@ class BenchmarkRunner:
     ) -> List[BenchmarkResult]:
         """Run all tasks with each feature configuration.
 
+        Feature flags are applied inside each worker process, so the global
+        ``FeatureRegistry`` of this process is left untouched.
+
         Args:
             feature_configs: List of feature sets to test
             run_id_prefix: Prefix for run IDs
 
         Returns:
-            List of all benchmark results
+            List of all benchmark results, in (config, task) order
         """
-        all_results = []
-
+        jobs = []
         for config_idx, features in enumerate(feature_configs):
+            run_id = f"{run_id_prefix}_{config_idx:03d}"
             logger.log("benchmark", "CONFIG_START", {
                 "config_idx": config_idx,
                 "features": [f.value for f in features],
                 "num_tasks": len(self.tasks)
             }, "INFO")
+            jobs.extend((task, set(features), run_id) for task in self.tasks)
 
-            # Create ablation config
-            ablation_config = AblationConfig(
-                enabled_features=features,
-                run_id=f"{run_id_prefix}_{config_idx:03d}",
-                benchmark_name="standard_suite"
-            )
-
-            # Set global config
-            FeatureRegistry.set_config(ablation_config)
-
-            # Run all tasks with this config
-            for task in self.tasks:
-                logger.log("benchmark", "TASK_START", {
-                    "task": task.name,
-                    "config": ablation_config.run_id
-                }, "INFO")
-
-                result = self._run_single_task(task, features)
-                all_results.append(result)
-                self.results.append(result)
-
-                logger.log("benchmark", "TASK_COMPLETE", {
-                    "task": task.name,
-                    "success": result.success,
-                    "time": result.time_seconds
-                }, "INFO")
-
-            # Clear config after this run
-            FeatureRegistry.clear()
+        with ThreadPoolExecutor(max_workers=self.pool_size) as pool:
+            all_results = list(pool.map(lambda job: self._run_single_task(*job), jobs))
 
+        for config_idx, features in enumerate(feature_configs):
             logger.log("benchmark", "CONFIG_COMPLETE", {
                 "config_idx": config_idx,
                 "features": [f.value for f in features]
@@ -172,78 +184,128 @@ class BenchmarkRunner:
     def _run_single_task(
         self,
         task: BenchmarkTask,
-        features: Set[Features]
+        features: Set[Features],
+        run_id: str = "exp_000",
     ) -> BenchmarkResult:
         """Run a single task with feature configuration.
 
         Args:
             task: The task to run
             features: Features enabled for this run
+            run_id: Identifier of the feature configuration
 
         Returns:
             BenchmarkResult with outcome
         """
-        # TODO: This is a stub - actual implementation would:
-        # 1. Create workspace with initial files
-        # 2. Run the agent with the user request
-        # 3. Check success criteria
-        # 4. Collect metrics
-        # 5. Clean up workspace
-
+        logger.log("benchmark", "TASK_START", {"task": task.name, "config": run_id}, "INFO")
         start_time = time.time()
+        run_dir = Path(tempfile.mkdtemp(prefix=f"rev_bench_{_slug(task.name)}_"))
+        workspace = run_dir / "workspace"
 
         try:
-            # Placeholder implementation
-            # In real implementation, this would call the executor
-            success = False
-            iterations = 0
-            loops_avoided = 0
-            tokens_used = 0
-            artifacts_created = []
-            error_message = None
-
-            # Simulate task execution
-            logger.log("benchmark", "TASK_SIMULATION", {
-                "task": task.name,
-                "note": "Using placeholder implementation"
-            }, "WARNING")
-
-            elapsed_time = time.time() - start_time
+            _materialize_workspace(task, workspace)
+            result_path = run_dir / "result.json"
+            spec_path = run_dir / "spec.json"
+            spec_path.write_text(json.dumps({
+                "workspace": str(workspace),
+                "user_request": task.user_request,
+                "features": sorted(f.value for f in features),
+                "run_id": run_id,
+                "benchmark_name": "standard_suite",
+                "result_path": str(result_path),
+                "orchestrator_options": self.orchestrator_options,
+            }), encoding="utf-8")
+
+            exit_code = _run_worker(
+                self.worker_command + [str(spec_path)],
+                cwd=workspace,
+                timeout=task.timeout_seconds,
+                log_path=run_dir / "worker.log",
+            )
+            timed_out = exit_code is None
+            worker = {}
+            if result_path.exists():
+                try:
+                    worker = json.loads(result_path.read_text(encoding="utf-8"))
+                except ValueError:
+                    worker = {}
+
+            criteria = evaluate_success_criteria(task, workspace)
+            missing = [name for name in task.expected_files if not (workspace / name).exists()]
+            success = (
+                not timed_out
+                and not missing
+                and all(c["status"] != "failed" for c in criteria)
+                # With nothing mechanically checkable, fall back to the agent's verdict.
+                and (any(c["status"] == "passed" for c in criteria) or bool(worker.get("agent_success")))
+            )
 
-            return BenchmarkResult(
+            error_message = None
+            if timed_out:
+                error_message = f"Timed out after {task.timeout_seconds}s"
+            elif worker.get("error"):
+                error_message = worker["error"]
+            elif missing:
+                error_message = f"Missing expected files: {', '.join(missing)}"
+
+            tokens = worker.get("tokens") or {}
+            result = BenchmarkResult(
                 task_name=task.name,
                 feature_config=features,
                 success=success,
-                time_seconds=elapsed_time,
-                iterations=iterations,
-                loops_avoided=loops_avoided,
-                tokens_used=tokens_used,
-                artifacts_created=artifacts_created,
+                time_seconds=time.time() - start_time,
+                iterations=int(worker.get("iterations", 0)),
+                loops_avoided=int(worker.get("loops_avoided", 0)),
+                tokens_used=int(tokens.get("total", 0)),
+                artifacts_created=_new_files(task, workspace),
                 error_message=error_message,
                 metadata={
-                    "placeholder": True,
-                    "timeout": task.timeout_seconds
-                }
+                    "run_id": run_id,
+                    "timeout": task.timeout_seconds,
+                    "timed_out": timed_out,
+                    "exit_code": exit_code,
+                    "agent_success": worker.get("agent_success"),
+                    "agent_seconds": worker.get("agent_seconds"),
+                    "llm_calls": worker.get("llm_calls"),
+                    "loops_avoided_by_guard": worker.get("loops_avoided_by_guard", {}),
+                    "tokens": tokens,
+                    "phase_timings": worker.get("phase_timings", {}),
+                    "latency_breakdown": worker.get("latency_breakdown", {}),
+                    "criteria": criteria,
+                    "workspace": str(workspace) if self.keep_workspaces else None,
+                },
             )
 
         except Exception as e:
-            elapsed_time = time.time() - start_time
             logger.log("benchmark", "TASK_ERROR", {
                 "task": task.name,
                 "error": str(e)
             }, "ERROR")
 
-            return BenchmarkResult(
+            result = BenchmarkResult(
                 task_name=task.name,
                 feature_config=features,
                 success=False,
-                time_seconds=elapsed_time,
+                time_seconds=time.time() - start_time,
                 iterations=0,
                 loops_avoided=0,
                 tokens_used=0,
                 artifacts_created=[],
                 error_message=str(e)
             )
+        finally:
+            if not self.keep_workspaces:
+                shutil.rmtree(run_dir, ignore_errors=True)
+
+        with self._results_lock:
+            self.results.append(result)
+        logger.log("benchmark", "TASK_COMPLETE", {
+            "task": task.name,
+            "config": run_id,
+            "success": result.success,
+            "time": result.time_seconds
+        }, "INFO")
+        return result
 
     def save_results(self, filename: Optional[str] = None):
         """Save results to JSON file.
@@ -296,6 +358,158 @@ class BenchmarkRunner:
         return results
 
 
+def _slug(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_").lower()[:40] or "task"
+
+
+def _materialize_workspace(task: BenchmarkTask, workspace: Path) -> None:
+    """Write the task's initial files and commit them to a fresh git repo."""
+    workspace.mkdir(parents=True)
+    root = workspace.resolve()
+    for name, content in task.initial_files.items():
+        target = (workspace / name).resolve()
+        if root not in target.parents:
+            raise ValueError(f"Initial file escapes the workspace: {name}")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content, encoding="utf-8")
+
+    # A baseline commit lets the agent's git tools diff against the initial state.
+    git = shutil.which("git")
+    if git:
+        for args in (
+            ["init", "-q"],
+            ["add", "-A"],
+            ["-c", "user.name=rev-bench", "-c", "user.email=bench@localhost", "commit", "-q", "-m", "initial"],
+        ):
+            subprocess.run([git, *args], cwd=workspace, capture_output=True, timeout=30)
+
+
+def _run_worker(cmd: List[str], cwd: Path, timeout: float, log_path: Path) -> Optional[int]:
+    """Run a worker process; returns its exit code, or None if it timed out."""
+    env = dict(os.environ)
+    package_root = str(Path(__file__).resolve().parents[2])
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (package_root, env.get("PYTHONPATH")) if p)
+    with open(log_path, "wb") as log:
+        proc = subprocess.Popen(
+            cmd, cwd=cwd, env=env, stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+            start_new_session=(os.name != "nt"),
+        )
+        try:
+            return proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            # Kill the whole process group: the agent may have spawned test runs.
+            if os.name != "nt":
+                try:
+                    os.killpg(proc.pid, signal.SIGKILL)
+                except OSError:
+                    proc.kill()
+            else:
+                proc.kill()
+            proc.wait()
+            return None
+
+
+def _new_files(task: BenchmarkTask, workspace: Path) -> List[str]:
+    """Files in the workspace that were not part of the task's initial files."""
+    created = []
+    for path in sorted(workspace.rglob("*")):
+        rel = path.relative_to(workspace)
+        if not path.is_file() or rel.parts[0] in _IGNORED_DIRS or "__pycache__" in rel.parts:
+            continue
+        if rel.as_posix() not in task.initial_files:
+            created.append(rel.as_posix())
+    return created
+
+
+_IGNORED_DIRS = {".git", ".rev", ".pytest_cache"}
+
+_CONTAINS = re.compile(r"^(?P<file>\S+)\s+(?P<neg>does not contain|doesn't contain|contains)\s+(?P<what>.+)$", re.IGNORECASE)
+_EXISTS = re.compile(r"^(?P<file>\S+\.\w+)(?:\s+exists)?$", re.IGNORECASE)
+_IMPORTS = re.compile(r"^(?P<file>\S+)\s+imports from\s+(?P<module>[\w.]+)$", re.IGNORECASE)
+_TESTS_PASS = re.compile(r"^(all )?tests pass$", re.IGNORECASE)
+
+
+def _criterion(text: str, status: str, detail: str = "") -> Dict[str, str]:
+    return {"criterion": text, "status": status, "detail": detail}
+
+
+def evaluate_success_criteria(task: BenchmarkTask, workspace: Path) -> List[Dict[str, str]]:
+    """Check a task's success criteria against its workspace.
+
+    Recognized forms: ``<file> exists``, ``<file> contains '<text>'`` (or
+    ``contains <name> function``), ``<file> does not contain '<text>'``,
+    ``<file> imports from <module>`` and ``All tests pass``. Anything else
+    needs judgement and is reported as ``unchecked``.
+
+    Returns:
+        One dict per criterion with ``status`` passed / failed / unchecked
+    """
+    results = []
+    for raw in task.success_criteria:
+        text = raw.strip().rstrip(".")
+
+        if _TESTS_PASS.match(text):
+            results.append(_run_tests(text, workspace, task.timeout_seconds))
+            continue
+
+        match = _IMPORTS.match(text)
+        if match:
+            content = _read(workspace, match["file"])
+            module = re.escape(match["module"])
+            found = content is not None and re.search(rf"^\s*(from\s+{module}\s+import|import\s+{module}\b)", content, re.MULTILINE)
+            results.append(_criterion(text, "passed" if found else "failed"))
+            continue
+
+        match = _CONTAINS.match(text)
+        if match:
+            content = _read(workspace, match["file"])
+            what = match["what"].strip()
+            quoted = re.fullmatch(r"['\"`](.+)['\"`](?:\s+statement)?", what)
+            function = re.fullmatch(r"(\w+) function", what)
+            if quoted:
+                needle = quoted.group(1)
+            elif function:
+                needle = f"def {function.group(1)}"
+            else:
+                results.append(_criterion(text, "unchecked"))
+                continue
+            if content is None:
+                results.append(_criterion(text, "failed", f"{match['file']} not found"))
+                continue
+            present = needle in content
+            negated = not match["neg"].lower().startswith("contains")
+            results.append(_criterion(text, "passed" if present != negated else "failed"))
+            continue
+
+        match = _EXISTS.match(text)
+        if match:
+            exists = (workspace / match["file"]).exists()
+            results.append(_criterion(text, "passed" if exists else "failed"))
+            continue
+
+        results.append(_criterion(text, "unchecked"))
+    return results
+
+
+def _read(workspace: Path, name: str) -> Optional[str]:
+    try:
+        return (workspace / name).read_text(encoding="utf-8", errors="ignore")
+    except OSError:
+        return None
+
+
+def _run_tests(text: str, workspace: Path, timeout: float) -> Dict[str, str]:
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider"],
+            cwd=workspace, capture_output=True, text=True, timeout=max(60, timeout),
+        )
+    except subprocess.TimeoutExpired:
+        return _criterion(text, "failed", "test run timed out")
+    tail = (proc.stdout or "").strip().splitlines()[-1:] or [""]
+    return _criterion(text, "passed" if proc.returncode == 0 else "failed", tail[0])
+
+
 def load_task_from_yaml(filepath: Path) -> BenchmarkTask:
     """Load a benchmark task from YAML file.
 
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Worker process for a single benchmark run.
+
+``BenchmarkRunner`` starts one of these per (task, feature config) pair, with
+the materialized task workspace as the working directory:
+
+    python -m rev.ablation.worker <spec.json>
+
+The spec names the workspace, user request, enabled features and the path
+the result JSON is written to. Feature flags are set in this process only,
+so parallel runs with different configurations cannot interfere.
+"""
+
+import json
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+def _run(spec: Dict[str, Any]) -> Dict[str, Any]:
+    from rev import config
+    from rev.ablation.feature_flags import AblationConfig, FeatureRegistry, Features
+    from rev.profiler import get_profiler
+
+    workspace = Path(spec["workspace"]).resolve()
+    config.set_workspace_root(workspace, allow_external=True)
+
+    FeatureRegistry.set_config(AblationConfig(
+        enabled_features={Features(f) for f in spec.get("features", [])},
+        run_id=spec.get("run_id") or "benchmark",
+        benchmark_name=spec.get("benchmark_name") or "standard_suite",
+    ))
+
+    # Per-phase timings and LLM call counts come from the span profiler.
+    profiler = get_profiler()
+    profiler.enable()
+    profiler.reset()
+
+    from rev.execution.orchestrator import run_orchestrated
+    from rev.llm.client import get_token_usage, reset_token_usage
+
+    reset_token_usage()
+    start = time.perf_counter()
+    result = run_orchestrated(
+        spec["user_request"],
+        workspace,
+        auto_approve=True,
+        context_guard_interactive=False,
+        **spec.get("orchestrator_options", {}),
+    )
+    elapsed = time.perf_counter() - start
+
+    summary = profiler.summary()
+    categories = summary.get("categories", {})
+    budget = result.resource_budget
+    loops_avoided = (result.agent_insights or {}).get("loops_avoided", {})
+    return {
+        "agent_success": bool(result.success),
+        "phase_reached": getattr(result.phase_reached, "value", str(result.phase_reached)),
+        "errors": [str(e) for e in (result.errors or [])][:20],
+        "agent_seconds": elapsed,
+        "iterations": int(budget.steps_used) if budget is not None else 0,
+        "loops_avoided": sum(loops_avoided.values()),
+        "loops_avoided_by_guard": loops_avoided,
+        "llm_calls": int(categories.get("llm", {}).get("count", 0)),
+        "tokens": get_token_usage(),
+        "phase_timings": summary.get("phases", {}),
+        "latency_breakdown": categories,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("usage: python -m rev.ablation.worker <spec.json>", file=sys.stderr)
+        return 2
+    spec = json.loads(Path(argv[0]).read_text(encoding="utf-8"))
+    result_path = Path(spec["result_path"])
+    try:
+        payload = _run(spec)
+        code = 0
+    except Exception as e:
+        payload = {"agent_success": False, "error": f"{type(e).__name__}: {e}", "traceback": traceback.format_exc()}
+        code = 1
+    result_path.write_text(json.dumps(payload, indent=2, default=str), encoding="utf-8")
+    return code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -79,6 +79,8 @@ def get_context_builder(root: Optional[Path] = None) -> ContextBuilder:
     global _BUILDER
     if _BUILDER is None:
         _BUILDER = ContextBuilder((root or Path.cwd()).resolve())
+    elif root is not None and _BUILDER.root != Path(root).resolve():
+        _BUILDER = ContextBuilder(Path(root).resolve())
     return _BUILDER
 
 
@@ -81,6 +81,17 @@ class FileContentCache(IntelligentCache):
                 self.invalidate(key)
 
 
+# Provider-reported timings of the call that produced a response. They describe
+# that original call, not a later cache hit, so they are never stored.
+_SERVER_TIMING_KEYS = ("total_duration", "load_duration", "prompt_eval_duration", "eval_duration")
+
+
+def _without_server_timings(response: Any) -> Any:
+    if not isinstance(response, dict) or not any(key in response for key in _SERVER_TIMING_KEYS):
+        return response
+    return {key: value for key, value in response.items() if key not in _SERVER_TIMING_KEYS}
+
+
 class LLMResponseCache(IntelligentCache):
     """Cache for LLM responses based on message hash.
 
@@ -156,7 +167,7 @@ class LLMResponseCache(IntelligentCache):
             model: Optional model name to match in cache
         """
         cache_key = self._hash_messages(messages, tools, model)
-        return self.get(cache_key)
+        return _without_server_timings(self.get(cache_key))
 
     def set_response(self, messages: List[Dict[str, str]], response: Dict[str, Any], tools: Optional[List[Dict]] = None, model: Optional[str] = None):
         """Cache LLM response.
@@ -168,7 +179,7 @@ class LLMResponseCache(IntelligentCache):
             model: Optional model name to include in cache key
         """
         cache_key = self._hash_messages(messages, tools, model)
-        self.set(cache_key, response, metadata={"messages_count": len(messages), "model": model})
+        self.set(cache_key, _without_server_timings(response), metadata={"messages_count": len(messages), "model": model})
 
 
 class RepoContextCache(IntelligentCache):
@@ -178,38 +189,25 @@ class RepoContextCache(IntelligentCache):
         super().__init__(name="repo_context", ttl=30, **kwargs)  # 30 seconds TTL
         self.root = root
 
-    def get_context(self) -> Optional[str]:
-        """Get cached repository context."""
-        # Use current git HEAD commit as part of cache key
+    def _head_commit(self) -> str:
+        """HEAD commit, memoised by GitRepo until a ref changes on disk."""
+        from rev.tools.git_access import get_git_repo
+
         try:
-            proc = subprocess.run(
-                ["git", "rev-parse", "HEAD"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-                cwd=self.root
-            )
-            head_commit = proc.stdout.strip() if proc.returncode == 0 else "no-git"
+            return get_git_repo(self.root).head() or "no-git"
         except Exception:
-            head_commit = "no-git"  # Git not available or subprocess error
+            return "no-git"  # Git not available or subprocess error
 
+    def get_context(self) -> Optional[str]:
+        """Get cached repository context."""
+        # Use current git HEAD commit as part of cache key
+        head_commit = self._head_commit()
         cache_key = f"context:{head_commit}"
         return self.get(cache_key)
 
     def set_context(self, context: str):
         """Cache repository context."""
-        try:
-            proc = subprocess.run(
-                ["git", "rev-parse", "HEAD"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-                cwd=self.root
-            )
-            head_commit = proc.stdout.strip() if proc.returncode == 0 else "no-git"
-        except Exception:
-            head_commit = "no-git"  # Git not available or subprocess error
-
+        head_commit = self._head_commit()
         cache_key = f"context:{head_commit}"
         self.set(cache_key, context, metadata={"commit": head_commit})
 
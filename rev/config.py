@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 """Configuration constants and settings for rev."""
 
+import importlib.util
 import os
 import pathlib
 import platform
@@ -46,13 +47,9 @@ def load_repo_config(root: pathlib.Path) -> None:
             print(f"  Warning: Failed to load {toml_config}: {e}")
 
 
-# Check for optional dependencies
-try:
-    import paramiko
-    SSH_AVAILABLE = True
-except ImportError:
-    SSH_AVAILABLE = False
-    paramiko = None
+# Check for optional dependencies without importing them (paramiko alone
+# costs ~100ms); rev.tools.ssh_ops imports it when a connection is made.
+SSH_AVAILABLE = importlib.util.find_spec("paramiko") is not None
 
 # ---------------------------------------------------------------------------
 # Workspace integration
@@ -212,6 +209,7 @@ def _get_primary_provider_and_model():
             "anthropic": os.getenv("ANTHROPIC_MODEL", "claude-3-5-sonnet-20241022"),
             "openai": os.getenv("OPENAI_MODEL", "gpt-5.2-mini"),
             "ollama": DEFAULT_OLLAMA_MODEL,
+            "mock": "mock",
         }
         return explicit_provider, provider_models.get(explicit_provider, DEFAULT_OLLAMA_MODEL)
 
@@ -244,6 +242,34 @@ if os.getenv("OLLAMA_DEBUG"):
 
 OLLAMA_BASE_URL = DEFAULT_OLLAMA_BASE_URL
 OLLAMA_MODEL = DEFAULT_OLLAMA_MODEL
+# Provider pools: set OLLAMA_BASE_URLS (or OPENAI/VLLM/LOCALAI/LMSTUDIO_BASE_URLS)
+# to a comma-separated list of endpoints to load-balance requests across them.
+PROVIDER_POOL_STRATEGY = os.getenv("REV_PROVIDER_POOL_STRATEGY", "least_outstanding").strip().lower()
+PROVIDER_POOL_HEALTH_CHECK_INTERVAL = float(os.getenv("REV_PROVIDER_POOL_HEALTH_CHECK_INTERVAL", "30"))
+# Attempts per endpoint before failing over to the next one.
+PROVIDER_POOL_MEMBER_ATTEMPTS = int(os.getenv("REV_PROVIDER_POOL_MEMBER_ATTEMPTS", "1"))
+# Mock provider (REV_LLM_PROVIDER=mock): replays a response script or recorded
+# run bundle with synthetic latency, for benchmarks and offline runs.
+MOCK_LLM_SCRIPT = os.getenv("REV_MOCK_LLM_SCRIPT", "").strip()
+MOCK_LLM_FIRST_TOKEN_MS = float(os.getenv("REV_MOCK_LLM_FIRST_TOKEN_MS", "0"))
+MOCK_LLM_PREFILL_TOKENS_PER_SEC = float(os.getenv("REV_MOCK_LLM_PREFILL_TOKENS_PER_SEC", "0"))
+MOCK_LLM_TOKENS_PER_SEC = float(os.getenv("REV_MOCK_LLM_TOKENS_PER_SEC", "0"))
+# Vector code retrieval (rev.retrieval.vector_index, needs the "vector" extra).
+# When enabled, rag_search and the research agent use it instead of the
+# lexical TF-IDF retriever. The embedder is "hashed" (built-in featurizer) or a
+# sentence-transformers model; the fusion weight is the share of the vector score vs. TF-IDF (1.0 = vector only,
+# which scored best in benchmarks/vector_retrieval_bench.py on this repo).
+VECTOR_RETRIEVAL_ENABLED = os.getenv("REV_VECTOR_RETRIEVAL", "false").strip().lower() == "true"
+VECTOR_EMBEDDER = os.getenv("REV_VECTOR_EMBEDDER", "hashed").strip()
+VECTOR_DIM = int(os.getenv("REV_VECTOR_DIM", "512"))
+VECTOR_FUSION_WEIGHT = float(os.getenv("REV_VECTOR_FUSION_WEIGHT", "1.0"))
+
+# IDE API server: run each submitted task in its own worker process
+# (isolated workspace/config) with a bounded priority queue.
+IDE_TASK_POOL_ENABLED = os.getenv("REV_IDE_TASK_POOL", "true").strip().lower() != "false"
+IDE_TASK_POOL_WORKERS = int(os.getenv("REV_IDE_TASK_POOL_WORKERS", "2"))
+IDE_TASK_POOL_QUEUE_SIZE = int(os.getenv("REV_IDE_TASK_POOL_QUEUE_SIZE", "32"))
+IDE_TASK_POOL_START_METHOD = os.getenv("REV_IDE_TASK_POOL_START_METHOD", "spawn").strip().lower() or None
 EXECUTION_MODEL = os.getenv("REV_EXECUTION_MODEL", _DEFAULT_MODEL)
 # Auto-switch target if repeated tool-call failures occur (env override supported)
 EXECUTION_MODEL_FALLBACK = os.getenv("REV_EXECUTION_MODEL_FALLBACK", "").strip()
@@ -451,6 +477,9 @@ MAX_EXECUTION_ITERATIONS = int(os.getenv("REV_MAX_EXEC_ITER", "45"))
 MAX_TASK_ITERATIONS = int(os.getenv("REV_MAX_TASK_ITER", "45"))
 MAX_PLANNING_TOOL_ITERATIONS = int(os.getenv("REV_MAX_PLANNING_ITER", "45"))
 CONTEXT_WINDOW_HISTORY = int(os.getenv("REV_CONTEXT_WINDOW_HISTORY", "8"))
+# Token budget for ContextBuilder selections (code/docs/memory chunks plus tool
+# examples), packed by relevance per token. 0 = fixed top-k per corpus.
+CONTEXT_TOKEN_BUDGET = int(os.getenv("REV_CONTEXT_TOKEN_BUDGET", "1600"))
 LOOP_GUARD_ENABLED = os.getenv("REV_LOOP_GUARD_ENABLED", "true").strip().lower() != "false"
 UCCT_ENABLED = os.getenv("REV_UCCT_ENABLED", "true").strip().lower() != "false"
 # Disabled by default until duplicate directory inclusion bug is fixed
@@ -489,12 +518,26 @@ MAX_LLM_TOKENS_PER_RUN = int(os.getenv("REV_MAX_TOKENS", str(1_000_000)))
 MAX_WALLCLOCK_SECONDS = int(os.getenv("REV_MAX_SECONDS", "3600"))  # 60 minutes default
 MAX_PLAN_TASKS = int(os.getenv("REV_MAX_PLAN_TASKS", "999"))
 RESEARCH_DEPTH_DEFAULT = os.getenv("REV_RESEARCH_DEPTH", "shallow").lower()
+# Run the research agent's search phases concurrently
+RESEARCH_PARALLEL = os.getenv("REV_RESEARCH_PARALLEL", "true").strip().lower() != "false"
 MAX_ORCHESTRATOR_RETRIES = int(os.getenv("REV_MAX_ORCH_RETRIES", "2"))
 MAX_PLAN_REGEN_RETRIES = int(os.getenv("REV_MAX_PLAN_REGEN_RETRIES", "2"))
 MAX_VALIDATION_RETRIES = int(os.getenv("REV_MAX_VALIDATION_RETRIES", "2"))
 MAX_ADAPTIVE_REPLANS = int(os.getenv("REV_MAX_ADAPTIVE_REPLANS", "1"))
 VALIDATION_TIMEOUT_SECONDS = int(os.getenv("REV_VALIDATION_TIMEOUT", "180"))
 
+# Tool schema pruning: send only the tools relevant to a task's action type
+TOOL_SCHEMA_PRUNING_ENABLED = os.getenv("REV_TOOL_SCHEMA_PRUNING", "true").strip().lower() != "false"
+# Start read-only tool calls as soon as they appear in a streamed LLM response
+STREAMING_TOOL_PREFETCH_ENABLED = os.getenv("REV_STREAMING_TOOL_PREFETCH", "true").strip().lower() != "false"
+# Build retrieval indexes on background workers at session start
+WARMUP_ENABLED = os.getenv("REV_WARMUP", "true").strip().lower() != "false"
+WARMUP_WORKERS = int(os.getenv("REV_WARMUP_WORKERS", "2"))
+# How long a consumer waits for an in-flight warm-up before degrading (seconds)
+WARMUP_WAIT_TIMEOUT = float(os.getenv("REV_WARMUP_WAIT_TIMEOUT", "5"))
+# Let git status use the built-in fsmonitor daemon (git >= 2.36, macOS/Windows)
+GIT_FSMONITOR = os.getenv("REV_GIT_FSMONITOR", "false").strip().lower() != "false"
+
 # ContextGuard Configuration
 ENABLE_CONTEXT_GUARD = os.getenv("REV_ENABLE_CONTEXT_GUARD", "true").lower() == "true"
 CONTEXT_GUARD_INTERACTIVE = os.getenv("REV_CONTEXT_GUARD_INTERACTIVE", "false").lower() == "true"
@@ -513,6 +556,20 @@ if VERIFICATION_STRICTNESS not in ("lenient", "moderate", "strict"):
 # Logging configuration
 LOG_RETENTION_LIMIT_DEFAULT = int(os.getenv("REV_LOG_RETENTION", "7"))
 LOG_RETENTION_LIMIT = LOG_RETENTION_LIMIT_DEFAULT
+# Debug event log: "jsonl" (default) or "msgpack" (needs the msgpack package)
+DEBUG_LOG_FORMAT = os.getenv("REV_DEBUG_LOG_FORMAT", "jsonl").strip().lower()
+# Per-component minimum levels, e.g. "llm=INFO,tools=WARNING,*=DEBUG"
+DEBUG_LOG_LEVELS = os.getenv("REV_DEBUG_LOG_LEVELS", "")
+# Keep 1 in N of high-frequency events, e.g. "TOOL_EXECUTION=0.1,FUNCTION_CALL=0.01"
+DEBUG_LOG_SAMPLING = os.getenv("REV_DEBUG_LOG_SAMPLING", "")
+# Per-run latency breakdown (spans + collapsed stacks under METRICS_DIR/profiles); --profile also adds cProfile
+PROFILE_ENABLED = os.getenv("REV_PROFILE", "false").strip().lower() == "true"
+
+# Checkpoints: append-only delta log per session, full plan snapshot every N checkpoints
+CHECKPOINT_SNAPSHOT_INTERVAL = int(os.getenv("REV_CHECKPOINT_SNAPSHOT_INTERVAL", "10"))
+
+# Transaction backups: content-addressed blobs kept for reuse across transactions (MB)
+TX_BLOB_CACHE_MB = int(os.getenv("REV_TX_BLOB_CACHE_MB", "256"))
 
 # History configuration
 HISTORY_SIZE = int(os.getenv("REV_HISTORY_SIZE", "100"))  # Number of history entries to keep
@@ -550,6 +607,10 @@ PERMISSIONS_FAIL_OPEN = os.getenv("REV_PERMISSIONS_FAIL_OPEN", "false").lower()
 MCP_ENABLED = os.getenv("REV_MCP_ENABLED", "true").strip().lower() != "false"
 DEFAULT_PRIVATE_MODE = os.getenv("REV_PRIVATE_MODE", "false").lower() == "true"
 PRIVATE_MODE = DEFAULT_PRIVATE_MODE
+# Per-request and handshake timeouts (seconds) and crash-restart budget for MCP sessions
+MCP_REQUEST_TIMEOUT = float(os.getenv("REV_MCP_REQUEST_TIMEOUT", "60"))
+MCP_CONNECT_TIMEOUT = float(os.getenv("REV_MCP_CONNECT_TIMEOUT", "15"))
+MCP_MAX_RESTARTS = int(os.getenv("REV_MCP_MAX_RESTARTS", "3"))
 
 # Default MCP servers (local NPM packages)
 # These are public, free servers that enhance AI capabilities without requiring API keys
@@ -3,22 +3,37 @@
 """Centralized debug logging system for rev CLI.
 
 This module provides comprehensive debug logging capabilities that can be enabled
-with the --debug flag. Logs are written to a file in a format optimized for LLM
-review and debugging.
+with the --debug flag. Events are written as compact JSON lines (or msgpack)
+by a background thread so that leaving debug logging on costs the caller
+little more than a queue put:
+
+- per-component minimum levels (``REV_DEBUG_LOG_LEVELS``) are resolved once
+  per component and checked before any payload work;
+- high-frequency events can be sampled 1-in-N (``REV_DEBUG_LOG_SAMPLING``);
+- ``data`` may be a zero-argument callable, built only if the event is kept.
 """
 
+import atexit
 import os
+import queue
 import sys
 import logging
 import json
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 from functools import wraps
 
 from rev import config
 
 
+_LEVELS = {"DEBUG": logging.DEBUG, "INFO": logging.INFO, "WARNING": logging.WARNING, "ERROR": logging.ERROR}
+_SINK_QUEUE_MAX = 10000
+_SINK_BATCH_MAX = 512
+
+
 def prune_old_logs(log_dir: Path, keep: int) -> None:
     """Remove old log files beyond the configured retention limit."""
 
@@ -26,7 +41,7 @@ def prune_old_logs(log_dir: Path, keep: int) -> None:
         return
 
     log_files = sorted(
-        [path for path in log_dir.glob("*.log") if path.is_file()],
+        [path for pattern in ("*.log", "*.jsonl", "*.msgpack") for path in log_dir.glob(pattern) if path.is_file()],
         key=lambda path: path.stat().st_mtime,
         reverse=True,
     )
@@ -39,6 +54,220 @@ def prune_old_logs(log_dir: Path, keep: int) -> None:
             continue
 
 
+def _json_line(record: Dict[str, Any]) -> bytes:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8", "replace") + b"\n"
+
+
+class EventSink:
+    """Append records to a file from a background thread.
+
+    Items are ``(encoder, record)`` pairs; the encoder turns the record into
+    bytes on the writer thread, so serialisation (and any deferred payload
+    construction inside it) stays off the caller's path. When the queue is
+    full, non-blocking emits are dropped and counted instead of stalling the
+    caller.
+    """
+
+    def __init__(self, path: Path, encoder: Callable[[Any], bytes] = _json_line, mode: str = "ab"):
+        self.path = Path(path)
+        self.encoder = encoder
+        self.dropped = 0
+        self.errors = 0
+        self._queue: "queue.Queue[Tuple[Optional[Callable[[Any], bytes]], Any]]" = queue.Queue(maxsize=_SINK_QUEUE_MAX)
+        self._cond = threading.Condition()
+        self._submitted = 0
+        self._written = 0
+        self._closed = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, mode)
+        self._thread = threading.Thread(target=self._run, name="rev-log-writer", daemon=True)
+        self._thread.start()
+
+    def emit(self, record: Any, *, encoder: Optional[Callable[[Any], bytes]] = None, block: bool = False) -> bool:
+        """Queue ``record``; returns False if it was dropped."""
+        with self._cond:
+            if self._closed:
+                return False
+            self._submitted += 1
+        try:
+            self._queue.put((encoder or self.encoder, record), block=block)
+            return True
+        except queue.Full:
+            with self._cond:
+                self._submitted -= 1
+                self.dropped += 1
+            return False
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything emitted so far is on disk (in the OS cache)."""
+        with self._cond:
+            target = self._submitted
+            return self._cond.wait_for(lambda: self._written >= target, timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._submitted += 1
+        self._queue.put((None, None))
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < _SINK_BATCH_MAX:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            chunks = []
+            stop = False
+            for encoder, record in batch:
+                if encoder is None:
+                    stop = True
+                    continue
+                try:
+                    chunks.append(encoder(record))
+                except Exception:
+                    self.errors += 1
+            try:
+                if chunks:
+                    self._file.write(b"".join(chunks))
+                self._file.flush()
+                if stop:
+                    self._file.close()
+            except Exception:
+                self.errors += 1
+            with self._cond:
+                self._written += len(batch)
+                self._cond.notify_all()
+            if stop:
+                return
+
+
+class _SinkHandler(logging.Handler):
+    """Forward stdlib ``rev.*`` log records into an :class:`EventSink`."""
+
+    def __init__(self, sink: EventSink):
+        super().__init__(logging.DEBUG)
+        self.sink = sink
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.sink.emit({
+                "ts": record.created,
+                "name": record.name,
+                "level": record.levelname,
+                "msg": record.getMessage(),
+            })
+        except Exception:
+            self.handleError(record)
+
+
+def _parse_levels(spec: str) -> Dict[str, int]:
+    levels: Dict[str, int] = {}
+    for part in (spec or "").split(","):
+        name, _, level = part.partition("=")
+        if name.strip() and level.strip().upper() in _LEVELS:
+            levels[name.strip()] = _LEVELS[level.strip().upper()]
+    return levels
+
+
+def _parse_sampling(spec: str) -> Dict[str, int]:
+    """``EVENT=rate`` pairs to keep-1-in-N intervals."""
+    intervals: Dict[str, int] = {}
+    for part in (spec or "").split(","):
+        name, _, rate = part.partition("=")
+        try:
+            value = float(rate)
+        except ValueError:
+            continue
+        if name.strip() and 0 < value < 1:
+            intervals[name.strip()] = max(1, round(1 / value))
+    return intervals
+
+
+def _make_encoder(fmt: str) -> Tuple[Callable[[Any], bytes], str]:
+    if fmt == "msgpack":
+        try:
+            import msgpack
+        except ImportError:
+            pass
+        else:
+            return (lambda record: msgpack.packb(record, default=str, use_bin_type=True)), ".msgpack"
+    return _json_line, ".jsonl"
+
+
+def _transcript_block(item: Tuple[str, Callable[[], Dict[str, Any]]]) -> bytes:
+    header, build = item
+    content = json.dumps(build(), ensure_ascii=False, indent=2, default=str)
+    return f"{header}\n{content}\n\n".encode("utf-8", "replace")
+
+
+_TRANSCRIPT_SINKS: Dict[str, EventSink] = {}
+_TRANSCRIPT_LOCK = threading.Lock()
+
+
+def _transcript_sink(path_val: str) -> EventSink:
+    with _TRANSCRIPT_LOCK:
+        sink = _TRANSCRIPT_SINKS.get(path_val)
+        if sink is None or sink._closed:
+            sink = _TRANSCRIPT_SINKS[path_val] = EventSink(Path(path_val), encoder=_transcript_block)
+        return sink
+
+
+def _close_transcript_sinks() -> None:
+    with _TRANSCRIPT_LOCK:
+        sinks = list(_TRANSCRIPT_SINKS.values())
+        _TRANSCRIPT_SINKS.clear()
+    for sink in sinks:
+        sink.close()
+
+
+atexit.register(_close_transcript_sinks)
+
+
+def _system_state() -> Dict[str, Any]:
+    """Debugging context for transcripts (gathered on the writer thread)."""
+    extra_context: Dict[str, Any] = {
+        "cwd": os.getcwd(),
+        "platform": sys.platform,
+        "python_version": sys.version,
+    }
+
+    # Filtered environment variables (no secrets)
+    try:
+        secret_keywords = {'key', 'token', 'secret', 'password', 'auth', 'credential', 'cert'}
+        extra_context["env"] = {
+            k: v for k, v in os.environ.items()
+            if not any(kw in k.lower() for kw in secret_keywords)
+        }
+    except Exception:
+        pass
+
+    # Simple file listing of root
+    try:
+        extra_context["files_root"] = os.listdir(".")[:50]
+    except Exception:
+        pass
+
+    # Available tools
+    try:
+        from rev.tools.registry import get_available_tools
+        extra_context["available_tools"] = [t.get("function", {}).get("name") for t in get_available_tools() if isinstance(t, dict)]
+    except Exception:
+        pass
+
+    # Git status (to see actual file changes)
+    try:
+        import subprocess
+        extra_context["git_status"] = subprocess.check_output(["git", "status", "--short"], timeout=5).decode("utf-8")
+    except Exception:
+        pass
+    return extra_context
+
+
 class DebugLogger:
     """Centralized debug logger with component-specific logging."""
 
@@ -56,6 +285,12 @@ class DebugLogger:
         """
         self._enabled = enabled
         self._trace_context: Dict[str, Any] = {}
+        self._sink: Optional[EventSink] = None
+        self._handler: Optional[_SinkHandler] = None
+        self._component_levels = _parse_levels(getattr(config, "DEBUG_LOG_LEVELS", ""))
+        self._thresholds: Dict[str, int] = {}
+        self._sample_intervals = _parse_sampling(getattr(config, "DEBUG_LOG_SAMPLING", ""))
+        self._sample_counts: Dict[str, int] = {}
 
         if enabled:
             # Create log directory
@@ -65,7 +300,9 @@ class DebugLogger:
 
             # Create log file with timestamp
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            self._log_file = log_dir / f"rev_debug_{timestamp}.log"
+            encoder, suffix = _make_encoder(getattr(config, "DEBUG_LOG_FORMAT", "jsonl"))
+            self._log_file = log_dir / f"rev_debug_{timestamp}{suffix}"
+            self._sink = EventSink(self._log_file, encoder=encoder, mode="wb")
 
             # Set up root logger
             self._setup_logging()
@@ -129,22 +366,13 @@ class DebugLogger:
         return dict(self._trace_context)
 
     def _setup_logging(self):
-        """Set up the logging configuration."""
-        # Create formatter for detailed logs
-        formatter = logging.Formatter(
-            '%(asctime)s | %(name)-20s | %(levelname)-8s | %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-
-        # Create file handler
-        file_handler = logging.FileHandler(self._log_file, mode='w', encoding='utf-8')
-        file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(formatter)
+        """Route stdlib ``rev.*`` loggers into the event sink."""
+        self._handler = _SinkHandler(self._sink)
 
         # Configure root logger
         root_logger = logging.getLogger('rev')
         root_logger.setLevel(logging.DEBUG)
-        root_logger.addHandler(file_handler)
+        root_logger.addHandler(self._handler)
         root_logger.propagate = False
 
     def get_logger(self, component: str) -> logging.Logger:
@@ -160,29 +388,64 @@ class DebugLogger:
             self._loggers[component] = logging.getLogger(f'rev.{component}')
         return self._loggers[component]
 
-    def log(self, component: str, event: str, data: Optional[Dict[str, Any]] = None, level: str = "INFO"):
+    def _threshold(self, component: str) -> int:
+        threshold = self._thresholds.get(component)
+        if threshold is None:
+            threshold = self._component_levels.get(component, self._component_levels.get("*", logging.DEBUG))
+            self._thresholds[component] = threshold
+        return threshold
+
+    def is_enabled_for(self, component: str, level: str = "DEBUG") -> bool:
+        """Whether an event of ``level`` from ``component`` would be recorded."""
+        return self._enabled and _LEVELS.get(level.upper(), logging.INFO) >= self._threshold(component)
+
+    def _sample(self, event: str) -> int:
+        """Return the sampling interval if this occurrence is kept, else 0."""
+        interval = self._sample_intervals.get(event)
+        if interval is None:
+            return 1
+        count = self._sample_counts.get(event, 0)
+        self._sample_counts[event] = count + 1
+        return interval if count % interval == 0 else 0
+
+    def log(
+        self,
+        component: str,
+        event: str,
+        data: Union[Dict[str, Any], Callable[[], Dict[str, Any]], None] = None,
+        level: str = "INFO",
+    ):
         """Log a structured event.
 
         Args:
             component: Component name (e.g., 'main', 'llm', 'executor')
             event: Event type/name
-            data: Optional dictionary of event data
+            data: Optional dictionary of event data, or a callable returning
+                it; the callable is only invoked if the event is recorded
             level: Log level (DEBUG, INFO, WARNING, ERROR)
         """
         if not self._enabled:
             return
+        level = level.upper()
+        level_no = _LEVELS.get(level, logging.INFO)
+        if level_no < self._threshold(component):
+            return
+        # Warnings and errors are never sampled out.
+        interval = self._sample(event) if level_no < logging.WARNING else 1
+        if not interval:
+            return
+        if callable(data):
+            try:
+                data = data()
+            except Exception as e:
+                data = {"payload_error": f"{type(e).__name__}: {e}"}
 
-        logger = self.get_logger(component)
-
-        # Format the log message
-        message = f"[{event}]"
+        record: Dict[str, Any] = {"ts": time.time(), "name": f"rev.{component}", "level": level, "event": event}
         if data:
-            # Pretty print the data for LLM readability
-            message += f" {json.dumps(data, indent=2, default=str)}"
-
-        # Log at the appropriate level
-        log_level = getattr(logging, level.upper(), logging.INFO)
-        logger.log(log_level, message)
+            record["data"] = data
+        if interval > 1:
+            record["sample_interval"] = interval
+        self._sink.emit(record)
 
     def log_function_call(self, component: str, function_name: str, args: tuple = (), kwargs: dict = None):
         """Log a function call with its arguments.
@@ -196,14 +459,16 @@ class DebugLogger:
         if not self._enabled:
             return
 
-        data = {
-            "function": function_name,
-            "args": [str(arg)[:200] for arg in args],  # Truncate long args
-        }
-        if kwargs:
-            data["kwargs"] = {k: str(v)[:200] for k, v in kwargs.items()}
+        def build() -> Dict[str, Any]:
+            data = {
+                "function": function_name,
+                "args": [str(arg)[:200] for arg in args],  # Truncate long args
+            }
+            if kwargs:
+                data["kwargs"] = {k: str(v)[:200] for k, v in kwargs.items()}
+            return data
 
-        self.log(component, "FUNCTION_CALL", data, "DEBUG")
+        self.log(component, "FUNCTION_CALL", build, "DEBUG")
 
     def log_llm_request(self, model: str, messages: list, tools: Optional[list] = None):
         """Log an LLM API request.
@@ -216,22 +481,24 @@ class DebugLogger:
         if not self._enabled:
             return
 
-        data = {
-            "model": model,
-            "message_count": len(messages),
-            "messages": [
-                {
-                    "role": msg.get("role"),
-                    "content": str(msg.get("content", ""))[:500]  # Truncate long content
-                }
-                for msg in messages
-            ],
-        }
-        if tools:
-            data["tools_count"] = len(tools)
-            data["tools"] = [tool.get("name") for tool in tools]
+        def build() -> Dict[str, Any]:
+            data = {
+                "model": model,
+                "message_count": len(messages),
+                "messages": [
+                    {
+                        "role": msg.get("role"),
+                        "content": str(msg.get("content", ""))[:500]  # Truncate long content
+                    }
+                    for msg in messages
+                ],
+            }
+            if tools:
+                data["tools_count"] = len(tools)
+                data["tools"] = [tool.get("name") for tool in tools]
+            return data
 
-        self.log("llm", "LLM_REQUEST", data, "DEBUG")
+        self.log("llm", "LLM_REQUEST", build, "DEBUG")
 
     def log_llm_response(self, model: str, response: dict, cached: bool = False):
         """Log an LLM API response.
@@ -244,28 +511,30 @@ class DebugLogger:
         if not self._enabled:
             return
 
-        data = {
-            "model": model,
-            "cached": cached,
-            "response_type": type(response).__name__,
-        }
+        def build() -> Dict[str, Any]:
+            data = {
+                "model": model,
+                "cached": cached,
+                "response_type": type(response).__name__,
+            }
 
-        # Extract relevant response info
-        if isinstance(response, dict):
-            if "message" in response:
-                msg = response["message"]
-                data["role"] = msg.get("role")
-                data["content_preview"] = str(msg.get("content", ""))[:500]
-                if "tool_calls" in msg:
-                    data["tool_calls"] = [
-                        {
-                            "name": tc.get("function", {}).get("name"),
-                            "args_preview": str(tc.get("function", {}).get("arguments", ""))[:200]
-                        }
-                        for tc in msg.get("tool_calls", [])
-                    ]
-
-        self.log("llm", "LLM_RESPONSE", data, "DEBUG")
+            # Extract relevant response info
+            if isinstance(response, dict):
+                if "message" in response:
+                    msg = response["message"]
+                    data["role"] = msg.get("role")
+                    data["content_preview"] = str(msg.get("content", ""))[:500]
+                    if "tool_calls" in msg:
+                        data["tool_calls"] = [
+                            {
+                                "name": tc.get("function", {}).get("name"),
+                                "args_preview": str(tc.get("function", {}).get("arguments", ""))[:200]
+                            }
+                            for tc in msg.get("tool_calls", [])
+                        ]
+            return data
+
+        self.log("llm", "LLM_RESPONSE", build, "DEBUG")
 
     def log_llm_transcript(self, *, model: str, messages: Any, response: Any, tools: Any = None):
         """Persist full LLM request/response (no truncation) when tracing is enabled.
@@ -306,65 +575,30 @@ class DebugLogger:
             elif not has_response:
                 write_run_log_line("Response: <pending>")
             write_run_log_line("=" * 80 + "\n")
-            # Gather extra context for debugging
-            extra_context = {
-                "cwd": os.getcwd(),
-                "platform": sys.platform,
-                "python_version": sys.version,
-            }
-            
-            # Filtered environment variables (no secrets)
-            try:
-                secret_keywords = {'key', 'token', 'secret', 'password', 'auth', 'credential', 'cert'}
-                extra_context["env"] = {
-                    k: v for k, v in os.environ.items() 
-                    if not any(kw in k.lower() for kw in secret_keywords)
-                }
-            except Exception:
-                pass
-            
-            # Simple file listing of root
-            try:
-                extra_context["files_root"] = os.listdir(".")[:50]
-            except Exception:
-                pass
-                
-            # Available tools
-            try:
-                from rev.tools.registry import get_available_tools
-                extra_context["available_tools"] = [t.get("function", {}).get("name") for t in get_available_tools() if isinstance(t, dict)]
-            except Exception:
-                pass
-                
-            # Git status (to see actual file changes)
-            try:
-                import subprocess
-                extra_context["git_status"] = subprocess.check_output(["git", "status", "--short"], timeout=5).decode("utf-8")
-            except Exception:
-                pass
 
-            payload = {
-                "model": model,
-                "messages": messages,
-                "tools": tools,
-                "response": response,
-                "system_state": extra_context,
-                "trace_context": self.get_trace_context(),
-                "tools_enabled": bool(tools),
-                "message_count": msg_count,
-                "last_message_role": last_role,
-            }
-            content = json.dumps(payload, ensure_ascii=False, indent=2)
             path_val = getattr(config, "LLM_TRANSACTION_LOG_PATH", "")
             if not path_val:
                 return
-            path = Path(path_val)
-            path.parent.mkdir(parents=True, exist_ok=True)
-            with path.open("a", encoding="utf-8") as f:
-                f.write(f"==== LLM TRANSCRIPT {datetime.utcnow().isoformat()}Z ====\n")
-                f.write(content)
-                f.write("\n\n")
-                f.flush()
+            # Shallow copies pin what was sent; serialisation and the system
+            # state snapshot happen on the writer thread.
+            messages_snapshot = list(messages) if isinstance(messages, list) else messages
+            trace_context = self.get_trace_context()
+
+            def build() -> Dict[str, Any]:
+                return {
+                    "model": model,
+                    "messages": messages_snapshot,
+                    "tools": tools,
+                    "response": response,
+                    "system_state": _system_state(),
+                    "trace_context": trace_context,
+                    "tools_enabled": bool(tools),
+                    "message_count": msg_count,
+                    "last_message_role": last_role,
+                }
+
+            header = f"==== LLM TRANSCRIPT {datetime.utcnow().isoformat()}Z ===="
+            _transcript_sink(path_val).emit((header, build), block=True)
         except Exception:
             # Best-effort tracing; never crash caller
             pass
@@ -387,23 +621,16 @@ class DebugLogger:
                 description = data.get("description", "")[:100]
                 write_run_log_line(f"[ORCHESTRATOR] {action_type.upper()}: {description}...")
 
+            path_val = getattr(config, "LLM_TRANSACTION_LOG_PATH", "")
+            if not path_val:
+                return
             payload = {
                 "event_type": event_type,
                 "timestamp": timestamp,
                 "data": data,
                 "trace_context": self.get_trace_context()
             }
-            content = json.dumps(payload, ensure_ascii=False, indent=2)
-            path_val = getattr(config, "LLM_TRANSACTION_LOG_PATH", "")
-            if not path_val:
-                return
-            path = Path(path_val)
-            path.parent.mkdir(parents=True, exist_ok=True)
-            with path.open("a", encoding="utf-8") as f:
-                f.write(f"==== TRANSACTION EVENT {event_type} ====\n")
-                f.write(content)
-                f.write("\n\n")
-                f.flush()
+            _transcript_sink(path_val).emit((f"==== TRANSACTION EVENT {event_type} ====", lambda: payload), block=True)
         except Exception:
             pass
 
@@ -420,21 +647,20 @@ class DebugLogger:
         if not self._enabled:
             return
 
-        data = {
-            "tool": tool_name,
-            "arguments": {k: str(v)[:200] for k, v in arguments.items()},
-            "duration_ms": round(duration_ms, 2)
-        }
-
-        if error:
-            data["error"] = str(error)
-            level = "ERROR"
-        else:
-            data["result_type"] = type(result).__name__
-            data["result_preview"] = str(result)[:500] if result is not None else None
-            level = "DEBUG"
+        def build() -> Dict[str, Any]:
+            data = {
+                "tool": tool_name,
+                "arguments": {k: str(v)[:200] for k, v in arguments.items()},
+                "duration_ms": round(duration_ms, 2)
+            }
+            if error:
+                data["error"] = str(error)
+            else:
+                data["result_type"] = type(result).__name__
+                data["result_preview"] = str(result)[:500] if result is not None else None
+            return data
 
-        self.log("tools", "TOOL_EXECUTION", data, level)
+        self.log("tools", "TOOL_EXECUTION", build, "ERROR" if error else "DEBUG")
 
     def log_task_status(self, task_id: str, status: str, details: Optional[Dict[str, Any]] = None):
         """Log a task status change.
@@ -506,7 +732,7 @@ class DebugLogger:
             *args: Positional format arguments.
             **kwargs: Keyword format arguments.
         """
-        if not self._enabled:
+        if not self._enabled or _LEVELS.get(level.upper(), logging.INFO) < self._threshold("general"):
             return
 
         logger = self.get_logger("general")
@@ -539,6 +765,13 @@ class DebugLogger:
         """Get the path to the current log file."""
         return self._log_file
 
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait for queued debug events and transcripts to be written."""
+        ok = self._sink.flush(timeout) if self._sink is not None else True
+        with _TRANSCRIPT_LOCK:
+            sinks = list(_TRANSCRIPT_SINKS.values())
+        return all([ok] + [sink.flush(timeout) for sink in sinks])
+
     def close(self):
         """Close the logger and write session end marker."""
         if self._enabled:
@@ -557,6 +790,10 @@ class DebugLogger:
                 handler.close()
                 root_logger.removeHandler(handler)
 
+            if self._sink is not None:
+                self._sink.close()
+            _close_transcript_sinks()
+
 
 def log_function(component: str):
     """Decorator to automatically log function calls.
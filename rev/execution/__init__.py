@@ -7,21 +7,25 @@ This package contains the execution phase functionality including:
 - Safety checks: Validates and confirms potentially destructive operations
 """
 
-from rev.execution.planner import planning_mode, PLANNING_SYSTEM
-from rev.execution.executor import (
-    execution_mode,
-    execute_single_task,
-    concurrent_execution_mode,
-    streaming_execution_mode,
-    EXECUTION_SYSTEM
-)
-from rev.execution.safety import (
-    is_scary_operation,
-    prompt_scary_operation,
-    clear_prompt_decisions,
-    SCARY_OPERATIONS,
-    format_operation_description,
-)
+from rev._lazy import exports_from, lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, exports_from({
+    "rev.execution.planner": ["planning_mode", "PLANNING_SYSTEM"],
+    "rev.execution.executor": [
+        "execution_mode",
+        "execute_single_task",
+        "concurrent_execution_mode",
+        "streaming_execution_mode",
+        "EXECUTION_SYSTEM",
+    ],
+    "rev.execution.safety": [
+        "is_scary_operation",
+        "prompt_scary_operation",
+        "clear_prompt_decisions",
+        "SCARY_OPERATIONS",
+        "format_operation_description",
+    ],
+}), globals())
 
 __all__ = [
     # Planner
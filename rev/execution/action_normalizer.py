@@ -44,6 +44,7 @@ _EXACT_ALIASES: dict[str, str] = {
     "list_directory": "read",
     "tree_view": "read",
     "search_code": "research",
+    "search_code_multi": "research",
     "get_repo_context": "read",
     "write_file": "add",
     "create_file": "add",
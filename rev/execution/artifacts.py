@@ -3,19 +3,34 @@
 """Artifact persistence helpers (safe by default).
 
 Stores large tool outputs on disk while redacting sensitive values.
-Writes are atomic and filenames are collision-proof.
+
+Tool outputs are written by a background thread into append-only JSONL
+segment files under ``.rev/artifacts/tool_outputs``:
+
+- each output body is stored once per content digest (``blob`` records) and
+  every tool call adds a small ``call`` record pointing at it;
+- the caller gets its :class:`ArtifactRef` (``<segment>#<record id>``) as soon
+  as the records are queued; :func:`read_tool_output_artifact` waits for
+  pending writes before reading;
+- retention is enforced from an in-memory index: evicted records only drop
+  reference counts, and a segment is deleted once nothing live remains in it.
 """
 
 from __future__ import annotations
 
+import atexit
 import hashlib
+import itertools
 import json
 import os
+import queue
+import re
 import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple, Set
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 from rev import config
 from rev.execution.redaction import redact_sensitive, REDACTION_RULES_VERSION
@@ -23,20 +38,27 @@ from rev.execution.redaction import redact_sensitive, REDACTION_RULES_VERSION
 
 SCHEMA_VERSION = "tool_output@1"
 
+_QUEUE_MAX = 256
+_BATCH_MAX = 64
+_SEGMENT_MAX_BYTES = 4 * 1024 * 1024
+_CLOSE_TIMEOUT = 5.0
 
 _COUNTER_LOCK = threading.Lock()
 _COUNTER = 0
+_STORE_SEQ = itertools.count(1)
 
 
 @dataclass(frozen=True)
 class ArtifactRef:
     path: Path
+    record_id: Optional[str] = None
 
     def as_posix(self) -> str:
         try:
-            return self.path.relative_to(config.ROOT).as_posix()
+            text = self.path.relative_to(config.ROOT).as_posix()
         except Exception:
-            return str(self.path).replace("\\", "/")
+            text = str(self.path).replace("\\", "/")
+        return f"{text}#{self.record_id}" if self.record_id else text
 
 
 def _iso_utc() -> str:
@@ -59,6 +81,13 @@ def _sha256_bytes(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
 
 
+def _canonical_json(value: Any) -> str:
+    try:
+        return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    except Exception:
+        return json.dumps(str(value), ensure_ascii=False)
+
+
 def _sha256_json(value: Any) -> str:
     try:
         payload = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
@@ -83,7 +112,7 @@ def _max_tool_outputs_to_keep() -> int:
 
 
 def _session_from_filename(path: Path) -> Optional[str]:
-    """Extract session_id token from the artifact filename if present."""
+    """Extract session_id token from a legacy per-call artifact filename."""
     try:
         parts = path.stem.split("_")
         # Filename format: stamp_counter_pid_session_task_tool.json
@@ -94,43 +123,444 @@ def _session_from_filename(path: Path) -> Optional[str]:
     return None
 
 
+def _safe_token(value: Any, default: str) -> str:
+    return "".join(c if c.isalnum() or c in ".-" else "-" for c in str(value or default))[:64] or default
+
+
+_BLOB_PREFIX = b'{"kind":"blob","digest":"'
+_BLOB_DIGEST_RE = re.compile(rb'^\{"kind":"blob","digest":"([0-9a-f]{64})"')
+
+
+@dataclass
+class _CallEntry:
+    session_id: Optional[str]
+    digest: Optional[str]
+    segment: Optional[str] = None
+    legacy_path: Optional[Path] = None
+    scanned: bool = False
+
+
+class ToolOutputStore:
+    """Append-only, content-addressed tool output store for one directory.
+
+    Producers only touch the in-memory index and a bounded queue; a single
+    daemon thread performs every file operation (appends, segment deletion,
+    the one-time scan of segments left by earlier sessions). Deletions are
+    queued behind the appends they depend on, so a segment is never removed
+    while writes to it are pending.
+    """
+
+    def __init__(self, directory: Path, *, queue_size: int = _QUEUE_MAX, segment_max_bytes: int = _SEGMENT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.segment_max_bytes = max(1, int(segment_max_bytes))
+        self.errors = 0
+        # Unique per store instance so the scan can tell our segments apart.
+        self._prefix = f"{_safe_stamp_for_filename()}_{os.getpid()}-{next(_STORE_SEQ)}_"
+        self._queue: "queue.Queue[tuple]" = queue.Queue(maxsize=max(1, int(queue_size)))
+        # _submit_lock orders producers' queue puts; the writer never takes it,
+        # so a producer blocked on a full queue cannot stall the writer.
+        self._submit_lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._calls: "OrderedDict[str, _CallEntry]" = OrderedDict()
+        self._blobs: Dict[str, List[Any]] = {}  # digest -> [segment, refcount]
+        self._segment_live: Dict[str, int] = {}
+        self._segment: Optional[str] = None
+        self._segment_bytes = 0
+        self._segment_seq = 0
+        self._max_keep = _max_tool_outputs_to_keep()
+        self._submitted = 0
+        self._written = 0
+        self._closed = False
+        self._handle = None
+        self._handle_segment: Optional[str] = None
+        self._enqueue([("scan",)])
+        self._thread = threading.Thread(target=self._run, name="rev-artifact-writer", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------ producers
+    def submit(
+        self,
+        *,
+        record_id: str,
+        record: Dict[str, Any],
+        digest: str,
+        content_type: str,
+        payload_json: str,
+        session_id: Optional[str],
+        max_keep: int,
+    ) -> ArtifactRef:
+        """Queue one tool call (and its output body unless already stored)."""
+        call_line = json.dumps(
+            {"kind": "call", "id": record_id, **record},
+            ensure_ascii=False, separators=(",", ":"), default=str,
+        ).encode("utf-8", errors="replace") + b"\n"
+        with self._submit_lock:
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("tool output store is closed")
+                self._max_keep = max_keep
+                blob = self._blobs.get(digest)
+                data = call_line
+                if blob is None:
+                    blob_line = (
+                        '{"kind":"blob","digest":"%s","content_type":%s,"output":%s}\n'
+                        % (digest, json.dumps(content_type), payload_json)
+                    ).encode("utf-8", errors="replace")
+                    data = blob_line + call_line
+                dead: List[Path] = []
+                segment = self._segment_for_locked(len(data), dead)
+                if blob is None:
+                    self._blobs[digest] = [segment, 1]
+                    self._segment_live[segment] = self._segment_live.get(segment, 0) + 1
+                else:
+                    blob[1] += 1
+                self._segment_live[segment] = self._segment_live.get(segment, 0) + 1
+                self._calls[record_id] = _CallEntry(session_id=session_id, digest=digest, segment=segment)
+                keep = {session_id} if session_id else set()
+                dead.extend(self._evict_locked(max_keep, keep))
+                ops = [("write", segment, data)] + [("delete", path) for path in dead]
+                self._submitted += len(ops)
+            for op in ops:
+                self._queue.put(op)
+        return ArtifactRef(path=self.directory / segment, record_id=record_id)
+
+    def prune(self, max_keep: int, keep_sessions: Optional[Set[str]] = None) -> None:
+        """Evict all but the newest ``max_keep`` calls (plus one per kept session)."""
+        with self._submit_lock:
+            with self._cond:
+                dead = self._evict_locked(max_keep, set(keep_sessions or ()))
+                ops = [("delete", path) for path in dead]
+                self._submitted += len(ops)
+            for op in ops:
+                self._queue.put(op)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything queued so far has been written."""
+        with self._cond:
+            target = self._submitted
+            return self._cond.wait_for(lambda: self._written >= target, timeout)
+
+    def close(self, timeout: Optional[float] = _CLOSE_TIMEOUT) -> None:
+        with self._submit_lock:
+            with self._cond:
+                if self._closed:
+                    return
+                self._closed = True
+                self._submitted += 1
+            self._queue.put(("stop",))
+        self._thread.join(timeout)
+
+    def entries(self) -> List[Tuple[str, Optional[str]]]:
+        """``(record_id, session_id)`` of retained calls, oldest first."""
+        with self._cond:
+            return [(rid, entry.session_id) for rid, entry in self._calls.items()]
+
+    def _enqueue(self, ops: List[tuple]) -> None:
+        with self._cond:
+            self._submitted += len(ops)
+        for op in ops:
+            self._queue.put(op)
+
+    # ------------------------------------------------------------- indexing
+    def _segment_for_locked(self, size: int, dead: List[Path]) -> str:
+        if self._segment is None or (self._segment_bytes and self._segment_bytes + size > self.segment_max_bytes):
+            previous = self._segment
+            self._segment_seq += 1
+            self._segment = f"{self._prefix}{self._segment_seq:04d}.jsonl"
+            self._segment_bytes = 0
+            if previous is not None and self._segment_live.get(previous, 0) <= 0:
+                self._segment_live.pop(previous, None)
+                dead.append(self.directory / previous)
+        self._segment_bytes += size
+        return self._segment
+
+    def _release_segment_locked(self, segment: str, dead: List[Path]) -> None:
+        remaining = self._segment_live.get(segment, 0) - 1
+        if remaining <= 0 and segment != self._segment:
+            self._segment_live.pop(segment, None)
+            dead.append(self.directory / segment)
+        else:
+            self._segment_live[segment] = remaining
+
+    def _release_locked(self, entry: _CallEntry, dead: List[Path]) -> None:
+        if entry.legacy_path is not None:
+            dead.append(entry.legacy_path)
+            return
+        if entry.segment is not None:
+            self._release_segment_locked(entry.segment, dead)
+        blob = self._blobs.get(entry.digest) if entry.digest else None
+        if blob is not None:
+            blob[1] -= 1
+            if blob[1] <= 0:
+                del self._blobs[entry.digest]
+                self._release_segment_locked(blob[0], dead)
+
+    def _evict_locked(self, max_keep: int, keep_sessions: Set[str], scanned_only: bool = False) -> List[Path]:
+        protected: Set[str] = set()
+        pending = set(keep_sessions)
+        if pending:
+            for record_id in reversed(self._calls):
+                session = self._calls[record_id].session_id
+                if session in pending:
+                    protected.add(record_id)
+                    pending.discard(session)
+                    if not pending:
+                        break
+        limit = max(max_keep, len(protected))
+        dead: List[Path] = []
+        for record_id in list(self._calls):
+            if len(self._calls) <= limit:
+                break
+            if record_id in protected:
+                continue
+            entry = self._calls[record_id]
+            if scanned_only and not entry.scanned:
+                break
+            del self._calls[record_id]
+            self._release_locked(entry, dead)
+        return dead
+
+    # --------------------------------------------------------------- writer
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < _BATCH_MAX:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = False
+            for op in batch:
+                try:
+                    if op[0] == "stop":
+                        stop = True
+                    else:
+                        self._apply(op)
+                except Exception:
+                    self.errors += 1
+            try:
+                if self._handle is not None:
+                    self._handle.flush()
+                    if stop:
+                        os.fsync(self._handle.fileno())
+                        self._handle.close()
+                        self._handle = None
+            except Exception:
+                self.errors += 1
+            with self._cond:
+                self._written += len(batch)
+                self._cond.notify_all()
+            if stop:
+                return
+
+    def _apply(self, op: tuple) -> None:
+        kind = op[0]
+        if kind == "write":
+            _, segment, data = op
+            if self._handle_segment != segment:
+                self._close_handle()
+                self.directory.mkdir(parents=True, exist_ok=True)
+                self._handle = open(self.directory / segment, "ab")
+                self._handle_segment = segment
+            self._handle.write(data)
+        elif kind == "delete":
+            path = op[1]
+            if self._handle_segment == path.name:
+                self._close_handle()
+            path.unlink(missing_ok=True)
+        elif kind == "scan":
+            self._scan_existing()
+
+    def _close_handle(self) -> None:
+        handle, self._handle, self._handle_segment = self._handle, None, None
+        if handle is not None:
+            handle.flush()
+            os.fsync(handle.fileno())
+            handle.close()
+
+    def _scan_existing(self) -> None:
+        """Index artifacts left by earlier sessions so retention covers them."""
+        if not self.directory.exists():
+            return
+        found: List[Tuple[float, List[Tuple[str, _CallEntry]], Dict[str, str]]] = []
+        for path in self.directory.glob("*.json"):
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                continue
+            entry = _CallEntry(session_id=_session_from_filename(path), digest=None, legacy_path=path, scanned=True)
+            found.append((mtime, [(f"legacy:{path.name}", entry)], {}))
+        for path in self.directory.glob("*.jsonl"):
+            if path.name.startswith(self._prefix):
+                continue
+            try:
+                mtime = path.stat().st_mtime
+                calls, blobs = _scan_segment(path)
+            except OSError:
+                continue
+            found.append((mtime, calls, blobs))
+        found.sort(key=lambda item: item[0])
+
+        dead: List[Path] = []
+        with self._cond:
+            merged: "OrderedDict[str, _CallEntry]" = OrderedDict()
+            for _mtime, calls, blobs in found:
+                for record_id, entry in calls:
+                    if entry.segment is not None:
+                        self._segment_live[entry.segment] = self._segment_live.get(entry.segment, 0) + 1
+                        blob = self._blobs.get(entry.digest)
+                        if blob is None and entry.digest in blobs:
+                            blob = self._blobs[entry.digest] = [blobs[entry.digest], 0]
+                            self._segment_live[blob[0]] = self._segment_live.get(blob[0], 0) + 1
+                        if blob is not None:
+                            blob[1] += 1
+                    merged[f"{entry.segment}#{record_id}" if entry.segment else record_id] = entry
+            for _mtime, calls, blobs in found:
+                for segment in {entry.segment for _rid, entry in calls if entry.segment} | set(blobs.values()):
+                    self._segment_live.setdefault(segment, 0)
+            merged.update(self._calls)
+            self._calls = merged
+            dead.extend(self._evict_locked(self._max_keep, set(), scanned_only=True))
+            # Segments whose calls were all evicted earlier but never deleted.
+            for segment in [s for s, n in self._segment_live.items() if n <= 0 and not s.startswith(self._prefix)]:
+                self._segment_live.pop(segment, None)
+                dead.append(self.directory / segment)
+        for path in dead:
+            path.unlink(missing_ok=True)
+
+
+def _scan_segment(path: Path) -> Tuple[List[Tuple[str, _CallEntry]], Dict[str, str]]:
+    calls: List[Tuple[str, _CallEntry]] = []
+    blobs: Dict[str, str] = {}
+    with open(path, "rb") as f:
+        for line in f:
+            if line.startswith(_BLOB_PREFIX):
+                match = _BLOB_DIGEST_RE.match(line)
+                if match:
+                    blobs[match.group(1).decode("ascii")] = path.name
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # torn write at the tail of a crashed session
+            if isinstance(record, dict) and record.get("kind") == "call" and record.get("id"):
+                entry = _CallEntry(
+                    session_id=record.get("session_id"),
+                    digest=record.get("output_digest_redacted"),
+                    segment=path.name,
+                    scanned=True,
+                )
+                calls.append((str(record["id"]), entry))
+    return calls, blobs
+
+
+_STORES: Dict[Path, ToolOutputStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_tool_output_store(directory: Optional[Path] = None) -> ToolOutputStore:
+    """Shared store for ``directory`` (defaults to the workspace tool output dir)."""
+    key = Path(directory or config.TOOL_OUTPUTS_DIR).resolve()
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None or store._closed:
+            store = _STORES[key] = ToolOutputStore(key)
+        return store
+
+
+def flush_tool_output_artifacts(timeout: Optional[float] = None) -> bool:
+    """Wait for all queued artifact writes in every store."""
+    with _STORES_LOCK:
+        stores = list(_STORES.values())
+    return all(store.flush(timeout) for store in stores)
+
+
+def close_tool_output_stores() -> None:
+    with _STORES_LOCK:
+        stores = list(_STORES.values())
+        _STORES.clear()
+    for store in stores:
+        store.close()
+
+
+atexit.register(close_tool_output_stores)
+
+
 def _prune_old_tool_outputs(max_keep: int, keep_sessions: Optional[Set[str]] = None) -> None:
     """Prune old tool output artifacts, preserving newest + protected sessions."""
-    try:
-        files = sorted(
-            config.TOOL_OUTPUTS_DIR.glob("*.json"),
-            key=lambda p: p.stat().st_mtime,
-            reverse=True,
-        )
-    except Exception:
-        return
-
-    keep_sessions = keep_sessions or set()
-    protected: Set[Path] = set()
-    for path in files:
-        session = _session_from_filename(path)
-        if session and session in keep_sessions:
-            protected.add(path)
-            # Only the newest artifact per keep_session should be protected
-            keep_sessions.remove(session)
-        if not keep_sessions:
-            break
-
-    allow_remaining = max_keep - len(protected)
-    if allow_remaining < 0:
-        allow_remaining = 0
-
-    kept_remaining = 0
-    for path in files:
-        if path in protected:
-            continue
-        if kept_remaining < allow_remaining:
-            kept_remaining += 1
-            continue
+    store = get_tool_output_store()
+    store.prune(max_keep, keep_sessions=keep_sessions)
+    store.flush()
+
+
+def read_tool_output_artifact(ref: Union[ArtifactRef, str]) -> Optional[Dict[str, Any]]:
+    """Load the artifact behind ``ref`` (an :class:`ArtifactRef` or its ``as_posix`` form)."""
+    text = ref.as_posix() if isinstance(ref, ArtifactRef) else str(ref)
+    path_text, _, record_id = text.partition("#")
+    path = Path(path_text)
+    if not path.is_absolute():
+        path = config.ROOT / path
+    with _STORES_LOCK:
+        store = _STORES.get(path.parent.resolve())
+    if store is not None:
+        store.flush()
+
+    if not record_id:
         try:
-            path.unlink(missing_ok=True)
-        except Exception:
-            continue
+            return json.loads(path.read_text(encoding="utf-8", errors="replace"))
+        except (OSError, ValueError):
+            return None
+
+    call = None
+    blob_lines: Dict[str, bytes] = {}
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                if line.startswith(_BLOB_PREFIX):
+                    match = _BLOB_DIGEST_RE.match(line)
+                    if match:
+                        blob_lines[match.group(1).decode("ascii")] = line
+                    continue
+                if call is None and f'"id":{json.dumps(record_id)}'.encode("utf-8") in line:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if record.get("kind") == "call" and record.get("id") == record_id:
+                        call = record
+    except OSError:
+        return None
+    if call is None:
+        return None
+
+    digest = call.get("output_digest_redacted")
+    line = blob_lines.get(digest)
+    if line is None and store is not None:
+        with store._cond:
+            blob = store._blobs.get(digest)
+        if blob is not None:
+            line = _find_blob_line(path.parent / blob[0], digest)
+    if line is None:
+        for other in path.parent.glob("*.jsonl"):
+            line = _find_blob_line(other, digest)
+            if line is not None:
+                break
+
+    artifact = {k: v for k, v in call.items() if k not in {"kind", "id"}}
+    artifact["output"] = json.loads(line)["output"] if line is not None else None
+    return artifact
+
+
+def _find_blob_line(path: Path, digest: str) -> Optional[bytes]:
+    needle = _BLOB_PREFIX + digest.encode("ascii")
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                if line.startswith(needle):
+                    return line
+    except OSError:
+        pass
+    return None
 
 
 def _tool_allowlisted_payload(tool: str, raw_output: str) -> Tuple[Any, str]:
@@ -168,21 +598,19 @@ def write_tool_output_artifact(
     agent_name: Optional[str] = None,
     truncated: bool = False,
 ) -> Tuple[ArtifactRef, Dict[str, Any]]:
-    """Persist tool output to `.rev/artifacts/tool_outputs` with redaction + metadata."""
+    """Queue tool output for `.rev/artifacts/tool_outputs` with redaction + metadata.
 
-    config.TOOL_OUTPUTS_DIR.mkdir(parents=True, exist_ok=True)
+    Returns immediately; the background writer appends the records.
+    """
 
-    stamp = _safe_stamp_for_filename()
     created_at = _iso_utc()
     counter = _next_counter()
-    pid = os.getpid()
-    tool_safe = "".join(c if c.isalnum() or c in "._-" else "_" for c in (tool or "tool"))[:64] or "tool"
-    sid_safe = "".join(c if c.isalnum() or c in "._-" else "_" for c in (session_id or "session"))[:64] or "session"
-    tid_safe = "".join(c if c.isalnum() or c in "._-" else "_" for c in str(task_id or "task"))[:64] or "task"
-
-    filename = f"{stamp}_{counter:06d}_{pid}_{sid_safe}_{tid_safe}_{tool_safe}.json"
-    final_path = config.TOOL_OUTPUTS_DIR / filename
-    tmp_path = final_path.with_suffix(final_path.suffix + ".tmp")
+    record_id = "_".join((
+        f"{counter:06d}",
+        _safe_token(session_id, "session"),
+        _safe_token(task_id, "task"),
+        _safe_token(tool, "tool"),
+    ))
 
     # Allowlist storage shape for certain tools.
     allow_payload, content_type = _tool_allowlisted_payload(tool, output)
@@ -190,16 +618,19 @@ def write_tool_output_artifact(
     # Redact before persisting.
     redacted_payload, redacted_changed = redact_sensitive(allow_payload)
 
-    # Compute digests (safe even for raw; hashes only).
+    # Serialize the body once: its canonical form is both the content
+    # address and what gets written.
+    payload_json = _canonical_json(redacted_payload)
+    output_bytes = output.encode("utf-8", errors="replace")
     tool_args_digest = _sha256_json(args)
-    output_digest_raw = _sha256_bytes(output.encode("utf-8", errors="replace"))
-    output_digest_redacted = _sha256_json(redacted_payload)
+    output_digest_raw = _sha256_bytes(output_bytes)
+    output_digest_redacted = _sha256_bytes(payload_json.encode("utf-8", errors="replace"))
 
     # Estimate size/lines based on raw string where possible.
-    raw_bytes = len(output.encode("utf-8", errors="replace"))
+    raw_bytes = len(output_bytes)
     raw_lines = _line_count(output)
 
-    artifact: Dict[str, Any] = {
+    record: Dict[str, Any] = {
         "schema_version": SCHEMA_VERSION,
         "created_at": created_at,
         "tool": tool,
@@ -210,7 +641,6 @@ def write_tool_output_artifact(
         "tool_args": args,
         "tool_args_digest": tool_args_digest,
         "content_type": content_type,
-        "output": redacted_payload,
         "redacted": bool(redacted_changed),
         "redaction_rules_version": REDACTION_RULES_VERSION,
         "output_digest_raw": output_digest_raw,
@@ -220,23 +650,16 @@ def write_tool_output_artifact(
         "line_count": raw_lines,
     }
 
-    # Atomic write: tmp -> fsync -> replace
-    tmp_path.write_text(json.dumps(artifact, indent=2, ensure_ascii=False), encoding="utf-8", errors="replace")
-    try:
-        with open(tmp_path, "rb") as f:
-            os.fsync(f.fileno())
-    except Exception:
-        pass
-    os.replace(tmp_path, final_path)
+    ref = get_tool_output_store().submit(
+        record_id=record_id,
+        record=record,
+        digest=output_digest_redacted,
+        content_type=content_type,
+        payload_json=payload_json,
+        session_id=session_id,
+        max_keep=_max_tool_outputs_to_keep(),
+    )
 
-    # Enforce retention: keep newest N artifacts, always preserving current session.
-    try:
-        keep_sessions = {session_id} if session_id else set()
-        _prune_old_tool_outputs(_max_tool_outputs_to_keep(), keep_sessions=keep_sessions)
-    except Exception:
-        pass
-
-    ref = ArtifactRef(path=final_path)
     meta = {
         "schema_version": SCHEMA_VERSION,
         "redacted": bool(redacted_changed),
@@ -251,3 +674,58 @@ def write_tool_output_artifact(
         "created_at": created_at,
     }
     return ref, meta
+
+
+# Lines returned per read_tool_output call; the model pages with ``start``.
+_READ_WINDOW_LINES = 400
+
+
+def _artifact_text(output: Any) -> str:
+    if isinstance(output, dict) and ("stdout" in output or "stderr" in output):
+        parts = [f"rc={output.get('rc')}"]
+        for stream in ("stdout", "stderr"):
+            text = output.get(stream) or ""
+            if text:
+                parts.append(f"--- {stream} ---\n{text}")
+        return "\n".join(parts)
+    if isinstance(output, str):
+        return output
+    return json.dumps(output, indent=2, ensure_ascii=False, default=str)
+
+
+def read_tool_output(ref: str, start: int = 1, end: Optional[int] = None) -> str:
+    """Tool entry point: a line window of a stored tool output, as JSON.
+
+    ``ref`` is the ``<segment>.jsonl#<record id>`` shown after a reduced tool
+    result. Only refs inside the tool output directory are accepted.
+    """
+    path_text, _, record_id = str(ref or "").strip().partition("#")
+    path = Path(path_text)
+    if not path.is_absolute():
+        path = config.ROOT / path
+    try:
+        inside = path.resolve().parent == Path(config.TOOL_OUTPUTS_DIR).resolve()
+    except OSError:
+        inside = False
+    if not record_id or not inside:
+        return json.dumps({"error": f"Not a tool output reference: {ref}"})
+
+    artifact = read_tool_output_artifact(f"{path}#{record_id}")
+    if artifact is None or artifact.get("output") is None:
+        return json.dumps({"error": f"Tool output not found (it may have been pruned): {ref}"})
+
+    lines = _artifact_text(artifact["output"]).splitlines()
+    start = max(1, int(start or 1))
+    end = len(lines) if end is None else min(len(lines), int(end))
+    end = min(end, start + _READ_WINDOW_LINES - 1)
+    result: Dict[str, Any] = {
+        "ref": ref,
+        "tool": artifact.get("tool"),
+        "line_count": len(lines),
+        "start_line": start,
+        "end_line": end,
+        "content": "\n".join(lines[start - 1:end]),
+    }
+    if end < len(lines):
+        result["next_start"] = end + 1
+    return json.dumps(result, ensure_ascii=False)
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Append-only checkpoint store with delta records and a small index.
+
+Each session appends one JSON line per checkpoint to its own log
+(``checkpoint_<session>_<stamp>.jsonl``). The first record and every
+``CHECKPOINT_SNAPSHOT_INTERVAL``-th record hold the full plan. The others
+hold only a delta against the previous checkpoint:
+
+- task list edits (``insert`` / ``delete`` of tasks, e.g. new subtasks)
+- per-task patches of the fields that changed; growing lists such as
+  ``tool_events`` and state transitions only carry the new items
+
+``index.json`` in the checkpoint directory holds the latest checkpoint, the
+most recent entries (for listing) and the byte offset of each session's
+snapshots. Finding the latest checkpoint reads only the index. Loading a
+checkpoint seeks to the nearest snapshot and replays deltas from there.
+
+Checkpoints are addressed as ``<log path>#<number>``. A bare log path means
+the latest checkpoint in that log. Legacy one-file JSON checkpoints are still
+readable through :func:`read_checkpoint`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from datetime import datetime
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from rev import config
+
+
+INDEX_FILENAME = "index.json"
+LOG_SUFFIX = ".jsonl"
+
+_INDEX_VERSION = 1
+_MAX_RECENT = 50
+_MAX_SESSIONS = 50
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+# ---------------------------------------------------------------------------
+# Deltas
+# ---------------------------------------------------------------------------
+
+def diff_value(old: Any, new: Any) -> Optional[Dict[str, Any]]:
+    """Patch turning ``old`` into ``new`` (``None`` when they are equal).
+
+    ``{"=": v}`` replaces, ``{"+": items}`` appends to a list that only grew,
+    ``{"{}": {key: patch}}`` patches dict members and ``{"-": 1}`` removes one.
+    """
+    if old == new:
+        return None
+    if isinstance(old, dict) and isinstance(new, dict):
+        members: Dict[str, Any] = {}
+        for key, value in new.items():
+            if key not in old:
+                members[key] = {"=": value}
+            else:
+                patch = diff_value(old[key], value)
+                if patch is not None:
+                    members[key] = patch
+        for key in old:
+            if key not in new:
+                members[key] = {"-": 1}
+        return {"{}": members}
+    if isinstance(old, list) and isinstance(new, list) and len(new) > len(old) and new[: len(old)] == old:
+        return {"+": new[len(old):]}
+    return {"=": new}
+
+
+def apply_patch(value: Any, patch: Dict[str, Any]) -> Any:
+    if "=" in patch:
+        return patch["="]
+    if "+" in patch:
+        return list(value or []) + patch["+"]
+    result = dict(value or {})
+    for key, member in patch["{}"].items():
+        if "-" in member:
+            result.pop(key, None)
+        else:
+            result[key] = apply_patch(result.get(key), member)
+    return result
+
+
+def _task_key(task: Dict[str, Any]) -> Tuple[Any, Any]:
+    return task.get("description"), task.get("action_type")
+
+
+def diff_tasks(old: List[Dict[str, Any]], new: List[Dict[str, Any]]) -> List[list]:
+    """Edits turning the task list ``old`` into ``new``, applied in order by :func:`apply_task_ops`."""
+    ops: List[list] = []
+    matcher = SequenceMatcher(None, [_task_key(t) for t in old], [_task_key(t) for t in new], autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            for offset in range(i2 - i1):
+                patch = diff_value(old[i1 + offset], new[j1 + offset])
+                if patch is not None:
+                    ops.append(["patch", j1 + offset, patch])
+            continue
+        if i2 > i1:
+            ops.append(["delete", j1, i2 - i1])
+        if j2 > j1:
+            ops.append(["insert", j1, new[j1:j2]])
+    return ops
+
+
+def apply_task_ops(tasks: List[Dict[str, Any]], ops: List[list]) -> List[Dict[str, Any]]:
+    tasks = list(tasks)
+    for op, index, arg in ops:
+        if op == "patch":
+            tasks[index] = apply_patch(tasks[index], arg)
+        elif op == "delete":
+            del tasks[index:index + arg]
+        elif op == "insert":
+            tasks[index:index] = arg
+    return tasks
+
+
+def diff_plan(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Delta between two ``ExecutionPlan.to_dict()`` results."""
+    rest_old = {k: v for k, v in old.items() if k != "tasks"}
+    rest_new = {k: v for k, v in new.items() if k != "tasks"}
+    delta: Dict[str, Any] = {"tasks": diff_tasks(old.get("tasks", []), new.get("tasks", []))}
+    patch = diff_value(rest_old, rest_new)
+    if patch is not None:
+        delta["plan"] = patch
+    return delta
+
+
+def apply_plan_delta(plan: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    tasks = apply_task_ops(plan.get("tasks", []), delta.get("tasks", []))
+    rest = {k: v for k, v in plan.items() if k != "tasks"}
+    if "plan" in delta:
+        rest = apply_patch(rest, delta["plan"])
+    rest["tasks"] = tasks
+    return rest
+
+
+# ---------------------------------------------------------------------------
+# References
+# ---------------------------------------------------------------------------
+
+def parse_ref(ref: Union[str, Path]) -> Tuple[Path, Optional[int]]:
+    """Split ``<log>#<n>`` into the log path and checkpoint number."""
+    text = str(ref)
+    path, sep, number = text.rpartition("#")
+    if sep and number.isdigit():
+        return Path(path), int(number)
+    return Path(text), None
+
+
+def is_log_ref(ref: Union[str, Path]) -> bool:
+    return parse_ref(ref)[0].name.endswith(LOG_SUFFIX)
+
+
+def _checkpoint_fields(record: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in record.items() if k not in {"type", "n", "delta", "plan"}}
+
+
+class _SessionLog:
+    def __init__(self, path: Path):
+        self.path = path
+        self.count = 0
+        self.offset = 0
+        self.since_snapshot = 0
+        self.plan: Optional[Dict[str, Any]] = None
+
+
+class CheckpointStore:
+    """Per-session append-only checkpoint logs plus ``index.json``."""
+
+    def __init__(self, directory: Union[str, Path], snapshot_interval: Optional[int] = None):
+        self.directory = Path(directory)
+        self.snapshot_interval = max(1, snapshot_interval or config.CHECKPOINT_SNAPSHOT_INTERVAL)
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, _SessionLog] = {}
+
+    @property
+    def index_path(self) -> Path:
+        return self.directory / INDEX_FILENAME
+
+    # -- writing ----------------------------------------------------------
+
+    def append(self, session_id: str, plan: Dict[str, Any], **fields: Any) -> str:
+        """Append a checkpoint of ``plan`` (``ExecutionPlan.to_dict()``); returns its reference.
+
+        ``fields`` (reason, resume_info, agent_state, model_config, ...) are
+        stored alongside and returned by :meth:`load`.
+        """
+        # JSON round-trip, so diffs compare exactly what a replay produces.
+        plan_text = _dumps(plan)
+        plan = json.loads(plan_text)
+        with self._lock:
+            log = self._sessions.get(session_id)
+            if log is None:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+                log = _SessionLog(self.directory / f"checkpoint_{session_id}_{stamp}{LOG_SUFFIX}")
+                self._sessions[session_id] = log
+
+            number = log.count + 1
+            record: Dict[str, Any] = {
+                "n": number,
+                "session_id": session_id,
+                "checkpoint_number": number,
+                "timestamp": datetime.now().isoformat(),
+            }
+            record.update({k: v for k, v in fields.items() if v is not None})
+
+            snapshot = log.plan is None or log.since_snapshot + 1 >= self.snapshot_interval
+            if not snapshot:
+                delta = diff_plan(log.plan, plan)
+                line = _dumps({**record, "type": "delta", "delta": delta})
+                # A delta larger than half a snapshot is not worth replaying.
+                snapshot = len(line) * 2 > len(plan_text)
+            if snapshot:
+                line = _dumps({**record, "type": "snapshot", "plan": plan})
+
+            data = (line + "\n").encode("utf-8")
+            with open(log.path, "ab") as f:
+                f.write(data)
+            offset = log.offset
+            log.offset += len(data)
+            log.count = number
+            log.since_snapshot = 0 if snapshot else log.since_snapshot + 1
+            log.plan = plan
+
+            ref = f"{log.path}#{number}"
+            self._update_index(session_id, log, ref, record, plan, snapshot_offset=offset if snapshot else None)
+            return ref
+
+    def _read_index(self) -> Dict[str, Any]:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if isinstance(index, dict) and index.get("version") == _INDEX_VERSION:
+                return index
+        except (OSError, ValueError):
+            pass
+        return {"version": _INDEX_VERSION, "latest": None, "recent": [], "sessions": {}}
+
+    def _write_index(self, index: Dict[str, Any]) -> None:
+        tmp = self.index_path.with_name(f"{INDEX_FILENAME}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f, separators=(",", ":"))
+        os.replace(tmp, self.index_path)
+
+    def _update_index(
+        self,
+        session_id: str,
+        log: _SessionLog,
+        ref: str,
+        record: Dict[str, Any],
+        plan: Dict[str, Any],
+        snapshot_offset: Optional[int],
+    ) -> None:
+        index = self._read_index()
+        sessions = index["sessions"]
+        entry = sessions.pop(session_id, None) or {"log": log.path.name, "snapshots": []}
+        entry["count"] = log.count
+        if snapshot_offset is not None:
+            entry["snapshots"].append([log.count, snapshot_offset])
+        sessions[session_id] = entry  # re-inserted: most recently written last
+        for stale in list(sessions)[:-_MAX_SESSIONS]:
+            del sessions[stale]
+
+        resume = record.get("resume_info") or {}
+        index["recent"].append({
+            "ref": ref,
+            "session_id": session_id,
+            "checkpoint_number": log.count,
+            "timestamp": record["timestamp"],
+            "reason": record.get("reason", "unknown"),
+            "tasks_total": len(plan.get("tasks", [])),
+            "tasks_completed": resume.get("tasks_completed", 0),
+            "progress_percent": resume.get("progress_percent", 0),
+            "next_task": resume.get("next_task"),
+            "summary": plan.get("summary", ""),
+        })
+        index["recent"] = index["recent"][-_MAX_RECENT:]
+        index["latest"] = ref
+        self._write_index(index)
+
+    # -- reading ----------------------------------------------------------
+
+    def latest(self) -> Optional[str]:
+        """Reference of the newest checkpoint whose log still exists."""
+        for entry in reversed(self._read_index()["recent"]):
+            if parse_ref(entry["ref"])[0].exists():
+                return entry["ref"]
+        return None
+
+    def list(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Index entries, most recent first (logs that were deleted are skipped)."""
+        entries = []
+        for entry in reversed(self._read_index()["recent"]):
+            if parse_ref(entry["ref"])[0].exists():
+                entries.append(dict(entry))
+                if limit is not None and len(entries) >= limit:
+                    break
+        return entries
+
+    def load(self, ref: Union[str, Path]) -> Dict[str, Any]:
+        """Checkpoint ``ref`` as a dict with the full ``plan`` plus its stored fields."""
+        path, number = parse_ref(ref)
+        start = 0
+        session = self._read_index()["sessions"].get(_session_from_log(path) or "")
+        if session and session.get("log") == path.name and number is not None:
+            candidates = [offset for n, offset in session.get("snapshots", []) if n <= number]
+            if candidates:
+                start = candidates[-1]
+
+        plan: Optional[Dict[str, Any]] = None
+        found: Optional[Dict[str, Any]] = None
+        with open(path, "rb") as f:
+            f.seek(start)
+            for raw in f:
+                try:
+                    record = json.loads(raw)
+                except ValueError:
+                    continue  # torn final line after a crash
+                if record.get("type") == "snapshot":
+                    plan = record["plan"]
+                elif plan is not None:
+                    plan = apply_plan_delta(plan, record.get("delta", {}))
+                else:
+                    continue
+                found = {**_checkpoint_fields(record), "plan": plan}
+                if number is not None and record.get("n") == number:
+                    break
+        if found is None or (number is not None and found.get("checkpoint_number") != number):
+            raise KeyError(f"checkpoint not found: {ref}")
+        return found
+
+    # -- retention --------------------------------------------------------
+
+    def prune(self, keep_last: int) -> List[Path]:
+        """Delete session logs holding none of the ``keep_last`` newest checkpoints."""
+        index = self._read_index()
+        keep = {parse_ref(e["ref"])[0].name for e in index["recent"][-keep_last:]} if keep_last else set()
+        with self._lock:
+            keep.update(log.path.name for log in self._sessions.values())
+        removed = []
+        for path in self.directory.glob(f"checkpoint_*{LOG_SUFFIX}"):
+            if path.name not in keep:
+                try:
+                    path.unlink()
+                    removed.append(path)
+                except OSError:
+                    pass
+        if removed:
+            names = {p.name for p in removed}
+            index["recent"] = [e for e in index["recent"] if parse_ref(e["ref"])[0].name not in names]
+            index["sessions"] = {s: v for s, v in index["sessions"].items() if v.get("log") not in names}
+            if index.get("latest") and parse_ref(index["latest"])[0].name in names:
+                index["latest"] = index["recent"][-1]["ref"] if index["recent"] else None
+            self._write_index(index)
+        return removed
+
+
+def _session_from_log(path: Path) -> Optional[str]:
+    name = path.name
+    if not (name.startswith("checkpoint_") and name.endswith(LOG_SUFFIX)):
+        return None
+    return name[len("checkpoint_"):].split("_", 1)[0]
+
+
+_STORES: Dict[str, CheckpointStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_checkpoint_store(directory: Union[str, Path, None] = None) -> CheckpointStore:
+    """Shared store for ``directory`` (default: ``config.CHECKPOINTS_DIR``)."""
+    key = str(Path(directory or config.CHECKPOINTS_DIR).resolve())
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = _STORES[key] = CheckpointStore(key)
+        return store
+
+
+def read_checkpoint(ref: Union[str, Path]) -> Dict[str, Any]:
+    """Load a checkpoint from a log reference or a legacy single-file JSON checkpoint."""
+    path, _ = parse_ref(ref)
+    if path.name.endswith(LOG_SUFFIX):
+        return get_checkpoint_store(path.parent).load(ref)
+    with open(path, "r") as f:
+        return json.load(f)
@@ -10,7 +10,9 @@ from __future__ import annotations
 import json
 import os
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from rev.execution.tool_reducers import reduce_tool_output
 
 
 def _env_bool(name: str, default: bool) -> bool:
@@ -35,6 +37,7 @@ class ToolCompressionDecision:
     compress: bool
     reason: str
     inline_content: Optional[str] = None  # for strict mode edit window
+    reduced_content: Optional[str] = None  # structure-aware reduction (see tool_reducers)
 
 
 class ToolCompressionPolicy:
@@ -45,6 +48,8 @@ class ToolCompressionPolicy:
         self.summary_target_chars = _env_int("REV_TOOL_SUMMARY_TARGET_CHARS", 400)
         self.compress_all = _env_bool("REV_COMPRESS_ALL_TOOL_OUTPUTS", False)
         self.read_file_inline_lines = _env_int("REV_READ_FILE_INLINE_LINES", 200)
+        self.reducers_enabled = _env_bool("REV_TOOL_OUTPUT_REDUCERS", True)
+        self.reduced_max_chars = _env_int("REV_TOOL_REDUCED_MAX_CHARS", 4000)
 
         self.noisy_tools = {
             "run_tests",
@@ -64,9 +69,16 @@ class ToolCompressionPolicy:
             "analyze_code_context",
         }
 
-        self.never_compress = {"read_file_lines"}
+        # read_tool_output already returns a bounded window of a stored output.
+        self.never_compress = {"read_file_lines", "read_tool_output"}
 
-    def decide(self, tool_name: str, output: str) -> ToolCompressionDecision:
+    def decide(
+        self,
+        tool_name: str,
+        output: str,
+        args: Optional[Dict[str, Any]] = None,
+        paths: Sequence[str] = (),
+    ) -> ToolCompressionDecision:
         tool = (tool_name or "").lower()
 
         if tool in self.never_compress:
@@ -81,6 +93,11 @@ class ToolCompressionPolicy:
         if tool == "read_file":
             return ToolCompressionDecision(compress=False, reason="read_file_inline")
 
+        if self.reducers_enabled:
+            reduced = reduce_tool_output(tool, output, args, paths, max_chars=self.reduced_max_chars)
+            if reduced is not None and len(reduced) < len(output):
+                return ToolCompressionDecision(compress=True, reason="reduced", reduced_content=reduced)
+
         if tool in self.noisy_tools:
             return ToolCompressionDecision(compress=True, reason="noisy_tool")
 
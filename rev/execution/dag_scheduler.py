@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Event-driven DAG scheduler for concurrent plan execution.
+
+Instead of rescanning the plan for ready tasks on a timer, the scheduler
+keeps an in-degree count per task and a ready heap. When a worker finishes a
+task it releases that task's dependents and dispatches them right away, from
+the completing worker, so dependent tasks start without an idle gap.
+
+Ready tasks are ordered by priority (higher first), then by critical path
+(the longest remaining chain of work behind the task, weighted by task
+complexity), then by task id. With a ``leases`` callback, a ready task is
+held back while another running task holds a conflicting lease on one of
+its files (see ``rev.tools.file_leases``).
+"""
+
+from __future__ import annotations
+
+import heapq
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from rev.models.task import ExecutionPlan, Task, TaskStatus
+from rev.tools.file_leases import LeaseTable
+
+
+_COMPLEXITY_WEIGHT = {"low": 1, "medium": 2, "high": 3}
+_RUNNABLE = (TaskStatus.PENDING, TaskStatus.STOPPED)
+
+
+@dataclass
+class SchedulerStats:
+    """Throughput and utilization of one scheduler run."""
+    workers: int = 0
+    dispatched: int = 0
+    completed: int = 0
+    failed: int = 0
+    blocked: int = 0  # never became ready (a dependency failed or is invalid)
+    invalid: int = 0  # failed up front: unknown dependency or dependency cycle
+    wall_seconds: float = 0.0
+    busy_seconds: float = 0.0
+    max_concurrency: int = 0
+    total_ready_wait_seconds: float = 0.0
+    critical_path_length: int = 0
+    lease_waits: int = 0  # times a ready task was held back by a file lease
+
+    @property
+    def utilization(self) -> float:
+        """Fraction of worker time spent running tasks."""
+        capacity = self.wall_seconds * self.workers
+        return self.busy_seconds / capacity if capacity > 0 else 0.0
+
+    @property
+    def mean_ready_wait_ms(self) -> float:
+        """Average time a task sat in the ready queue before a worker picked it up."""
+        return self.total_ready_wait_seconds / self.dispatched * 1000 if self.dispatched else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        data = asdict(self)
+        data["utilization"] = round(self.utilization, 3)
+        data["mean_ready_wait_ms"] = round(self.mean_ready_wait_ms, 3)
+        return data
+
+    def format(self) -> str:
+        return (
+            f"Scheduler: {self.completed} completed, {self.failed} failed, {self.blocked} blocked, "
+            f"{self.invalid} invalid in {self.wall_seconds:.1f}s; utilization {self.utilization:.0%} of {self.workers} workers, "
+            f"peak concurrency {self.max_concurrency}, mean ready wait {self.mean_ready_wait_ms:.1f}ms"
+        )
+
+
+def _dependency_cycles(tasks: List[Task], candidates: Set[int]) -> List[List[int]]:
+    """Cycles among ``candidates`` following their dependencies on each other."""
+    state: Dict[int, int] = {}  # 1 = on the current DFS path, 2 = finished
+    cycles: List[List[int]] = []
+
+    def deps(task_id: int) -> List[int]:
+        return sorted(d for d in set(tasks[task_id].dependencies) if d in candidates)
+
+    for root in sorted(candidates):
+        if root in state:
+            continue
+        state[root] = 1
+        path = [root]
+        stack = [iter(deps(root))]
+        while stack:
+            for dep_id in stack[-1]:
+                if state.get(dep_id) == 1:
+                    cycles.append(path[path.index(dep_id):])
+                elif dep_id not in state:
+                    state[dep_id] = 1
+                    path.append(dep_id)
+                    stack.append(iter(deps(dep_id)))
+                    break
+            else:
+                state[path.pop()] = 2
+                stack.pop()
+    return cycles
+
+
+class DAGScheduler:
+    """Run the tasks of an ``ExecutionPlan`` on a thread pool in dependency order.
+
+    ``run_task`` executes one task and returns True on success; dependents are
+    only released once the task's status is ``COMPLETED``. Tasks appended to
+    the plan while it runs are picked up when the next task finishes.
+
+    ``leases`` maps a task to the ``(read_paths, write_paths)`` it needs.
+    """
+
+    def __init__(
+        self,
+        plan: ExecutionPlan,
+        max_workers: int = 4,
+        critical_path_first: bool = True,
+        leases: Optional[Callable[[Task], Tuple[Iterable[str], Iterable[str]]]] = None,
+    ):
+        self.plan = plan
+        self.max_workers = max(1, max_workers)
+        self.critical_path_first = critical_path_first
+        self._leases = leases
+        self._lease_table = LeaseTable()
+        self._task_leases: Dict[int, Tuple[List[str], List[str]]] = {}
+        self._cond = threading.Condition()
+        self._indegree: Dict[int, int] = {}
+        self._dependents: Dict[int, List[int]] = {}
+        self._critical_path: Dict[int, int] = {}
+        self._ready: List[Tuple[int, int, int]] = []
+        self._ready_since: Dict[int, float] = {}
+        self._known = 0
+        self._in_flight = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._run_task: Optional[Callable[[Task], bool]] = None
+        self._should_stop: Callable[[], bool] = lambda: False
+        self.stats = SchedulerStats(workers=self.max_workers)
+
+    # -- graph -------------------------------------------------------------
+
+    def _index_new_tasks(self) -> None:
+        """Add tasks not seen yet to the graph; call with ``_cond`` held.
+
+        Tasks with an unknown dependency or on a dependency cycle can never
+        run: they are marked failed (their dependents stay blocked).
+        """
+        tasks = self.plan.tasks
+        if self._known == len(tasks):
+            return
+        new_ids = range(self._known, len(tasks))
+        self._known = len(tasks)
+
+        invalid: Dict[int, str] = {}
+        for task_id in new_ids:
+            unknown = [d for d in tasks[task_id].dependencies if d < 0 or d >= len(tasks)]
+            if unknown:
+                invalid[task_id] = f"invalid dependency: {unknown[0]}"
+        unfinished = {
+            task_id for task_id in new_ids
+            if task_id not in invalid and tasks[task_id].status != TaskStatus.COMPLETED
+        }
+        for cycle in _dependency_cycles(tasks, unfinished):
+            description = " -> ".join(str(task_id) for task_id in cycle + cycle[:1])
+            for task_id in cycle:
+                invalid.setdefault(task_id, f"dependency cycle: {description}")
+        for task_id, error in invalid.items():
+            self._fail_invalid(tasks[task_id], error)
+
+        for task_id in new_ids:
+            task = tasks[task_id]
+            deps = {dep_id for dep_id in task.dependencies if 0 <= dep_id < len(tasks)}
+            self._indegree[task_id] = sum(1 for dep_id in deps if tasks[dep_id].status != TaskStatus.COMPLETED)
+            for dep_id in deps:
+                self._dependents.setdefault(dep_id, []).append(task_id)
+        self._compute_critical_paths()
+
+        now = time.perf_counter()
+        for task_id in new_ids:
+            if self._indegree[task_id] == 0 and tasks[task_id].status in _RUNNABLE:
+                self._push_ready(task_id, now)
+
+    def _fail_invalid(self, task: Task, error: str) -> None:
+        print(f"  Warning: task {task.task_id} cannot run ({error})")
+        with self.plan.lock:
+            # Never started, so bypass the PENDING -> IN_PROGRESS -> FAILED path.
+            task.status = TaskStatus.FAILED
+            task.error = error
+        self.stats.invalid += 1
+
+    def _compute_critical_paths(self) -> None:
+        """Longest weighted chain from each task to the end of the plan."""
+        tasks = self.plan.tasks
+        memo: Dict[int, int] = {}
+        for root in range(len(tasks)):
+            if root in memo:
+                continue
+            # Iterative post-order DFS; cycles are cut at the back edge.
+            stack = [(root, iter(self._dependents.get(root, ())))]
+            on_path = {root}
+            while stack:
+                node, children = stack[-1]
+                advanced = False
+                for child in children:
+                    if child in memo or child in on_path:
+                        continue
+                    stack.append((child, iter(self._dependents.get(child, ()))))
+                    on_path.add(child)
+                    advanced = True
+                    break
+                if advanced:
+                    continue
+                stack.pop()
+                on_path.discard(node)
+                tail = max((memo.get(child, 0) for child in self._dependents.get(node, ())), default=0)
+                memo[node] = _COMPLEXITY_WEIGHT.get(getattr(tasks[node], "complexity", "low"), 1) + tail
+        self._critical_path = memo
+        self.stats.critical_path_length = max(memo.values(), default=0)
+
+    def _push_ready(self, task_id: int, now: float) -> None:
+        task = self.plan.tasks[task_id]
+        path = self._critical_path.get(task_id, 0) if self.critical_path_first else 0
+        heapq.heappush(self._ready, (-task.priority, -path, task_id))
+        self._ready_since[task_id] = now
+
+    # -- execution ---------------------------------------------------------
+
+    def _dispatch(self) -> None:
+        """Start ready tasks while workers are free; call with ``_cond`` held."""
+        if self._should_stop():
+            return
+        deferred = []
+        while self._ready and self._in_flight < self.max_workers:
+            entry = heapq.heappop(self._ready)
+            task_id = entry[2]
+            task = self.plan.tasks[task_id]
+            if task.status not in _RUNNABLE:
+                continue
+            if not self._acquire_leases(task):
+                deferred.append(entry)
+                self.stats.lease_waits += 1
+                continue
+            now = time.perf_counter()
+            self.stats.total_ready_wait_seconds += now - self._ready_since.pop(task_id, now)
+            self.stats.dispatched += 1
+            self._in_flight += 1
+            self.stats.max_concurrency = max(self.stats.max_concurrency, self._in_flight)
+            self._executor.submit(self._run_one, task)
+        for entry in deferred:
+            heapq.heappush(self._ready, entry)
+
+    def _acquire_leases(self, task: Task) -> bool:
+        if self._leases is None:
+            return True
+        leases = self._task_leases.get(task.task_id)
+        if leases is None:
+            try:
+                reads, writes = self._leases(task)
+                leases = (list(reads), list(writes))
+            except Exception:
+                leases = ([], [])
+            self._task_leases[task.task_id] = leases
+        return self._lease_table.try_acquire(task.task_id, *leases)
+
+    def _run_one(self, task: Task) -> None:
+        start = time.perf_counter()
+        ok = False
+        try:
+            ok = bool(self._run_task(task))
+        except Exception as exc:
+            self.plan.mark_task_failed(task, str(exc))
+        finally:
+            self._on_done(task, ok, time.perf_counter() - start)
+
+    def _on_done(self, task: Task, ok: bool, elapsed: float) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self.stats.busy_seconds += elapsed
+            self._lease_table.release(task.task_id)
+            if ok and task.status == TaskStatus.COMPLETED:
+                self.stats.completed += 1
+                now = time.perf_counter()
+                for child in self._dependents.get(task.task_id, ()):
+                    self._indegree[child] -= 1
+                    if self._indegree[child] == 0 and self.plan.tasks[child].status in _RUNNABLE:
+                        self._push_ready(child, now)
+            else:
+                self.stats.failed += 1
+            self._index_new_tasks()
+            self._dispatch()
+            self._cond.notify_all()
+
+    def run(self, run_task: Callable[[Task], bool], should_stop: Optional[Callable[[], bool]] = None) -> SchedulerStats:
+        """Execute the plan; returns when no task is running and none is ready.
+
+        ``should_stop`` is checked before each dispatch; once it returns True
+        no new tasks are started and running ones are allowed to finish.
+        """
+        self._run_task = run_task
+        self._should_stop = should_stop or (lambda: False)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            self._executor = executor
+            with self._cond:
+                self._index_new_tasks()
+                self._dispatch()
+                while self._in_flight:
+                    # Completions notify; the timeout only keeps Ctrl+C responsive.
+                    self._cond.wait(timeout=1.0)
+        self._executor = None
+        self.stats.wall_seconds = time.perf_counter() - start
+        self.stats.blocked = sum(1 for task in self.plan.tasks if task.status in _RUNNABLE)
+        return self.stats
@@ -17,11 +17,14 @@ import concurrent.futures
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from collections import OrderedDict
 from difflib import SequenceMatcher
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Callable, Dict, Any, Iterable, List, Optional, Tuple
 
 from rev.models.task import ExecutionPlan, Task, TaskStatus
 from rev.execution.state_manager import StateManager
+from rev.execution.dag_scheduler import DAGScheduler
+from rev.tools.file_leases import note_read, seen_version, task_leases, track_file_versions, tracking_active
 from rev.tools.registry import execute_tool, get_available_tools
+from rev.tools.tool_selection import select_tools_for_action
 from rev.llm.client import ollama_chat
 from rev.execution.ultrathink_prompts import get_ultrathink_prompt
 from rev.config import (
@@ -43,11 +46,13 @@ from rev.execution.safety import (
 )
 from rev.execution.reviewer import review_action, display_action_review, format_review_feedback_for_llm
 from rev.execution.session import SessionTracker, create_message_summary_from_history
+from rev.execution.history import MessageHistory, RunningSummary, TokenCountedMessages, summary_message
 from rev.debug_logger import get_logger
 from rev.core.tool_call_recovery import recover_tool_call_from_text
 from rev.execution.artifacts import write_tool_output_artifact
 from rev.execution.evidence import summarize_tool_output
 from rev.execution.compression_policy import get_tool_compression_policy
+from rev.execution.tool_reducers import task_paths
 from rev.memory.project_memory import (
     ensure_project_memory_file,
     maybe_record_known_failure_from_error,
@@ -182,7 +187,7 @@ def _tool_message_content(
 ) -> str:
     """Return the content to attach to a tool message (compressed when needed)."""
     policy = get_tool_compression_policy()
-    decision = policy.decide(tool_name, result)
+    decision = policy.decide(tool_name, result, args=tool_args, paths=task_paths(current_task))
 
     # Always persist artifact for observability/replay.
     evidence = _build_tool_evidence(tool_name, tool_args, result, session_tracker, task_id=task_id)
@@ -194,6 +199,10 @@ def _tool_message_content(
     if not decision.compress:
         return result
 
+    if decision.reduced_content is not None:
+        # The model can page through the full output with the read_tool_output tool.
+        return f"{decision.reduced_content}\n[full output via read_tool_output: {evidence.get('artifact_ref')}]"
+
     if decision.inline_content is not None:
         evidence["inline_window"] = decision.inline_content[: max(200, policy.inline_max_chars // 2)]
         evidence["note"] = "Strict compression mode: include inline window for editability"
@@ -248,7 +257,8 @@ class ExecutionContext:
 
     def __init__(self, plan: ExecutionPlan):
         self.plan_summary = _summarize_plan(plan)
-        self.code_cache: OrderedDict[str, str] = OrderedDict()
+        # path -> (content, digest of the file version the content came from)
+        self.code_cache: OrderedDict[str, Tuple[str, Optional[str]]] = OrderedDict()
         self.max_code_cache = 32
         self.search_cache: Dict[Tuple[Any, ...], str] = {}
         self.snippet_cache: List[Dict[str, Any]] = []
@@ -272,21 +282,37 @@ class ExecutionContext:
         self.thought_loop_warnings = 0
 
     def get_code(self, path: Optional[str]) -> Optional[str]:
-        """Return cached code for a path if available."""
+        """Return cached code for a path if available.
+
+        A hit counts as a read for write-conflict checks: the cached version is
+        recorded for the current task, so a later write fails if the file has
+        changed since. Entries of unknown version are misses while tracking.
+        """
         if not path:
             return None
         with self._lock:
-            if path in self.code_cache:
-                self.code_cache.move_to_end(path)
-                return self.code_cache[path]
-            return None
+            entry = self.code_cache.get(path)
+            if entry is None:
+                return None
+            self.code_cache.move_to_end(path)
+        content, digest = entry
+        if tracking_active():
+            if digest is None:
+                return None
+            note_read(path, digest)
+        return content
+
+    def set_code(self, path: Optional[str], content: str, digest: Optional[str] = None):
+        """Cache code content for a path.
 
-    def set_code(self, path: Optional[str], content: str):
-        """Cache code content for a path."""
+        ``digest`` defaults to the version the current task last read or wrote.
+        """
         if not path:
             return
+        if digest is None:
+            digest = seen_version(path)
         with self._lock:
-            self.code_cache[path] = content
+            self.code_cache[path] = (content, digest)
             self.code_cache.move_to_end(path)
             if len(self.code_cache) > self.max_code_cache:
                 self.code_cache.popitem(last=False)
@@ -627,6 +653,11 @@ def _consume_tool_budget(tool_name: str, counters: Dict[str, int], limits: Dict[
     return True, ""
 
 
+def _remaining_tool_budget(counters: Dict[str, int], limits: Dict[str, int]) -> Dict[str, int]:
+    """Return the calls left per budgeted tool (tools without a limit are omitted)."""
+    return {name: max(0, limit - counters.get(name, 0)) for name, limit in limits.items()}
+
+
 def _trim_snippet_content(content: str, max_chars: int = 2000) -> str:
     """Trim snippet content to a manageable size."""
     if content is None:
@@ -682,7 +713,8 @@ def _prepare_llm_messages(
     if max_recent is None:
         max_recent = config.CONTEXT_WINDOW_HISTORY
     trimmed = _manage_message_history(messages, max_recent=max_recent, tracker=tracker)
-    prepared: List[Dict[str, Any]] = []
+    # Carries its token estimate so the LLM client can skip re-counting.
+    prepared = TokenCountedMessages()
 
     if not trimmed:
         return prepared
@@ -1176,39 +1208,11 @@ def _summarize_old_messages(messages: List[Dict], tracker: 'SessionTracker' = No
     if tracker:
         return create_message_summary_from_history(messages, tracker)
 
-    # Fallback: basic message-based summarization
-    tasks_completed = []
-    tools_used = []
-
+    # Fallback: basic message-based summarization (tasks completed, tools used)
+    summary = RunningSummary()
     for msg in messages:
-        # Extract task descriptions from user messages
-        if msg.get("role") == "user" and "Task:" in msg.get("content", ""):
-            content = msg["content"]
-            if "Task:" in content:
-                task_line = content.split("Task:", 1)[1].split("\n")[0].strip()
-                if task_line and task_line not in tasks_completed:
-                    tasks_completed.append(task_line)
-
-        # Extract tool usage from tool messages
-        if msg.get("role") == "tool":
-            tool_name = msg.get("name", "unknown")
-            if tool_name not in tools_used:
-                tools_used.append(tool_name)
-
-    # Build concise summary
-    summary_parts = []
-    if tasks_completed:
-        # Limit to first 10 tasks
-        task_list = tasks_completed[:10]
-        summary_parts.append(f"Completed {len(tasks_completed)} tasks:")
-        summary_parts.extend([f"  • {t[:80]}" for t in task_list])
-        if len(tasks_completed) > 10:
-            summary_parts.append(f"  ... and {len(tasks_completed) - 10} more")
-
-    if tools_used:
-        summary_parts.append(f"\nTools used: {', '.join(tools_used[:15])}")
-
-    return "\n".join(summary_parts) if summary_parts else "Previous work completed successfully."
+        summary.fold(msg)
+    return summary.render()
 
 
 def _manage_message_history(messages: List[Dict], max_recent: Optional[int] = None, tracker: 'SessionTracker' = None) -> List[Dict]:
@@ -1229,6 +1233,9 @@ def _manage_message_history(messages: List[Dict], max_recent: Optional[int] = No
     """
     if max_recent is None:
         max_recent = config.CONTEXT_WINDOW_HISTORY
+    if isinstance(messages, MessageHistory):
+        # Folds only the messages that left the window since the last call.
+        return messages.window(max_recent, tracker=tracker)
     if len(messages) <= max_recent + 1:  # +1 for system message
         return messages
 
@@ -1245,10 +1252,7 @@ def _manage_message_history(messages: List[Dict], max_recent: Optional[int] = No
     if len(old_messages) > 0:
         # Create summary of completed work (use tracker if available)
         summary = _summarize_old_messages(old_messages, tracker)
-        summary_msg = {
-            "role": "user",
-            "content": f"[Summary of previous work]\n{summary}\n\n[Continuing with recent context...]"
-        }
+        summary_msg = summary_message(summary)
 
         # Rebuild: system + summary + recent messages
         if system_msg:
@@ -1275,6 +1279,16 @@ def _trim_history_with_notice(
     if max_recent is None:
         max_recent = config.CONTEXT_WINDOW_HISTORY
 
+    if isinstance(messages, MessageHistory):
+        before_count = len(messages)
+        if not messages.compact(max_recent, tracker=tracker):
+            return messages, False
+        print(
+            "  ℹ️  Context window trimmed: "
+            f"{before_count} → {len(messages) + 1} messages (keeping last {max_recent} + summary to avoid token overflow)"
+        )
+        return messages, True
+
     if len(messages) <= max_recent + 1:  # +1 for optional system prompt
         return messages, False
 
@@ -1342,7 +1356,7 @@ def execution_mode(
     model_name = config.EXECUTION_MODEL
     model_supports_tools = config.EXECUTION_SUPPORTS_TOOLS
 
-    messages = [{"role": "system", "content": system_context}]
+    messages = MessageHistory([{"role": "system", "content": system_context}])
     message_queue = None
     cleanup_streaming_input = lambda: None
     redisplay_prompt = lambda: None
@@ -1544,7 +1558,12 @@ IMPORTANT: Do not repeat failed commands or search unavailable paths listed abov
             """
 
             # Final safety net: always send a non-empty tool list when the model supports tools.
-            effective_tools = tools or get_available_tools()
+            effective_tools = select_tools_for_action(
+                current_task.action_type,
+                tool_universe=tools or get_available_tools(),
+                agent_name="executor",
+                query=current_task.description,
+            )
             call_tools = effective_tools if model_supports_tools else None
             tools_enabled = bool(call_tools)
             llm_messages = _prepare_llm_messages(messages, exec_context, session_tracker)
@@ -2117,7 +2136,7 @@ def execute_single_task(
 
     system_context = _build_execution_system_context(sys_info, coding_mode)
 
-    messages = [{"role": "system", "content": system_context}]
+    messages = MessageHistory([{"role": "system", "content": system_context}])
 
     # Add task to conversation with constraints
     task_constraints = _build_task_constraints(task)
@@ -2183,7 +2202,12 @@ Execute this task completely. When done, respond with TASK_COMPLETE."""
         """
 
         # Final safety net: always send a non-empty tool list when the model supports tools.
-        effective_tools = tools or get_available_tools()
+        effective_tools = select_tools_for_action(
+            task.action_type,
+            tool_universe=tools or get_available_tools(),
+            agent_name="executor",
+            query=task.description,
+        )
         call_tools = effective_tools if model_supports_tools else None
         tools_enabled = bool(call_tools)
         llm_messages = _prepare_llm_messages(messages, exec_context)
@@ -2515,9 +2539,14 @@ def concurrent_execution_mode(
     coding_mode: bool = False,
     state_manager: Optional[StateManager] = None,
     budget: Optional["ResourceBudget"] = None,
+    task_paths: Optional[Callable[[Task], Iterable[str]]] = None,
 ) -> bool:
     """Execute independent tasks in parallel using a thread pool.
 
+    Tasks that declare (``impact_scope``) or are inferred (``task_paths``) to
+    touch the same file are not run at the same time; writes to files another
+    task changed after this one read them are rejected as conflicts.
+
     Args:
         plan: ExecutionPlan with tasks to execute
         max_workers: Maximum number of parallel workers
@@ -2527,6 +2556,7 @@ def concurrent_execution_mode(
         coding_mode: If True, use coding-specific prompts
         state_manager: Optional state manager for persistence
         budget: Optional resource budget
+        task_paths: Optional callable returning the file paths a task targets
 
     Returns:
         True if all tasks completed successfully, False otherwise
@@ -2576,7 +2606,7 @@ def concurrent_execution_mode(
             print(f"\n[Task {task.task_id + 1}/{len(plan.tasks)}] STARTING: {task.description}")
             
             # Use shared context but task-specific message history
-            task_messages = [{"role": "system", "content": system_context}]
+            task_messages = MessageHistory([{"role": "system", "content": system_context}])
             
             # Add session context from previously completed tasks
             # Note: Parallel tasks won't see each other's work until complete
@@ -2615,59 +2645,31 @@ def concurrent_execution_mode(
                     active_tasks.remove(task.task_id)
             return False
 
-    # Main coordination loop
-    iteration = 0
-    max_total_iterations = MAX_EXECUTION_ITERATIONS * 2 
-    
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {}
-        
-        while not plan.is_complete() and iteration < max_total_iterations:
-            # Check for ready tasks
-            ready_tasks = plan.get_executable_tasks(max_count=max_workers - len(futures))
-            
-            for task in ready_tasks:
-                if task.task_id not in futures:
-                    # Skip if already in progress or completed
-                    if task.status != TaskStatus.PENDING and task.status != TaskStatus.STOPPED:
-                        continue
-                        
-                    future = executor.submit(execute_task_thread, task)
-                    futures[future] = task
-            
-            if not futures:
-                # No tasks in flight and no tasks ready - check if deadlocked or finished
-                if plan.is_complete():
-                    break
-                # Wait for something to change
-                time.sleep(0.5)
-                iteration += 1
-                continue
-            
-            # Wait for at least one task to complete
-            try:
-                # Use a small timeout so we can periodically check for new ready tasks
-                # and handle interrupts.
-                for future in concurrent.futures.as_completed(futures, timeout=1.0):
-                    task = futures.pop(future)
-                    try:
-                        success = future.result()
-                        status_symbol = "✓" if success else "✗"
-                        print(f"\n[{status_symbol}] Task {task.task_id + 1} finished: {task.description[:60]}...")
-                    except Exception as e:
-                        print(f"✗ Future error for task {task.task_id}: {e}")
-                    
-                    # Break after processing one completed task to re-check for newly ready tasks
-                    break
-            except TimeoutError:
-                # No tasks completed in this interval, just continue the loop
-                pass
-            except Exception as e:
-                print(f" Error in coordination loop: {e}")
-            
-            # Small delay to prevent tight loop
-            time.sleep(0.1)
-            iteration += 1
+    def run_task(task: Task) -> bool:
+        with track_file_versions():
+            success = execute_task_thread(task)
+        status_symbol = "✓" if success else "✗"
+        print(f"\n[{status_symbol}] Task {task.task_id + 1} finished: {task.description[:60]}...")
+        return success
+
+    # Dependents are dispatched as soon as the tasks they wait on complete.
+    def leases_for(task: Task):
+        paths = [p for p in (getattr(task, "impact_scope", None) or []) if isinstance(p, str)]
+        if task_paths is not None:
+            paths.extend(task_paths(task))
+        return task_leases(task, paths)
+
+    scheduler = DAGScheduler(plan, max_workers=max_workers, leases=leases_for)
+    stats = scheduler.run(run_task, should_stop=get_escape_interrupt)
+    print(f"\n{stats.format()}")
+    try:
+        debug_logger.log("executor", "SCHEDULER_STATS", stats.to_dict())
+    except Exception:
+        pass
+    if stats.invalid:
+        print(f"  {stats.invalid} task(s) failed: unknown dependency or dependency cycle")
+    if stats.blocked:
+        print(f"  {stats.blocked} task(s) not run: a dependency failed or was not completed")
 
     return plan.is_complete() and all(t.status == TaskStatus.COMPLETED for t in plan.tasks)
 
@@ -2976,9 +2978,11 @@ def streaming_execution_mode(
     from rev.llm.client import ollama_chat_stream
     from rev.execution.streaming import (
         StreamingExecutionManager,
+        StreamingToolPrefetcher,
         UserMessageQueue,
         MessagePriority,
     )
+    from rev.execution.tool_constraints import READ_ONLY_TOOLS
     from rev.terminal.input import start_streaming_input, stop_streaming_input, get_streaming_handler
     from rev.terminal.formatting import colorize, Colors
 
@@ -3048,7 +3052,7 @@ def streaming_execution_mode(
         model_name = config.EXECUTION_MODEL
         model_supports_tools = config.EXECUTION_SUPPORTS_TOOLS
 
-        messages = [{"role": "system", "content": system_context}]
+        messages = MessageHistory([{"role": "system", "content": system_context}])
         max_iterations = MAX_EXECUTION_ITERATIONS
         iteration = 0
 
@@ -3151,11 +3155,36 @@ Action type: {current_task.action_type}
                         print("\n  📥 [Message pending - will process after response]", end='', flush=True)
 
                 # Final safety net: always send a non-empty tool list when the model supports tools.
-                effective_tools = tools or get_available_tools()
+                effective_tools = select_tools_for_action(
+                    current_task.action_type,
+                    tool_universe=tools or get_available_tools(),
+                    agent_name="executor",
+                    query=current_task.description,
+                )
                 call_tools = effective_tools if model_supports_tools else None
                 tools_enabled = bool(call_tools)
                 llm_messages = _prepare_llm_messages(messages, exec_context, session_tracker)
 
+                # Start read-only tool calls while the model is still generating.
+                prefetcher = None
+                if call_tools and getattr(config, "STREAMING_TOOL_PREFETCH_ENABLED", True):
+                    offered = {t.get("function", {}).get("name") for t in call_tools if isinstance(t, dict)}
+                    prefetcher = StreamingToolPrefetcher(
+                        lambda name, args: execute_tool(name, args, agent_name="executor"),
+                        allowed_tools=READ_ONLY_TOOLS & offered,
+                        budget=_remaining_tool_budget(tool_usage, tool_limits),
+                        admit=lambda name, args: not is_scary_operation(
+                            name, args, current_task.action_type
+                        )[0],
+                    )
+
+                def run_tool(name: str, args: Dict[str, Any]) -> str:
+                    if prefetcher is not None:
+                        prefetched = prefetcher.take(name, args)
+                        if prefetched is not None:
+                            return prefetched
+                    return execute_tool(name, args, agent_name="executor")
+
                 try:
                     response = ollama_chat_stream(
                         llm_messages,
@@ -3165,8 +3194,11 @@ Action type: {current_task.action_type}
                         on_chunk=chunk_handler,
                         check_interrupt=check_interrupt,
                         check_user_messages=check_messages,
+                        on_tool_call=prefetcher.submit if prefetcher else None,
                     )
                 except KeyboardInterrupt:
+                    if prefetcher:
+                        prefetcher.shutdown()
                     print("\n  Request cancelled")
                     plan.mark_task_stopped(current_task)
                     task_complete = True
@@ -3180,6 +3212,8 @@ Action type: {current_task.action_type}
                     handler.redisplay_prompt()
 
                 if "error" in response:
+                    if prefetcher:
+                        prefetcher.shutdown()
                     print(f"  ✗ Error: {response['error']}")
                     continue
 
@@ -3206,6 +3240,10 @@ Action type: {current_task.action_type}
                             except:
                                 tool_args = {}
 
+                        if prefetcher is not None and not prefetcher.can_prefetch(tool_name):
+                            # Reads prefetched for later calls may predate this one.
+                            prefetcher.invalidate()
+
                         """
                         # Check for back-to-back duplicate
                         if exec_context.is_duplicate_call(tool_name, tool_args):
@@ -3262,7 +3300,7 @@ Action type: {current_task.action_type}
                             if cached is not None:
                                 result = cached
                             else:
-                                result = execute_tool(tool_name, tool_args, agent_name="executor")
+                                result = run_tool(tool_name, tool_args)
                                 if not _has_error_result(result):
                                     exec_context.set_code(path, result)
                         elif tool_name == "write_file":
@@ -3275,7 +3313,7 @@ Action type: {current_task.action_type}
                             if not _has_error_result(result):
                                 exec_context.clear_code_cache()
                         else:
-                            result = execute_tool(tool_name, tool_args, agent_name="executor")
+                            result = run_tool(tool_name, tool_args)
 
                         print(" done")
                         session_tracker.track_tool_call(tool_name, tool_args)
@@ -3293,6 +3331,9 @@ Action type: {current_task.action_type}
                             )
                         })
 
+                if prefetcher:
+                    prefetcher.shutdown()
+
                 # Check for task completion
                 if "TASK_COMPLETE" in content or "task complete" in content.lower():
                     print(f"\n  ✅ Task completed")
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Incrementally summarized message history for the executor.
+
+The executor keeps the system prompt, a "[Summary of previous work]" message
+and the last ``CONTEXT_WINDOW_HISTORY`` messages. Rebuilding that summary
+from the whole evicted slice on every LLM call makes long sessions quadratic,
+so ``MessageHistory`` folds each message into a running summary exactly once,
+when it first leaves the recent window, and keeps prefix sums of per-message
+token estimates so the size of any window is known without re-walking it.
+
+Message lists handed to the LLM layer are ``TokenCountedMessages``; their
+``estimated_tokens`` lets ``_enforce_token_limit`` answer "fits in budget?"
+without counting again.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from rev.llm.providers.ollama import _estimate_message_tokens as estimate_message_tokens
+
+
+SUMMARY_HEADER = "[Summary of previous work]"
+SUMMARY_FOOTER = "[Continuing with recent context...]"
+
+
+def _invalidating(name: str):
+    base = getattr(list, name)
+
+    def method(self, *args, **kwargs):
+        self._invalidate()
+        return base(self, *args, **kwargs)
+
+    method.__name__ = name
+    method.__doc__ = base.__doc__
+    return method
+
+
+class _TrackedList(list):
+    """List whose mutations other than ``append``/``extend`` call ``_invalidate``."""
+
+    def _invalidate(self) -> None:
+        raise NotImplementedError
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+
+for _name in ("__setitem__", "__delitem__", "__imul__", "insert", "pop", "remove", "clear", "sort", "reverse"):
+    setattr(_TrackedList, _name, _invalidating(_name))
+del _name
+
+
+class TokenCountedMessages(_TrackedList):
+    """A message list that carries its own token estimate.
+
+    ``append``/``extend`` keep ``estimated_tokens`` current; any other
+    mutation drops it to ``None`` so consumers fall back to counting.
+    """
+
+    def __init__(self, messages: Iterable[Dict[str, Any]] = (), estimated_tokens: Optional[int] = None):
+        super().__init__(messages)
+        if estimated_tokens is None:
+            estimated_tokens = sum(estimate_message_tokens(m) for m in self)
+        self.estimated_tokens: Optional[int] = estimated_tokens
+
+    def _invalidate(self) -> None:
+        self.estimated_tokens = None
+
+    def append(self, message: Dict[str, Any]) -> None:
+        super().append(message)
+        if self.estimated_tokens is not None:
+            self.estimated_tokens += estimate_message_tokens(message)
+
+    def extend(self, messages: Iterable[Dict[str, Any]]) -> None:
+        for message in messages:
+            self.append(message)
+
+
+class RunningSummary:
+    """Tasks and tools seen in evicted messages, in first-seen order."""
+
+    def __init__(self) -> None:
+        self.tasks: Dict[str, None] = {}
+        self.tools: Dict[str, None] = {}
+        self.messages = 0
+        self.tokens = 0
+
+    def fold(self, message: Dict[str, Any], tokens: int = 0) -> None:
+        self.messages += 1
+        self.tokens += tokens
+        role = message.get("role")
+        if role == "user":
+            content = message.get("content") or ""
+            if isinstance(content, str) and "Task:" in content:
+                task_line = content.split("Task:", 1)[1].split("\n")[0].strip()
+                if task_line:
+                    self.tasks.setdefault(task_line)
+        elif role == "tool":
+            self.tools.setdefault(message.get("name", "unknown"))
+
+    def render(self) -> str:
+        """Concise summary string of completed work."""
+        parts = []
+        if self.tasks:
+            tasks = list(self.tasks)
+            parts.append(f"Completed {len(tasks)} tasks:")
+            parts.extend([f"  • {t[:80]}" for t in tasks[:10]])
+            if len(tasks) > 10:
+                parts.append(f"  ... and {len(tasks) - 10} more")
+        if self.tools:
+            parts.append(f"\nTools used: {', '.join(list(self.tools)[:15])}")
+        return "\n".join(parts) if parts else "Previous work completed successfully."
+
+
+def summary_message(summary: str) -> Dict[str, str]:
+    return {"role": "user", "content": f"{SUMMARY_HEADER}\n{summary}\n\n{SUMMARY_FOOTER}"}
+
+
+class MessageHistory(_TrackedList):
+    """The executor's conversation, summarized incrementally.
+
+    Messages are appended as usual. ``window()`` returns the system prompt,
+    the running summary and the recent messages; ``compact()`` additionally
+    drops the folded messages from memory. The executor only appends, so
+    other mutations are supported but fall back to recounting tokens.
+    """
+
+    def __init__(self, messages: Iterable[Dict[str, Any]] = ()) -> None:
+        super().__init__(messages)
+        self.summary = RunningSummary()
+        self._prefix: List[int] = [0]
+        self._folded_until = 0  # messages before this index are in the summary
+        self._summary_text: Optional[str] = None
+        self._summary_message: Optional[Dict[str, str]] = None
+        self._summary_tokens = 0
+
+    def _invalidate(self) -> None:
+        self._prefix = [0]
+
+    def _sync(self) -> None:
+        """Extend the token prefix sums over messages appended since the last call."""
+        prefix = self._prefix
+        for message in self[len(prefix) - 1:]:
+            prefix.append(prefix[-1] + estimate_message_tokens(message))
+        self._folded_until = min(self._folded_until, len(self))
+
+    def _start(self) -> int:
+        return 1 if self and self[0].get("role") == "system" else 0
+
+    def _fold(self, until: int, tracker=None) -> None:
+        start = max(self._start(), self._folded_until)
+        if until <= start:
+            return
+        for index in range(start, until):
+            self.summary.fold(self[index], self._prefix[index + 1] - self._prefix[index])
+        self._folded_until = until
+
+        if tracker:
+            tracker.track_messages(self.summary.messages, self.summary.tokens)
+            text = tracker.get_summary(detailed=False)
+        else:
+            text = self.summary.render()
+        if text != self._summary_text:
+            self._summary_text = text
+            self._summary_message = summary_message(text)
+            self._summary_tokens = estimate_message_tokens(self._summary_message)
+
+    @property
+    def total_tokens(self) -> int:
+        """Estimated tokens of the messages currently held (summary excluded)."""
+        self._sync()
+        return self._prefix[-1]
+
+    def window(self, max_recent: int, tracker=None) -> TokenCountedMessages:
+        """System prompt + running summary + the last ``max_recent`` messages.
+
+        Messages older than the window are folded into the summary once; the
+        token estimate of the result comes from the prefix sums.
+        """
+        self._sync()
+        start = self._start()
+        boundary = max(start, len(self) - max_recent) if max_recent > 0 else start
+        self._fold(boundary, tracker)
+        if self._summary_message is None:
+            return TokenCountedMessages(self, self._prefix[-1])
+
+        recent_from = max(boundary, self._folded_until)
+        messages = self[:start] + [self._summary_message] + self[recent_from:]
+        tokens = self._prefix[start] + self._summary_tokens + self._prefix[-1] - self._prefix[recent_from]
+        return TokenCountedMessages(messages, tokens)
+
+    def compact(self, max_recent: int, tracker=None) -> int:
+        """Fold messages older than the window and drop them; returns how many were dropped."""
+        self._sync()
+        start = self._start()
+        if max_recent > 0:
+            self._fold(max(start, len(self) - max_recent), tracker)
+        dropped = self._folded_until - start
+        if dropped > 0:
+            list.__delitem__(self, slice(start, self._folded_until))
+            base = self._prefix[start]
+            shift = self._prefix[self._folded_until] - base
+            self._prefix[start + 1:] = [total - shift for total in self._prefix[self._folded_until + 1:]]
+            self._folded_until = start
+        return max(dropped, 0)
@@ -53,6 +53,7 @@ from rev.execution.quick_verify import verify_task_execution, VerificationResult
 from rev.execution.anchoring_scorer import AnchoringScorer, AnchoringDecision
 from rev.tools.registry import execute_tool, get_available_tools, get_repo_context
 from rev.debug_logger import DebugLogger
+from rev.profiler import get_profiler, profiles_dir
 from rev.config import (
     MAX_PLAN_TASKS,
     MAX_STEPS_PER_RUN,
@@ -74,6 +75,7 @@ from rev.core.agent_registry import AgentRegistry
 from rev.cache import clear_analysis_caches
 import re
 from rev.retrieval.context_builder import ContextBuilder
+from rev.agents.context_provider import get_context_builder
 from rev.memory.project_memory import ensure_project_memory_file, maybe_record_known_failure_from_error
 from rev.tools.workspace_resolver import resolve_workspace_path
 from rev.workspace import get_workspace
@@ -3296,6 +3298,7 @@ class Orchestrator:
         return task
 
     def _update_phase(self, new_phase: AgentPhase):
+        get_profiler().set_phase(new_phase.value)
         if self.context:
             self.context.set_current_phase(new_phase)
             if config.EXECUTION_MODE != 'sub-agent':
@@ -3446,6 +3449,13 @@ class Orchestrator:
             task.error = f"Failed to process deep reasoning result: {e}"
             return False
 
+    def _note_loop_avoided(self, kind: str) -> None:
+        """Count a repeated action that a loop guard rewrote or blocked."""
+        if not self.context:
+            return
+        counts = self.context.agent_insights.setdefault("loops_avoided", {})
+        counts[kind] = counts.get(kind, 0) + 1
+
     def _transform_redundant_action(self, task: Task, action_sig: str, count: int) -> Task:
         """Transform a redundant action into one that produces new evidence."""
         desc = task.description.lower()
@@ -3802,6 +3812,8 @@ class Orchestrator:
         self._maybe_optimize_user_request()
         user_request = self.context.user_request
         start_time = time.time()
+        if get_profiler().enabled:
+            get_profiler().reset()
 
         from rev.execution.router import TaskRouter
         router = TaskRouter()
@@ -3955,6 +3967,7 @@ class Orchestrator:
                 coding_mode=coding_mode,
                 state_manager=self.context.state_manager,
                 budget=self.context.resource_budget,
+                task_paths=_extract_task_paths,
             )
         else:
             execution_mode(
@@ -4792,6 +4805,7 @@ class Orchestrator:
                         return False
 
                     next_task = self._transform_redundant_action(next_task, action_sig, action_counts[action_sig])
+                    self._note_loop_avoided("redundant_action")
                     # Update signature after transformation
                     action_sig = f"{(next_task.action_type or '').strip().lower()}::{(next_task.description or '').strip().lower()}"
 
@@ -5283,6 +5297,7 @@ class Orchestrator:
             # Check if this action is blocked
             if action_sig in blocked_sigs:
                 print(f"  [blocked-action] This action is blocked due to previous repetition: {action_sig[:100]}...")
+                self._note_loop_avoided("blocked_action")
                 # Auto-rewrite to a diagnostic fallback
                 next_task.action_type = "analyze"
                 next_task.description = (
@@ -5305,6 +5320,7 @@ class Orchestrator:
                     # Increased threshold: only block after 5 reads (was 2)
                     if read_count >= 5:
                         print(f"  [redundant-read] File '{target_file}' already read {read_count}x - BLOCKING")
+                        self._note_loop_avoided("redundant_read")
                         # Block this specific action
                         blocked_sigs.add(action_sig)
                         if self.context:
@@ -5390,6 +5406,7 @@ class Orchestrator:
                 and (next_task.action_type or "").lower() in {"read", "analyze", "research"}
             ):
                 print("  [loop-guard] Repeated READ/ANALYZE detected; checking if goal is achieved.")
+                self._note_loop_avoided("loop_guard")
 
                 # P0-2: Block this action from being proposed again
                 blocked_sigs.add(action_sig)
@@ -6602,7 +6619,8 @@ class Orchestrator:
             # Build a focused context snapshot (selection pipeline); agents will also
             # use this same pipeline when selecting tools and composing prompts.
             if self._context_builder is None:
-                self._context_builder = ContextBuilder(self.project_root)
+                # Shared with the session warm-up so its prebuilt corpora are reused.
+                self._context_builder = get_context_builder(self.project_root)
             try:
                 tool_names = [t.get("function", {}).get("name") for t in get_available_tools() if isinstance(t, dict)]
                 bundle = self._context_builder.build(
@@ -6938,6 +6956,22 @@ class Orchestrator:
     def _emit_run_metrics(self, plan: Optional[ExecutionPlan], result: OrchestratorResult, budget: ResourceBudget):
         if config.EXECUTION_MODE != 'sub-agent':
             print(f"\n🔥 Emitting run metrics...")
+
+        profiler = get_profiler()
+        if not profiler.enabled:
+            return
+        profiler.set_phase(None)
+        summary = profiler.summary()
+        try:
+            paths = profiler.write(profiles_dir())
+        except OSError as exc:
+            paths = {}
+            print(f"  Warning: could not write profile ({exc})")
+        self.debug_logger.log("profile", "LATENCY_BREAKDOWN", summary)
+        if config.EXECUTION_MODE != 'sub-agent':
+            print(profiler.format_summary(summary))
+            if paths:
+                print(f"  Flame graph input: {paths['folded']}")
     
     def _display_summary(self, result: OrchestratorResult):
         """Display a final execution summary."""
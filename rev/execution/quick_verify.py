@@ -21,6 +21,7 @@ from dataclasses import dataclass
 from rev.models.task import Task, TaskStatus, explicitly_requests_tests, explicitly_requests_lint
 from rev.tools.registry import execute_tool, get_last_tool_call
 from rev import config
+from rev.profiler import span as profile_span
 from rev.core.context import RevContext
 from rev.tools.workspace_resolver import (
     WorkspacePathError,
@@ -61,6 +62,7 @@ _READ_ONLY_TOOLS = {
     "list_dir",
     "tree_view",
     "search_code",
+    "search_code_multi",
     "get_file_info",
     "file_exists",
 }
@@ -347,7 +349,8 @@ def verify_task_execution(task: Task, context: RevContext) -> VerificationResult
     Wrapper catches unexpected exceptions to avoid opaque failures.
     """
     try:
-        return _verify_task_execution_impl(task, context)
+        with profile_span("verification", str(task.action_type or "task").lower()):
+            return _verify_task_execution_impl(task, context)
     except Exception as e:
         return VerificationResult(
             passed=False,
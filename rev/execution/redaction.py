@@ -3,72 +3,234 @@
 """Redaction helpers for persisted artifacts.
 
 Artifacts are a truth store; redact sensitive values by default.
+
+Most text contains no secrets, so the engine is built to reject clean text
+quickly:
+
+1. a literal prefilter (``sk-``, ``ghp_``, ``AKIA``, ``bearer``, ``=`` plus a
+   key word, ...) selects the rules that could possibly match;
+2. one combined regex over just those rules confirms whether anything
+   matches at all;
+3. only then are the rules applied in order, so output is identical to
+   running every pattern sequentially.
+
+Large strings are processed in chunks split at line boundaries no rule can
+match across, so only the chunks that contain a secret are rewritten.
+Containers are only copied when something inside them changed.
 """
 
 from __future__ import annotations
 
 import json
 import re
-from typing import Any, Dict, Tuple, Union
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Tuple, Union
 
 
 REDACTION_RULES_VERSION = 1
 
+# Strings longer than this are redacted chunk by chunk.
+_CHUNK_CHARS = 64 * 1024
+
+
+class _Rule:
+    __slots__ = ("name", "source", "ignore_case", "replacement", "literals", "needs_equals", "pattern")
+
+    def __init__(self, name: str, source: str, replacement: str, literals: Tuple[str, ...],
+                 *, ignore_case: bool = False, needs_equals: bool = False):
+        self.name = name
+        self.source = source
+        self.ignore_case = ignore_case
+        self.replacement = replacement
+        # Lower-cased when ``ignore_case``; at least one must occur for a match.
+        self.literals = literals
+        self.needs_equals = needs_equals
+        self.pattern = re.compile(source, re.IGNORECASE if ignore_case else 0)
+
 
-_TOKEN_PATTERNS: list[tuple[re.Pattern[str], str]] = [
+# Order matters: rules are applied sequentially to text that matched.
+_RULES: List[_Rule] = [
     # OpenAI-style keys
-    (re.compile(r"\bsk-[A-Za-z0-9]{16,}\b"), "sk-[REDACTED]"),
+    _Rule("openai_key", r"\bsk-[A-Za-z0-9]{16,}\b", "sk-[REDACTED]", ("sk-",)),
     # GitHub personal access tokens
-    (re.compile(r"\bghp_[A-Za-z0-9]{20,}\b"), "ghp_[REDACTED]"),
-    (re.compile(r"\bgithub_pat_[A-Za-z0-9_]{20,}\b"), "github_pat_[REDACTED]"),
+    _Rule("github_pat", r"\bghp_[A-Za-z0-9]{20,}\b", "ghp_[REDACTED]", ("ghp_",)),
+    _Rule("github_fine_grained_pat", r"\bgithub_pat_[A-Za-z0-9_]{20,}\b", "github_pat_[REDACTED]", ("github_pat_",)),
     # AWS access key id
-    (re.compile(r"\bAKIA[0-9A-Z]{16}\b"), "AKIA[REDACTED]"),
+    _Rule("aws_access_key", r"\bAKIA[0-9A-Z]{16}\b", "AKIA[REDACTED]", ("AKIA",)),
     # Generic bearer tokens / auth headers
-    (re.compile(r"(?i)\bAuthorization:\s*Bearer\s+[A-Za-z0-9._-]{10,}"), "Authorization: Bearer [REDACTED]"),
-    (re.compile(r"(?i)\bBearer\s+[A-Za-z0-9._-]{10,}"), "Bearer [REDACTED]"),
+    _Rule("authorization_header", r"\bAuthorization:\s*Bearer\s+[A-Za-z0-9._-]{10,}",
+          "Authorization: Bearer [REDACTED]", ("bearer",), ignore_case=True),
+    _Rule("bearer_token", r"\bBearer\s+[A-Za-z0-9._-]{10,}", "Bearer [REDACTED]", ("bearer",), ignore_case=True),
     # Common env-style assignments
-    (re.compile(r"(?i)\b(api[_-]?key|token|secret|password)\s*=\s*['\"]?[^'\"\s]{6,}"), r"\1=[REDACTED]"),
+    _Rule("env_assignment", r"\b(api[_-]?key|token|secret|password)\s*=\s*['\"]?[^'\"\s]{6,}", r"\1=[REDACTED]",
+          ("api", "token", "secret", "password"), ignore_case=True, needs_equals=True),
 ]
 
+_SCANNERS: Dict[FrozenSet[int], re.Pattern[str]] = {}
+
+
+def _scanner(candidates: FrozenSet[int]) -> re.Pattern[str]:
+    """One alternation over the candidate rules (capture groups made inert)."""
+    scanner = _SCANNERS.get(candidates)
+    if scanner is None:
+        parts = []
+        for index in sorted(candidates):
+            rule = _RULES[index]
+            source = re.sub(r"(?<!\\)\((?!\?)", "(?:", rule.source)
+            parts.append(f"(?i:{source})" if rule.ignore_case else f"(?:{source})")
+        scanner = _SCANNERS[candidates] = re.compile("|".join(parts))
+    return scanner
+
+
+def _candidate_rules(text: str) -> FrozenSet[int]:
+    """Indices of rules that can match ``text`` (one of their literals occurs)."""
+    candidates = []
+    lowered = None
+    has_equals = "=" in text
+    # re.IGNORECASE also folds a few non-ASCII letters onto ASCII ones
+    # (e.g. "\u017f" matches "s"), which lower() does not; skip the literal
+    # check for case-insensitive rules on non-ASCII text.
+    ascii_only = text.isascii()
+    for index, rule in enumerate(_RULES):
+        if rule.needs_equals and not has_equals:
+            continue
+        if rule.ignore_case:
+            if not ascii_only:
+                candidates.append(index)
+                continue
+            if lowered is None:
+                lowered = text.lower()
+            haystack = lowered
+        else:
+            haystack = text
+        if any(literal in haystack for literal in rule.literals):
+            candidates.append(index)
+    return frozenset(candidates)
+
+
+def _redact_chunk(text: str) -> Tuple[str, bool]:
+    candidates = _candidate_rules(text)
+    if not candidates or _scanner(candidates).search(text) is None:
+        return text, False
+    changed = False
+    out = text
+    for index in sorted(candidates):
+        rule = _RULES[index]
+        new_out, n = rule.pattern.subn(rule.replacement, out)
+        if n:
+            changed = True
+            out = new_out
+    return out, changed
+
+
+def _is_safe_boundary(text: str, pos: int) -> bool:
+    """True if no rule can match across the line break ending at ``pos``.
+
+    Matches can only span a newline through ``\\s`` runs: after
+    ``Authorization:``/``Bearer`` or around the ``=`` of an assignment.
+    """
+    if pos >= len(text):
+        return True
+    nxt = text[pos]
+    if nxt.isspace() or nxt in "='\"":
+        return False
+    prev = text[max(0, pos - 64):pos].rstrip()
+    if not prev:
+        return False
+    if prev[-1] in ":='\"":
+        return False
+    return not prev[-6:].lower().endswith("bearer")
+
+
+def _split_point(text: str, start: int, size: int) -> int:
+    """End of the chunk starting at ``start``: a safe line boundary at/after ``start + size``."""
+    pos = start + size
+    while pos < len(text):
+        newline = text.find("\n", pos)
+        if newline < 0:
+            break
+        pos = newline + 1
+        if _is_safe_boundary(text, pos):
+            return pos
+    return len(text)
+
 
 def redact_sensitive_text(text: str) -> Tuple[str, bool]:
     """Return (redacted_text, changed)."""
 
     if not text:
         return text, False
+    if len(text) <= _CHUNK_CHARS:
+        return _redact_chunk(text)
 
+    pieces: List[str] = []
     changed = False
-    out = text
-    for pattern, replacement in _TOKEN_PATTERNS:
-        new_out, n = pattern.subn(replacement, out)
-        if n:
-            changed = True
-            out = new_out
-    return out, changed
+    start = 0
+    while start < len(text):
+        end = _split_point(text, start, _CHUNK_CHARS)
+        piece, did = _redact_chunk(text[start:end])
+        pieces.append(piece)
+        changed = changed or did
+        start = end
+    return ("".join(pieces) if changed else text), changed
+
+
+def iter_redacted_text(chunks: Iterable[str], chunk_chars: int = _CHUNK_CHARS) -> Iterator[Tuple[str, bool]]:
+    """Redact a stream of text chunks, yielding ``(redacted_piece, changed)``.
+
+    Input is buffered only up to the next safe line boundary past
+    ``chunk_chars``, so arbitrarily large outputs can be redacted without
+    holding them in memory.
+    """
+    buffer = ""
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buffer += chunk
+        while len(buffer) > chunk_chars:
+            end = _split_point(buffer, 0, chunk_chars)
+            # The last line may still continue in the next chunk.
+            if end >= len(buffer):
+                break
+            yield _redact_chunk(buffer[:end])
+            buffer = buffer[end:]
+    if buffer:
+        yield _redact_chunk(buffer)
 
 
 def redact_sensitive(value: Union[str, Dict[str, Any], Any]) -> Tuple[Any, bool]:
-    """Redact sensitive data in str or JSON-like dict/list payloads."""
+    """Redact sensitive data in str or JSON-like dict/list payloads.
+
+    Unchanged values (including containers) are returned as-is, not copied.
+    """
 
     if isinstance(value, str):
         return redact_sensitive_text(value)
 
+    if value is None or isinstance(value, (bool, int, float)):
+        return value, False
+
     if isinstance(value, dict):
-        changed = False
         out: Dict[str, Any] = {}
+        changed = False
         for k, v in value.items():
             red_v, did = redact_sensitive(v)
-            changed = changed or did
-            out[k] = red_v
-        return out, changed
+            if did and not changed:
+                changed = True
+                out = dict(value)
+            if did:
+                out[k] = red_v
+        return (out if changed else value), changed
 
     if isinstance(value, list):
+        out_list = value
         changed = False
-        out_list = []
-        for item in value:
+        for i, item in enumerate(value):
             red_item, did = redact_sensitive(item)
-            changed = changed or did
-            out_list.append(red_item)
+            if did:
+                if not changed:
+                    changed = True
+                    out_list = list(value)
+                out_list[i] = red_item
         return out_list, changed
 
     # Fallback: try JSON roundtrip for simple types
@@ -78,4 +240,3 @@ def redact_sensitive(value: Union[str, Dict[str, Any], Any]) -> Tuple[Any, bool]
         return json.loads(red), did
     except Exception:
         return value, False
-
@@ -11,10 +11,13 @@ import json
 import os
 import re
 import signal
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, field
 
+from rev import config
+from rev.retrieval.warmup import get_warmup
 from rev.tools.registry import execute_tool
 from rev.llm.client import ollama_chat
 
@@ -32,11 +35,23 @@ def get_rag_retriever(budget=None, repo_stats: Optional[Dict[str, Any]] = None):
     global _RAG_RETRIEVER
 
     if _RAG_RETRIEVER is None:
+        warmup = get_warmup()
+        warm_task = warmup.get("rag_index") if warmup else None
+        if warm_task is not None:
+            retriever = warmup.result("rag_index", timeout=config.WARMUP_WAIT_TIMEOUT)
+            if retriever is not None and Path(retriever.root).resolve() == Path.cwd().resolve():
+                _RAG_RETRIEVER = retriever
+                return _RAG_RETRIEVER
+            if retriever is None and not warm_task.done:
+                # Still indexing in the background: research proceeds with
+                # symbolic search only rather than blocking the first turn.
+                print("    RAG index still warming up - continuing without semantic search")
+                return None
         try:
-            from rev.retrieval import SimpleCodeRetriever
+            from rev.retrieval import create_code_retriever
 
             # Initialize retriever for current directory
-            retriever = SimpleCodeRetriever(root=Path.cwd(), chunk_size=50)
+            retriever = create_code_retriever(root=Path.cwd(), chunk_size=50)
 
             # Build index if not already built
             if not retriever.index_built:
@@ -562,7 +577,6 @@ def research_codebase(
     keywords = _extract_search_keywords(user_request)
     print(f"→ Searching for: {', '.join(keywords[:5])}")
 
-    # Sequential research tasks to avoid parallel threads
     research_steps = [
         ("code_search", lambda: _search_relevant_code(keywords)),
         ("structure", _analyze_project_structure),
@@ -577,9 +591,15 @@ def research_codebase(
     if not quick_mode and search_depth in ["medium", "deep"]:
         research_steps.append(("dependencies", lambda: _analyze_dependencies(keywords)))
 
-    for task_name, step in research_steps:
+    # The steps are independent (each does its own search pass, RAG may wait on
+    # the warm-up), so overlap them; results are merged in step order below.
+    outcomes = _run_research_steps(research_steps)
+
+    for task_name, _step in research_steps:
         try:
-            result = step()
+            result = outcomes[task_name]
+            if isinstance(result, Exception):
+                raise result
             if task_name == "code_search":
                 findings.relevant_files = result.get("files", [])
                 findings.code_patterns = result.get("patterns", [])
@@ -613,6 +633,24 @@ def research_codebase(
     return findings
 
 
+def _run_research_steps(steps: List[Tuple[str, Any]]) -> Dict[str, Any]:
+    """Run research steps, concurrently unless REV_RESEARCH_PARALLEL=false.
+
+    Returns each step's result (or the exception it raised) keyed by name.
+    """
+    def _call(step):
+        try:
+            return step()
+        except Exception as e:
+            return e
+
+    if not config.RESEARCH_PARALLEL or len(steps) < 2:
+        return {name: _call(step) for name, step in steps}
+    with ThreadPoolExecutor(max_workers=len(steps), thread_name_prefix="rev-research") as pool:
+        futures = {name: pool.submit(_call, step) for name, step in steps}
+        return {name: future.result() for name, future in futures.items()}
+
+
 def _extract_search_keywords(user_request: str) -> List[str]:
     """Extract keywords for code search."""
     lang_config = {
@@ -666,19 +704,34 @@ def _extract_search_keywords(user_request: str) -> List[str]:
     return list(keywords)[:10]
 
 
+def _multi_search(patterns: List[str], max_matches: int, regex: bool = False) -> Dict[str, List[Dict[str, Any]]]:
+    """Run one search_code_multi pass and return matches bucketed per pattern."""
+    if not patterns:
+        return {}
+    try:
+        result = execute_tool(
+            "search_code_multi",
+            {"patterns": patterns, "regex": regex, "max_matches_per_pattern": max_matches},
+            agent_name="researcher",
+        )
+        result_data = json.loads(result)
+    except Exception:
+        return {}
+    buckets = result_data.get("results") or {}
+    return {pattern: (buckets.get(pattern) or {}).get("matches", []) for pattern in patterns}
+
+
 def _search_relevant_code(keywords: List[str]) -> Dict[str, Any]:
     """Search for code relevant to the keywords."""
     files = []
     patterns = []
     seen_paths = set()  # O(1) lookup instead of O(n) list membership
 
+    # One pass over the tree for all keywords instead of one per keyword.
+    matches_by_keyword = _multi_search(keywords[:5], max_matches=5)
     for keyword in keywords[:5]:
         try:
-            # Search for keyword in code
-            result = execute_tool("search_code", {"pattern": keyword, "max_results": 5}, agent_name="researcher")
-            result_data = json.loads(result)
-
-            matches = result_data.get("matches", [])
+            matches = matches_by_keyword.get(keyword, [])
             for match in matches:
                 path = match.get("file", "")
                 if path not in seen_paths:
@@ -691,7 +744,7 @@ def _search_relevant_code(keywords: List[str]) -> Dict[str, Any]:
                     seen_paths.add(path)
 
                 # Extract pattern from context
-                context = match.get("context", "")
+                context = match.get("text") or match.get("context", "")
                 if context:
                     # Look for function/class definitions
                     if "def " in context or "class " in context:
@@ -766,12 +819,10 @@ def _find_similar_implementations(user_request: str, keywords: List[str]) -> Dic
     if "database" in request_lower or "db" in request_lower:
         search_patterns.extend(["def query", "cursor", "execute"])
 
+    matches_by_pattern = _multi_search(search_patterns[:3], max_matches=3)
     for pattern in search_patterns[:3]:
         try:
-            result = execute_tool("search_code", {"pattern": pattern, "max_results": 3}, agent_name="researcher")
-            result_data = json.loads(result)
-
-            for match in result_data.get("matches", []):
+            for match in matches_by_pattern.get(pattern, []):
                 impl = {
                     "file": match.get("file", ""),
                     "description": f"Contains '{pattern}' pattern"
@@ -789,14 +840,13 @@ def _analyze_dependencies(keywords: List[str]) -> Dict[str, Any]:
     dependencies = []
     conflicts = []
 
-    for keyword in keywords[:3]:
+    # Search for imports of every keyword in a single pass
+    import_patterns = [f"import.*{re.escape(keyword)}" for keyword in keywords[:3]]
+    matches_by_pattern = _multi_search(import_patterns, max_matches=5, regex=True)
+    for pattern in import_patterns:
         try:
-            # Search for imports
-            result = execute_tool("search_code", {"pattern": f"import.*{keyword}", "max_results": 5}, agent_name="researcher")
-            result_data = json.loads(result)
-
-            for match in result_data.get("matches", []):
-                dep = match.get("context", "").strip()
+            for match in matches_by_pattern.get(pattern, []):
+                dep = (match.get("text") or match.get("context", "")).strip()
                 if dep and dep not in dependencies:
                     dependencies.append(dep)
         except Exception:
@@ -21,6 +21,7 @@ import uuid
 from rev import config
 from rev.models.task import ExecutionPlan, Task, TaskStatus
 from rev.debug_logger import get_logger
+from rev.execution.checkpoint_store import get_checkpoint_store, read_checkpoint
 
 
 class StateManager:
@@ -74,7 +75,7 @@ class StateManager:
             force: Force save even if auto_save is disabled
 
         Returns:
-            Path to checkpoint file, or None if save was skipped
+            Checkpoint reference (``<session log>#<number>``), or None if save was skipped
         """
         if not self.auto_save and not force:
             return None
@@ -82,46 +83,39 @@ class StateManager:
         with self._lock:
             try:
                 self._checkpoint_count += 1
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
-                # Filename now includes the GUID‑based session_id for clear identification
-                filename = f"checkpoint_{self.session_id}_{self._checkpoint_count:04d}_{timestamp}.json"
-                filepath = self.checkpoint_dir / filename
-
-                checkpoint_data = {
-                    "version": "1.1",  # Bumped for agent_state support
-                    "session_id": self.session_id,
-                    "checkpoint_number": self._checkpoint_count,
-                    "timestamp": datetime.now().isoformat(),
-                    "reason": reason,
-                    "plan": self.plan.to_dict(),
-                    "resume_info": self._get_resume_info()
-                }
 
                 # Include recovery-related agent state for persistence
+                filtered_state = None
                 if self._agent_state:
                     persistent_keys = [
                         "total_recovery_attempts",
                         "recovery_attempts",
                         "task_recovery_counts",
                     ]
-                    filtered_state = {k: v for k, v in self._agent_state.items() if k in persistent_keys}
-                    if filtered_state:
-                        checkpoint_data["agent_state"] = filtered_state
+                    filtered_state = {k: v for k, v in self._agent_state.items() if k in persistent_keys} or None
 
-                with open(filepath, "w") as f:
-                    json.dump(checkpoint_data, f, indent=2)
+                # Appends a delta (or a periodic snapshot) to this session's log;
+                # the log filename includes the GUID-based session_id.
+                filepath = get_checkpoint_store(self.checkpoint_dir).append(
+                    self.session_id,
+                    self.plan.to_dict(),
+                    version="1.1",  # Bumped for agent_state support
+                    reason=reason,
+                    resume_info=self._get_resume_info(),
+                    agent_state=filtered_state,
+                )
 
-                self._last_checkpoint = str(filepath)
+                self._last_checkpoint = filepath
 
                 self.logger.log("state", "CHECKPOINT_SAVED", {
-                    "filepath": str(filepath),
+                    "filepath": filepath,
                     "reason": reason,
                     "checkpoint_number": self._checkpoint_count,
                     "tasks_completed": sum(1 for t in self.plan.tasks if t.status == TaskStatus.COMPLETED),
                     "tasks_total": len(self.plan.tasks)
                 }, "INFO")
 
-                return str(filepath)
+                return filepath
 
             except Exception as e:
                 self.logger.log("state", "CHECKPOINT_SAVE_ERROR", {
@@ -253,7 +247,10 @@ class StateManager:
         return self._last_checkpoint
 
     def list_checkpoints(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """List recent checkpoints by modification time.
+        """List recent checkpoints, most recent first.
+
+        Checkpoint-log entries come from the store index; legacy single-file
+        checkpoints are still read and merged in by timestamp.
 
         Args:
             limit: Maximum number of checkpoints to return
@@ -266,6 +263,21 @@ class StateManager:
         if not self.checkpoint_dir.exists():
             return checkpoints
 
+        for entry in get_checkpoint_store(self.checkpoint_dir).list(limit):
+            checkpoints.append({
+                "filepath": entry["ref"],
+                "filename": Path(entry["ref"]).name,
+                "timestamp": entry.get("timestamp"),
+                "reason": entry.get("reason", "unknown"),
+                "session_id": entry.get("session_id"),
+                "checkpoint_number": entry.get("checkpoint_number"),
+                "tasks_completed": entry.get("tasks_completed", 0),
+                "tasks_total": entry.get("tasks_total", 0),
+                "progress_percent": entry.get("progress_percent", 0),
+                "next_task": entry.get("next_task")
+            })
+        logged = len(checkpoints)
+
         # Sort by modification time (most recent first)
         checkpoint_files = sorted(
             self.checkpoint_dir.glob("checkpoint_*.json"),
@@ -274,7 +286,7 @@ class StateManager:
         )
 
         for filepath in checkpoint_files:
-            if len(checkpoints) >= limit:
+            if len(checkpoints) >= logged + limit:
                 break
 
             try:
@@ -301,11 +313,15 @@ class StateManager:
                     "error": str(e)
                 }, "WARNING")
 
-        return checkpoints
+        checkpoints.sort(key=lambda cp: cp.get("timestamp") or "", reverse=True)
+        return checkpoints[:limit]
 
     def clean_old_checkpoints(self, keep_last: int = 10):
         """Remove old checkpoints by modification time, keeping only the most recent.
 
+        Checkpoint logs are removed whole, once none of the ``keep_last``
+        newest checkpoints is in them; logs still being appended to are kept.
+
         Args:
             keep_last: Number of recent checkpoints to keep
         """
@@ -315,6 +331,11 @@ class StateManager:
         if not self.checkpoint_dir.exists():
             return
 
+        for filepath in get_checkpoint_store(self.checkpoint_dir).prune(keep_last):
+            self.logger.log("state", "CHECKPOINT_CLEANED", {
+                "filepath": str(filepath)
+            }, "INFO")
+
         # Sort by modification time (most recent first) to keep the newest checkpoints
         checkpoints = sorted(
             self.checkpoint_dir.glob("checkpoint_*.json"),
@@ -368,8 +389,7 @@ class StateManager:
         logger = get_logger()
 
         try:
-            with open(checkpoint_path, "r") as f:
-                data = json.load(f)
+            data = read_checkpoint(checkpoint_path)
 
             plan = ExecutionPlan.from_dict(data["plan"])
             agent_state = data.get("agent_state", {})
@@ -395,19 +415,26 @@ class StateManager:
 
     @staticmethod
     def find_latest_checkpoint(checkpoint_dir: str = str(config.CHECKPOINTS_DIR)) -> Optional[str]:
-        """Find the most recent checkpoint file by modification time.
+        """Find the most recent checkpoint.
+
+        Reads the checkpoint-store index; only when it has no entries are
+        legacy checkpoint files ranked by modification time.
 
         Args:
             checkpoint_dir: Directory containing checkpoints
 
         Returns:
-            Path to latest checkpoint, or None if no checkpoints found
+            Reference to latest checkpoint, or None if no checkpoints found
         """
         checkpoint_path = Path(checkpoint_dir)
 
         if not checkpoint_path.exists():
             return None
 
+        latest = get_checkpoint_store(checkpoint_path).latest()
+        if latest:
+            return latest
+
         # Sort by modification time (most recent first), not lexicographically
         checkpoints = list(checkpoint_path.glob("checkpoint_*.json"))
 
@@ -433,8 +460,7 @@ class StateManager:
             return
 
         try:
-            with open(checkpoint_path, "r") as f:
-                data = json.load(f)
+            data = read_checkpoint(checkpoint_path)
 
             resume_info = data.get("resume_info", {})
 
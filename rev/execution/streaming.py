@@ -12,6 +12,8 @@ Key components:
 - Non-blocking input handling for concurrent user interaction
 """
 
+import contextvars
+import json
 import threading
 import time
 import sys
@@ -378,6 +380,142 @@ class StreamingExecutionManager:
         self._queue.disable()
 
 
+class StreamingToolPrefetcher:
+    """Start read-only tool calls while the LLM response is still streaming.
+
+    Tool calls detected mid-stream are submitted to a small thread pool when
+    the tool is read-only and still within its budget; the executor later
+    claims the result with ``take`` instead of running the tool again. Write
+    tools are never prefetched, and once any non-prefetchable call appears in
+    the stream nothing after it is prefetched either. The stream parser can
+    miss calls that are only recovered from the final response, so the
+    executor also calls ``invalidate`` when it reaches a non-prefetchable call
+    in the final list; reads ordered after it then run again.
+    """
+
+    def __init__(
+        self,
+        execute: Callable[[str, Dict[str, Any]], str],
+        allowed_tools: Optional[set] = None,
+        max_workers: int = 4,
+        budget: Optional[Dict[str, int]] = None,
+        admit: Optional[Callable[[str, Dict[str, Any]], bool]] = None,
+    ):
+        """Initialize the prefetcher.
+
+        Args:
+            execute: Callable running a tool, e.g. ``execute_tool(name, args)``
+            allowed_tools: Tool names eligible for prefetching (read-only set by default)
+            max_workers: Size of the prefetch thread pool
+            budget: Remaining calls per tool name; tools not listed are unlimited
+            admit: Extra check a call must pass before it is prefetched
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        if allowed_tools is None:
+            from rev.execution.tool_constraints import READ_ONLY_TOOLS
+
+            allowed_tools = READ_ONLY_TOOLS
+        self._execute = execute
+        self._allowed = set(allowed_tools)
+        self._budget = dict(budget or {})
+        self._admit = admit
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rev-prefetch")
+        self._futures: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._barrier = False
+        self.submitted = 0
+        self.claimed = 0
+
+    @staticmethod
+    def _key(name: str, args: Any) -> str:
+        if isinstance(args, str):
+            try:
+                args = json.loads(args)
+            except Exception:
+                return f"{name}:{args}"
+        try:
+            return f"{name}:{json.dumps(args, sort_keys=True, default=str)}"
+        except Exception:
+            return f"{name}:{args}"
+
+    def submit(self, tool_call: Dict[str, Any]) -> bool:
+        """Start a tool call in the background; returns True if it was scheduled."""
+        func = tool_call.get("function", {}) if isinstance(tool_call, dict) else {}
+        name = func.get("name")
+        args = func.get("arguments", {})
+        if self._barrier:
+            return False
+        if name not in self._allowed:
+            self._barrier = True
+            return False
+        if isinstance(args, str):
+            try:
+                args = json.loads(args)
+            except Exception:
+                return False
+        if not isinstance(args, dict):
+            return False
+        if self._admit is not None and not self._admit(name, args):
+            return False
+        key = self._key(name, args)
+        with self._lock:
+            if key in self._futures:
+                return False
+            if name in self._budget:
+                if self._budget[name] <= 0:
+                    return False
+                self._budget[name] -= 1
+            # Run in the submitting task's context so reads count as that task's.
+            context = contextvars.copy_context()
+            self._futures[key] = self._pool.submit(context.run, self._execute, name, dict(args))
+            self.submitted += 1
+        return True
+
+    def can_prefetch(self, name: Optional[str]) -> bool:
+        """Return True if calls to ``name`` are eligible for prefetching."""
+        return name in self._allowed
+
+    def invalidate(self) -> None:
+        """Discard all unclaimed results, waiting for reads still in flight.
+
+        Called before a write runs so that no read started ahead of it is served
+        afterwards, and none is still running while it executes.
+        """
+        with self._lock:
+            futures = list(self._futures.values())
+            self._futures.clear()
+        for future in futures:
+            if not future.cancel():
+                try:
+                    future.result()
+                except Exception:
+                    pass
+
+    def take(self, name: str, args: Any, timeout: Optional[float] = None) -> Optional[str]:
+        """Return the prefetched result for ``name(args)``, or None if not prefetched."""
+        key = self._key(name, args)
+        with self._lock:
+            future = self._futures.pop(key, None)
+        if future is None:
+            return None
+        try:
+            result = future.result(timeout=timeout)
+        except Exception:
+            return None
+        self.claimed += 1
+        return result
+
+    def shutdown(self) -> None:
+        """Cancel unclaimed work and release the pool."""
+        with self._lock:
+            futures = list(self._futures.values())
+            self._futures.clear()
+        for future in futures:
+            future.cancel()
+        self._pool.shutdown(wait=False)
+
+
 # Singleton instance for global access
 _streaming_manager: Optional[StreamingExecutionManager] = None
 _input_reader: Optional[NonBlockingInputReader] = None
@@ -36,6 +36,24 @@ WRITE_TOOLS: Set[str] = {
     "remove_unused_imports",
 }
 
+# Tools without side effects; safe to run speculatively or out of order.
+READ_ONLY_TOOLS: Set[str] = {
+    "read_file",
+    "read_file_lines",
+    "read_tool_output",
+    "list_dir",
+    "tree_view",
+    "search_code",
+    "search_code_multi",
+    "get_file_info",
+    "file_exists",
+    "find_symbol_usages",
+    "analyze_code_context",
+    "git_diff",
+    "git_status",
+    "git_log",
+}
+
 
 def allowed_tools_for_action(action_type: Optional[str]) -> Optional[Set[str]]:
     """Return the allowed tool names for a given action type.
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Structure-aware reducers for tool outputs.
+
+A reducer turns a raw (JSON) tool result into a compact text rendering that
+keeps what the model acts on and drops the rest:
+
+- ``run_tests`` / ``run_cmd``: pytest and jest output collapsed to the
+  failures and the run summary
+- ``search_code``: matches grouped by file, identical lines folded
+- ``git_diff``: full hunks only for files the task touches, a stat line for
+  the others
+- ``list_dir``: a compact tree
+
+The full output is always persisted as an artifact before reduction, so the
+reduced text only needs to carry its reference. Reducers return ``None``
+when they do not recognize the output; the compression policy then falls
+back to its default handling.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from rev import config
+
+
+Reducer = Callable[[Dict[str, Any], Dict[str, Any], Sequence[str]], Optional[str]]
+
+_REDUCERS: Dict[str, Reducer] = {}
+
+_ANSI_RE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+_MAX_LINE_CHARS = 200
+
+
+def register_reducer(tool: str, reducer: Reducer) -> None:
+    """Register ``reducer`` for ``tool`` (replaces any existing one)."""
+    _REDUCERS[tool.lower()] = reducer
+
+
+def has_reducer(tool: str) -> bool:
+    return (tool or "").lower() in _REDUCERS
+
+
+def reduce_tool_output(
+    tool: str,
+    output: str,
+    args: Optional[Dict[str, Any]] = None,
+    paths: Sequence[str] = (),
+    max_chars: int = 4000,
+) -> Optional[str]:
+    """Reduced rendering of ``output``, or ``None`` when no reducer applies."""
+    reducer = _REDUCERS.get((tool or "").lower())
+    if reducer is None or not output:
+        return None
+    try:
+        payload = json.loads(output)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get("error"):
+        return None
+    try:
+        reduced = reducer(payload, args if isinstance(args, dict) else {}, paths)
+    except Exception:
+        return None
+    if reduced is None:
+        return None
+    if len(reduced) > max_chars:
+        reduced = reduced[:max_chars].rsplit("\n", 1)[0] + "\n...[reduced output truncated]..."
+    return reduced
+
+
+def _clip(line: str) -> str:
+    line = line.rstrip()
+    return line if len(line) <= _MAX_LINE_CHARS else line[:_MAX_LINE_CHARS] + "..."
+
+
+# ---------------------------------------------------------------------------
+# Task paths
+# ---------------------------------------------------------------------------
+
+_FILE_RE = re.compile(r"[\w./\\-]+\.[A-Za-z0-9]{1,8}\b")
+
+
+def normalize_path(path: str) -> str:
+    text = str(path).strip().strip("`'\"").replace("\\", "/")
+    try:
+        candidate = Path(text)
+        if candidate.is_absolute():
+            text = candidate.resolve().relative_to(config.ROOT.resolve()).as_posix()
+    except (ValueError, OSError):
+        pass
+    while text.startswith("./"):
+        text = text[2:]
+    return text
+
+
+def task_paths(task: Any) -> List[str]:
+    """Files a task is about: named in its description, its impact scope or its tool calls."""
+    if task is None:
+        return []
+    found: List[str] = list(_FILE_RE.findall(getattr(task, "description", "") or ""))
+    found.extend(str(p) for p in getattr(task, "impact_scope", None) or [])
+    for event in getattr(task, "tool_events", None) or []:
+        args = event.get("args") if isinstance(event, dict) else None
+        if isinstance(args, dict):
+            for key in ("path", "file_path", "target"):
+                if isinstance(args.get(key), str):
+                    found.append(args[key])
+    return list(dict.fromkeys(p for p in (normalize_path(p) for p in found) if p))
+
+
+def _matches_any(path: str, paths: Iterable[str]) -> bool:
+    for wanted in paths:
+        if path == wanted or path.endswith("/" + wanted) or wanted.endswith("/" + path):
+            return True
+    return False
+
+
+# ---------------------------------------------------------------------------
+# Test runners
+# ---------------------------------------------------------------------------
+
+_PYTEST_SECTION_RE = re.compile(r"^=+ (.+?) =+$")
+_PYTEST_SECTIONS = {"test session starts", "failures", "errors", "short test summary info"}
+_PYTEST_BLOCK_RE = re.compile(r"^_{3,} (.+?) _{3,}$")
+_PYTEST_LOCATION_RE = re.compile(r"^\S+:\d+: \w")
+_PYTEST_TOTALS_RE = re.compile(r"^=*\s*((?:\d+ \w+(?:, )?)+ in [\d.]+s\b.*?|no tests ran\b.*?)\s*=*$")
+_JEST_TOTALS_RE = re.compile(r"^(Test Suites|Tests):\s+")
+_JEST_CODE_FRAME_RE = re.compile(r"^\s*(>\s*)?\d*\s*\|")
+
+_MAX_FAILURES = 15
+_MAX_FAILURE_LINES = 8
+_MAX_SUMMARY_LINES = 30
+
+
+def _reduce_pytest(lines: List[str]) -> Optional[str]:
+    section = ""
+    totals = ""
+    short_summary: List[str] = []
+    failures: List[Tuple[str, List[str]]] = []
+    recognized = False
+
+    for line in lines:
+        header = _PYTEST_SECTION_RE.match(line)
+        if header:
+            section = header.group(1).lower()
+            # Other tools print "=== ... ===" banners too; only pytest's own sections count.
+            if section in _PYTEST_SECTIONS:
+                recognized = True
+            totals_match = _PYTEST_TOTALS_RE.match(line)
+            if totals_match:
+                recognized = True
+                totals = totals_match.group(1)
+            continue
+        totals_match = _PYTEST_TOTALS_RE.match(line)
+        if totals_match:
+            recognized = True
+            totals = totals_match.group(1)
+            continue
+        if section in {"failures", "errors"}:
+            block = _PYTEST_BLOCK_RE.match(line)
+            if block:
+                failures.append((block.group(1), []))
+            elif failures and (line.startswith((">", "E ")) or _PYTEST_LOCATION_RE.match(line)):
+                failures[-1][1].append(line)
+        elif section == "short test summary info" and line.strip():
+            short_summary.append(line)
+
+    if not recognized:
+        return None
+
+    out = [f"pytest: {totals or 'no summary line'}"]
+    out.extend(_clip(line) for line in short_summary[:_MAX_SUMMARY_LINES])
+    if len(short_summary) > _MAX_SUMMARY_LINES:
+        out.append(f"... {len(short_summary) - _MAX_SUMMARY_LINES} more")
+    for title, body in failures[:_MAX_FAILURES]:
+        locations = [line for line in body if _PYTEST_LOCATION_RE.match(line)]
+        detail = [line for line in body if not _PYTEST_LOCATION_RE.match(line)]
+        out.append("")
+        out.append(f"{title} ({locations[-1]})" if locations else title)
+        out.extend(_clip(line) for line in detail[:_MAX_FAILURE_LINES])
+        if len(detail) > _MAX_FAILURE_LINES:
+            out.append(f"  ... {len(detail) - _MAX_FAILURE_LINES} more lines")
+    if len(failures) > _MAX_FAILURES:
+        out.append(f"\n... {len(failures) - _MAX_FAILURES} more failures")
+    return "\n".join(out)
+
+
+def _reduce_jest(lines: List[str]) -> Optional[str]:
+    totals = [" ".join(line.split()) for line in lines if _JEST_TOTALS_RE.match(line.strip())]
+    if not totals:
+        return None
+
+    failed_files = [line.strip() for line in lines if line.strip().startswith("FAIL ")]
+    failures: List[Tuple[str, List[str]]] = []
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith("● ") and stripped != "● Console":
+            failures.append((stripped, []))
+        elif failures and stripped and not _JEST_TOTALS_RE.match(stripped):
+            if stripped.startswith(("FAIL ", "PASS ", "Snapshots:", "Time:", "Ran all")):
+                continue
+            if _JEST_CODE_FRAME_RE.match(line):
+                continue
+            body = failures[-1][1]
+            if stripped.startswith("at ") and any(b.startswith("at ") for b in body):
+                continue
+            body.append(stripped)
+
+    out = [f"jest: {' | '.join(totals)}"]
+    out.extend(failed_files[:_MAX_SUMMARY_LINES])
+    for title, body in failures[:_MAX_FAILURES]:
+        out.append("")
+        out.append(_clip(title))
+        out.extend(f"  {_clip(line)}" for line in body[:_MAX_FAILURE_LINES])
+        if len(body) > _MAX_FAILURE_LINES:
+            out.append(f"  ... {len(body) - _MAX_FAILURE_LINES} more lines")
+    if len(failures) > _MAX_FAILURES:
+        out.append(f"\n... {len(failures) - _MAX_FAILURES} more failures")
+    return "\n".join(out)
+
+
+def reduce_test_output(payload: Dict[str, Any], args: Dict[str, Any], paths: Sequence[str]) -> Optional[str]:
+    """Failures plus run summary for pytest or jest output."""
+    text = "\n".join(str(payload.get(key) or "") for key in ("stdout", "stderr"))
+    lines = _ANSI_RE.sub("", text).splitlines()
+    body = _reduce_pytest(lines) or _reduce_jest(lines)
+    if body is None:
+        return None
+    cmd = payload.get("cmd") or args.get("cmd") or args.get("command") or ""
+    if isinstance(cmd, list):
+        cmd = " ".join(str(part) for part in cmd)
+    header = f"rc={payload.get('rc')}" + (f" cmd: {_clip(str(cmd))}" if cmd else "")
+    if payload.get("timeout") or payload.get("timed_out"):
+        header += " (timed out)"
+    return f"{header}\n{body}"
+
+
+# ---------------------------------------------------------------------------
+# search_code
+# ---------------------------------------------------------------------------
+
+def reduce_search_results(payload: Dict[str, Any], args: Dict[str, Any], paths: Sequence[str]) -> Optional[str]:
+    """Matches grouped by file; identical lines within a file share one entry."""
+    matches = payload.get("matches")
+    if not isinstance(matches, list):
+        return None
+    by_file: "OrderedDict[str, OrderedDict[str, List[str]]]" = OrderedDict()
+    for match in matches:
+        if not isinstance(match, dict):
+            continue
+        lines = by_file.setdefault(str(match.get("file", "?")), OrderedDict())
+        lines.setdefault(_clip(str(match.get("text", "")).strip()), []).append(str(match.get("line", "?")))
+
+    truncated = " (truncated)" if payload.get("truncated") else ""
+    out = [f"{len(matches)} matches in {len(by_file)} files{truncated}"]
+    for file, lines in by_file.items():
+        out.append(f"{file}:")
+        for text, numbers in lines.items():
+            out.append(f"  {','.join(numbers)}: {text}")
+    return "\n".join(out)
+
+
+# ---------------------------------------------------------------------------
+# git_diff
+# ---------------------------------------------------------------------------
+
+_DIFF_FILE_RE = re.compile(r"^diff --git a/(.+?) b/(.+)$")
+_MAX_DIFF_LINES = 200
+
+
+def _split_diff(diff: str) -> List[Tuple[str, List[str]]]:
+    files: List[Tuple[str, List[str]]] = []
+    for line in diff.splitlines():
+        header = _DIFF_FILE_RE.match(line)
+        if header:
+            files.append((header.group(2), [line]))
+        elif files:
+            files[-1][1].append(line)
+    return files
+
+
+def _diff_stat(path: str, lines: List[str]) -> str:
+    added = sum(1 for line in lines if line.startswith("+") and not line.startswith("+++"))
+    removed = sum(1 for line in lines if line.startswith("-") and not line.startswith("---"))
+    hunks = sum(1 for line in lines if line.startswith("@@"))
+    return f"{path} (+{added} -{removed}, {hunks} hunks)"
+
+
+def reduce_git_diff(payload: Dict[str, Any], args: Dict[str, Any], paths: Sequence[str]) -> Optional[str]:
+    """Hunks of the files the task touches; a stat line for every other file."""
+    diff = payload.get("diff")
+    if not isinstance(diff, str):
+        return None
+    files = _split_diff(diff)
+    if not files:
+        return "git diff: no changes" if not diff.strip() else None
+
+    relevant = [entry for entry in files if _matches_any(entry[0], paths)] if paths else []
+    shown = {path for path, _ in (relevant or files)}
+    out = [f"git diff: {len(files)} files changed"]
+    budget = _MAX_DIFF_LINES
+    omitted: List[str] = []
+    for path, lines in files:
+        if path not in shown or budget <= 0:
+            omitted.append(_diff_stat(path, lines))
+            continue
+        hunk_lines = [line for line in lines if not line.startswith(("diff --git", "index "))]
+        out.extend(_clip(line) for line in hunk_lines[:budget])
+        if len(hunk_lines) > budget:
+            out.append(f"... {len(hunk_lines) - budget} more diff lines in {path}")
+        budget -= len(hunk_lines)
+    if omitted:
+        label = "other files" if relevant else "not shown"
+        out.append(f"{label}: " + "; ".join(omitted))
+    return "\n".join(out)
+
+
+# ---------------------------------------------------------------------------
+# list_dir
+# ---------------------------------------------------------------------------
+
+_MAX_TREE_LINES = 150
+
+
+def reduce_listing(payload: Dict[str, Any], args: Dict[str, Any], paths: Sequence[str]) -> Optional[str]:
+    """Directory listing as an indented tree, with each directory's files on one line."""
+    files = payload.get("files")
+    if not isinstance(files, list):
+        return None
+    entries = sorted({str(f).strip("/") for f in files if str(f).strip("/")})
+    directories = {entry.rsplit("/", 1)[0] for entry in entries if "/" in entry}
+    directories.update(parent for d in list(directories) for parent in _parents(d))
+
+    children: Dict[str, List[str]] = {}
+    for entry in entries:
+        if entry in directories:
+            continue
+        parent, _, name = entry.rpartition("/")
+        children.setdefault(parent, []).append(name)
+
+    out = [f"{payload.get('count', len(entries))} entries"]
+    if children.get(""):
+        out.append(", ".join(children[""]))
+    for directory in sorted(directories, key=lambda d: d.split("/")):
+        depth = directory.count("/")
+        out.append(f"{'  ' * depth}{directory.rsplit('/', 1)[-1]}/")
+        if children.get(directory):
+            out.append(f"{'  ' * (depth + 1)}{', '.join(children[directory])}")
+    if len(out) > _MAX_TREE_LINES:
+        out = out[:_MAX_TREE_LINES] + [f"... {len(out) - _MAX_TREE_LINES} more lines"]
+    return "\n".join(out)
+
+
+def _parents(directory: str) -> List[str]:
+    parts = directory.split("/")
+    return ["/".join(parts[:i]) for i in range(1, len(parts))]
+
+
+register_reducer("run_tests", reduce_test_output)
+register_reducer("run_cmd", reduce_test_output)
+register_reducer("search_code", reduce_search_results)
+register_reducer("git_diff", reduce_git_diff)
+register_reducer("list_dir", reduce_listing)
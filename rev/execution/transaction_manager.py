@@ -4,22 +4,75 @@
 
 Implements MACI's transactional memory pattern for agent coordination.
 Every tool action is tracked, and changes are rolled back if verification fails.
+
+File backups are content-addressed: each file version is stored once as a
+blob under ``tx_backups/blobs`` (a copy-on-write clone where the filesystem
+supports it) and hard-linked into the transaction's backup directory, so
+unchanged files are not copied again by later transactions. The JSONL log
+has an offset index next to it (``<log>.idx``), so lookups by id and recent
+history read only the records they return.
 """
 
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 from enum import Enum
 import json
 import hashlib
+import os
 import shutil
 import subprocess
+import sys
+import time
 from datetime import datetime
 import uuid
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from rev import config
 from rev.tools.command_runner import run_command_safe
 
 
+# Linux ioctl that makes dst share src's extents (btrfs, XFS, bcachefs, ...).
+_FICLONE = 0x40049409
+
+# Digests of files modified this recently are not cached: a second write
+# within the filesystem's timestamp granularity would leave the stat unchanged.
+_RACY_WINDOW_NS = 2_000_000_000
+
+# Paths per "git checkout" invocation, to stay well below argv limits.
+_GIT_CHECKOUT_BATCH = 200
+
+
+def _clone_file(src: Path, dst: Path) -> None:
+    """Copy ``src`` to ``dst`` (with metadata), as a reflink where supported."""
+    if fcntl is not None and sys.platform.startswith("linux"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
+
+def _sha256_file(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def _stat_key(st: os.stat_result) -> Tuple[int, int, int, int]:
+    return (st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+
+
 class TransactionStatus(Enum):
     """Status of a transaction."""
     ACTIVE = "active"
@@ -118,6 +171,133 @@ class Transaction:
         )
 
 
+class _LogIndex:
+    """Byte offset and length of each transaction's latest record in the JSONL log.
+
+    Persisted as ``<tx_id> <offset> <length>`` lines in ``<log>.idx``. Records
+    appended by other writers are indexed by scanning from the last indexed
+    byte; an index that no longer matches the log is rebuilt.
+    """
+
+    def __init__(self, log_file: Path):
+        self.log_file = log_file
+        self.index_file = log_file.with_name(log_file.name + ".idx")
+        # Ordered by latest write, like the log itself
+        self.entries: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+        self.end = 0
+        self._loaded = False
+
+    def _add(self, tx_id: str, offset: int, length: int):
+        self.entries.pop(tx_id, None)
+        self.entries[tx_id] = (offset, length)
+        self.end = max(self.end, offset + length)
+
+    def _persist(self, items: List[Tuple[str, int, int]]):
+        try:
+            with open(self.index_file, "a") as f:
+                f.writelines(f"{tx_id} {offset} {length}\n" for tx_id, offset, length in items)
+        except OSError:
+            pass  # The index is rebuilt from the log when missing
+
+    def _reset(self):
+        self.entries.clear()
+        self.end = 0
+        try:
+            self.index_file.unlink()
+        except OSError:
+            pass
+
+    def _load(self):
+        self._loaded = True
+        try:
+            with open(self.index_file, "r") as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) == 3 and parts[1].isdigit() and parts[2].isdigit():
+                        self._add(parts[0], int(parts[1]), int(parts[2]))
+        except OSError:
+            return
+        if not self.entries:
+            return
+        try:
+            size = self.log_file.stat().st_size
+        except OSError:
+            size = 0
+        last = next(reversed(self.entries))
+        if size < self.end or not self._read_one(last):
+            # Log truncated or replaced since the index was written
+            self._reset()
+
+    def refresh(self):
+        """Index records appended to the log since the last call."""
+        if not self._loaded:
+            self._load()
+        try:
+            size = self.log_file.stat().st_size
+        except OSError:
+            size = 0
+        if size < self.end:
+            self._reset()
+        if size == self.end:
+            return
+
+        added = []
+        with open(self.log_file, "rb") as f:
+            f.seek(self.end)
+            offset = self.end
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # Partially written record
+                try:
+                    tx_id = json.loads(raw)["tx_id"]
+                except (ValueError, KeyError, TypeError):
+                    tx_id = None
+                if isinstance(tx_id, str) and tx_id:
+                    added.append((tx_id, offset, len(raw)))
+                offset += len(raw)
+        for item in added:
+            self._add(*item)
+        self.end = offset
+        self._persist(added)
+
+    def append(self, tx_id: str, offset: int, length: int):
+        """Index a record just written at ``offset``."""
+        if not self._loaded or offset != self.end:
+            self.refresh()
+            return
+        self._add(tx_id, offset, length)
+        self._persist([(tx_id, offset, length)])
+
+    def _read_one(self, tx_id: str) -> Optional[Dict[str, Any]]:
+        records = self._read([tx_id])
+        return records[0] if records else None
+
+    def _read(self, tx_ids: List[str]) -> List[Dict[str, Any]]:
+        records = []
+        with open(self.log_file, "rb") as f:
+            for tx_id in tx_ids:
+                offset, length = self.entries[tx_id]
+                f.seek(offset)
+                try:
+                    data = json.loads(f.read(length))
+                except ValueError:
+                    continue
+                if isinstance(data, dict) and data.get("tx_id") == tx_id:
+                    records.append(data)
+        return records
+
+    def read(self, tx_ids: List[str]) -> List[Dict[str, Any]]:
+        """Latest records of ``tx_ids`` (unknown ids are skipped)."""
+        tx_ids = [tx_id for tx_id in tx_ids if tx_id in self.entries]
+        records = self._read(tx_ids)
+        if len(records) != len(tx_ids):
+            # Stale offsets (e.g. a concurrent writer): rebuild and read again
+            self._reset()
+            self.refresh()
+            records = self._read([tx_id for tx_id in tx_ids if tx_id in self.entries])
+        return records
+
+
 class TransactionManager:
     """Manages transactions with automatic rollback on failure."""
 
@@ -134,9 +314,14 @@ class TransactionManager:
         self.current_transaction: Optional[Transaction] = None
         self._backup_dir = workspace_root / ".rev" / "tx_backups"
         self._backup_dir.mkdir(parents=True, exist_ok=True)
+        self._blob_dir = self._backup_dir / "blobs"
+        self._blobs_added = False
+        # str(path) -> (stat key, sha256) for files not modified since hashing
+        self._digests: Dict[str, Tuple[Tuple[int, int, int, int], str]] = {}
 
         # Ensure log file directory exists
         self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        self._log_index = _LogIndex(self.log_file)
 
     def begin(self, task_id: Optional[str] = None, rollback_method: RollbackMethod = RollbackMethod.FILE_RESTORE) -> Transaction:
         """
@@ -250,6 +435,7 @@ class TransactionManager:
             backup_dir = Path(self.current_transaction.rollback_data.get("backup_dir", ""))
             if backup_dir.exists():
                 shutil.rmtree(backup_dir, ignore_errors=True)
+            self._prune_blobs()
 
         self._log_transaction(self.current_transaction)
 
@@ -291,7 +477,12 @@ class TransactionManager:
         return transaction
 
     def _backup_files(self, files: List[str], tx_id: str):
-        """Backup files before modification."""
+        """Backup files before modification.
+
+        Backups are hard links to content-addressed blobs. Only the first
+        backup of a file in a transaction is kept, so rollback restores the
+        content from before the transaction.
+        """
         backup_dir = self._backup_dir / tx_id
         backup_dir.mkdir(parents=True, exist_ok=True)
 
@@ -305,14 +496,110 @@ class TransactionManager:
             relative_path = Path(file_path)
             backup_path = backup_dir / relative_path
 
+            if backup_path.exists():
+                continue
+
             backup_path.parent.mkdir(parents=True, exist_ok=True)
 
             try:
-                shutil.copy2(full_path, backup_path)
+                blob = self._store_blob(full_path)
+                try:
+                    os.link(blob, backup_path)
+                except OSError:
+                    _clone_file(blob, backup_path)
             except Exception as e:
                 # Log but don't fail - backup is best-effort
                 print(f"Warning: Failed to backup {file_path}: {e}")
 
+    def _blob_path(self, digest: str) -> Path:
+        return self._blob_dir / digest[:2] / digest
+
+    def _cached_digest(self, path: Path, st: os.stat_result) -> Optional[str]:
+        entry = self._digests.get(str(path))
+        if entry and entry[0] == _stat_key(st):
+            return entry[1]
+        return None
+
+    def _remember_digest(self, path: Path, st: os.stat_result, digest: str):
+        """Cache ``digest`` for ``path`` if it is unchanged since ``st`` and not racily new."""
+        try:
+            current = path.stat()
+        except OSError:
+            return
+        if _stat_key(current) == _stat_key(st) and time.time_ns() - st.st_mtime_ns > _RACY_WINDOW_NS:
+            self._digests[str(path)] = (_stat_key(st), digest)
+
+    def _file_digest(self, path: Path) -> str:
+        """SHA-256 of a file's content, reusing the digest while its stat is unchanged."""
+        st = path.stat()
+        digest = self._cached_digest(path, st)
+        if digest is None:
+            digest = _sha256_file(path)
+            self._remember_digest(path, st, digest)
+        return digest
+
+    def _store_blob(self, path: Path) -> Path:
+        """Store the current content of ``path`` as a blob and return the blob's path.
+
+        A file whose stat matches an already-stored version is not read at
+        all; otherwise it is cloned first and the clone is hashed, so the
+        blob matches its name even if the file changes meanwhile.
+        """
+        st = path.stat()
+        digest = self._cached_digest(path, st)
+        if digest:
+            blob = self._blob_path(digest)
+            try:
+                # atime tracks use for pruning; mtime is the backed-up file's
+                os.utime(blob, ns=(time.time_ns(), blob.stat().st_mtime_ns))
+                return blob
+            except OSError:
+                pass
+
+        self._blob_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self._blob_dir / f".tmp_{uuid.uuid4().hex}"
+        try:
+            _clone_file(path, tmp)
+            digest = _sha256_file(tmp)
+            blob = self._blob_path(digest)
+            if not blob.exists():
+                blob.parent.mkdir(exist_ok=True)
+                os.replace(tmp, blob)
+                self._blobs_added = True
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+        self._remember_digest(path, st, digest)
+        return blob
+
+    def _prune_blobs(self):
+        """Delete unreferenced blobs, least recently used first, beyond ``config.TX_BLOB_CACHE_MB``."""
+        if not self._blobs_added:
+            return
+        self._blobs_added = False
+
+        budget = config.TX_BLOB_CACHE_MB * 1024 * 1024
+        unreferenced = []
+        total = 0
+        for blob in self._blob_dir.glob("*/*"):
+            try:
+                st = blob.stat()
+            except OSError:
+                continue
+            if st.st_nlink > 1:
+                continue  # Still linked from a transaction's backup directory
+            unreferenced.append((st.st_atime_ns, st.st_size, blob))
+            total += st.st_size
+
+        for _, size, blob in sorted(unreferenced):
+            if total <= budget:
+                break
+            try:
+                blob.unlink()
+                total -= size
+            except OSError:
+                pass
+
     def _rollback(self, transaction: Transaction):
         """Perform rollback based on transaction's rollback method."""
         if transaction.rollback_method == RollbackMethod.GIT_CHECKOUT:
@@ -332,16 +619,32 @@ class TransactionManager:
         if not affected_files:
             return
 
-        # Checkout each file from git
-        for file_path in affected_files:
+        # Checkout files from git in batches
+        files = sorted(affected_files)
+        for start in range(0, len(files), _GIT_CHECKOUT_BATCH):
+            batch = files[start:start + _GIT_CHECKOUT_BATCH]
             try:
-                run_command_safe(
-                    ["git", "checkout", ref, "--", file_path],
+                result = run_command_safe(
+                    ["git", "checkout", ref, "--", *batch],
                     cwd=self.workspace_root,
                     timeout=30
                 )
-            except Exception as e:
-                print(f"Warning: Failed to rollback {file_path}: {e}")
+                if result.get("rc") == 0:
+                    continue
+            except Exception:
+                pass
+
+            # One unknown path (e.g. a file created in this transaction) fails
+            # the whole batch; retry file by file so the others are restored.
+            for file_path in batch:
+                try:
+                    run_command_safe(
+                        ["git", "checkout", ref, "--", file_path],
+                        cwd=self.workspace_root,
+                        timeout=30
+                    )
+                except Exception as e:
+                    print(f"Warning: Failed to rollback {file_path}: {e}")
 
     def _rollback_file_restore(self, transaction: Transaction):
         """Rollback using file backups."""
@@ -352,8 +655,12 @@ class TransactionManager:
             return
 
         # Restore each backed up file
+        restored = set()
         for action in transaction.actions:
             for file_path in action.files:
+                if file_path in restored:
+                    continue
+                restored.add(file_path)
                 backup_path = backup_dir / file_path
                 full_path = self.workspace_root / file_path
 
@@ -363,12 +670,13 @@ class TransactionManager:
                 try:
                     # Restore file from backup
                     full_path.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(backup_path, full_path)
+                    _clone_file(backup_path, full_path)
                 except Exception as e:
                     print(f"Warning: Failed to restore {file_path}: {e}")
 
         # Clean up backup directory
         shutil.rmtree(backup_dir, ignore_errors=True)
+        self._prune_blobs()
 
     def _prepare_git_rollback(self) -> Dict[str, Any]:
         """Prepare git rollback data."""
@@ -399,7 +707,7 @@ class TransactionManager:
             }
 
     def _compute_hash(self, files: List[str]) -> str:
-        """Compute combined hash of files."""
+        """Compute combined hash of files (over their per-file SHA-256 digests)."""
         if not files:
             return ""
 
@@ -413,8 +721,7 @@ class TransactionManager:
                 continue
 
             try:
-                with open(full_path, "rb") as f:
-                    hasher.update(f.read())
+                hasher.update(self._file_digest(full_path).encode())
             except Exception:
                 hasher.update(b"<read_error>")
 
@@ -423,8 +730,11 @@ class TransactionManager:
     def _log_transaction(self, transaction: Transaction):
         """Log transaction to JSONL file."""
         try:
-            with open(self.log_file, "a") as f:
-                f.write(json.dumps(transaction.to_dict()) + "\n")
+            line = (json.dumps(transaction.to_dict()) + "\n").encode("utf-8")
+            with open(self.log_file, "ab") as f:
+                offset = f.seek(0, os.SEEK_END)
+                f.write(line)
+            self._log_index.append(transaction.tx_id, offset, len(line))
         except Exception as e:
             print(f"Warning: Failed to log transaction: {e}")
 
@@ -441,36 +751,23 @@ class TransactionManager:
         if not self.log_file.exists():
             return []
 
-        # Use OrderedDict to preserve order while deduplicating
-        from collections import OrderedDict
-        tx_by_id = OrderedDict()
-
         try:
-            with open(self.log_file, "r") as f:
-                for line in f:
-                    if not line.strip():
-                        continue
-                    try:
-                        data = json.loads(line)
-                        transaction = Transaction.from_dict(data)
-                        # Update existing entry (last write wins)
-                        if transaction.tx_id in tx_by_id:
-                            del tx_by_id[transaction.tx_id]
-                        tx_by_id[transaction.tx_id] = transaction
-                    except json.JSONDecodeError:
-                        continue
+            self._log_index.refresh()
+            # Index is ordered by latest write (last write wins); most recent first
+            tx_ids = list(reversed(self._log_index.entries))
+            if limit:
+                tx_ids = tx_ids[:limit]
+            records = self._log_index.read(tx_ids)
         except Exception as e:
             print(f"Warning: Failed to read transaction log: {e}")
             return []
 
-        # Convert to list (already in chronological order)
-        transactions = list(tx_by_id.values())
-
-        # Reverse to get most recent first
-        transactions.reverse()
-
-        if limit:
-            transactions = transactions[:limit]
+        transactions = []
+        for data in records:
+            try:
+                transactions.append(Transaction.from_dict(data))
+            except (KeyError, ValueError):
+                continue
 
         return transactions
 
@@ -484,13 +781,16 @@ class TransactionManager:
         Returns:
             Transaction object or None if not found
         """
-        transactions = self.get_transaction_history()
-
-        for tx in transactions:
-            if tx.tx_id == tx_id:
-                return tx
+        if not self.log_file.exists():
+            return None
 
-        return None
+        try:
+            self._log_index.refresh()
+            records = self._log_index.read([tx_id])
+            return Transaction.from_dict(records[0]) if records else None
+        except Exception as e:
+            print(f"Warning: Failed to read transaction log: {e}")
+            return None
 
     def get_statistics(self) -> Dict[str, Any]:
         """
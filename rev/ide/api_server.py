@@ -27,6 +27,7 @@ except ImportError:
 
 from ..execution.orchestrator import Orchestrator, OrchestratorConfig
 from .. import config as rev_config
+from .task_pool import CANCELLED, COMPLETED, FAILED, PoolTask, TaskPool, TaskQueueFull
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +48,81 @@ def _sanitize_payload(payload: Any) -> Any:
     return payload
 
 
+# Settings a client may override per task, with their allowed values (a
+# tuple of choices, or the required type). These only shape how a task
+# runs; endpoints, credentials and safety limits stay under server control.
+_OVERRIDABLE_CONFIG: Dict[str, Any] = {
+    'EXECUTION_MODE': ('linear', 'sub-agent'),
+    'RESEARCH_DEPTH_DEFAULT': ('off', 'shallow', 'medium', 'deep'),
+    'VALIDATION_MODE_DEFAULT': ('none', 'smoke', 'targeted', 'full'),
+    'REVIEW_STRICTNESS_DEFAULT': ('lenient', 'moderate', 'strict'),
+    'VERIFICATION_STRICTNESS': ('lenient', 'moderate', 'strict'),
+    'LLM_THINKING_MODE': ('auto', 'off'),
+    'TEMPERATURE': float,
+    'OLLAMA_TEMPERATURE': float,
+    'RESEARCH_PARALLEL': bool,
+    'TDD_ENABLED': bool,
+    'STREAMING_TOOL_PREFETCH_ENABLED': bool,
+    'TOOL_SCHEMA_PRUNING_ENABLED': bool,
+}
+
+
+class InvalidRequestError(ValueError):
+    """A task request carried a field the server cannot accept (HTTP 400)."""
+
+
+class ConfigOverrideError(InvalidRequestError):
+    """A request asked to override a setting clients may not change."""
+
+
+def _task_priority(data: Dict[str, Any]) -> int:
+    """Queue priority of a task request (0 when omitted).
+
+    Raises:
+        InvalidRequestError: If ``priority`` is not an integer.
+    """
+    raw = data.get('priority')
+    if raw is None or raw == '':
+        return 0
+    if isinstance(raw, bool):
+        raise InvalidRequestError(f"Invalid priority: {raw!r}")
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        raise InvalidRequestError(f"Invalid priority: {raw!r}") from None
+
+
+def _config_overrides(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Per-task config overrides, restricted to ``_OVERRIDABLE_CONFIG``.
+
+    Raises:
+        ConfigOverrideError: For any other key or an invalid value.
+    """
+    overrides: Dict[str, Any] = {}
+    raw = data.get('config')
+    if raw is not None and not isinstance(raw, dict):
+        raise ConfigOverrideError("'config' must be an object")
+    for key, value in (raw or {}).items():
+        allowed = _OVERRIDABLE_CONFIG.get(key)
+        if allowed is None:
+            raise ConfigOverrideError(f"Config override not allowed: {key}")
+        if isinstance(allowed, tuple):
+            valid = value in allowed
+        elif allowed is float:
+            valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+            value = float(value) if valid else value
+        else:
+            valid = isinstance(value, allowed)
+        if not valid:
+            raise ConfigOverrideError(f"Invalid value for {key}: {value!r}")
+        overrides[key] = value
+    model = data.get('model')
+    if isinstance(model, str) and model.strip():
+        for key in ('EXECUTION_MODEL', 'PLANNING_MODEL', 'RESEARCH_MODEL'):
+            overrides[key] = model.strip()
+    return overrides
+
+
 class RevAPIServer:
     """HTTP/JSON-RPC API server for IDE integration"""
 
@@ -66,7 +142,11 @@ class RevAPIServer:
         self.app = web.Application()
         self.orchestrator = None
         self.active_tasks: Dict[str, Any] = {}
+        # Guards active_tasks for pool updates applied off the event loop
+        # (before the server starts or after it stops).
+        self._active_tasks_lock = threading.Lock()
         self._task_futures: Dict[str, asyncio.Task] = {}
+        self._task_pool: Optional[TaskPool] = None
         self.websockets: List[web.WebSocketResponse] = []
         self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._shutdown_event: Optional[asyncio.Event] = None
@@ -90,6 +170,7 @@ class RevAPIServer:
         self.app.router.add_post('/api/v1/document', self.handle_document)
         self.app.router.add_get('/api/v1/status/{task_id}', self.handle_status)
         self.app.router.add_get('/api/v1/tasks', self.handle_list_tasks)
+        self.app.router.add_get('/api/v1/pool', self.handle_pool_status)
         self.app.router.add_delete('/api/v1/task/{task_id}', self.handle_cancel_task)
         self.app.router.add_get('/api/v1/models', self.handle_list_models)
         self.app.router.add_get('/api/v1/models/current', self.handle_get_current_model)
@@ -110,7 +191,81 @@ class RevAPIServer:
             )
         return self.orchestrator
 
-    def _maybe_set_workspace(self, cwd: Optional[str], file_path: Optional[str]) -> None:
+    def _use_task_pool(self) -> bool:
+        return bool(getattr(rev_config, "IDE_TASK_POOL_ENABLED", False))
+
+    def _get_task_pool(self) -> TaskPool:
+        """Get or create the process pool that runs submitted tasks."""
+        if self._task_pool is None:
+            self._task_pool = TaskPool(
+                max_workers=getattr(rev_config, "IDE_TASK_POOL_WORKERS", 2),
+                max_queue=getattr(rev_config, "IDE_TASK_POOL_QUEUE_SIZE", 32),
+                start_method=getattr(rev_config, "IDE_TASK_POOL_START_METHOD", None),
+                on_update=self._on_pool_update,
+                on_log=self._on_pool_log,
+            )
+        return self._task_pool
+
+    def _on_pool_update(self, pool_task: PoolTask) -> None:
+        """Pool callback, called from pool threads: hand the update to the loop.
+
+        The task state is captured here, then applied on the event loop so
+        ``active_tasks`` and the websocket list are only touched there.
+        """
+        snapshot = pool_task.snapshot()
+        done = pool_task.done
+        loop = self._loop
+        if loop is not None and loop.is_running() and not self._on_loop_thread(loop):
+            try:
+                loop.call_soon_threadsafe(self._apply_pool_update, snapshot, done)
+                return
+            except RuntimeError:  # loop closed in the meantime
+                pass
+        self._apply_pool_update(snapshot, done)
+
+    @staticmethod
+    def _on_loop_thread(loop: asyncio.AbstractEventLoop) -> bool:
+        try:
+            return asyncio.get_running_loop() is loop
+        except RuntimeError:
+            return False
+
+    def _apply_pool_update(self, snapshot: Dict[str, Any], done: bool) -> None:
+        """Mirror pool state into ``active_tasks`` and announce finished tasks."""
+        task_id = snapshot['id']
+        with self._active_tasks_lock:
+            record = self.active_tasks.setdefault(task_id, {'id': task_id})
+            record.update(_sanitize_payload(snapshot))
+            if snapshot['status'] == 'running' and 'started_at' not in record:
+                record['started_at'] = datetime.now().isoformat()
+            if not done:
+                return
+            record['completed_at'] = datetime.now().isoformat()
+        if snapshot['status'] == COMPLETED:
+            message = {'type': 'task_completed', 'task_id': task_id, 'result': record.get('result')}
+        elif snapshot['status'] == FAILED:
+            message = {'type': 'task_failed', 'task_id': task_id, 'error': record.get('error')}
+        else:
+            message = {'type': 'task_cancelled', 'task_id': task_id}
+        self._schedule_ws_broadcast(message)
+
+    def _on_pool_log(self, pool_task: PoolTask, stream: str, message: str) -> None:
+        original = self._stdout_original if stream == "stdout" else self._stderr_original
+        if original is not None:
+            try:
+                original.write(message + "\n")
+            except Exception:
+                pass
+        self._schedule_ws_broadcast({
+            "type": "log",
+            "stream": stream,
+            "task_id": pool_task.task_id,
+            "message": _strip_ansi(message),
+        })
+
+    @staticmethod
+    def _resolve_workspace(cwd: Optional[str], file_path: Optional[str]) -> Optional[Path]:
+        """Resolve the workspace directory a request refers to, if any."""
         target: Optional[Path] = None
         if cwd:
             target = Path(cwd)
@@ -119,7 +274,7 @@ class RevAPIServer:
             target = file_target if file_target.is_dir() else file_target.parent
 
         if not target:
-            return
+            return None
 
         try:
             target = target.expanduser()
@@ -131,10 +286,13 @@ class RevAPIServer:
 
         if not target.exists():
             logger.warning("Workspace root does not exist: %s", target)
-            return
+            return None
 
-        target = target.resolve()
-        if self._workspace_root == target:
+        return target.resolve()
+
+    def _maybe_set_workspace(self, cwd: Optional[str], file_path: Optional[str]) -> None:
+        target = self._resolve_workspace(cwd, file_path)
+        if target is None or self._workspace_root == target:
             return
 
         try:
@@ -243,6 +401,8 @@ class RevAPIServer:
         cwd: Optional[str] = None,
         file_path: Optional[str] = None,
         read_only: bool = False,
+        priority: int = 0,
+        config_overrides: Optional[Dict[str, Any]] = None,
     ) -> web.Response:
         """Submit a task string to the orchestrator and return a response."""
         if not task:
@@ -254,6 +414,9 @@ class RevAPIServer:
         if not task_id:
             task_id = f"task_{len(self.active_tasks)}"
 
+        if self._use_task_pool():
+            return self._submit_to_pool(task, task_id, cwd, file_path, read_only, priority, config_overrides)
+
         self._maybe_set_workspace(cwd, file_path)
         orchestrator = await self._get_orchestrator()
 
@@ -305,6 +468,54 @@ class RevAPIServer:
             'message': 'Task started'
         })
 
+    def _submit_to_pool(
+        self,
+        task: str,
+        task_id: str,
+        cwd: Optional[str],
+        file_path: Optional[str],
+        read_only: bool,
+        priority: int,
+        config_overrides: Optional[Dict[str, Any]],
+    ) -> web.Response:
+        """Queue a task on the worker pool with its own workspace root."""
+        workspace = self._resolve_workspace(cwd, file_path) or self._workspace_root
+        self.active_tasks[task_id] = {
+            'id': task_id,
+            'task': task,
+            'status': 'queued',
+            'submitted_at': datetime.now().isoformat(),
+            'result': None
+        }
+        try:
+            self._get_task_pool().submit(
+                task_id,
+                task,
+                workspace_root=str(workspace) if workspace else None,
+                read_only=read_only,
+                priority=priority,
+                config_overrides=config_overrides,
+            )
+        except TaskQueueFull as e:
+            self.active_tasks.pop(task_id, None)
+            return web.json_response(
+                {'status': 'error', 'message': str(e)},
+                status=429,
+                headers={'Retry-After': '5'}
+            )
+        except ValueError as e:
+            self.active_tasks.pop(task_id, None)
+            return web.json_response(
+                {'status': 'error', 'message': str(e)},
+                status=409
+            )
+
+        return web.json_response({
+            'status': 'success',
+            'task_id': task_id,
+            'message': 'Task queued'
+        })
+
     async def handle_execute(self, request: web.Request) -> web.Response:
         """Execute a Rev task"""
         try:
@@ -313,8 +524,20 @@ class RevAPIServer:
             task_id = data.get('task_id', f"task_{len(self.active_tasks)}")
             cwd = data.get('cwd')
 
-            return await self._submit_task(task, task_id, cwd=cwd)
+            return await self._submit_task(
+                task,
+                task_id,
+                cwd=cwd,
+                read_only=bool(data.get('read_only')),
+                priority=_task_priority(data),
+                config_overrides=_config_overrides(data),
+            )
 
+        except InvalidRequestError as e:
+            return web.json_response(
+                {'status': 'error', 'message': str(e)},
+                status=400
+            )
         except Exception as e:
             logger.error(f"Error handling execute request: {e}", exc_info=True)
             return web.json_response(
@@ -489,6 +712,22 @@ class RevAPIServer:
                 status=500
             )
 
+    async def handle_pool_status(self, request: web.Request) -> web.Response:
+        """Report worker-pool queue depth and latency metrics"""
+        try:
+            return web.json_response({
+                'status': 'success',
+                'enabled': self._use_task_pool(),
+                'pool': self._task_pool.get_metrics() if self._task_pool else None
+            })
+
+        except Exception as e:
+            logger.error(f"Error handling pool status request: {e}", exc_info=True)
+            return web.json_response(
+                {'status': 'error', 'message': str(e)},
+                status=500
+            )
+
     async def handle_cancel_task(self, request: web.Request) -> web.Response:
         """Cancel a task"""
         try:
@@ -500,7 +739,9 @@ class RevAPIServer:
                     status=404
                 )
 
-            # Mark task as cancelled
+            # Stop the worker process (pool) and mark task as cancelled
+            if self._task_pool is not None:
+                await asyncio.to_thread(self._task_pool.cancel, task_id)
             self.active_tasks[task_id]['status'] = 'cancelled'
             self.active_tasks[task_id]['completed_at'] = datetime.now().isoformat()
 
@@ -665,6 +906,7 @@ class RevAPIServer:
                 'status': self._rpc_status,
                 'listTasks': self._rpc_list_tasks,
                 'cancelTask': self._rpc_cancel_task,
+                'poolStatus': self._rpc_pool_status,
             }
 
             handler = method_map.get(method)
@@ -675,7 +917,14 @@ class RevAPIServer:
                     'id': request_id
                 })
 
-            result = await handler(params)
+            try:
+                result = await handler(params)
+            except InvalidRequestError as e:
+                return web.json_response({
+                    'jsonrpc': jsonrpc,
+                    'error': {'code': -32602, 'message': str(e)},
+                    'id': request_id
+                }, status=400)
 
             return web.json_response({
                 'jsonrpc': jsonrpc,
@@ -697,6 +946,9 @@ class RevAPIServer:
         if not task:
             raise ValueError('No task specified')
 
+        if self._use_task_pool():
+            return await self._rpc_execute_pooled(task, params)
+
         self._maybe_set_workspace(params.get("cwd"), params.get("file_path"))
         orchestrator = await self._get_orchestrator()
         result = await asyncio.to_thread(
@@ -705,6 +957,36 @@ class RevAPIServer:
             read_only=bool(params.get("read_only")),
         )
         return {'status': 'success', 'result': _sanitize_payload(result)}
+
+    async def _rpc_execute_pooled(self, task: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a JSON-RPC task on the worker pool and wait for its result."""
+        task_id = params.get('task_id') or f"rpc_{len(self.active_tasks)}"
+        workspace = self._resolve_workspace(params.get("cwd"), params.get("file_path")) or self._workspace_root
+        self.active_tasks[task_id] = {
+            'id': task_id,
+            'task': task,
+            'status': 'queued',
+            'submitted_at': datetime.now().isoformat(),
+            'result': None
+        }
+        try:
+            pool_task = self._get_task_pool().submit(
+                task_id,
+                task,
+                workspace_root=str(workspace) if workspace else None,
+                read_only=bool(params.get("read_only")),
+                priority=_task_priority(params),
+                config_overrides=_config_overrides(params),
+            )
+        except (TaskQueueFull, ValueError):
+            self.active_tasks.pop(task_id, None)
+            raise
+        await asyncio.to_thread(pool_task.wait)
+        if pool_task.status == FAILED:
+            raise RuntimeError(_strip_ansi(pool_task.error or 'Task failed'))
+        if pool_task.status == CANCELLED:
+            return {'status': 'cancelled', 'task_id': task_id}
+        return {'status': 'success', 'task_id': task_id, 'result': _sanitize_payload(pool_task.result)}
 
     async def _rpc_analyze(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """JSON-RPC analyze method"""
@@ -774,9 +1056,18 @@ class RevAPIServer:
         if task_id not in self.active_tasks:
             raise ValueError('Task not found')
 
+        if self._task_pool is not None:
+            await asyncio.to_thread(self._task_pool.cancel, task_id)
         self.active_tasks[task_id]['status'] = 'cancelled'
         return {'status': 'success', 'message': 'Task cancelled'}
 
+    async def _rpc_pool_status(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """JSON-RPC poolStatus method"""
+        return {
+            'enabled': self._use_task_pool(),
+            'pool': self._task_pool.get_metrics() if self._task_pool else None,
+        }
+
     def _request_shutdown(self, reason: str = "signal") -> None:
         if self._shutdown_requested:
             return
@@ -795,6 +1086,8 @@ class RevAPIServer:
                 async_task.cancel()
         if self._task_futures:
             self._task_futures.clear()
+        if self._task_pool is not None:
+            threading.Thread(target=self._task_pool.shutdown, name="rev-task-pool-shutdown", daemon=True).start()
         if self._loop and self._shutdown_event:
             self._loop.call_soon_threadsafe(self._shutdown_event.set)
         logger.info("Shutdown requested (%s).", reason)
@@ -0,0 +1,480 @@
+"""
+Process-isolated task pool for the IDE API server.
+
+Each submitted task runs in its own worker process with its own workspace
+root and config overrides, so concurrent IDE clients cannot clobber each
+other's global state. The pool keeps a bounded priority queue (submissions
+beyond ``max_queue`` are rejected so callers can apply backpressure), kills
+the worker process on cancellation, and tracks queue-depth and latency
+metrics for the status endpoint.
+"""
+
+import heapq
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+# Number of recent samples kept for latency percentiles.
+_LATENCY_WINDOW = 256
+
+# Finished tasks retained for status lookups before the oldest are dropped.
+_MAX_FINISHED_TASKS = 512
+
+# Effective settings every worker inherits from the server process. Workers
+# may start from a fresh import (the "spawn" start method), which would drop
+# values set in memory at startup: CLI --model / --base-url / --llm-provider
+# and the execution and tool modes.
+INHERITED_CONFIG_KEYS = (
+    "LLM_PROVIDER",
+    "EXECUTION_PROVIDER",
+    "PLANNING_PROVIDER",
+    "RESEARCH_PROVIDER",
+    "OLLAMA_BASE_URL",
+    "OLLAMA_MODEL",
+    "EXECUTION_MODEL",
+    "PLANNING_MODEL",
+    "REVIEW_MODEL",
+    "RESEARCH_MODEL",
+    "EXECUTION_MODE",
+    "TOOL_EXECUTION_MODE",
+)
+
+
+class TaskQueueFull(Exception):
+    """Raised when the pool's pending queue is at capacity."""
+
+
+def snapshot_config() -> Dict[str, Any]:
+    """Current values of ``INHERITED_CONFIG_KEYS`` in this process."""
+    from rev import config as rev_config
+
+    return {key: getattr(rev_config, key) for key in INHERITED_CONFIG_KEYS if hasattr(rev_config, key)}
+
+
+@dataclass
+class PoolTask:
+    """A task tracked by :class:`TaskPool`."""
+
+    task_id: str
+    task: str
+    workspace_root: Optional[str] = None
+    read_only: bool = False
+    priority: int = 0
+    config_overrides: Dict[str, Any] = field(default_factory=dict)
+    base_config: Dict[str, Any] = field(default_factory=dict)
+    status: str = QUEUED
+    enqueued_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    pid: Optional[int] = None
+    _done: threading.Event = field(default_factory=threading.Event, repr=False)
+    _process: Any = field(default=None, repr=False)
+
+    def spec(self) -> Dict[str, Any]:
+        """Picklable description handed to the worker process."""
+        return {
+            "task_id": self.task_id,
+            "task": self.task,
+            "workspace_root": self.workspace_root,
+            "read_only": self.read_only,
+            "base_config": dict(self.base_config),
+            "config_overrides": dict(self.config_overrides),
+        }
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def snapshot(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "id": self.task_id,
+            "task": self.task,
+            "status": self.status,
+            "priority": self.priority,
+            "workspace_root": self.workspace_root,
+            "result": self.result,
+        }
+        if self.error:
+            data["error"] = self.error
+        if self.started_at is not None:
+            data["queue_wait"] = round(self.started_at - self.enqueued_at, 4)
+        if self.finished_at is not None and self.started_at is not None:
+            data["run_time"] = round(self.finished_at - self.started_at, 4)
+        return data
+
+
+def apply_spec_config(spec: Dict[str, Any]) -> None:
+    """Apply the parent's config snapshot, then the task's own overrides."""
+    from rev import config as rev_config
+
+    for key, value in (spec.get("base_config") or {}).items():
+        setattr(rev_config, key, value)
+    for key, value in (spec.get("config_overrides") or {}).items():
+        setattr(rev_config, key, value)
+
+
+def run_orchestrator_task(spec: Dict[str, Any]) -> Any:
+    """Default worker entry: run one request through a fresh Orchestrator."""
+    from rev import config as rev_config
+
+    root = spec.get("workspace_root")
+    if root:
+        rev_config.set_workspace_root(Path(root), allow_external=True)
+        os.chdir(root)
+    apply_spec_config(spec)
+
+    from rev.execution.orchestrator import Orchestrator, OrchestratorConfig
+
+    orchestrator = Orchestrator(
+        project_root=Path.cwd(),
+        config=OrchestratorConfig(enable_context_guard=True, context_guard_interactive=False),
+    )
+    result = orchestrator.execute(spec["task"], read_only=bool(spec.get("read_only")))
+    return result.to_dict() if hasattr(result, "to_dict") else result
+
+
+class _PipeStream:
+    """File-like object in the worker that forwards complete lines to the parent."""
+
+    def __init__(self, name: str, conn, lock: threading.Lock):
+        self._name = name
+        self._conn = conn
+        self._lock = lock
+        self._buffer = ""
+
+    def write(self, data):
+        if not data:
+            return 0
+        if not isinstance(data, str):
+            data = str(data)
+        with self._lock:
+            self._buffer += data
+            while "\n" in self._buffer:
+                line, self._buffer = self._buffer.split("\n", 1)
+                self._send(line)
+        return len(data)
+
+    def flush(self):
+        with self._lock:
+            if self._buffer:
+                self._send(self._buffer)
+                self._buffer = ""
+
+    def _send(self, line: str) -> None:
+        try:
+            self._conn.send(("log", self._name, line))
+        except Exception:
+            pass
+
+    def isatty(self):
+        return False
+
+
+def _jsonable(value: Any) -> Any:
+    return json.loads(json.dumps(value, default=str))
+
+
+def _worker_main(runner: Callable[[Dict[str, Any]], Any], spec: Dict[str, Any], conn) -> None:
+    lock = threading.Lock()
+    sys.stdout = _PipeStream("stdout", conn, lock)
+    sys.stderr = _PipeStream("stderr", conn, lock)
+    try:
+        message = ("result", _jsonable(runner(spec)))
+    except BaseException as exc:  # report everything, including SystemExit
+        message = ("error", f"{type(exc).__name__}: {exc}")
+    try:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        conn.send(message)
+    finally:
+        conn.close()
+
+
+def _percentiles(samples: Deque[float]) -> Dict[str, float]:
+    if not samples:
+        return {"count": 0, "avg": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 4)
+
+    return {
+        "count": len(ordered),
+        "avg": round(sum(ordered) / len(ordered), 4),
+        "p50": pick(0.5),
+        "p95": pick(0.95),
+        "max": round(ordered[-1], 4),
+    }
+
+
+class TaskPool:
+    """Bounded, prioritized pool of process-isolated task workers."""
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_queue: int = 32,
+        runner: Callable[[Dict[str, Any]], Any] = run_orchestrator_task,
+        start_method: Optional[str] = None,
+        on_update: Optional[Callable[[PoolTask], None]] = None,
+        on_log: Optional[Callable[[PoolTask, str, str], None]] = None,
+        kill_grace: float = 2.0,
+    ):
+        self.max_workers = max(1, int(max_workers))
+        self.max_queue = max(1, int(max_queue))
+        self._runner = runner
+        self._ctx = multiprocessing.get_context(start_method) if start_method else multiprocessing.get_context()
+        self._on_update = on_update
+        self._on_log = on_log
+        self._kill_grace = kill_grace
+        self._heap: List[Any] = []
+        self._seq = itertools.count()
+        self._tasks: Dict[str, PoolTask] = {}
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._closed = False
+        self._counts = {COMPLETED: 0, FAILED: 0, CANCELLED: 0, "rejected": 0}
+        self._queue_wait: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self._run_time: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def submit(
+        self,
+        task_id: str,
+        task: str,
+        *,
+        workspace_root: Optional[str] = None,
+        read_only: bool = False,
+        priority: int = 0,
+        config_overrides: Optional[Dict[str, Any]] = None,
+    ) -> PoolTask:
+        """Queue a task; higher ``priority`` runs first.
+
+        The worker gets a snapshot of the current provider, model, base URL and
+        mode settings (see ``INHERITED_CONFIG_KEYS``) with ``config_overrides``
+        applied on top.
+
+        Raises:
+            TaskQueueFull: If ``max_queue`` tasks are already waiting.
+        """
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Task pool is shut down")
+            if len(self._heap) >= self.max_queue:
+                self._counts["rejected"] += 1
+                raise TaskQueueFull(f"Task queue is full ({self.max_queue} pending)")
+            existing = self._tasks.get(task_id)
+            if existing is not None and not existing.done:
+                raise ValueError(f"Task {task_id} is already active")
+            pool_task = PoolTask(
+                task_id=task_id,
+                task=task,
+                workspace_root=workspace_root,
+                read_only=read_only,
+                priority=int(priority),
+                config_overrides=dict(config_overrides or {}),
+                base_config=snapshot_config(),
+            )
+            self._prune_finished()
+            self._tasks[task_id] = pool_task
+            heapq.heappush(self._heap, (-pool_task.priority, next(self._seq), pool_task))
+            self._ensure_workers()
+            self._cond.notify()
+        self._notify(pool_task)
+        return pool_task
+
+    def get(self, task_id: str) -> Optional[PoolTask]:
+        return self._tasks.get(task_id)
+
+    def cancel(self, task_id: str) -> bool:
+        """Cancel a queued task, or kill the worker process of a running one."""
+        with self._cond:
+            pool_task = self._tasks.get(task_id)
+            if pool_task is None or pool_task.done:
+                return False
+            was_queued = pool_task.status == QUEUED
+            if was_queued:
+                self._heap = [entry for entry in self._heap if entry[2] is not pool_task]
+                heapq.heapify(self._heap)
+            pool_task.status = CANCELLED
+            process = pool_task._process
+        if was_queued:
+            self._finish(pool_task, CANCELLED)
+        elif process is not None:
+            self._kill(process)
+        return True
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._cond:
+            running = sum(1 for t in self._tasks.values() if t.status == RUNNING)
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queue_depth": len(self._heap),
+                "running": running,
+                "completed": self._counts[COMPLETED],
+                "failed": self._counts[FAILED],
+                "cancelled": self._counts[CANCELLED],
+                "rejected": self._counts["rejected"],
+                "queue_wait": _percentiles(self._queue_wait),
+                "run_time": _percentiles(self._run_time),
+            }
+
+    def shutdown(self, cancel_running: bool = True, timeout: float = 5.0) -> None:
+        with self._cond:
+            self._closed = True
+            pending = [entry[2] for entry in self._heap]
+            self._heap = []
+            running = [t for t in self._tasks.values() if t.status == RUNNING]
+            self._cond.notify_all()
+        for pool_task in pending:
+            pool_task.status = CANCELLED
+            self._finish(pool_task, CANCELLED)
+        if cancel_running:
+            for pool_task in running:
+                self.cancel(pool_task.task_id)
+        for thread in self._threads:
+            thread.join(timeout)
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    def _prune_finished(self) -> None:
+        finished = [tid for tid, t in self._tasks.items() if t.done]
+        for tid in finished[:max(0, len(finished) - _MAX_FINISHED_TASKS)]:
+            del self._tasks[tid]
+
+    def _ensure_workers(self) -> None:
+        alive = [t for t in self._threads if t.is_alive()]
+        while len(alive) < self.max_workers:
+            thread = threading.Thread(target=self._worker_loop, name=f"rev-task-worker-{len(alive)}", daemon=True)
+            thread.start()
+            alive.append(thread)
+        self._threads = alive
+
+    def _worker_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._heap and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                _, _, pool_task = heapq.heappop(self._heap)
+                pool_task.status = RUNNING
+                pool_task.started_at = time.monotonic()
+                self._queue_wait.append(pool_task.started_at - pool_task.enqueued_at)
+            self._notify(pool_task)
+            self._run(pool_task)
+
+    def _run(self, pool_task: PoolTask) -> None:
+        recv_conn, send_conn = self._ctx.Pipe(duplex=False)
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(self._runner, pool_task.spec(), send_conn),
+            name=f"rev-task-{pool_task.task_id}",
+            daemon=True,
+        )
+        with self._cond:
+            if pool_task.status == CANCELLED:
+                recv_conn.close()
+                send_conn.close()
+                self._finish(pool_task, CANCELLED)
+                return
+            process.start()
+            pool_task._process = process
+            pool_task.pid = process.pid
+        send_conn.close()
+
+        outcome: Optional[tuple] = None
+        try:
+            while outcome is None:
+                try:
+                    if not recv_conn.poll(0.1):
+                        if not process.is_alive() and not recv_conn.poll(0):
+                            break
+                        continue
+                    message = recv_conn.recv()
+                except (EOFError, OSError):
+                    break
+                if message[0] == "log":
+                    if self._on_log is not None:
+                        try:
+                            self._on_log(pool_task, message[1], message[2])
+                        except Exception:
+                            pass
+                else:
+                    outcome = message
+        finally:
+            recv_conn.close()
+            process.join(self._kill_grace)
+            if process.is_alive():
+                self._kill(process)
+
+        if pool_task.status == CANCELLED:
+            self._finish(pool_task, CANCELLED)
+        elif outcome is None:
+            pool_task.error = f"Worker process exited with code {process.exitcode}"
+            self._finish(pool_task, FAILED)
+        elif outcome[0] == "result":
+            pool_task.result = outcome[1]
+            self._finish(pool_task, COMPLETED)
+        else:
+            pool_task.error = outcome[1]
+            self._finish(pool_task, FAILED)
+
+    def _kill(self, process) -> None:
+        try:
+            process.terminate()
+            process.join(self._kill_grace)
+            if process.is_alive():
+                process.kill()
+                process.join(self._kill_grace)
+        except Exception as exc:
+            logger.warning("Failed to stop worker process %s: %s", getattr(process, "pid", "?"), exc)
+
+    def _finish(self, pool_task: PoolTask, status: str) -> None:
+        with self._cond:
+            if pool_task.done:
+                return
+            pool_task.status = status
+            pool_task.finished_at = time.monotonic()
+            pool_task._process = None
+            self._counts[status] += 1
+            if pool_task.started_at is not None:
+                self._run_time.append(pool_task.finished_at - pool_task.started_at)
+            pool_task._done.set()
+        self._notify(pool_task)
+
+    def _notify(self, pool_task: PoolTask) -> None:
+        if self._on_update is None:
+            return
+        try:
+            self._on_update(pool_task)
+        except Exception as exc:
+            logger.warning("Task pool update callback failed: %s", exc)
@@ -17,7 +17,8 @@ from rev import config
 from rev.cache import LLMResponseCache, get_llm_cache
 from rev.debug_logger import get_logger
 from rev.llm.provider_factory import get_provider, get_provider_for_model
-from rev.llm.tool_call_parser import parse_tool_calls_from_text
+from rev.llm.tool_call_parser import IncrementalToolCallParser, parse_tool_calls_from_text
+from rev.profiler import record_llm_phases, span as profile_span
 
 
 # Debug mode - set to True to see API requests/responses
@@ -38,14 +39,22 @@ class _TokenUsageTracker:
     def __init__(self):
         self.prompt_tokens = 0
         self.completion_tokens = 0
+        self.tool_schema_tokens = 0
+        self.tool_schema_tokens_saved = 0
 
     def record(self, prompt: int, completion: int) -> None:
         self.prompt_tokens += max(0, int(prompt))
         self.completion_tokens += max(0, int(completion))
 
+    def record_tool_schemas(self, sent: int, saved: int) -> None:
+        self.tool_schema_tokens += max(0, int(sent))
+        self.tool_schema_tokens_saved += max(0, int(saved))
+
     def reset(self) -> None:
         self.prompt_tokens = 0
         self.completion_tokens = 0
+        self.tool_schema_tokens = 0
+        self.tool_schema_tokens_saved = 0
 
     def snapshot(self) -> Dict[str, int]:
         prompt = self.prompt_tokens
@@ -54,11 +63,25 @@ class _TokenUsageTracker:
             "prompt": prompt,
             "completion": completion,
             "total": prompt + completion,
+            "tool_schema_tokens": self.tool_schema_tokens,
+            "tool_schema_tokens_saved": self.tool_schema_tokens_saved,
         }
 
 
 _token_usage_tracker = _TokenUsageTracker()
 
+
+def _tool_schema_usage(tools: Optional[List[Dict]]) -> Tuple[int, int]:
+    """Return (estimated schema tokens sent, tokens saved vs. the unpruned tool set)."""
+    if not tools:
+        return 0, 0
+    try:
+        from rev.tools.tool_selection import tool_schema_usage  # local import to avoid circular dependency
+
+        return tool_schema_usage(tools)
+    except Exception:
+        return 0, 0
+
 # Cache per provider+model: None (unknown), True (supported), False (unsupported)
 _THINKING_SUPPORT: Dict[str, Optional[bool]] = {}
 
@@ -480,6 +503,11 @@ def _enforce_token_limit(messages: List[Dict[str, Any]], max_tokens: int) -> Tup
     if max_tokens <= 0:
         return [], 0, 0, True
 
+    # Lists built by rev.execution.history carry their estimate: O(1) when under budget.
+    known_tokens = getattr(messages, "estimated_tokens", None)
+    if known_tokens is not None and known_tokens <= effective_max_tokens:
+        return messages, known_tokens, known_tokens, False
+
     original_tokens = sum(_estimate_message_tokens(m) for m in messages)
     if original_tokens <= effective_max_tokens:
         return messages, original_tokens, original_tokens, False
@@ -691,14 +719,16 @@ def ollama_chat(
         return {"error": f"Provider error: {e}"}
 
     # Make the request through the provider
-    response = _call_with_auto_thinking(
-        provider=provider,
-        messages=messages,
-        tools=tools,
-        model_name=model_name,
-        supports_tools=supports_tools,
-        **kwargs
-    )
+    with profile_span("llm", model_name) as llm_span:
+        response = _call_with_auto_thinking(
+            provider=provider,
+            messages=messages,
+            tools=tools,
+            model_name=model_name,
+            supports_tools=supports_tools,
+            **kwargs
+        )
+        record_llm_phases(llm_span, response)
 
     # Persist full transcript (raw response) when tracing is enabled
     if getattr(config, "LLM_TRANSACTION_LOG_ENABLED", False):
@@ -715,6 +745,11 @@ def ollama_chat(
             response["usage"].get("prompt", 0),
             response["usage"].get("completion", 0)
         )
+        schema_tokens, schema_saved = _tool_schema_usage(tools)
+        _token_usage_tracker.record_tool_schemas(schema_tokens, schema_saved)
+        if isinstance(response["usage"], dict):
+            response["usage"]["tool_schema_tokens"] = schema_tokens
+            response["usage"]["tool_schema_tokens_saved"] = schema_saved
 
         # Cache successful response
         llm_cache.set_response(messages, response, tools if tools_provided else None, model_name)
@@ -730,6 +765,7 @@ def ollama_chat_stream(
     on_chunk: Optional[callable] = None,
     check_interrupt: Optional[callable] = None,
     check_user_messages: Optional[callable] = None,
+    on_tool_call: Optional[callable] = None,
     **kwargs
 ) -> Dict[str, Any]:
     """Stream chat responses from LLM with real-time output.
@@ -746,6 +782,9 @@ def ollama_chat_stream(
         on_chunk: Callback called with each text chunk as it arrives
         check_interrupt: Callback to check if execution should be interrupted
         check_user_messages: Callback to check for and inject user messages
+        on_tool_call: Callback called with each tool call as soon as it is
+            complete in the stream (native or recovered from text), before the
+            full response has finished
         **kwargs: Additional arguments to pass to the provider (e.g. temperature)
 
     Returns:
@@ -768,17 +807,45 @@ def ollama_chat_stream(
     except ValueError as e:
         return {"error": f"Provider error: {e}"}
 
-    response = _call_stream_with_auto_thinking(
-        provider=provider,
-        messages=messages,
-        tools=tools,
-        model_name=model_name,
-        supports_tools=supports_tools,
-        on_chunk=on_chunk,
-        check_interrupt=check_interrupt,
-        check_user_messages=check_user_messages,
-        **kwargs
-    )
+    if on_tool_call is not None:
+        parser = IncrementalToolCallParser()
+        text_chunk_handler = on_chunk
+
+        def _dispatch(calls: List[Dict[str, Any]]) -> None:
+            for call in calls:
+                try:
+                    on_tool_call(call)
+                except Exception:
+                    pass
+
+        def on_chunk(chunk: str) -> None:
+            if text_chunk_handler:
+                text_chunk_handler(chunk)
+            _dispatch(parser.feed(chunk))
+
+        if getattr(provider, "supports_streaming_tool_calls", False) is True:
+            kwargs["on_tool_call"] = lambda call: _dispatch(parser.feed_native([call]))
+
+    with profile_span("llm", model_name) as llm_span:
+        if llm_span.active and on_chunk is not None:
+            timed_chunk_handler = on_chunk
+
+            def on_chunk(chunk: str) -> None:
+                llm_span.mark_first_token()
+                timed_chunk_handler(chunk)
+
+        response = _call_stream_with_auto_thinking(
+            provider=provider,
+            messages=messages,
+            tools=tools,
+            model_name=model_name,
+            supports_tools=supports_tools,
+            on_chunk=on_chunk,
+            check_interrupt=check_interrupt,
+            check_user_messages=check_user_messages,
+            **kwargs
+        )
+        record_llm_phases(llm_span, response)
     response = _sanitize_response_content(response)
 
     # Track token usage if successful
@@ -787,5 +854,10 @@ def ollama_chat_stream(
             response["usage"].get("prompt", 0),
             response["usage"].get("completion", 0)
         )
+        schema_tokens, schema_saved = _tool_schema_usage(tools)
+        _token_usage_tracker.record_tool_schemas(schema_tokens, schema_saved)
+        if isinstance(response["usage"], dict):
+            response["usage"]["tool_schema_tokens"] = schema_tokens
+            response["usage"]["tool_schema_tokens_saved"] = schema_saved
 
     return response
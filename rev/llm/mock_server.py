@@ -0,0 +1,243 @@
+"""Local Ollama/OpenAI-compatible HTTP server backed by scripted responses.
+
+Point the real providers at it to benchmark the full request path (payload
+building, HTTP, streaming parsers) without a model behind it::
+
+    with MockLLMServer(MockResponder(script, latency)) as server:
+        os.environ["OLLAMA_BASE_URL"] = server.url            # /api/chat
+        os.environ["OPENAI_BASE_URL"] = server.openai_url     # /v1/chat/completions
+
+Or run it standalone::
+
+    python -m rev.llm.mock_server --script responses.json --port 11435 --tokens-per-second 50
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+from rev.llm.providers.mock_provider import LatencyModel, MockResponder, MockScript, MockTurn
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_Server"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - signature from base class
+        pass
+
+    # -- plumbing ------------------------------------------------------------
+
+    def _send_json(self, payload: Dict[str, Any], status: int = 200) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _start_stream(self, content_type: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def _end_stream(self) -> None:
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    # -- routes --------------------------------------------------------------
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        model = self.server.model
+        if self.path.rstrip("/") == "/api/tags":
+            self._send_json({"models": [{"name": model, "model": model}]})
+        elif self.path.rstrip("/") == "/v1/models":
+            self._send_json({"object": "list", "data": [{"id": model, "object": "model"}]})
+        else:
+            self._send_json({"error": f"not found: {self.path}"}, status=404)
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        path = self.path.rstrip("/")
+        try:
+            request = self._read_json()
+        except ValueError:
+            self._send_json({"error": "invalid JSON body"}, status=400)
+            return
+        responder = self.server.responder
+        turn = responder.respond(request.get("messages") or [])
+        model = request.get("model") or self.server.model
+        if path == "/api/chat":
+            # Ollama streams unless told otherwise.
+            if request.get("stream", True):
+                self._ollama_stream(turn, model)
+            else:
+                responder.wait_for_completion(turn)
+                self._send_json(self._ollama_final(turn, model, turn.ollama_message()))
+        elif path in ("/v1/chat/completions", "/chat/completions"):
+            if request.get("stream"):
+                self._openai_stream(turn, model)
+            else:
+                responder.wait_for_completion(turn)
+                self._send_json(self._openai_completion(turn, model))
+        else:
+            self._send_json({"error": f"not found: {self.path}"}, status=404)
+
+    def _ollama_final(self, turn: MockTurn, model: str, message: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "model": model,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "message": message,
+            "done": True,
+            "done_reason": "stop",
+            **self.server.responder.timings(turn),
+        }
+
+    def _ollama_stream(self, turn: MockTurn, model: str) -> None:
+        self._start_stream("application/x-ndjson")
+        for piece in self.server.responder.stream(turn):
+            line = {"model": model, "message": {"role": "assistant", "content": piece}, "done": False}
+            self._write_chunk(json.dumps(line).encode("utf-8") + b"\n")
+        message = turn.ollama_message()
+        message["content"] = ""
+        self._write_chunk(json.dumps(self._ollama_final(turn, model, message)).encode("utf-8") + b"\n")
+        self._end_stream()
+
+    def _openai_completion(self, turn: MockTurn, model: str) -> Dict[str, Any]:
+        message: Dict[str, Any] = {"role": "assistant", "content": turn.content}
+        if turn.tool_calls:
+            message["tool_calls"] = turn.openai_tool_calls()
+        return {
+            "id": f"chatcmpl-mock-{self.server.responder.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": message,
+                "finish_reason": "tool_calls" if turn.tool_calls else "stop",
+            }],
+            "usage": {
+                "prompt_tokens": turn.prompt_tokens,
+                "completion_tokens": turn.completion_tokens,
+                "total_tokens": turn.prompt_tokens + turn.completion_tokens,
+            },
+        }
+
+    def _openai_stream(self, turn: MockTurn, model: str) -> None:
+        completion_id = f"chatcmpl-mock-{self.server.responder.requests}"
+
+        def event(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> None:
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            self._write_chunk(b"data: " + json.dumps(chunk).encode("utf-8") + b"\n\n")
+
+        self._start_stream("text/event-stream")
+        event({"role": "assistant", "content": ""})
+        for piece in self.server.responder.stream(turn):
+            event({"content": piece})
+        if turn.tool_calls:
+            event({"tool_calls": [dict(call, index=i) for i, call in enumerate(turn.openai_tool_calls())]})
+        event({}, "tool_calls" if turn.tool_calls else "stop")
+        self._write_chunk(b"data: [DONE]\n\n")
+        self._end_stream()
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, responder: MockResponder, model: str):
+        super().__init__(address, _Handler)
+        self.responder = responder
+        self.model = model
+
+
+class MockLLMServer:
+    """Serve a ``MockResponder`` over HTTP from a background thread.
+
+    ``port=0`` binds a free port; read the address back from ``url``.
+    """
+
+    def __init__(
+        self,
+        responder: Optional[MockResponder] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        model: str = "mock",
+    ):
+        self.responder = responder or MockResponder()
+        self._server = _Server((host, port), self.responder, model)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def openai_url(self) -> str:
+        return f"{self.url}/v1"
+
+    def start(self) -> "MockLLMServer":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, name="mock-llm-server", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serve scripted LLM responses over Ollama/OpenAI-compatible HTTP.")
+    parser.add_argument("--script", help="response script or run bundle JSON (default: always answer 'Done.')")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--model", default="mock")
+    parser.add_argument("--loop", action="store_true", help="restart the script when it runs out")
+    parser.add_argument("--first-token-ms", type=float, default=0.0)
+    parser.add_argument("--prefill-tokens-per-second", type=float, default=0.0)
+    parser.add_argument("--tokens-per-second", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    script = MockScript.load(args.script, loop=args.loop) if args.script else MockScript([])
+    latency = LatencyModel(args.first_token_ms, args.prefill_tokens_per_second, args.tokens_per_second)
+    server = MockLLMServer(MockResponder(script, latency), args.host, args.port, args.model)
+    print(f"Mock LLM server on {server.url} (Ollama) and {server.openai_url} (OpenAI)")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
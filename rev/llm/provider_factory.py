@@ -1,8 +1,10 @@
 """Provider factory for creating LLM provider instances."""
 
 import os
-from typing import Optional
+from typing import List, Optional
 
+from rev import config
+from rev.llm.provider_pool import ProviderPool
 from rev.llm.providers.base import LLMProvider
 from rev.llm.providers.ollama import OllamaProvider
 from rev.llm.providers.openai_provider import OpenAIProvider
@@ -11,6 +13,9 @@ from rev.llm.providers.openai_provider import OpenAIProvider
 # Cache for provider instances (singleton pattern)
 _provider_cache = {}
 
+# Providers that can be pooled over several base URLs via {NAME}_BASE_URLS.
+_POOLABLE_PROVIDERS = {"ollama", "openai", "localai", "vllm", "lmstudio"}
+
 
 def _load_anthropic():
     """Lazily load Anthropic provider to avoid dependency issues."""
@@ -30,11 +35,42 @@ def _load_gemini():
         raise RuntimeError("Gemini provider requires extras: pip install rev-agentic[gemini]") from e
 
 
+def _load_mock():
+    from rev.llm.providers.mock_provider import MockProvider
+    return MockProvider.from_config()
+
+
+def _pool_endpoints(provider_name: str) -> List[str]:
+    """Return the endpoints listed in ``{PROVIDER}_BASE_URLS`` (comma-separated)."""
+    raw = os.getenv(f"{provider_name.upper()}_BASE_URLS", "")
+    return list(dict.fromkeys(url.strip().rstrip("/") for url in raw.split(",") if url.strip()))
+
+
+def _build_pool(provider_name: str, urls: List[str]) -> LLMProvider:
+    """Create one member provider per endpoint and wrap them in a ProviderPool."""
+    if provider_name == "ollama":
+        members = [OllamaProvider(base_url=url) for url in urls]
+    else:
+        members = [OpenAIProvider(base_url=url) for url in urls]
+    # Rounds over the whole pool follow the backend's normal retry policy,
+    # while each member gives up quickly so the pool can fail over.
+    retry_config = members[0].get_retry_config()
+    for member in members:
+        if hasattr(member, "max_attempts_override"):
+            member.max_attempts_override = config.PROVIDER_POOL_MEMBER_ATTEMPTS
+    return ProviderPool(
+        members,
+        strategy=config.PROVIDER_POOL_STRATEGY,
+        health_check_interval=config.PROVIDER_POOL_HEALTH_CHECK_INTERVAL,
+        retry_config=retry_config,
+    )
+
+
 def get_provider(provider_name: Optional[str] = None, force_new: bool = False) -> LLMProvider:
     """Get a provider instance by name.
 
     Args:
-        provider_name: Name of the provider (ollama, openai, anthropic, gemini).
+        provider_name: Name of the provider (ollama, openai, anthropic, gemini, mock).
                       If None, uses REV_LLM_PROVIDER env var or defaults to ollama.
         force_new: If True, creates a new instance instead of using cached one.
 
@@ -54,6 +90,13 @@ def get_provider(provider_name: Optional[str] = None, force_new: bool = False) -
     if not force_new and provider_name in _provider_cache:
         return _provider_cache[provider_name]
 
+    # Several endpoints configured: load-balance across them
+    pool_urls = _pool_endpoints(provider_name) if provider_name in _POOLABLE_PROVIDERS else []
+    if len(pool_urls) > 1:
+        provider = _build_pool(provider_name, pool_urls)
+        _provider_cache[provider_name] = provider
+        return provider
+
     # Create new provider instance
     if provider_name == "ollama":
         provider = OllamaProvider()
@@ -65,6 +108,8 @@ def get_provider(provider_name: Optional[str] = None, force_new: bool = False) -
     elif provider_name == "gemini":
         GeminiProvider = _load_gemini()
         provider = GeminiProvider()
+    elif provider_name == "mock":
+        provider = _load_mock()
     elif provider_name in {"localai", "vllm", "lmstudio"}:
         # Local OpenAI-compatible backends; reuse OpenAIProvider with base URLs set via env
         # LOCALAI_BASE_URL, VLLM_BASE_URL, LMSTUDIO_BASE_URL (fallback: OPENAI_BASE_URL)
@@ -144,7 +189,7 @@ def list_available_providers() -> list[str]:
     Returns:
         List of provider names
     """
-    return ["ollama", "openai", "anthropic", "gemini", "localai", "vllm", "lmstudio"]
+    return ["ollama", "openai", "anthropic", "gemini", "localai", "vllm", "lmstudio", "mock"]
 
 
 def validate_provider(provider_name: str) -> bool:
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Load-balancing provider pool over several endpoints of one backend.
+
+``ProviderPool`` wraps multiple provider instances (for example one
+``OllamaProvider`` per host) behind the regular ``LLMProvider`` interface.
+Each request is routed to the healthy endpoint with the fewest outstanding
+requests (or the lowest latency-weighted load), failures are classified with
+the member's ``classify_error`` and retryable ones fail over to the next
+endpoint. Unhealthy endpoints are re-probed with ``validate_config`` once their
+cool-down expires.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from rev.debug_logger import get_logger
+from rev.llm.providers.base import ErrorClass, LLMProvider, ProviderError, RetryConfig
+from rev.llm.retry import RetryHandler
+
+
+logger = get_logger()
+
+STRATEGY_LEAST_OUTSTANDING = "least_outstanding"
+STRATEGY_LATENCY_WEIGHTED = "latency_weighted"
+STRATEGIES = (STRATEGY_LEAST_OUTSTANDING, STRATEGY_LATENCY_WEIGHTED)
+
+# Smoothing factor for the per-endpoint latency moving average.
+_EWMA_ALPHA = 0.3
+
+
+@dataclass
+class EndpointStats:
+    """Routing state for one pool member."""
+
+    label: str
+    outstanding: int = 0
+    ewma_latency: float = 0.0
+    requests: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    healthy: bool = True
+    unhealthy_since: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "endpoint": self.label,
+            "outstanding": self.outstanding,
+            "ewma_latency": round(self.ewma_latency, 4),
+            "requests": self.requests,
+            "failures": self.failures,
+            "healthy": self.healthy,
+        }
+
+
+def _error_from_result(result: Any) -> Optional[str]:
+    if isinstance(result, dict) and result.get("error"):
+        return str(result["error"])
+    return None
+
+
+class ProviderPool(LLMProvider):
+    """Route requests across several providers of the same kind."""
+
+    def __init__(
+        self,
+        members: Sequence[LLMProvider],
+        *,
+        strategy: str = STRATEGY_LEAST_OUTSTANDING,
+        health_check_interval: float = 30.0,
+        labels: Optional[Sequence[str]] = None,
+        retry_config: Optional[RetryConfig] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        super().__init__()
+        if not members:
+            raise ValueError("ProviderPool requires at least one member provider")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown pool strategy '{strategy}' (expected one of {', '.join(STRATEGIES)})")
+        self.members: List[LLMProvider] = list(members)
+        self.name = getattr(self.members[0], "name", "pool")
+        self.strategy = strategy
+        self.health_check_interval = max(0.0, float(health_check_interval))
+        self.supports_streaming_tool_calls = all(
+            getattr(m, "supports_streaming_tool_calls", False) is True for m in self.members
+        )
+        labels = list(labels or [])
+        self._stats = [
+            EndpointStats(label=labels[i] if i < len(labels) else getattr(m, "base_url", None) or f"{self.name}[{i}]")
+            for i, m in enumerate(self.members)
+        ]
+        self._retry_config = retry_config
+        self._lock = threading.Lock()
+        self._sleep = sleep
+
+    # ------------------------------------------------------------------
+    # Endpoint selection and bookkeeping
+    # ------------------------------------------------------------------
+
+    def _maybe_reprobe(self, index: int) -> None:
+        """Re-check an unhealthy endpoint once its cool-down has expired."""
+        stats = self._stats[index]
+        with self._lock:
+            if stats.healthy or time.monotonic() - stats.unhealthy_since < self.health_check_interval:
+                return
+            # Push the next probe out so concurrent callers don't all probe.
+            stats.unhealthy_since = time.monotonic()
+        try:
+            ok = bool(self.members[index].validate_config())
+        except Exception:
+            ok = False
+        if ok:
+            with self._lock:
+                stats.healthy = True
+                stats.consecutive_failures = 0
+            logger.info(f"[provider_pool] endpoint {stats.label} is healthy again")
+
+    def _load(self, stats: EndpointStats) -> tuple:
+        if self.strategy == STRATEGY_LATENCY_WEIGHTED:
+            # Unmeasured endpoints count as fast so they get sampled.
+            return ((stats.outstanding + 1) * stats.ewma_latency, stats.outstanding)
+        return (stats.outstanding, stats.ewma_latency)
+
+    def _acquire(self, exclude: set) -> Optional[int]:
+        """Pick an endpoint and count a request against it."""
+        for i in range(len(self.members)):
+            if i not in exclude:
+                self._maybe_reprobe(i)
+        with self._lock:
+            candidates = [i for i in range(len(self.members)) if i not in exclude]
+            if not candidates:
+                return None
+            healthy = [i for i in candidates if self._stats[i].healthy]
+            # With every remaining endpoint down, still try the least-recently
+            # failed one rather than refusing the request outright.
+            pool = healthy or sorted(candidates, key=lambda i: self._stats[i].unhealthy_since)[:1]
+            index = min(pool, key=lambda i: (self._load(self._stats[i]), i))
+            stats = self._stats[index]
+            stats.outstanding += 1
+            stats.requests += 1
+            return index
+
+    def _release(self, index: int, started: float, error: Optional[ProviderError]) -> None:
+        with self._lock:
+            stats = self._stats[index]
+            stats.outstanding = max(0, stats.outstanding - 1)
+            if error is None:
+                elapsed = time.monotonic() - started
+                stats.ewma_latency = (
+                    elapsed if stats.ewma_latency <= 0 else
+                    _EWMA_ALPHA * elapsed + (1 - _EWMA_ALPHA) * stats.ewma_latency
+                )
+                stats.consecutive_failures = 0
+                stats.healthy = True
+                return
+            stats.failures += 1
+            if error.retryable:
+                stats.consecutive_failures += 1
+                if stats.healthy:
+                    logger.info(f"[provider_pool] marking {stats.label} unhealthy: {error.error_class.value}")
+                stats.healthy = False
+                stats.unhealthy_since = time.monotonic()
+
+    def _classify(self, index: int, error: Any) -> ProviderError:
+        exc = error if isinstance(error, Exception) else Exception(str(error))
+        try:
+            return self.members[index].classify_error(exc)
+        except Exception:
+            return ProviderError(error_class=ErrorClass.UNKNOWN, message=str(error), retryable=False, original_error=exc)
+
+    def _dispatch(
+        self,
+        call: Callable[[LLMProvider], Dict[str, Any]],
+        emitted: Optional[Callable[[], bool]] = None,
+    ) -> Dict[str, Any]:
+        """Run ``call`` on pool members, failing over on retryable errors.
+
+        ``emitted`` reports whether the call already delivered output to the
+        caller (streamed chunks or tool calls); once it has, a failure is
+        returned as-is, since retrying elsewhere would repeat that output.
+        """
+        handler = RetryHandler(self.get_retry_config())
+        round_no = 0
+        while True:
+            round_no += 1
+            tried: set = set()
+            last_error: Optional[ProviderError] = None
+            last_result: Optional[Dict[str, Any]] = None
+            while True:
+                index = self._acquire(tried)
+                if index is None:
+                    break
+                tried.add(index)
+                started = time.monotonic()
+                try:
+                    result = call(self.members[index])
+                except Exception as exc:
+                    error = self._classify(index, exc)
+                    self._release(index, started, error)
+                    if not error.retryable or (emitted is not None and emitted()):
+                        raise
+                    last_error, last_result = error, {"error": str(exc)}
+                    continue
+                message = _error_from_result(result)
+                if message is None:
+                    self._release(index, started, None)
+                    return result
+                error = self._classify(index, message)
+                self._release(index, started, error)
+                if not error.retryable or (emitted is not None and emitted()):
+                    return result
+                last_error, last_result = error, result
+                logger.info(
+                    f"[provider_pool] {self._stats[index].label} failed ({error.error_class.value}); failing over"
+                )
+
+            if last_error is None or not handler.should_retry(last_error, round_no):
+                return last_result or {"error": "No provider endpoints available"}
+            self._sleep(handler.get_backoff_delay(round_no, last_error.retry_after))
+
+    # ------------------------------------------------------------------
+    # LLMProvider interface
+    # ------------------------------------------------------------------
+
+    def chat(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        model: Optional[str] = None,
+        supports_tools: bool = True,
+        **kwargs
+    ) -> Dict[str, Any]:
+        return self._dispatch(
+            lambda p: p.chat(messages, tools=tools, model=model, supports_tools=supports_tools, **kwargs)
+        )
+
+    def chat_stream(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        model: Optional[str] = None,
+        supports_tools: bool = True,
+        on_chunk: Optional[Callable[[str], None]] = None,
+        check_interrupt: Optional[Callable[[], bool]] = None,
+        check_user_messages: Optional[Callable[[], bool]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        emitted = threading.Event()
+
+        def track(callback: Optional[Callable[..., Any]]) -> Optional[Callable[..., Any]]:
+            if callback is None:
+                return None
+
+            def wrapper(*args: Any, **kw: Any) -> Any:
+                emitted.set()
+                return callback(*args, **kw)
+
+            return wrapper
+
+        on_chunk = track(on_chunk)
+        if kwargs.get("on_tool_call") is not None:
+            kwargs["on_tool_call"] = track(kwargs["on_tool_call"])
+        return self._dispatch(
+            lambda p: p.chat_stream(
+                messages,
+                tools=tools,
+                model=model,
+                supports_tools=supports_tools,
+                on_chunk=on_chunk,
+                check_interrupt=check_interrupt,
+                check_user_messages=check_user_messages,
+                **kwargs
+            ),
+            emitted=emitted.is_set,
+        )
+
+    def supports_tool_calling(self, model: str) -> bool:
+        return self.members[0].supports_tool_calling(model)
+
+    def validate_config(self) -> bool:
+        """Probe every endpoint; the pool is usable if any member is."""
+        any_ok = False
+        for index, member in enumerate(self.members):
+            try:
+                ok = bool(member.validate_config())
+            except Exception:
+                ok = False
+            with self._lock:
+                stats = self._stats[index]
+                stats.healthy = ok
+                if not ok:
+                    stats.unhealthy_since = time.monotonic()
+            any_ok = any_ok or ok
+        return any_ok
+
+    def get_model_list(self) -> List[str]:
+        models: List[str] = []
+        for index, member in enumerate(self.members):
+            if not self._stats[index].healthy:
+                continue
+            try:
+                names = member.get_model_list()
+            except Exception:
+                continue
+            models.extend(n for n in names if n not in models)
+        return models
+
+    def count_tokens(self, messages: List[Dict[str, Any]]) -> int:
+        return self.members[0].count_tokens(messages)
+
+    def classify_error(self, error: Exception) -> ProviderError:
+        return self.members[0].classify_error(error)
+
+    def get_retry_config(self) -> RetryConfig:
+        """Retry policy for whole failover rounds (one round tries every endpoint)."""
+        if self._retry_config is not None:
+            return self._retry_config
+        return self.members[0].get_retry_config()
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Return per-endpoint routing statistics."""
+        with self._lock:
+            return [s.as_dict() for s in self._stats]
+
+    def __repr__(self) -> str:
+        labels = ", ".join(s.label for s in self._stats)
+        return f"ProviderPool(name='{self.name}', strategy='{self.strategy}', endpoints=[{labels}])"
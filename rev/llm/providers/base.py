@@ -52,6 +52,10 @@ class LLMProvider(ABC):
     Anthropic, Google, etc.).
     """
 
+    # Providers that accept an ``on_tool_call`` keyword in chat_stream and
+    # invoke it with each native tool call as it arrives set this to True.
+    supports_streaming_tool_calls = False
+
     def __init__(self):
         """Initialize the provider."""
         self.name = "base"
@@ -0,0 +1,334 @@
+"""Deterministic stand-in LLM provider for benchmarks and offline runs.
+
+``MockProvider`` replays scripted or recorded responses with a synthetic
+latency model, so framework overhead can be measured independently of model
+speed. ``rev.llm.mock_server`` serves the same responses over Ollama- and
+OpenAI-compatible HTTP endpoints.
+
+A script is a JSON file holding either a list of responses, an object with
+a ``responses`` list, or a run bundle (``rev.run_bundle``) whose recorded
+``llm_calls`` are replayed in order. Each response is a dict with optional
+``content``, ``tool_calls`` (``{"name": ..., "arguments": {...}}``),
+``thinking`` and ``match``. Responses with a ``match`` regex are rules: they
+answer any request whose last message matches and are never used up. The
+others are returned in order; once they run out the script wraps around if
+``loop`` is set, and otherwise answers with ``final_content``.
+"""
+
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .base import LLMProvider, ErrorClass, ProviderError, RetryConfig
+
+
+_CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Deterministic token estimate used for usage counts and pacing."""
+    return (len(text) + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
+
+
+def _message_text(message: Dict[str, Any]) -> str:
+    content = message.get("content", "")
+    if isinstance(content, list):
+        content = "".join(str(part.get("text", "")) if isinstance(part, dict) else str(part) for part in content)
+    return str(content or "")
+
+
+@dataclass
+class MockTurn:
+    """One scripted assistant response, with token counts for the request."""
+    content: str = ""
+    tool_calls: List[Dict[str, Any]] = field(default_factory=list)
+    thinking: Optional[str] = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    def ollama_message(self) -> Dict[str, Any]:
+        message: Dict[str, Any] = {"role": "assistant", "content": self.content}
+        if self.tool_calls:
+            message["tool_calls"] = [
+                {"function": {"name": call["name"], "arguments": call.get("arguments", {})}}
+                for call in self.tool_calls
+            ]
+        if self.thinking:
+            message["thinking"] = self.thinking
+        return message
+
+    def openai_tool_calls(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": f"call_{index}",
+                "type": "function",
+                "function": {"name": call["name"], "arguments": json.dumps(call.get("arguments", {}))},
+            }
+            for index, call in enumerate(self.tool_calls)
+        ]
+
+    def chunks(self) -> Iterator[str]:
+        """Content split into token-sized pieces, as a model would stream it."""
+        for start in range(0, len(self.content), _CHARS_PER_TOKEN):
+            yield self.content[start:start + _CHARS_PER_TOKEN]
+
+
+@dataclass
+class LatencyModel:
+    """Synthetic model timing: fixed time to first token plus token rates.
+
+    A rate of 0 means that phase takes no time.
+    """
+    first_token_ms: float = 0.0
+    prefill_tokens_per_second: float = 0.0
+    tokens_per_second: float = 0.0
+
+    def prefill_seconds(self, prompt_tokens: int) -> float:
+        seconds = self.first_token_ms / 1000.0
+        if self.prefill_tokens_per_second > 0:
+            seconds += prompt_tokens / self.prefill_tokens_per_second
+        return seconds
+
+    def token_seconds(self) -> float:
+        return 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+    def total_seconds(self, turn: MockTurn) -> float:
+        return self.prefill_seconds(turn.prompt_tokens) + turn.completion_tokens * self.token_seconds()
+
+
+def _normalize_tool_call(call: Dict[str, Any]) -> Dict[str, Any]:
+    function = call.get("function", call)
+    arguments = function.get("arguments", {})
+    if isinstance(arguments, str):
+        try:
+            arguments = json.loads(arguments)
+        except ValueError:
+            arguments = {"raw": arguments}
+    return {"name": function.get("name", ""), "arguments": arguments or {}}
+
+
+def _normalize_entry(entry: Any) -> Dict[str, Any]:
+    if isinstance(entry, str):
+        return {"content": entry}
+    if not isinstance(entry, dict):
+        raise ValueError(f"Invalid mock response: {entry!r}")
+    # Recorded provider responses nest the assistant message.
+    message = entry.get("message", entry)
+    normalized = {
+        "content": _message_text(message),
+        "tool_calls": [_normalize_tool_call(c) for c in message.get("tool_calls") or []],
+        "thinking": message.get("thinking"),
+    }
+    if entry.get("match"):
+        normalized["match"] = re.compile(entry["match"], re.IGNORECASE | re.DOTALL)
+    return normalized
+
+
+class MockScript:
+    """Thread-safe cursor over scripted responses."""
+
+    def __init__(self, responses: List[Any], loop: bool = False, final_content: str = "Done."):
+        entries = [_normalize_entry(entry) for entry in responses]
+        self.rules = [entry for entry in entries if "match" in entry]
+        self.sequence = [entry for entry in entries if "match" not in entry]
+        self.loop = loop
+        self.final_content = final_content
+        self._cursor = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: "str | Path", **kwargs) -> "MockScript":
+        """Load a script file, or the ``llm_calls`` of a recorded run bundle."""
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        if isinstance(data, dict) and "llm_calls" in data:
+            responses = [call.get("response", {}) for call in data["llm_calls"]]
+        elif isinstance(data, dict):
+            responses = data.get("responses", [])
+            kwargs.setdefault("loop", bool(data.get("loop", False)))
+            if "final_content" in data:
+                kwargs.setdefault("final_content", data["final_content"])
+        else:
+            responses = data
+        return cls(responses, **kwargs)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._cursor = 0
+
+    def next_turn(self, messages: List[Dict[str, Any]]) -> MockTurn:
+        prompt_text = "".join(_message_text(m) for m in messages)
+        last = _message_text(messages[-1]) if messages else ""
+        entry = next((rule for rule in self.rules if rule["match"].search(last)), None)
+        if entry is None:
+            with self._lock:
+                if self._cursor < len(self.sequence):
+                    entry = self.sequence[self._cursor]
+                    self._cursor += 1
+                    if self.loop and self._cursor == len(self.sequence):
+                        self._cursor = 0
+        if entry is None:
+            entry = {"content": self.final_content, "tool_calls": []}
+        tool_text = "".join(json.dumps(c) for c in entry.get("tool_calls", []))
+        return MockTurn(
+            content=entry.get("content", ""),
+            tool_calls=list(entry.get("tool_calls", [])),
+            thinking=entry.get("thinking"),
+            prompt_tokens=estimate_tokens(prompt_text),
+            completion_tokens=estimate_tokens(entry.get("content", "") + tool_text),
+        )
+
+
+class MockResponder:
+    """Script plus latency model; shared by the provider and the HTTP server."""
+
+    def __init__(self, script: Optional[MockScript] = None, latency: Optional[LatencyModel] = None):
+        self.script = script or MockScript([])
+        self.latency = latency or LatencyModel()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.simulated_seconds = 0.0
+
+    def respond(self, messages: List[Dict[str, Any]]) -> MockTurn:
+        turn = self.script.next_turn(messages)
+        with self._lock:
+            self.requests += 1
+            self.simulated_seconds += self.latency.total_seconds(turn)
+        return turn
+
+    def wait_for_completion(self, turn: MockTurn) -> None:
+        time.sleep(self.latency.total_seconds(turn))
+
+    def stream(self, turn: MockTurn, interrupted: Callable[[], bool] = lambda: False) -> Iterator[str]:
+        """Yield content pieces at the configured token rate.
+
+        Sleeps toward a deadline rather than per token, so pacing does not
+        accumulate sleep overshoot.
+        """
+        start = time.perf_counter()
+        deadline = start + self.latency.prefill_seconds(turn.prompt_tokens)
+        per_token = self.latency.token_seconds()
+        for piece in turn.chunks():
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            if interrupted():
+                return
+            yield piece
+            deadline += per_token
+        remaining = deadline - time.perf_counter()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def timings(self, turn: MockTurn) -> Dict[str, int]:
+        """Ollama-style usage counts and durations (nanoseconds)."""
+        return {
+            "prompt_eval_count": turn.prompt_tokens,
+            "eval_count": turn.completion_tokens,
+            "load_duration": 0,
+            "prompt_eval_duration": int(self.latency.prefill_seconds(turn.prompt_tokens) * 1e9),
+            "eval_duration": int(turn.completion_tokens * self.latency.token_seconds() * 1e9),
+        }
+
+
+class MockProvider(LLMProvider):
+    """In-process provider that answers from a ``MockResponder``.
+
+    Responses have the same shape as ``OllamaProvider`` results, including
+    server timings, so the span profiler can attribute the synthetic time.
+    """
+
+    supports_streaming_tool_calls = True
+
+    def __init__(self, responder: Optional[MockResponder] = None, model: str = "mock"):
+        super().__init__()
+        self.name = "mock"
+        self.model = model
+        self.responder = responder or MockResponder()
+
+    @classmethod
+    def from_config(cls) -> "MockProvider":
+        from rev import config
+
+        script_path = getattr(config, "MOCK_LLM_SCRIPT", "")
+        script = MockScript.load(script_path) if script_path else MockScript([])
+        latency = LatencyModel(
+            first_token_ms=getattr(config, "MOCK_LLM_FIRST_TOKEN_MS", 0.0),
+            prefill_tokens_per_second=getattr(config, "MOCK_LLM_PREFILL_TOKENS_PER_SEC", 0.0),
+            tokens_per_second=getattr(config, "MOCK_LLM_TOKENS_PER_SEC", 0.0),
+        )
+        return cls(MockResponder(script, latency))
+
+    def _response(self, turn: MockTurn, model: Optional[str]) -> Dict[str, Any]:
+        response: Dict[str, Any] = {
+            "model": model or self.model,
+            "message": turn.ollama_message(),
+            "done": True,
+            **self.responder.timings(turn),
+        }
+        response["usage"] = {
+            "prompt": turn.prompt_tokens,
+            "completion": turn.completion_tokens,
+            "total": turn.prompt_tokens + turn.completion_tokens,
+        }
+        return response
+
+    def chat(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        model: Optional[str] = None,
+        supports_tools: bool = True,
+        **kwargs
+    ) -> Dict[str, Any]:
+        turn = self.responder.respond(messages)
+        self.responder.wait_for_completion(turn)
+        return self._response(turn, model)
+
+    def chat_stream(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        model: Optional[str] = None,
+        supports_tools: bool = True,
+        on_chunk: Optional[Callable[[str], None]] = None,
+        check_interrupt: Optional[Callable[[], bool]] = None,
+        check_user_messages: Optional[Callable[[], bool]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        on_tool_call = kwargs.get("on_tool_call")
+        turn = self.responder.respond(messages)
+        for piece in self.responder.stream(turn, check_interrupt or (lambda: False)):
+            if on_chunk:
+                on_chunk(piece)
+        response = self._response(turn, model)
+        if on_tool_call:
+            for call in response["message"].get("tool_calls", []):
+                on_tool_call(call)
+        return response
+
+    def supports_tool_calling(self, model: str) -> bool:
+        return True
+
+    def validate_config(self) -> bool:
+        return True
+
+    def get_model_list(self) -> List[str]:
+        return [self.model]
+
+    def count_tokens(self, messages: List[Dict[str, Any]]) -> int:
+        return sum(estimate_tokens(_message_text(m)) for m in messages)
+
+    def classify_error(self, error: Exception) -> ProviderError:
+        # Only the HTTP path (mock_server) can fail at the transport level.
+        if isinstance(error, TimeoutError):
+            return ProviderError(ErrorClass.TIMEOUT, str(error), retryable=True, original_error=error)
+        if isinstance(error, OSError):
+            return ProviderError(ErrorClass.NETWORK_ERROR, str(error), retryable=True, original_error=error)
+        return ProviderError(ErrorClass.UNKNOWN, str(error), retryable=False, original_error=error)
+
+    def get_retry_config(self) -> RetryConfig:
+        return RetryConfig(max_retries=2, base_backoff=0.1, max_backoff=1.0)
@@ -111,6 +111,11 @@ def _enforce_token_limit(messages: List[Dict[str, Any]], max_tokens: int) -> Tup
     if max_tokens <= 0:
         return [], 0, 0, True
 
+    # Lists built by rev.execution.history carry their estimate: O(1) when under budget.
+    known_tokens = getattr(messages, "estimated_tokens", None)
+    if known_tokens is not None and known_tokens <= effective_max_tokens:
+        return messages, known_tokens, known_tokens, False
+
     original_tokens = sum(_estimate_message_tokens(m) for m in messages)
     if original_tokens <= effective_max_tokens:
         return messages, original_tokens, original_tokens, False
@@ -189,10 +194,16 @@ def _make_request_interruptible(url, json_payload, timeout):
 class OllamaProvider(LLMProvider):
     """Ollama LLM provider."""
 
-    def __init__(self):
+    # chat_stream accepts an ``on_tool_call`` callback for native tool calls.
+    supports_streaming_tool_calls = True
+
+    def __init__(self, base_url: Optional[str] = None):
         super().__init__()
         self.name = "ollama"
-        self.base_url = config.OLLAMA_BASE_URL
+        self.base_url = base_url or config.OLLAMA_BASE_URL
+        # When set, caps attempts per request and disables retry-forever
+        # (used by ProviderPool so a dead endpoint fails over quickly).
+        self.max_attempts_override: Optional[int] = None
 
     def chat(
         self,
@@ -532,7 +543,12 @@ class OllamaProvider(LLMProvider):
         check_user_messages: Optional[Callable[[], bool]] = None,
         **kwargs
     ) -> Dict[str, Any]:
-        """Stream chat responses from Ollama."""
+        """Stream chat responses from Ollama.
+
+        ``on_tool_call`` (keyword) is invoked with each native tool call as
+        soon as its chunk arrives.
+        """
+        on_tool_call = kwargs.pop("on_tool_call", None)
         _setup_signal_handlers()
         _interrupt_requested.clear()
 
@@ -675,6 +691,9 @@ class OllamaProvider(LLMProvider):
 
                         if tool_calls:
                             accumulated_tool_calls.extend(tool_calls)
+                            if on_tool_call:
+                                for tool_call in tool_calls:
+                                    on_tool_call(tool_call)
 
                         if chunk_data.get("done", False):
                             final_message = {
@@ -939,6 +958,10 @@ class OllamaProvider(LLMProvider):
         if not retry_forever:
             max_retries = max(1, max_retries)
 
+        override = getattr(self, "max_attempts_override", None)
+        if override is not None:
+            max_retries, retry_forever = max(1, int(override)), False
+
         return max_retries, retry_forever, backoff_seconds, max_backoff_seconds, timeout_multiplier_cap
 
     def _sleep_before_retry(self, retry_backoff, max_backoff, attempt):
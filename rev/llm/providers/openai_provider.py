@@ -11,7 +11,7 @@ from .base import LLMProvider, ErrorClass, ProviderError, RetryConfig
 class OpenAIProvider(LLMProvider):
     """OpenAI (ChatGPT/GPT-4) LLM provider."""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
         super().__init__()
         self.name = "openai"
         self.api_key = api_key or os.getenv("OPENAI_API_KEY", "") or config.OPENAI_API_KEY
@@ -19,7 +19,7 @@ class OpenAIProvider(LLMProvider):
         self._responses_only_models: set[str] = set()
         self._no_temperature_models: set[str] = set()
         # Allow overriding base URL for OpenAI-compatible local backends (LocalAI/vLLM/LM Studio)
-        self.base_url = os.getenv("OPENAI_BASE_URL", "").strip()
+        self.base_url = (base_url or os.getenv("OPENAI_BASE_URL", "")).strip()
 
     def _get_client(self):
         """Lazy initialization of OpenAI client."""
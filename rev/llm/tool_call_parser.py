@@ -140,3 +140,156 @@ def parse_tool_calls_from_text(content: str) -> Tuple[List[Dict[str, Any]], str,
         cleaned = cleaned.strip()
 
     return tool_calls, cleaned, errors
+
+
+_STREAM_MARKERS = ("```", "<tool_call>", "{")
+# Longest marker prefix that may be split across two stream chunks.
+_STREAM_MARKER_TAIL = len("<tool_call>") - 1
+# An unbalanced "{" older than this is treated as prose rather than a pending call.
+_STREAM_MAX_PENDING_CHARS = 64 * 1024
+
+
+_JsonScanState = Tuple[int, bool, bool]
+_JSON_SCAN_START: _JsonScanState = (0, False, False)
+
+
+def _find_json_object_end(
+    text: str, start: int, state: _JsonScanState = _JSON_SCAN_START
+) -> Tuple[int, _JsonScanState]:
+    """Scan ``text`` from ``start`` for the end of a balanced JSON object.
+
+    ``state`` is the (depth, in_string, escaped) state reached at ``start``, so a
+    scan can resume where the previous one stopped. Returns the index just past
+    the object, or -1, together with the state at the end of the scan.
+    """
+    depth, in_string, escaped = state
+    for idx in range(start, len(text)):
+        ch = text[idx]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return idx + 1, _JSON_SCAN_START
+    return -1, (depth, in_string, escaped)
+
+
+class IncrementalToolCallParser:
+    """Recover tool calls from streamed assistant text as soon as each block closes.
+
+    ``feed`` accepts raw stream chunks and returns the tool calls whose JSON
+    object, fenced code block or ``<tool_call>`` element completed within the
+    text seen so far. ``feed_native`` accepts provider-native tool calls so
+    both sources share one de-duplication set.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        # End of the text already searched for the closing delimiter of the
+        # block pending at ``_pos``; only the tail past it is scanned again.
+        self._scanned = 0
+        # Brace-matching state at ``_scanned`` for a pending inline JSON object.
+        self._json_state: _JsonScanState = _JSON_SCAN_START
+        self._counter = 1
+        self._seen_ids: set[str] = set()
+        self._fingerprints: set[str] = set()
+        self.errors: List[str] = []
+        self.emitted: List[Dict[str, Any]] = []
+
+    def _advance(self, pos: int) -> None:
+        """Move past a finished block and drop the state of its pending scan."""
+        self._pos = pos
+        self._scanned = 0
+        self._json_state = _JSON_SCAN_START
+
+    def _accept(self, calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        fresh: List[Dict[str, Any]] = []
+        for call in calls:
+            fn = call.get("function", {}) if isinstance(call, dict) else {}
+            args = fn.get("arguments", {})
+            if not isinstance(args, str):
+                try:
+                    args = json.dumps(args, sort_keys=True)
+                except Exception:
+                    args = str(args)
+            fingerprint = f"{fn.get('name')}:{args}"
+            if fingerprint in self._fingerprints:
+                continue
+            self._fingerprints.add(fingerprint)
+            fresh.append(call)
+        self.emitted.extend(fresh)
+        return fresh
+
+    def _parse_snippet(self, snippet: str, xml: bool = False) -> List[Dict[str, Any]]:
+        calls: List[Dict[str, Any]] = []
+        if xml:
+            self._counter, _ = _parse_xml_snippets(snippet, self._counter, self.errors, calls, self._seen_ids)
+            return calls
+        try:
+            parsed = json.loads(snippet)
+        except Exception:
+            return calls
+        self._counter = _parse_json_obj(parsed, self._counter, self.errors, calls, self._seen_ids)
+        return calls
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        """Append streamed text and return newly completed tool calls."""
+        if text:
+            self._buffer += text
+        buf = self._buffer
+        found: List[Dict[str, Any]] = []
+        while True:
+            starts = [(buf.find(m, self._pos), m) for m in _STREAM_MARKERS]
+            starts = [(i, m) for i, m in starts if i >= 0]
+            if not starts:
+                self._pos = max(self._pos, len(buf) - _STREAM_MARKER_TAIL)
+                break
+            start, marker = min(starts)
+            if marker == "```":
+                body_start = buf.find("\n", start + 3)
+                close = buf.find("```", max(start + 3, self._scanned - 2))
+                if close < 0:
+                    self._pos, self._scanned = start, len(buf)
+                    break
+                body = buf[body_start + 1 if 0 <= body_start < close else start + 3:close].strip()
+                found.extend(self._parse_snippet(body))
+                self._advance(close + 3)
+            elif marker == "<tool_call>":
+                close_tag = "</tool_call>"
+                # Lowercase only the unscanned tail, overlapping the previous
+                # scan so a closing tag split across chunks is still found.
+                scan_from = max(start + len(marker), self._scanned - len(close_tag) + 1)
+                close = buf[scan_from:].lower().find(close_tag)
+                if close < 0:
+                    self._pos, self._scanned = start, len(buf)
+                    break
+                end = scan_from + close + len(close_tag)
+                found.extend(self._parse_snippet(buf[start:end], xml=True))
+                self._advance(end)
+            else:
+                end, state = _find_json_object_end(buf, max(start, self._scanned), self._json_state)
+                if end < 0:
+                    if len(buf) - start > _STREAM_MAX_PENDING_CHARS:
+                        # Stray brace in prose; stop waiting for it to close.
+                        self._advance(start + 1)
+                        continue
+                    self._pos, self._scanned, self._json_state = start, len(buf), state
+                    break
+                found.extend(self._parse_snippet(buf[start:end]))
+                self._advance(end)
+        return self._accept(found)
+
+    def feed_native(self, tool_calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Register provider-native tool calls and return the ones not seen before."""
+        return self._accept([tc for tc in tool_calls or [] if isinstance(tc, dict)])
@@ -9,19 +9,35 @@ import shutil
 from typing import Optional
 
 from . import config
+from ._lazy import exports_from, lazy_exports
 from .cache import initialize_caches
-from .execution import planning_mode, execution_mode, concurrent_execution_mode
-from .execution.reviewer import review_execution_plan, ReviewStrictness, ReviewDecision
-from .execution.validator import validate_execution, ValidationStatus
-from .execution.orchestrator import run_orchestrated
-from .terminal import repl_mode
 from .settings_manager import apply_saved_settings
 from .models.task import ExecutionPlan, TaskStatus
-from .tools.registry import get_available_tools
 from .debug_logger import DebugLogger
-from .execution.state_manager import StateManager
 from rev.mcp.loader import start_mcp_servers, stop_mcp_servers
 
+# The agent stack (orchestrator, LLM client, tool registry) is only needed once
+# arguments have been parsed; deferring it keeps `rev --help`/`--version` fast.
+_LAZY_IMPORTS = exports_from({
+    "rev.execution.planner": ["planning_mode"],
+    "rev.execution.executor": ["execution_mode", "concurrent_execution_mode"],
+    "rev.execution.reviewer": ["review_execution_plan", "ReviewStrictness", "ReviewDecision"],
+    "rev.execution.validator": ["validate_execution", "ValidationStatus"],
+    "rev.execution.orchestrator": ["run_orchestrated"],
+    "rev.terminal.repl": ["repl_mode"],
+    "rev.tools.registry": ["get_available_tools"],
+    "rev.execution.state_manager": ["StateManager"],
+})
+__getattr__, _ = lazy_exports(__name__, _LAZY_IMPORTS, globals())
+
+
+def _resolve_lazy_imports() -> None:
+    """Bind the deferred imports as module globals (keeping any patched ones)."""
+    namespace = globals()
+    for name in _LAZY_IMPORTS:
+        if name not in namespace:
+            __getattr__(name)
+
 
 def main():
     """Main entry point for the rev CLI."""
@@ -33,6 +49,9 @@ def main():
     pre_parser = argparse.ArgumentParser(add_help=False)
     pre_parser.add_argument("--workspace", type=str, default=None)
     pre_parser.add_argument("--allow-external-paths", action="store_true", default=False)
+    # Flags that end the run before any task executes; no point warming indexes.
+    for flag in ("--no-warmup", "--clean", "--version", "-h", "--help"):
+        pre_parser.add_argument(flag, action="store_true", default=False)
     pre_args, _unknown = pre_parser.parse_known_args()
 
     # Initialize workspace from CLI args and environment variable
@@ -60,6 +79,14 @@ def main():
     cache_dir = config.CACHE_DIR
     initialize_caches(config.ROOT, cache_dir)
 
+    # Build retrieval indexes on background workers so they overlap with
+    # provider setup and the user typing a prompt instead of the first task.
+    warmup = None
+    if not (pre_args.no_warmup or pre_args.clean or pre_args.version or pre_args.help):
+        from rev.retrieval.warmup import start_session_warmup
+
+        warmup = start_session_warmup(config.ROOT)
+
     parser = argparse.ArgumentParser(
         description="rev - CI/CD Agent powered by Ollama"
     )
@@ -220,6 +247,11 @@ def main():
         action="store_true",
         help="Disable MCP server startup and registration for this run"
     )
+    parser.add_argument(
+        "--no-warmup",
+        action="store_true",
+        help="Do not pre-build retrieval indexes in the background at startup (or set REV_WARMUP=false)"
+    )
     parser.add_argument(
         "--research",
         action="store_true",
@@ -302,6 +334,11 @@ def main():
         action="store_true",
         help="Enable detailed debug logging to file for LLM review"
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile the run: per-phase latency breakdown, flame graph input and cProfile data under .rev/metrics/profiles"
+    )
     parser.add_argument(
         "--clean",
         action="store_true",
@@ -359,6 +396,7 @@ def main():
 
 
     args = parser.parse_args()
+    _resolve_lazy_imports()
     config.EXPLICIT_YES = bool(args.yes)
     # Windows: ensure ANSI output is handled correctly in classic consoles.
     try:
@@ -439,6 +477,13 @@ def main():
     if args.debug:
         _log(f"Debug logging enabled: {debug_logger.log_file_path}")
 
+    if args.profile:
+        from rev.profiler import get_profiler
+
+        config.PROFILE_ENABLED = True
+        get_profiler().enable()
+        get_profiler().start_cprofile()
+
     # Update config globals for ollama_chat function
     config.set_model(args.model)
     config.OLLAMA_BASE_URL = args.base_url
@@ -1122,6 +1167,17 @@ def main():
                 stop_mcp_servers(mcp_processes)
         except Exception:
             pass
+        if warmup is not None:
+            from rev.retrieval.warmup import stop_session_warmup
+
+            debug_logger.log("warmup", "TIMINGS", warmup.get_timings())
+            stop_session_warmup()
+        if args.profile:
+            from rev.profiler import get_profiler, profiles_dir
+
+            prof_path = get_profiler().stop_cprofile(profiles_dir())
+            if prof_path is not None:
+                _log(f"cProfile data: {prof_path}")
         # Close the debug logger
         debug_logger.close()
 
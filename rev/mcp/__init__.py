@@ -8,6 +8,7 @@ from .client import (
     mcp_add_server,
     mcp_list_servers,
     mcp_call_tool,
+    mcp_list_tools,
     mcp_enable_private_mode,
     mcp_disable_private_mode,
     mcp_get_private_mode_status,
@@ -20,6 +21,7 @@ __all__ = [
     "mcp_add_server",
     "mcp_list_servers",
     "mcp_call_tool",
+    "mcp_list_tools",
     "mcp_enable_private_mode",
     "mcp_disable_private_mode",
     "mcp_get_private_mode_status",
@@ -2,10 +2,14 @@
 # -*- coding: utf-8 -*-
 """MCP (Model Context Protocol) client for rev."""
 
+import atexit
 import json
 import os
+import threading
 from typing import Dict, Any, List, Optional
 
+from rev.mcp.transport import MCPError, MCPSession, MCPTimeoutError, create_session
+
 
 class MCPClient:
     """Client for Model Context Protocol servers."""
@@ -13,20 +17,31 @@ class MCPClient:
     def __init__(self, load_defaults: bool = True):
         self.servers = {}
         self.tools = {}
+        self._sessions: Dict[str, MCPSession] = {}
+        self._sessions_lock = threading.Lock()
 
         # Load default MCP servers if enabled
         if load_defaults:
             self._load_default_servers()
 
-    def add_server(self, name: str, command: str, args: List[str] = None) -> Dict[str, Any]:
+    def add_server(
+        self,
+        name: str,
+        command: str,
+        args: List[str] = None,
+        env: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
         """Add an MCP server."""
         try:
+            self._close_session(name)
             # Store server configuration
             self.servers[name] = {
                 "command": command,
                 "args": args or [],
                 "connected": False
             }
+            if env:
+                self.servers[name]["env"] = dict(env)
             return {"added": name, "command": command}
         except Exception as e:
             return {"error": f"{type(e).__name__}: {e}"}
@@ -35,22 +50,98 @@ class MCPClient:
         """List configured MCP servers."""
         return {"servers": list(self.servers.keys())}
 
-    def call_mcp_tool(self, server: str, tool: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
-        """Call a tool on an MCP server."""
+    def _get_session(self, server: str) -> MCPSession:
+        """Return the persistent session for ``server``, creating it on first use."""
+        with self._sessions_lock:
+            session = self._sessions.get(server)
+            if session is None:
+                from rev import config
+
+                session = create_session(
+                    server,
+                    self.servers[server],
+                    request_timeout=getattr(config, "MCP_REQUEST_TIMEOUT", 60.0),
+                    connect_timeout=getattr(config, "MCP_CONNECT_TIMEOUT", 15.0),
+                    max_restarts=getattr(config, "MCP_MAX_RESTARTS", 3),
+                )
+                self._sessions[server] = session
+            return session
+
+    def _close_session(self, server: str) -> None:
+        with self._sessions_lock:
+            session = self._sessions.pop(server, None)
+        if session is not None:
+            session.close()
+        if server in self.servers:
+            self.servers[server]["connected"] = False
+        self.tools.pop(server, None)
+
+    def start_server(self, server: str):
+        """Spawn a local server's process ahead of its first call.
+
+        Returns the process handle, or None for remote servers.
+        """
+        if server not in self.servers:
+            raise MCPError(f"Server not found: {server}")
+        session = self._get_session(server)
+        start = getattr(session, "start", None)
+        return start() if start else None
+
+    def list_mcp_tools(self, server: str, refresh: bool = False) -> Dict[str, Any]:
+        """List tools exposed by an MCP server (cached per server)."""
         try:
             if server not in self.servers:
                 return {"error": f"Server not found: {server}"}
+            tools = self._get_session(server).list_tools(refresh=refresh)
+            self.tools[server] = tools
+            self.servers[server]["connected"] = True
+            return {"server": server, "tools": tools}
+        except Exception as e:
+            return {"error": f"{type(e).__name__}: {e}"}
 
-            # For now, return a placeholder
-            # Full MCP implementation would use stdio communication
-            return {
+    def call_mcp_tool(
+        self,
+        server: str,
+        tool: str,
+        arguments: Dict[str, Any],
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Call a tool on an MCP server."""
+        try:
+            if server not in self.servers:
+                return {"error": f"Server not found: {server}"}
+            if not tool:
+                return {"error": "No tool name specified"}
+
+            session = self._get_session(server)
+            result = session.call_tool(tool, arguments or {}, timeout=timeout)
+            self.servers[server]["connected"] = True
+            result = result if isinstance(result, dict) else {"content": result}
+            response = {
                 "mcp_call": True,
                 "server": server,
                 "tool": tool,
-                "note": "MCP server communication would happen here"
+                "content": result.get("content", []),
+                "is_error": bool(result.get("isError")),
             }
+            if "structuredContent" in result:
+                response["structured_content"] = result["structuredContent"]
+            return response
+        except MCPTimeoutError as e:
+            return {"error": str(e), "server": server, "tool": tool, "timeout": True}
         except Exception as e:
-            return {"error": f"{type(e).__name__}: {e}"}
+            return {"error": f"{type(e).__name__}: {e}", "server": server, "tool": tool}
+
+    def get_tool_stats(self) -> Dict[str, Any]:
+        """Per-server call counts and latency for servers used so far."""
+        with self._sessions_lock:
+            sessions = dict(self._sessions)
+        return {name: session.get_stats() for name, session in sessions.items()}
+
+    def close(self) -> None:
+        """Shut down all server connections and processes."""
+        for server in list(self._sessions):
+            self._close_session(server)
 
     def _load_default_servers(self) -> None:
         """Load default MCP servers from configuration."""
@@ -114,6 +205,7 @@ class MCPClient:
             Result dictionary
         """
         try:
+            self._close_session(name)
             self.servers[name] = {
                 "type": "remote",
                 "url": url,
@@ -147,6 +239,7 @@ class MCPClient:
             set_private_mode(True)
 
             # Reload servers (will skip public ones)
+            self.close()
             self.servers.clear()
             self.tools.clear()
             self._load_default_servers()
@@ -181,6 +274,7 @@ class MCPClient:
             set_private_mode(False)
 
             # Reload servers (will include public ones)
+            self.close()
             self.servers.clear()
             self.tools.clear()
             self._load_default_servers()
@@ -222,6 +316,7 @@ class MCPClient:
 
 # Global MCP client instance
 mcp_client = MCPClient()
+atexit.register(mcp_client.close)
 
 
 def mcp_add_server(name: str, command: str, args: str = "") -> str:
@@ -247,6 +342,12 @@ def mcp_call_tool(server: str, tool: str, arguments: str = "{}") -> str:
         return json.dumps({"error": f"Invalid JSON arguments: {e}"})
 
 
+def mcp_list_tools(server: str, refresh: bool = False) -> str:
+    """List the tools exposed by an MCP server."""
+    result = mcp_client.list_mcp_tools(server, refresh=refresh)
+    return json.dumps(result)
+
+
 def mcp_enable_private_mode() -> str:
     """Enable private mode - disables all public MCP servers."""
     result = mcp_client.enable_private_mode()
@@ -62,10 +62,22 @@ def _register_entry(entry: Dict[str, Any]) -> Optional[str]:
             name=name,
             command=entry["command"],
             args=entry.get("args", []),
+            env=entry.get("env") or None,
         )
     return name
 
 
+def _start_registered_server(name: str) -> Optional[subprocess.Popen]:
+    """Spawn a registered server through the client's persistent stdio session."""
+    try:
+        from rev.mcp.client import mcp_client
+
+        return mcp_client.start_server(name)
+    except Exception as e:
+        get_logger().log("mcp", "START_ERROR", {"server": name, "error": str(e)}, "ERROR")
+        return None
+
+
 def _start_mcp_server(entry: Dict[str, Any]) -> Optional[subprocess.Popen]:
     """Start a single MCP server based on config entry."""
     name = entry.get("name") or "mcp"
@@ -92,9 +104,12 @@ def start_mcp_servers(root: Path, enable: bool = True, register: bool = True) ->
     procs: List[subprocess.Popen] = []
 
     for entry in servers:
-        if register:
-            _register_entry(entry)
-        proc = _start_mcp_server(entry)
+        name = _register_entry(entry) if register else None
+        if name and entry.get("command") and not entry.get("url"):
+            # The client owns the process so tool calls reuse its stdio pipe.
+            proc = _start_registered_server(name)
+        else:
+            proc = _start_mcp_server(entry)
         if proc:
             procs.append(proc)
             get_logger().log("mcp", "STARTED", {"server": entry.get("name"), "pid": proc.pid}, "INFO")
@@ -0,0 +1,565 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""JSON-RPC transports for MCP servers.
+
+Each session keeps one long-lived connection to a server and multiplexes
+concurrent requests over it, correlating responses by JSON-RPC id:
+
+- ``StdioMCPSession``: a subprocess speaking newline-delimited JSON on
+  stdin/stdout.
+- ``SSEMCPSession``: the HTTP+SSE transport (GET an event stream, POST
+  requests to the endpoint it announces).
+- ``HTTPMCPSession``: the streamable HTTP transport (POST each request, the
+  reply is JSON or a short SSE stream), reusing pooled connections.
+
+Sessions connect lazily, cache the server's tool list, apply per-call
+timeouts, restart a crashed connection (bounded by ``max_restarts``) and keep
+per-server latency statistics.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin
+
+PROTOCOL_VERSION = "2024-11-05"
+
+
+class MCPError(Exception):
+    """Base error for MCP transport failures."""
+
+
+class MCPTimeoutError(MCPError):
+    """A request did not receive a response in time."""
+
+
+class MCPServerError(MCPError):
+    """The server answered with a JSON-RPC error object."""
+
+    def __init__(self, message: str, code: Optional[int] = None, data: Any = None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+
+def iter_sse_events(lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """Yield ``(event, data)`` pairs from decoded SSE lines."""
+    event, data = "message", []
+    for raw in lines:
+        line = raw.rstrip("\r")
+        if not line:
+            if data:
+                yield event, "\n".join(data)
+            event, data = "message", []
+            continue
+        if line.startswith(":"):
+            continue
+        field, _, value = line.partition(":")
+        value = value[1:] if value.startswith(" ") else value
+        if field == "event":
+            event = value
+        elif field == "data":
+            data.append(value)
+    if data:
+        yield event, "\n".join(data)
+
+
+class MCPSession:
+    """Base class: request multiplexing, handshake, tool cache and stats."""
+
+    def __init__(
+        self,
+        name: str,
+        request_timeout: float = 60.0,
+        connect_timeout: float = 15.0,
+        max_restarts: int = 3,
+    ):
+        self.name = name
+        self.request_timeout = request_timeout
+        self.connect_timeout = connect_timeout
+        self.max_restarts = max_restarts
+        self.server_info: Dict[str, Any] = {}
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, Future] = {}
+        self._pending_lock = threading.Lock()
+        self._connect_lock = threading.RLock()
+        self._connected = False
+        self._started_once = False
+        self._closed = False
+        self._tools: Optional[List[Dict[str, Any]]] = None
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, Any] = {
+            "calls": 0,
+            "errors": 0,
+            "timeouts": 0,
+            "restarts": 0,
+            "total_latency": 0.0,
+            "max_latency": 0.0,
+            "last_latency": 0.0,
+        }
+
+    # -- transport hooks -------------------------------------------------
+
+    def _open(self) -> None:
+        raise NotImplementedError
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def _alive(self) -> bool:
+        return self._connected
+
+    def _close_transport(self) -> None:
+        pass
+
+    # -- connection management -------------------------------------------
+
+    def connect(self) -> None:
+        """Open the connection and perform the MCP handshake if needed."""
+        with self._connect_lock:
+            if self._closed:
+                raise MCPError(f"MCP session '{self.name}' is closed")
+            if self._connected and self._alive():
+                return
+            if self._started_once:
+                if self._stats["restarts"] >= self.max_restarts:
+                    raise MCPError(f"MCP server '{self.name}' crashed and exceeded {self.max_restarts} restarts")
+                with self._stats_lock:
+                    self._stats["restarts"] += 1
+                self._connected = False
+                self._close_transport()
+                self._fail_pending(MCPError(f"MCP server '{self.name}' restarted"))
+            self._started_once = True
+            self._open()
+            self._connected = True
+            try:
+                result = self._call("initialize", {
+                    "protocolVersion": PROTOCOL_VERSION,
+                    "capabilities": {},
+                    "clientInfo": {"name": "rev", "version": _rev_version()},
+                }, self.connect_timeout)
+                self.server_info = result if isinstance(result, dict) else {}
+                self.notify("notifications/initialized")
+            except Exception:
+                self._connected = False
+                self._close_transport()
+                raise
+
+    def close(self) -> None:
+        with self._connect_lock:
+            self._closed = True
+            self._connected = False
+            self._close_transport()
+        self._fail_pending(MCPError(f"MCP session '{self.name}' closed"))
+
+    @property
+    def connected(self) -> bool:
+        return self._connected and self._alive()
+
+    # -- JSON-RPC ---------------------------------------------------------
+
+    def request(self, method: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Any:
+        """Send a request (connecting first if needed) and wait for its result."""
+        self.connect()
+        return self._call(method, params, timeout)
+
+    def notify(self, method: str, params: Optional[Dict[str, Any]] = None) -> None:
+        message: Dict[str, Any] = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        self._send(message)
+
+    def _call(self, method: str, params: Optional[Dict[str, Any]], timeout: Optional[float]) -> Any:
+        request_id = next(self._ids)
+        future: Future = Future()
+        with self._pending_lock:
+            self._pending[request_id] = future
+        message = {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params or {}}
+        try:
+            self._send(message)
+        except Exception as e:
+            with self._pending_lock:
+                self._pending.pop(request_id, None)
+            self._connected = False
+            raise MCPError(f"Failed to send to MCP server '{self.name}': {e}") from e
+        wait = self.request_timeout if timeout is None else timeout
+        try:
+            return future.result(timeout=wait)
+        except FutureTimeout:
+            with self._pending_lock:
+                self._pending.pop(request_id, None)
+            try:
+                self.notify("notifications/cancelled", {"requestId": request_id, "reason": "timeout"})
+            except Exception:
+                pass
+            raise MCPTimeoutError(f"MCP request '{method}' to '{self.name}' timed out after {wait}s")
+
+    def _dispatch(self, message: Any) -> None:
+        """Route one incoming message (response, server request or notification)."""
+        if isinstance(message, list):
+            for item in message:
+                self._dispatch(item)
+            return
+        if not isinstance(message, dict):
+            return
+        if "id" in message and ("result" in message or "error" in message):
+            with self._pending_lock:
+                future = self._pending.pop(message["id"], None)
+            if future is None or future.done():
+                return
+            error = message.get("error")
+            if error:
+                if not isinstance(error, dict):
+                    error = {"message": str(error)}
+                future.set_exception(MCPServerError(
+                    str(error.get("message", "MCP error")), error.get("code"), error.get("data")
+                ))
+            else:
+                future.set_result(message.get("result"))
+            return
+        method = message.get("method")
+        if method and "id" in message:
+            # Server-initiated request; we only support ping.
+            if method == "ping":
+                reply: Dict[str, Any] = {"jsonrpc": "2.0", "id": message["id"], "result": {}}
+            else:
+                reply = {"jsonrpc": "2.0", "id": message["id"],
+                         "error": {"code": -32601, "message": f"Method not supported: {method}"}}
+            try:
+                self._send(reply)
+            except Exception:
+                pass
+        elif method == "notifications/tools/list_changed":
+            self._tools = None
+
+    def _fail_pending(self, error: Exception) -> None:
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    # -- MCP methods ------------------------------------------------------
+
+    def list_tools(self, refresh: bool = False) -> List[Dict[str, Any]]:
+        """Return the server's tools, fetched once and cached."""
+        if self._tools is not None and not refresh:
+            return self._tools
+        tools: List[Dict[str, Any]] = []
+        cursor = None
+        while True:
+            result = self.request("tools/list", {"cursor": cursor} if cursor else {}) or {}
+            tools.extend(result.get("tools") or [])
+            cursor = result.get("nextCursor")
+            if not cursor:
+                break
+        self._tools = tools
+        return tools
+
+    def call_tool(self, tool: str, arguments: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Any:
+        started = time.perf_counter()
+        outcome = "errors"
+        try:
+            result = self.request("tools/call", {"name": tool, "arguments": arguments or {}}, timeout)
+            outcome = None
+            return result
+        except MCPTimeoutError:
+            outcome = "timeouts"
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._stats_lock:
+                stats = self._stats
+                stats["calls"] += 1
+                stats["total_latency"] += elapsed
+                stats["last_latency"] = elapsed
+                stats["max_latency"] = max(stats["max_latency"], elapsed)
+                if outcome:
+                    stats[outcome] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        calls = stats["calls"]
+        stats["avg_latency"] = stats["total_latency"] / calls if calls else 0.0
+        for key in ("total_latency", "max_latency", "last_latency", "avg_latency"):
+            stats[key] = round(stats[key], 4)
+        stats["connected"] = self.connected
+        stats["tools_cached"] = self._tools is not None
+        return stats
+
+
+class StdioMCPSession(MCPSession):
+    """MCP server running as a subprocess, newline-delimited JSON over stdio."""
+
+    def __init__(
+        self,
+        name: str,
+        command: str,
+        args: Optional[List[str]] = None,
+        env: Optional[Dict[str, str]] = None,
+        cwd: Optional[str] = None,
+        **kwargs: Any,
+    ):
+        super().__init__(name, **kwargs)
+        self.command = command
+        self.args = list(args or [])
+        self.env = dict(env or {})
+        self.cwd = cwd
+        self.process: Optional[subprocess.Popen] = None
+        self._write_lock = threading.Lock()
+
+    def start(self) -> subprocess.Popen:
+        """Spawn the server process without performing the handshake."""
+        with self._connect_lock:
+            if self.process is None or self.process.poll() is not None:
+                self._spawn()
+        return self.process
+
+    def _spawn(self) -> None:
+        if not self.command:
+            raise MCPError(f"MCP server '{self.name}' has no command")
+        env = os.environ.copy()
+        env.update(self.env)
+        try:
+            process = subprocess.Popen(
+                [self.command, *self.args],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                env=env,
+                cwd=self.cwd,
+                bufsize=0,
+            )
+        except OSError as e:
+            raise MCPError(f"Failed to start MCP server '{self.name}': {e}") from e
+        self.process = process
+        threading.Thread(
+            target=self._read_loop, args=(process,), name=f"mcp-{self.name}-reader", daemon=True
+        ).start()
+
+    def _open(self) -> None:
+        if self.process is None or self.process.poll() is not None:
+            self._spawn()
+
+    def _read_loop(self, process: subprocess.Popen) -> None:
+        stream = process.stdout
+        try:
+            for raw in iter(stream.readline, b""):
+                line = raw.decode("utf-8", errors="replace").strip()
+                if not line:
+                    continue
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # servers sometimes log to stdout
+                self._dispatch(message)
+        except (OSError, ValueError):
+            pass
+        if process is self.process:
+            self._connected = False
+            self._fail_pending(MCPError(f"MCP server '{self.name}' exited (code {process.poll()})"))
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        process = self.process
+        if process is None or process.poll() is not None or process.stdin is None:
+            raise MCPError(f"MCP server '{self.name}' is not running")
+        data = (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._write_lock:
+            process.stdin.write(data)
+            process.stdin.flush()
+
+    def _alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def _close_transport(self) -> None:
+        process, self.process = self.process, None
+        if process is None:
+            return
+        try:
+            if process.stdin:
+                process.stdin.close()
+        except Exception:
+            pass
+        try:
+            if process.poll() is None:
+                process.terminate()
+                process.wait(timeout=3)
+        except Exception:
+            try:
+                process.kill()
+            except Exception:
+                pass
+
+
+class HTTPMCPSession(MCPSession):
+    """Streamable HTTP transport: one POST per message over a pooled session."""
+
+    def __init__(self, name: str, url: str, headers: Optional[Dict[str, str]] = None, **kwargs: Any):
+        super().__init__(name, **kwargs)
+        self.url = url
+        self.headers = dict(headers or {})
+        self._http = None
+        self._session_id: Optional[str] = None
+
+    def _open(self) -> None:
+        import requests
+
+        if self._http is None:
+            self._http = requests.Session()
+        self._session_id = None
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json, text/event-stream",
+            **self.headers,
+        }
+        if self._session_id:
+            headers["Mcp-Session-Id"] = self._session_id
+        is_request = "id" in message and "method" in message
+        response = self._http.post(
+            self.url,
+            data=json.dumps(message),
+            headers=headers,
+            stream=True,
+            timeout=(self.connect_timeout, self.request_timeout),
+        )
+        try:
+            response.raise_for_status()
+            session_id = response.headers.get("Mcp-Session-Id")
+            if session_id:
+                self._session_id = session_id
+            if not is_request:
+                return
+            content_type = response.headers.get("Content-Type", "")
+            if "text/event-stream" in content_type:
+                lines = response.iter_lines(decode_unicode=True)
+                for _event, data in iter_sse_events(lines):
+                    try:
+                        reply = json.loads(data)
+                    except json.JSONDecodeError:
+                        continue
+                    self._dispatch(reply)
+                    if isinstance(reply, dict) and reply.get("id") == message["id"]:
+                        break
+            elif response.content:
+                self._dispatch(response.json())
+        finally:
+            response.close()
+
+    def _close_transport(self) -> None:
+        if self._http is not None and self._session_id:
+            try:
+                self._http.delete(self.url, headers={"Mcp-Session-Id": self._session_id}, timeout=5)
+            except Exception:
+                pass
+        self._session_id = None
+
+
+class SSEMCPSession(MCPSession):
+    """HTTP+SSE transport: responses arrive on a long-lived event stream."""
+
+    def __init__(self, name: str, url: str, headers: Optional[Dict[str, str]] = None, **kwargs: Any):
+        super().__init__(name, **kwargs)
+        self.url = url
+        self.headers = dict(headers or {})
+        self._http = None
+        self._stream = None
+        self._endpoint: Optional[str] = None
+        self._endpoint_ready = threading.Event()
+
+    def _open(self) -> None:
+        import requests
+
+        if self._http is None:
+            self._http = requests.Session()
+        self._endpoint = None
+        self._endpoint_ready.clear()
+        stream = self._http.get(
+            self.url,
+            headers={"Accept": "text/event-stream", **self.headers},
+            stream=True,
+            timeout=(self.connect_timeout, None),
+        )
+        stream.raise_for_status()
+        self._stream = stream
+        threading.Thread(
+            target=self._read_loop, args=(stream,), name=f"mcp-{self.name}-sse", daemon=True
+        ).start()
+        if not self._endpoint_ready.wait(self.connect_timeout):
+            self._close_transport()
+            raise MCPTimeoutError(f"MCP server '{self.name}' did not announce an SSE endpoint")
+
+    def _read_loop(self, stream) -> None:
+        try:
+            for event, data in iter_sse_events(stream.iter_lines(decode_unicode=True)):
+                if event == "endpoint":
+                    self._endpoint = urljoin(self.url, data.strip())
+                    self._endpoint_ready.set()
+                    continue
+                try:
+                    self._dispatch(json.loads(data))
+                except json.JSONDecodeError:
+                    continue
+        except Exception:
+            pass
+        if stream is self._stream:
+            self._connected = False
+            self._fail_pending(MCPError(f"MCP SSE stream for '{self.name}' closed"))
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        if not self._endpoint:
+            raise MCPError(f"MCP server '{self.name}' is not connected")
+        response = self._http.post(
+            self._endpoint,
+            data=json.dumps(message),
+            headers={"Content-Type": "application/json", **self.headers},
+            timeout=(self.connect_timeout, self.request_timeout),
+        )
+        response.raise_for_status()
+
+    def _alive(self) -> bool:
+        return self._stream is not None and self._endpoint is not None
+
+    def _close_transport(self) -> None:
+        stream, self._stream = self._stream, None
+        self._endpoint = None
+        if stream is not None:
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+
+def create_session(name: str, server: Dict[str, Any], **kwargs: Any) -> MCPSession:
+    """Build the right session type for a server config from ``MCPClient``."""
+    url = server.get("url")
+    if url:
+        headers = server.get("headers") or {}
+        if url.rstrip("/").endswith("/sse"):
+            return SSEMCPSession(name, url, headers=headers, **kwargs)
+        return HTTPMCPSession(name, url, headers=headers, **kwargs)
+    return StdioMCPSession(
+        name,
+        server.get("command", ""),
+        server.get("args") or [],
+        env=server.get("env") or {},
+        **kwargs,
+    )
+
+
+def _rev_version() -> str:
+    try:
+        from rev import __version__
+
+        return str(__version__)
+    except Exception:
+        return "unknown"
@@ -1016,19 +1016,18 @@ class ExecutionPlan:
         """Save the current execution state to a checkpoint file.
 
         Args:
-            filepath: Path to save checkpoint. If None, uses default location.
+            filepath: Path to save checkpoint. If None, appends to this plan's
+                checkpoint log in the default location.
             agent_state: Optional agent state dict to persist (e.g., recovery_attempts)
+
+        Returns:
+            Path of the checkpoint file (for the default location, the log
+            file, which loads as its latest checkpoint)
         """
         import json
         import os
         from datetime import datetime
 
-        if filepath is None:
-            checkpoint_dir = config.CHECKPOINTS_DIR
-            os.makedirs(checkpoint_dir, exist_ok=True)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filepath = os.path.join(checkpoint_dir, f"checkpoint_{timestamp}.json")
-
         checkpoint_data = {
             "version": "1.2",  # Bumped version for model_config support
             "timestamp": datetime.now().isoformat(),
@@ -1066,6 +1065,19 @@ class ExecutionPlan:
             if filtered_state:
                 checkpoint_data["agent_state"] = filtered_state
 
+        if filepath is None:
+            # Lazy import to avoid circular dependency
+            from uuid import uuid4
+            from rev.execution.checkpoint_store import get_checkpoint_store, parse_ref
+
+            session_id = getattr(self, "_checkpoint_session", None)
+            if session_id is None:
+                session_id = self._checkpoint_session = uuid4().hex
+            plan = checkpoint_data.pop("plan")
+            checkpoint_data.pop("timestamp")
+            ref = get_checkpoint_store(config.CHECKPOINTS_DIR).append(session_id, plan, **checkpoint_data)
+            return str(parse_ref(ref)[0])
+
         with open(filepath, "w") as f:
             json.dump(checkpoint_data, f, indent=2)
 
@@ -1076,15 +1088,15 @@ class ExecutionPlan:
         """Load an execution plan from a checkpoint file.
 
         Args:
-            filepath: Path to the checkpoint file
+            filepath: Path to the checkpoint file, or a checkpoint log reference
 
         Returns:
             Tuple of (ExecutionPlan, agent_state dict, model_config dict) restored from checkpoint
         """
-        import json
+        # Lazy import to avoid circular dependency
+        from rev.execution.checkpoint_store import read_checkpoint
 
-        with open(filepath, "r") as f:
-            checkpoint_data = json.load(f)
+        checkpoint_data = read_checkpoint(filepath)
 
         plan = cls.from_dict(checkpoint_data["plan"])
         agent_state = checkpoint_data.get("agent_state", {})
@@ -1104,13 +1116,24 @@ class ExecutionPlan:
         import os
         import json
         from datetime import datetime
+        # Lazy import to avoid circular dependency
+        from rev.execution.checkpoint_store import INDEX_FILENAME, get_checkpoint_store
 
         if not os.path.exists(checkpoint_dir):
             return []
 
         checkpoints = []
+        for entry in get_checkpoint_store(checkpoint_dir).list():
+            checkpoints.append({
+                "filename": os.path.basename(entry["ref"]),
+                "filepath": entry["ref"],
+                "timestamp": entry.get("timestamp"),
+                "tasks_total": entry.get("tasks_total", 0),
+                "summary": entry.get("summary", "")
+            })
+
         for filename in sorted(os.listdir(checkpoint_dir), reverse=True):
-            if filename.endswith(".json"):
+            if filename.endswith(".json") and filename != INDEX_FILENAME:
                 filepath = os.path.join(checkpoint_dir, filename)
                 try:
                     with open(filepath, "r") as f:
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Opt-in hot-path profiler for orchestrated runs.
+
+Enabled with ``--profile`` or ``REV_PROFILE=true``. When disabled, ``span()``
+returns a shared no-op context manager, so instrumented call sites cost one
+attribute check.
+
+Spans nest per thread and are aggregated by their full stack, e.g.
+``phase:execution;tool:run_tests`` or ``phase:research;context:build;index:code``.
+At the end of a run the profile is written as collapsed stacks (self time in
+microseconds; the input format of ``flamegraph.pl``, speedscope and inferno)
+and a per-category summary table (LLM, tools, verification, context, index).
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from rev import config
+
+
+class _NullSpan:
+    """Returned by ``span()`` while profiling is off."""
+
+    __slots__ = ()
+    active = False
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+    def add(self, name: str, seconds: float) -> None:
+        pass
+
+    def mark_first_token(self) -> None:
+        pass
+
+    def elapsed(self) -> float:
+        return 0.0
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("profiler", "category", "frame", "stack", "start", "child_time", "first_token", "outermost")
+    active = True
+
+    def __init__(self, profiler: "Profiler", category: str, name: Optional[str]):
+        self.profiler = profiler
+        self.category = category
+        self.frame = f"{category}:{name}" if name else category
+        self.stack: Tuple[str, ...] = ()
+        self.start = 0.0
+        self.child_time = 0.0
+        self.first_token: Optional[float] = None
+        self.outermost = True
+
+    def __enter__(self) -> "_Span":
+        local = self.profiler._local
+        parent = local.spans[-1] if local.spans else None
+        base = parent.stack if parent is not None else self.profiler._root_frames()
+        self.stack = base + (self.frame,)
+        # Nested spans of the same category (a tool calling a tool) only
+        # count once towards the category total.
+        self.outermost = local.categories[self.category] == 0
+        local.categories[self.category] += 1
+        local.spans.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        elapsed = time.perf_counter() - self.start
+        local = self.profiler._local
+        if local.spans and local.spans[-1] is self:
+            local.spans.pop()
+        local.categories[self.category] -= 1
+        if local.spans:
+            local.spans[-1].child_time += elapsed
+        self.profiler._record(self.stack, self.category, elapsed, max(0.0, elapsed - self.child_time), self.outermost)
+        return False
+
+    def add(self, name: str, seconds: float) -> None:
+        """Attribute ``seconds`` of this span to a synthetic child frame (e.g. ``prefill``)."""
+        if seconds <= 0:
+            return
+        self.child_time += seconds
+        self.profiler._record(self.stack + (name,), f"{self.category}.{name}", seconds, seconds, True)
+
+    def mark_first_token(self) -> None:
+        if self.first_token is None:
+            self.first_token = time.perf_counter()
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+
+class _Local(threading.local):
+    def __init__(self) -> None:
+        self.spans: List[_Span] = []
+        self.categories: Counter = Counter()
+
+
+class Profiler:
+    """Aggregates spans for the current run."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._local = _Local()
+        self._cprofile = None
+        self.reset()
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def reset(self) -> None:
+        with self._lock:
+            # stack -> [count, total seconds, self seconds]
+            self._stacks: Dict[Tuple[str, ...], List[float]] = {}
+            # category -> [count, total seconds, max seconds]
+            self._categories: Dict[str, List[float]] = {}
+            self._phases: Dict[str, float] = {}
+            self._phase: Optional[str] = None
+            self._phase_start = time.perf_counter()
+            self._run_start = self._phase_start
+
+    def _root_frames(self) -> Tuple[str, ...]:
+        frames: Tuple[str, ...] = (f"phase:{self._phase}",) if self._phase else ("run",)
+        thread = threading.current_thread()
+        if thread is not threading.main_thread():
+            frames += (f"thread:{thread.name}",)
+        return frames
+
+    def _record(self, stack: Tuple[str, ...], category: str, total: float, self_time: float, count_category: bool) -> None:
+        with self._lock:
+            entry = self._stacks.get(stack)
+            if entry is None:
+                self._stacks[stack] = [1, total, self_time]
+            else:
+                entry[0] += 1
+                entry[1] += total
+                entry[2] += self_time
+            if count_category:
+                cat = self._categories.get(category)
+                if cat is None:
+                    self._categories[category] = [1, total, total]
+                else:
+                    cat[0] += 1
+                    cat[1] += total
+                    cat[2] = max(cat[2], total)
+
+    def span(self, category: str, name: Optional[str] = None):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, category, name)
+
+    def set_phase(self, phase: Optional[str]) -> None:
+        """Close the current orchestrator phase and start ``phase``."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        with self._lock:
+            if self._phase:
+                self._phases[self._phase] = self._phases.get(self._phase, 0.0) + now - self._phase_start
+            self._phase = phase
+            self._phase_start = now
+
+    # -- reporting ---------------------------------------------------------
+
+    def collapsed(self) -> List[str]:
+        """Collapsed stacks (``frame;frame;frame <self microseconds>``)."""
+        with self._lock:
+            items = sorted(self._stacks.items())
+        lines = []
+        for stack, (_count, _total, self_time) in items:
+            micros = int(round(self_time * 1_000_000))
+            if micros > 0:
+                lines.append(f"{';'.join(frame.replace(';', ',') for frame in stack)} {micros}")
+        return lines
+
+    def summary(self) -> Dict[str, Any]:
+        now = time.perf_counter()
+        with self._lock:
+            wall = now - self._run_start
+            phases = dict(self._phases)
+            if self._phase:
+                phases[self._phase] = phases.get(self._phase, 0.0) + now - self._phase_start
+            categories = {name: list(values) for name, values in self._categories.items()}
+            stacks = sorted(self._stacks.items(), key=lambda item: item[1][2], reverse=True)[:15]
+        return {
+            "wall_seconds": round(wall, 6),
+            "phases": {name: round(seconds, 6) for name, seconds in phases.items()},
+            "categories": {
+                name: {
+                    "count": int(count),
+                    "total_seconds": round(total, 6),
+                    "mean_ms": round(total / count * 1000, 3) if count else 0.0,
+                    "max_ms": round(longest * 1000, 3),
+                    "pct_of_wall": round(total / wall * 100, 1) if wall > 0 else 0.0,
+                }
+                for name, (count, total, longest) in sorted(categories.items())
+            },
+            "top_stacks": [
+                {"stack": ";".join(stack), "count": int(count), "self_seconds": round(self_time, 6)}
+                for stack, (count, _total, self_time) in stacks
+            ],
+        }
+
+    @staticmethod
+    def format_summary(summary: Dict[str, Any]) -> str:
+        wall = summary.get("wall_seconds", 0.0)
+        lines = [f"Latency breakdown (wall {wall:.2f}s)"]
+        lines.append(f"  {'category':<24}{'calls':>7}{'total s':>10}{'mean ms':>10}{'max ms':>10}{'% wall':>8}")
+        for name, row in summary.get("categories", {}).items():
+            lines.append(
+                f"  {name:<24}{row['count']:>7}{row['total_seconds']:>10.2f}"
+                f"{row['mean_ms']:>10.1f}{row['max_ms']:>10.1f}{row['pct_of_wall']:>8.1f}"
+            )
+        phases = summary.get("phases") or {}
+        if phases:
+            lines.append("  phases: " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in phases.items()))
+        return "\n".join(lines)
+
+    def write(self, directory: Path, run_id: Optional[str] = None) -> Dict[str, Path]:
+        """Write ``<run>.folded`` and ``<run>.summary.json`` under ``directory``."""
+        directory.mkdir(parents=True, exist_ok=True)
+        run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        folded = directory / f"{run_id}.folded"
+        folded.write_text("\n".join(self.collapsed()) + "\n", encoding="utf-8")
+        summary = directory / f"{run_id}.summary.json"
+        summary.write_text(json.dumps(self.summary(), indent=2), encoding="utf-8")
+        return {"folded": folded, "summary": summary}
+
+    # -- cProfile ------------------------------------------------------------
+
+    def start_cprofile(self) -> None:
+        import cProfile
+
+        if self._cprofile is None:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def stop_cprofile(self, directory: Path, run_id: Optional[str] = None) -> Optional[Path]:
+        """Stop cProfile and dump ``<run>.prof`` (``pstats``/snakeviz format)."""
+        prof = self._cprofile
+        if prof is None:
+            return None
+        self._cprofile = None
+        prof.disable()
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{run_id or datetime.now().strftime('%Y%m%d_%H%M%S')}.prof"
+        prof.dump_stats(str(path))
+        return path
+
+
+_PROFILER = Profiler(enabled=config.PROFILE_ENABLED)
+
+
+def get_profiler() -> Profiler:
+    return _PROFILER
+
+
+def span(category: str, name: Optional[str] = None):
+    """Time a block as ``category:name``; a no-op unless profiling is enabled."""
+    if not _PROFILER.enabled:
+        return _NULL_SPAN
+    return _PROFILER.span(category, name)
+
+
+def record_llm_phases(llm_span, response: Any) -> None:
+    """Split an LLM span into queue/load/prefill/generation where the provider allows.
+
+    Ollama reports ``load_duration``/``prompt_eval_duration``/``eval_duration``
+    (nanoseconds); whatever remains of the wall time is queueing and
+    transport. For streamed calls without server timings, time to first
+    token is reported as prefill (it includes queueing) and the rest as
+    generation. Phase times are clamped to the span's wall time, so timings
+    that did not come from this call (e.g. a cached response) cannot inflate
+    the breakdown.
+    """
+    if not llm_span.active:
+        return
+    elapsed = llm_span.elapsed()
+    timings = response if isinstance(response, dict) else {}
+    if "eval_duration" in timings or "prompt_eval_duration" in timings:
+        phases = [
+            ("load", timings.get("load_duration", 0)),
+            ("prefill", timings.get("prompt_eval_duration", 0)),
+            ("generation", timings.get("eval_duration", 0)),
+        ]
+        remaining = elapsed
+        for name, nanos in phases:
+            seconds = min(max(0.0, (nanos or 0) / 1e9), remaining)
+            remaining -= seconds
+            llm_span.add(name, seconds)
+        llm_span.add("queue", remaining)
+    elif llm_span.first_token is not None:
+        ttft = min(llm_span.first_token - llm_span.start, elapsed)
+        llm_span.add("prefill", ttft)
+        llm_span.add("generation", elapsed - ttft)
+
+
+def profiles_dir() -> Path:
+    return config.METRICS_DIR / "profiles"
@@ -7,16 +7,25 @@ providing semantic code search and retrieval capabilities with
 code-aware enhancements (symbol indexing, import graphs).
 """
 
-from rev.retrieval.base import BaseCodeRetriever, CodeChunk
-from rev.retrieval.simple_rag import SimpleCodeRetriever
-from rev.retrieval.symbol_index import Symbol, SymbolIndexer
-from rev.retrieval.import_graph import ImportEdge, ImportGraph
-from rev.retrieval.code_queries import CodeQueryEngine
+from rev._lazy import exports_from, lazy_exports
+
+# Submodules load on first use; in particular vector_index pulls in numpy.
+__getattr__, __dir__ = lazy_exports(__name__, exports_from({
+    "rev.retrieval.base": ["BaseCodeRetriever", "CodeChunk"],
+    "rev.retrieval.simple_rag": ["SimpleCodeRetriever", "create_code_retriever"],
+    "rev.retrieval.vector_index": ["HashedEmbedder", "VectorCodeRetriever"],
+    "rev.retrieval.symbol_index": ["Symbol", "SymbolIndexer"],
+    "rev.retrieval.import_graph": ["ImportEdge", "ImportGraph"],
+    "rev.retrieval.code_queries": ["CodeQueryEngine"],
+}), globals())
 
 __all__ = [
     "BaseCodeRetriever",
     "CodeChunk",
     "SimpleCodeRetriever",
+    "create_code_retriever",
+    "HashedEmbedder",
+    "VectorCodeRetriever",
     "Symbol",
     "SymbolIndexer",
     "ImportEdge",
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Okapi BM25 ranking over precomputed postings lists.
+
+The index is built once from tokenized documents: term frequencies go into
+per-term postings lists, and document lengths and IDF are computed up front.
+A query then only touches the postings of its own terms instead of
+re-tokenizing every document.
+
+Scores are normalized by the best score a document could reach for the
+query (every query term present with saturated term frequency), so they fall
+in ``[0, 1)`` and stay comparable with the fixed rerank bonuses the
+ContextBuilder adds on top.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from collections import Counter
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+
+class BM25Index:
+    """Immutable BM25 index over a list of documents (given as term lists)."""
+
+    __slots__ = ("k1", "b", "size", "_postings", "_idf", "_norm")
+
+    def __init__(self, documents: Iterable[Sequence[str]], k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        lengths: List[int] = []
+        for doc_id, terms in enumerate(documents):
+            lengths.append(len(terms))
+            for term, tf in Counter(terms).items():
+                postings.setdefault(term, []).append((doc_id, tf))
+        self.size = len(lengths)
+        self._postings = postings
+
+        n = self.size
+        self._idf = {
+            # BM25+ style floor: common terms still count a little, never negatively.
+            term: math.log(1.0 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in postings.items()
+        }
+        avg_len = (sum(lengths) / n) if n else 0.0
+        # Per-document length normalization, precomputed: k1 * (1 - b + b * len / avg).
+        self._norm = [
+            k1 * (1.0 - b + b * (length / avg_len if avg_len else 0.0))
+            for length in lengths
+        ]
+
+    def __len__(self) -> int:
+        return self.size
+
+    def scores(self, query_terms: Sequence[str]) -> Dict[int, float]:
+        """Normalized BM25 score for every document matching at least one term."""
+        terms = [t for t in dict.fromkeys(query_terms) if t in self._postings]
+        if not terms:
+            return {}
+        k1_plus = self.k1 + 1.0
+        best = sum(self._idf[t] for t in dict.fromkeys(query_terms) if t in self._idf) * k1_plus
+        norm = self._norm
+        totals: Dict[int, float] = {}
+        for term in terms:
+            idf = self._idf[term]
+            for doc_id, tf in self._postings[term]:
+                totals[doc_id] = totals.get(doc_id, 0.0) + idf * tf * k1_plus / (tf + norm[doc_id])
+        if best <= 0:
+            return totals
+        return {doc_id: score / best for doc_id, score in totals.items()}
+
+    def top_k(self, query_terms: Sequence[str], k: int) -> List[Tuple[int, float]]:
+        """The ``k`` best ``(doc_id, score)`` pairs, highest score first."""
+        scores = self.scores(query_terms)
+        if k <= 0 or not scores:
+            return []
+        # Ties keep document order, matching a stable sort on score.
+        best = heapq.nsmallest(k, scores.items(), key=lambda item: (-item[1], item[0]))
+        return best
@@ -14,16 +14,21 @@ tool schemas when calling the LLM.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 import hashlib
 import json
 import re
+import threading
 import time
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from rev import config
 from rev.config import EXCLUDE_DIRS
+from rev.profiler import span as profile_span
+from rev.retrieval.bm25 import BM25Index
+from rev.retrieval.context_packing import estimate_tokens, pack_chunks, tool_entry
 
 
 _STOP_WORDS = {
@@ -117,20 +122,30 @@ _INSTRUCTION_FILENAMES = {
 _INSTRUCTION_MAX_FILES = 8
 _INSTRUCTION_SCORE = 2.0
 
+# Per-corpus counts: fixed selections without a token budget, caps with one.
+_FIXED_TOP_K = {"code": 4, "docs": 3, "memory": 3}
+_PACKED_TOP_K = {"code": 12, "docs": 6, "memory": 6}
+
 
 def _tokenize(text: str) -> List[str]:
     terms = re.findall(r"\b\w+\b", (text or "").lower())
     return [t for t in terms if len(t) > 2 and t not in _STOP_WORDS]
 
 
-def _overlap_score(query_terms: Sequence[str], text: str) -> float:
-    if not query_terms:
-        return 0.0
-    hay = set(_tokenize(text))
-    if not hay:
-        return 0.0
-    hit = sum(1 for t in query_terms if t in hay)
-    return hit / max(1, len(set(query_terms)))
+class _ChunkIndex:
+    """Chunks plus a BM25 index over their text, built once per corpus build."""
+
+    __slots__ = ("chunks", "index")
+
+    def __init__(self, chunks: Sequence["RetrievedChunk"], text_of) -> None:
+        self.chunks = list(chunks)
+        self.index = BM25Index(_tokenize(text_of(c)) for c in self.chunks)
+
+    def query(self, query: str, k: int) -> List["RetrievedChunk"]:
+        return [replace(self.chunks[i], score=score) for i, score in self.index.top_k(_tokenize(query), k)]
+
+
+_EMPTY_INDEX = _ChunkIndex([], str)
 
 
 def _rerank_chunks(query: str, chunks: Sequence[RetrievedChunk]) -> List[RetrievedChunk]:
@@ -141,17 +156,35 @@ def _rerank_chunks(query: str, chunks: Sequence[RetrievedChunk]) -> List[Retriev
     for c in chunks:
         bonus = 0.0
         src = (c.source or "").lower()
-        base = c.score
         if src and (src in q or Path(src).name.lower() in q):
             bonus += 0.5
         # Prefer chunks whose location is explicitly referenced.
         if c.location and c.location.lower() in q:
             bonus += 0.3
-        boosted.append(RetrievedChunk(**{**c.__dict__, "score": base + bonus}))
+        boosted.append(replace(c, score=c.score + bonus) if bonus else c)
     boosted.sort(key=lambda x: x.score, reverse=True)
     return boosted
 
 
+# The corpus queries in ContextBuilder.build are independent; run them side by side.
+_QUERY_POOL: Optional[ThreadPoolExecutor] = None
+_QUERY_POOL_LOCK = threading.Lock()
+
+
+def _query_pool() -> ThreadPoolExecutor:
+    global _QUERY_POOL
+    if _QUERY_POOL is None:
+        with _QUERY_POOL_LOCK:
+            if _QUERY_POOL is None:
+                _QUERY_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="context-query")
+    return _QUERY_POOL
+
+
+def _profiled(category: str, name: str, fn, *args, **kwargs):
+    with profile_span(category, name):
+        return fn(*args, **kwargs)
+
+
 def _infer_language(path: Path) -> str:
     suffix = path.suffix.lower()
     if not suffix:
@@ -267,17 +300,24 @@ class ContextBundle:
     selected_docs_chunks: List[RetrievedChunk]
     selected_tool_schemas: List[RetrievedTool]
     selected_memory_items: List[RetrievedChunk]
+    # Set when the selection was packed to a token budget; chunks are then
+    # already trimmed and render() emits them whole.
+    token_budget: Optional[int] = None
+    estimated_tokens: int = 0
 
 
 class CodeCorpus:
-    """Lightweight code corpus index (token-overlap ranking)."""
+    """Lightweight code corpus index (BM25 ranking)."""
 
     VERSION = 2
 
     def __init__(self, root: Path):
         self.root = root.resolve()
         self._chunks: List[RetrievedChunk] = []
+        self._index = _EMPTY_INDEX
         self._built = False
+        # Session warm-up may build on a background thread while a task queries.
+        self._build_lock = threading.Lock()
 
     def _cache_path(self) -> Path:
         cache_dir = config.CACHE_DIR
@@ -389,6 +429,7 @@ class CodeCorpus:
             if payload.get("root") != str(self.root):
                 return False
             self._chunks = [RetrievedChunk(**c) for c in payload.get("chunks", [])]
+            self._index = _ChunkIndex(self._chunks, self._index_text)
             self._built = True
             return True
         except Exception:
@@ -404,6 +445,11 @@ class CodeCorpus:
     def build(self) -> None:
         if self._built:
             return
+        with self._build_lock:
+            if not self._built:
+                self._build()
+
+    def _build(self) -> None:
         if self._load():
             return
         start = time.perf_counter()
@@ -414,21 +460,18 @@ class CodeCorpus:
             else:
                 chunks.extend(self._chunk_text_file(fp))
         self._chunks = chunks
+        self._index = _ChunkIndex(chunks, self._index_text)
         self._built = True
         self._save()
         _ = time.perf_counter() - start
 
+    @staticmethod
+    def _index_text(chunk: RetrievedChunk) -> str:
+        return chunk.content + "\n" + chunk.source
+
     def query(self, query: str, k: int) -> List[RetrievedChunk]:
         self.build()
-        q_terms = _tokenize(query)
-        scored: List[RetrievedChunk] = []
-        for c in self._chunks:
-            score = _overlap_score(q_terms, c.content + "\n" + c.source)
-            if score <= 0:
-                continue
-            scored.append(RetrievedChunk(**{**c.__dict__, "score": score}))
-        scored.sort(key=lambda x: x.score, reverse=True)
-        return scored[:k]
+        return self._index.query(query, k)
 
 
 class DocsCorpus:
@@ -439,7 +482,10 @@ class DocsCorpus:
     def __init__(self, root: Path):
         self.root = root.resolve()
         self._chunks: List[RetrievedChunk] = []
+        self._index = _EMPTY_INDEX
         self._built = False
+        # Session warm-up may build on a background thread while a task queries.
+        self._build_lock = threading.Lock()
 
     def _cache_path(self) -> Path:
         cache_dir = config.CACHE_DIR
@@ -509,6 +555,7 @@ class DocsCorpus:
             if payload.get("root") != str(self.root):
                 return False
             self._chunks = [RetrievedChunk(**c) for c in payload.get("chunks", [])]
+            self._index = _ChunkIndex(self._chunks, self._index_text)
             self._built = True
             return True
         except Exception:
@@ -524,26 +571,28 @@ class DocsCorpus:
     def build(self) -> None:
         if self._built:
             return
+        with self._build_lock:
+            if not self._built:
+                self._build()
+
+    def _build(self) -> None:
         if self._load():
             return
         chunks: List[RetrievedChunk] = []
         for fp in self._iter_files():
             chunks.extend(self._chunk_markdown(fp))
         self._chunks = chunks
+        self._index = _ChunkIndex(chunks, self._index_text)
         self._built = True
         self._save()
 
+    @staticmethod
+    def _index_text(chunk: RetrievedChunk) -> str:
+        return chunk.content + "\n" + chunk.location
+
     def query(self, query: str, k: int) -> List[RetrievedChunk]:
         self.build()
-        q_terms = _tokenize(query)
-        scored: List[RetrievedChunk] = []
-        for c in self._chunks:
-            score = _overlap_score(q_terms, c.content + "\n" + c.location)
-            if score <= 0:
-                continue
-            scored.append(RetrievedChunk(**{**c.__dict__, "score": score}))
-        scored.sort(key=lambda x: x.score, reverse=True)
-        return scored[:k]
+        return self._index.query(query, k)
 
 
 class ToolsCorpus:
@@ -551,6 +600,7 @@ class ToolsCorpus:
 
     def __init__(self):
         self._entries: List[RetrievedTool] = []
+        self._index = BM25Index([])
         self._built = False
 
     def build(self, tools: Sequence[Dict[str, Any]]) -> None:
@@ -566,8 +616,14 @@ class ToolsCorpus:
             example = self._make_example(name, fn.get("parameters") or {})
             entries.append(RetrievedTool(name=name, schema=schema, example=example, score=0.0))
         self._entries = entries
+        self._index = BM25Index(_tokenize(self._index_text(t)) for t in entries)
         self._built = True
 
+    @staticmethod
+    def _index_text(tool: RetrievedTool) -> str:
+        fn = tool.schema.get("function", {}) if isinstance(tool.schema, dict) else {}
+        return f"{tool.name}\n{fn.get('description','')}\n{json.dumps(fn.get('parameters', {}))}"
+
     def _make_example(self, name: str, params_schema: Dict[str, Any]) -> str:
         required = params_schema.get("required") or []
         props = params_schema.get("properties") or {}
@@ -591,13 +647,11 @@ class ToolsCorpus:
         return json.dumps(payload, indent=2)
 
     def query(self, query: str, k: int) -> List[RetrievedTool]:
-        q_terms = _tokenize(query)
+        text_scores = self._index.scores(_tokenize(query))
         q_lower = (query or "").lower()
         scored: List[RetrievedTool] = []
-        for t in self._entries:
-            fn = t.schema.get("function", {}) if isinstance(t.schema, dict) else {}
-            hay = f"{t.name}\n{fn.get('description','')}\n{json.dumps(fn.get('parameters', {}))}"
-            score = _overlap_score(q_terms, hay)
+        for i, t in enumerate(self._entries):
+            score = text_scores.get(i, 0.0)
 
             # Second-stage boosts for common intent signals.
             name_lower = t.name.lower()
@@ -621,33 +675,36 @@ class ToolsCorpus:
 
             if score <= 0:
                 continue
-            scored.append(RetrievedTool(name=t.name, schema=t.schema, example=t.example, score=score))
+            scored.append(replace(t, score=score))
         scored.sort(key=lambda x: x.score, reverse=True)
         return scored[:k]
 
 
 class MemoryCorpus:
-    """Session memory corpus backed by RevContext fields (no persistence)."""
+    """Session memory corpus backed by RevContext fields (no persistence).
+
+    The items change between turns, so the index is rebuilt only when they do.
+    """
+
+    def __init__(self):
+        self._items: Tuple[Tuple[str, str], ...] = ()
+        self._index = _EMPTY_INDEX
+        self._lock = threading.Lock()
+
+    def _index_for(self, memory_items: Sequence[Tuple[str, str]]) -> _ChunkIndex:
+        items = tuple((key, text) for key, text in memory_items)
+        with self._lock:
+            if items != self._items:
+                chunks = [
+                    RetrievedChunk(corpus="memory", source=key, location=key, score=0.0, content=text, metadata={"key": key})
+                    for key, text in items
+                ]
+                self._index = _ChunkIndex(chunks, lambda c: f"{c.source}\n{c.content}")
+                self._items = items
+            return self._index
 
     def query(self, query: str, memory_items: Sequence[Tuple[str, str]], k: int) -> List[RetrievedChunk]:
-        q_terms = _tokenize(query)
-        scored: List[RetrievedChunk] = []
-        for key, text in memory_items:
-            score = _overlap_score(q_terms, f"{key}\n{text}")
-            if score <= 0:
-                continue
-            scored.append(
-                RetrievedChunk(
-                    corpus="memory",
-                    source=key,
-                    location=key,
-                    score=score,
-                    content=text,
-                    metadata={"key": key},
-                )
-            )
-        scored.sort(key=lambda x: x.score, reverse=True)
-        return scored[:k]
+        return self._index_for(memory_items).query(query, k)
 
 
 class ProjectMemoryCorpus:
@@ -658,7 +715,9 @@ class ProjectMemoryCorpus:
     def __init__(self, memory_file: Path):
         self.memory_file = memory_file
         self._chunks: List[RetrievedChunk] = []
+        self._index = _EMPTY_INDEX
         self._built = False
+        self._build_lock = threading.Lock()
 
     def _cache_path(self) -> Path:
         cache_dir = config.CACHE_DIR
@@ -709,6 +768,7 @@ class ProjectMemoryCorpus:
             if payload.get("version") != self.VERSION:
                 return False
             self._chunks = [RetrievedChunk(**c) for c in payload.get("chunks", [])]
+            self._index = _ChunkIndex(self._chunks, self._index_text)
             self._built = True
             return True
         except Exception:
@@ -724,6 +784,11 @@ class ProjectMemoryCorpus:
     def build(self) -> None:
         if self._built:
             return
+        with self._build_lock:
+            if not self._built:
+                self._build()
+
+    def _build(self) -> None:
         # Try cache first (fast path).
         if self._load():
             return
@@ -738,20 +803,17 @@ class ProjectMemoryCorpus:
             self._built = True
             return
         self._chunks = self._chunk_markdown(md)
+        self._index = _ChunkIndex(self._chunks, self._index_text)
         self._built = True
         self._save()
 
+    @staticmethod
+    def _index_text(chunk: RetrievedChunk) -> str:
+        return chunk.content + "\n" + chunk.location
+
     def query(self, query: str, k: int) -> List[RetrievedChunk]:
         self.build()
-        q_terms = _tokenize(query)
-        scored: List[RetrievedChunk] = []
-        for c in self._chunks:
-            score = _overlap_score(q_terms, c.content + "\n" + c.location)
-            if score <= 0:
-                continue
-            scored.append(RetrievedChunk(**{**c.__dict__, "score": score}))
-        scored.sort(key=lambda x: x.score, reverse=True)
-        return scored[:k]
+        return self._index.query(query, k)
 
 class ContextBuilder:
     """Unified context retrieval and tool selection pipeline."""
@@ -792,62 +854,118 @@ class ContextBuilder:
                     return configs
         return configs
 
-    def build(
-        self,
-        *,
-        query: str,
-        tool_universe: Sequence[Dict[str, Any]],
-        tool_candidates: Optional[Sequence[str]] = None,
-        top_k_code: int = 4,
-        top_k_docs: int = 3,
-        top_k_tools: int = 5,
-        top_k_memory: int = 3,
-        memory_items: Optional[Sequence[Tuple[str, str]]] = None,
-    ) -> ContextBundle:
-        self.tools.build(tool_universe)
-
-        # Stage 1: retrieve top-K' per corpus.
-        code_candidates = self.code.query(query, k=max(top_k_code * 3, top_k_code))
-        docs_candidates = self.docs.query(query, k=max(top_k_docs * 3, top_k_docs))
-
-        # Stage 2: rerank within each corpus.
-        selected_code = _rerank_chunks(query, code_candidates)[:top_k_code]
-        selected_docs = _rerank_chunks(query, docs_candidates)[:top_k_docs]
-        instruction_paths = _discover_instruction_files(self.root)
-        instruction_chunks = _build_file_chunks(self.root, instruction_paths, score=_INSTRUCTION_SCORE)
-        if instruction_chunks:
-            selected_docs = _prepend_deduped(instruction_chunks, selected_docs)
-
-        tools_ranked = self.tools.query(query, k=max(top_k_tools, 12))
-        if tool_candidates is not None:
-            allowed = set(tool_candidates)
-            tools_ranked = [t for t in tools_ranked if t.name in allowed]
-        selected_tools = tools_ranked[:top_k_tools]
-
-        mem_items = list(memory_items or [])
-        mem_candidates: List[RetrievedChunk] = []
-        mem_candidates.extend(self.project_memory.query(query, k=max(top_k_memory * 3, top_k_memory)))
+    def _query_memory(self, query: str, mem_items: Sequence[Tuple[str, str]], top_k_memory: int) -> List[RetrievedChunk]:
+        candidates = self.project_memory.query(query, k=max(top_k_memory * 3, top_k_memory))
         if mem_items:
-            mem_candidates.extend(self.memory.query(query, mem_items, k=max(top_k_memory * 2, top_k_memory)))
+            candidates = candidates + self.memory.query(query, mem_items, k=max(top_k_memory * 2, top_k_memory))
+        return candidates
 
+    @staticmethod
+    def _dedupe_memory(candidates: Sequence[RetrievedChunk]) -> List[RetrievedChunk]:
         # Deduplicate by location while keeping order.
         deduped: List[RetrievedChunk] = []
         seen = set()
-        for c in mem_candidates:
+        for c in candidates:
             key = (c.location or c.source or "")[:200]
             if key in seen:
                 continue
             seen.add(key)
             deduped.append(c)
+        return deduped
 
-        selected_mem = _rerank_chunks(query, deduped)[:top_k_memory]
+    @staticmethod
+    def _pack(
+        query: str,
+        token_budget: int,
+        tools: Sequence[RetrievedTool],
+        groups: Dict[str, Sequence[RetrievedChunk]],
+        caps: Dict[str, int],
+    ) -> Tuple[Dict[str, List[RetrievedChunk]], int]:
+        # Tools decide what the model can call, so they are kept and their cost reserved.
+        tools_cost = sum(estimate_tokens(tool_entry(t)) for t in tools)
+        with profile_span("context", "pack"):
+            packed, used = pack_chunks(groups, _tokenize(query), max(0, token_budget - tools_cost), caps=caps)
+        return packed, used + tools_cost
 
-        return ContextBundle(
-            selected_code_chunks=selected_code,
-            selected_docs_chunks=selected_docs,
-            selected_tool_schemas=selected_tools,
-            selected_memory_items=selected_mem,
-        )
+    def build(
+        self,
+        *,
+        query: str,
+        tool_universe: Sequence[Dict[str, Any]],
+        tool_candidates: Optional[Sequence[str]] = None,
+        top_k_code: Optional[int] = None,
+        top_k_docs: Optional[int] = None,
+        top_k_tools: int = 5,
+        top_k_memory: Optional[int] = None,
+        memory_items: Optional[Sequence[Tuple[str, str]]] = None,
+        token_budget: Optional[int] = None,
+    ) -> ContextBundle:
+        """Select context for ``query``.
+
+        With a token budget (``token_budget``, default ``config.CONTEXT_TOKEN_BUDGET``;
+        0 disables it) chunks from all corpora are packed by relevance per
+        token and the ``top_k_*`` values only cap each corpus. Without one,
+        each corpus contributes exactly its ``top_k_*`` best chunks.
+        """
+        budget = config.CONTEXT_TOKEN_BUDGET if token_budget is None else token_budget
+        defaults = _PACKED_TOP_K if budget > 0 else _FIXED_TOP_K
+        top_k_code = defaults["code"] if top_k_code is None else top_k_code
+        top_k_docs = defaults["docs"] if top_k_docs is None else top_k_docs
+        top_k_memory = defaults["memory"] if top_k_memory is None else top_k_memory
+
+        with profile_span("context", "build"):
+            self.tools.build(tool_universe)
+            mem_items = list(memory_items or [])
+
+            # Stage 1: retrieve top-K' per corpus, all corpora concurrently.
+            pool = _query_pool()
+            code_future = pool.submit(_profiled, "index", "code", self.code.query, query, k=max(top_k_code * 3, top_k_code))
+            docs_future = pool.submit(_profiled, "index", "docs", self.docs.query, query, k=max(top_k_docs * 3, top_k_docs))
+            tools_future = pool.submit(_profiled, "index", "tools", self.tools.query, query, k=max(top_k_tools, 12))
+            memory_future = pool.submit(_profiled, "index", "memory", self._query_memory, query, mem_items, top_k_memory)
+            instruction_paths = _discover_instruction_files(self.root)
+            instruction_chunks = _build_file_chunks(self.root, instruction_paths, score=_INSTRUCTION_SCORE)
+
+            # Stage 2: rerank within each corpus.
+            code_ranked = _rerank_chunks(query, code_future.result())
+            docs_ranked = _rerank_chunks(query, docs_future.result())
+
+            tools_ranked = tools_future.result()
+            if tool_candidates is not None:
+                allowed = set(tool_candidates)
+                tools_ranked = [t for t in tools_ranked if t.name in allowed]
+            selected_tools = tools_ranked[:top_k_tools]
+
+            mem_ranked = _rerank_chunks(query, self._dedupe_memory(memory_future.result()))
+
+            if budget > 0:
+                # Stage 3: pack all corpora into the token budget. Instruction
+                # files compete like any chunk but do not count against top_k_docs.
+                packed, used = self._pack(
+                    query,
+                    budget,
+                    selected_tools,
+                    {"code": code_ranked, "docs": list(instruction_chunks) + docs_ranked, "memory": mem_ranked},
+                    {"code": top_k_code, "docs": top_k_docs + len(instruction_chunks), "memory": top_k_memory},
+                )
+                return ContextBundle(
+                    selected_code_chunks=packed["code"],
+                    selected_docs_chunks=packed["docs"],
+                    selected_tool_schemas=selected_tools,
+                    selected_memory_items=packed["memory"],
+                    token_budget=budget,
+                    estimated_tokens=used,
+                )
+
+            selected_docs = docs_ranked[:top_k_docs]
+            if instruction_chunks:
+                selected_docs = _prepend_deduped(instruction_chunks, selected_docs)
+            return ContextBundle(
+                selected_code_chunks=code_ranked[:top_k_code],
+                selected_docs_chunks=selected_docs,
+                selected_tool_schemas=selected_tools,
+                selected_memory_items=mem_ranked[:top_k_memory],
+            )
 
     def build_minimal(
         self,
@@ -860,76 +978,91 @@ class ContextBuilder:
         top_k_tools: int = 5,
         top_k_memory: int = 3,
         memory_items: Optional[Sequence[Tuple[str, str]]] = None,
+        token_budget: Optional[int] = None,
     ) -> ContextBundle:
-        self.tools.build(tool_universe)
-
-        tools_ranked = self.tools.query(query, k=max(top_k_tools, 12))
-        if tool_candidates is not None:
-            allowed = set(tool_candidates)
-            tools_ranked = [t for t in tools_ranked if t.name in allowed]
-        selected_tools = tools_ranked[:top_k_tools]
-
-        config_paths = list(config_paths or [])
-        selected_code = _build_file_chunks(self.root, target_paths, score=1.0)
-        selected_code.extend(_build_file_chunks(self.root, config_paths, score=0.7))
-        if selected_code:
-            deduped_code: List[RetrievedChunk] = []
-            seen_code = set()
-            for chunk in selected_code:
-                key = chunk.source
-                if key in seen_code:
-                    continue
-                seen_code.add(key)
-                deduped_code.append(chunk)
-            selected_code = deduped_code
-
-        instruction_paths = _discover_instruction_files(self.root)
-        instruction_chunks = _build_file_chunks(self.root, instruction_paths, score=_INSTRUCTION_SCORE)
-
-        mem_items = list(memory_items or [])
-        mem_candidates: List[RetrievedChunk] = []
-        mem_candidates.extend(self.project_memory.query(query, k=max(top_k_memory * 3, top_k_memory)))
-        if mem_items:
-            mem_candidates.extend(self.memory.query(query, mem_items, k=max(top_k_memory * 2, top_k_memory)))
-
-        deduped: List[RetrievedChunk] = []
-        seen = set()
-        for c in mem_candidates:
-            key = (c.location or c.source or "")[:200]
-            if key in seen:
-                continue
-            seen.add(key)
-            deduped.append(c)
-
-        selected_mem = _rerank_chunks(query, deduped)[:top_k_memory]
+        budget = config.CONTEXT_TOKEN_BUDGET if token_budget is None else token_budget
+        with profile_span("context", "build_minimal"):
+            self.tools.build(tool_universe)
+
+            with profile_span("index", "tools"):
+                tools_ranked = self.tools.query(query, k=max(top_k_tools, 12))
+            if tool_candidates is not None:
+                allowed = set(tool_candidates)
+                tools_ranked = [t for t in tools_ranked if t.name in allowed]
+            selected_tools = tools_ranked[:top_k_tools]
+
+            config_paths = list(config_paths or [])
+            selected_code = _build_file_chunks(self.root, target_paths, score=1.0)
+            selected_code.extend(_build_file_chunks(self.root, config_paths, score=0.7))
+            if selected_code:
+                deduped_code: List[RetrievedChunk] = []
+                seen_code = set()
+                for chunk in selected_code:
+                    key = chunk.source
+                    if key in seen_code:
+                        continue
+                    seen_code.add(key)
+                    deduped_code.append(chunk)
+                selected_code = deduped_code
+
+            instruction_paths = _discover_instruction_files(self.root)
+            instruction_chunks = _build_file_chunks(self.root, instruction_paths, score=_INSTRUCTION_SCORE)
+
+            with profile_span("index", "memory"):
+                mem_candidates = self._query_memory(query, list(memory_items or []), top_k_memory)
+
+            selected_mem = _rerank_chunks(query, self._dedupe_memory(mem_candidates))[:top_k_memory]
+
+            if budget > 0:
+                # Target files are trimmed to the windows the query is about
+                # rather than sent as 400-line excerpts.
+                packed, used = self._pack(
+                    query,
+                    budget,
+                    selected_tools,
+                    {"code": selected_code, "docs": instruction_chunks, "memory": selected_mem},
+                    {},
+                )
+                return ContextBundle(
+                    selected_code_chunks=packed["code"],
+                    selected_docs_chunks=packed["docs"],
+                    selected_tool_schemas=selected_tools,
+                    selected_memory_items=packed["memory"],
+                    token_budget=budget,
+                    estimated_tokens=used,
+                )
 
-        return ContextBundle(
-            selected_code_chunks=selected_code,
-            selected_docs_chunks=instruction_chunks,
-            selected_tool_schemas=selected_tools,
-            selected_memory_items=selected_mem,
-        )
+            return ContextBundle(
+                selected_code_chunks=selected_code,
+                selected_docs_chunks=instruction_chunks,
+                selected_tool_schemas=selected_tools,
+                selected_memory_items=selected_mem,
+            )
 
     def render(self, bundle: ContextBundle) -> str:
         parts: List[str] = []
 
+        # Packed bundles are already trimmed to the budget; legacy ones are cut per chunk.
+        memory_limit = None if bundle.token_budget else 400
+        chunk_limit = None if bundle.token_budget else 500
+
         if bundle.selected_memory_items:
             parts.append("Selected memory:")
             for item in bundle.selected_memory_items:
                 parts.append(f"- {item.location} (score={item.score:.2f})")
-                parts.append(item.content.strip()[:400])
+                parts.append(item.content.strip()[:memory_limit])
 
         if bundle.selected_docs_chunks:
             parts.append("\nSelected docs:")
             for chunk in bundle.selected_docs_chunks:
                 parts.append(f"- {chunk.location} (score={chunk.score:.2f})")
-                parts.append(chunk.content.strip()[:500])
+                parts.append(chunk.content.strip()[:chunk_limit])
 
         if bundle.selected_code_chunks:
             parts.append("\nSelected code:")
             for chunk in bundle.selected_code_chunks:
                 parts.append(f"- {chunk.location} (score={chunk.score:.2f})")
-                parts.append(chunk.content.strip()[:500])
+                parts.append(chunk.content.strip()[:chunk_limit])
 
         if bundle.selected_tool_schemas:
             parts.append("\nSelected tools (schema + example):")
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Token-budget packing for ContextBuilder selections.
+
+Instead of a fixed number of chunks per corpus, candidates from all corpora
+compete for one token budget:
+
+1. Overlapping chunks from the same file are deduplicated (the higher score
+   wins), so a def-chunk and a file excerpt covering it are not both sent.
+2. Long chunks are trimmed to the line windows around query-term matches,
+   keeping the first line (signature / heading) and marking elisions.
+3. Chunks are taken greedily by relevance per token until the budget is
+   spent, subject to optional per-group caps.
+
+Token costs are estimated from the rendered entry, the same way
+``ContextBuilder.render`` lays it out.
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from rev.retrieval.context_builder import RetrievedChunk, RetrievedTool
+
+
+# Mirrors rev.llm.client._CHARS_PER_TOKEN_ESTIMATE.
+_CHARS_PER_TOKEN_ESTIMATE = 3
+
+_WHOLE_FILE = (1, float("inf"))
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // _CHARS_PER_TOKEN_ESTIMATE)
+
+
+def chunk_entry(chunk: "RetrievedChunk") -> str:
+    """Rendered form of a chunk (header line + content)."""
+    return f"- {chunk.location} (score={chunk.score:.2f})\n{chunk.content.strip()}"
+
+
+def tool_entry(tool: "RetrievedTool") -> str:
+    """Rendered form of a tool (description line + example)."""
+    fn = tool.schema.get("function", {}) if isinstance(tool.schema, dict) else {}
+    desc = fn.get("description", "")
+    return f"- {tool.name} (score={tool.score:.2f}): {desc}".strip() + f"\nExample:\n{tool.example}"
+
+
+def _line_range(chunk: "RetrievedChunk") -> Optional[Tuple[float, float]]:
+    meta = chunk.metadata or {}
+    start, end = meta.get("start_line"), meta.get("end_line")
+    if isinstance(start, int) and isinstance(end, int):
+        return start, end
+    if meta.get("file"):
+        # File excerpts (build_minimal targets, instruction files) cover the whole file.
+        return _WHOLE_FILE
+    return None
+
+
+def dedupe_overlapping(chunks: Sequence["RetrievedChunk"]) -> List["RetrievedChunk"]:
+    """Drop chunks that repeat a location or overlap a higher-scored chunk of the same file."""
+    kept: List["RetrievedChunk"] = []
+    ranges: Dict[str, List[Tuple[float, float]]] = {}
+    seen_locations = set()
+    for chunk in sorted(chunks, key=lambda c: c.score, reverse=True):
+        key = chunk.location or chunk.source
+        if key in seen_locations:
+            continue
+        span = _line_range(chunk)
+        if span is not None and chunk.source:
+            taken = ranges.setdefault(chunk.source, [])
+            if any(span[0] <= end and start <= span[1] for start, end in taken):
+                continue
+            taken.append(span)
+        seen_locations.add(key)
+        kept.append(chunk)
+    return kept
+
+
+def _windows(lines: Sequence[str], terms: Sequence[str], max_lines: int, context: int) -> List[Tuple[int, int]]:
+    """Line windows (inclusive, 0-based) around the best term matches, at most ``max_lines`` lines."""
+    hits = []
+    for index, line in enumerate(lines):
+        lowered = line.lower()
+        matched = sum(1 for term in terms if term in lowered)
+        if matched:
+            hits.append((matched, index))
+    # Best-matching lines first; earlier lines break ties.
+    hits.sort(key=lambda hit: (-hit[0], hit[1]))
+
+    keep = {0}
+    for _, index in hits:
+        window = range(max(0, index - context), min(len(lines), index + context + 1))
+        new = [i for i in window if i not in keep]
+        if len(keep) + len(new) > max_lines:
+            break
+        keep.update(new)
+    if len(keep) == 1:
+        # No usable match: keep the head of the chunk.
+        keep.update(range(min(max_lines, len(lines))))
+
+    spans: List[Tuple[int, int]] = []
+    for index in sorted(keep):
+        if spans and index == spans[-1][1] + 1:
+            spans[-1] = (spans[-1][0], index)
+        else:
+            spans.append((index, index))
+    return spans
+
+
+def trim_chunk(chunk: "RetrievedChunk", terms: Sequence[str], max_lines: int = 40, context: int = 3) -> "RetrievedChunk":
+    """Cut a long chunk down to the windows around matched query terms."""
+    lines = chunk.content.splitlines()
+    if len(lines) <= max_lines:
+        return chunk
+    spans = _windows(lines, terms, max_lines, context)
+    out: List[str] = []
+    previous_end = -1
+    for start, end in spans:
+        if start > previous_end + 1:
+            out.append(f"... ({start - previous_end - 1} lines omitted) ...")
+        out.extend(lines[start:end + 1])
+        previous_end = end
+    if previous_end < len(lines) - 1:
+        out.append(f"... ({len(lines) - 1 - previous_end} lines omitted) ...")
+
+    meta = dict(chunk.metadata or {})
+    first_line = meta.get("start_line")
+    if isinstance(first_line, int):
+        meta["windows"] = [(first_line + start, first_line + end) for start, end in spans]
+    else:
+        meta["windows"] = [(start + 1, end + 1) for start, end in spans]
+    return replace(chunk, content="\n".join(out), metadata=meta)
+
+
+def pack_chunks(
+    groups: Mapping[str, Sequence["RetrievedChunk"]],
+    terms: Sequence[str],
+    token_budget: int,
+    *,
+    caps: Optional[Mapping[str, int]] = None,
+    max_chunk_lines: int = 40,
+    context_lines: int = 3,
+) -> Tuple[Dict[str, List["RetrievedChunk"]], int]:
+    """Select chunks from all groups by score per token within ``token_budget``.
+
+    Returns the selection per group (highest score first) and the tokens used.
+    Deduplication runs across groups, so the same file region is never sent
+    twice even when it is found by two corpora.
+    """
+    caps = caps or {}
+    group_of: Dict[int, str] = {}
+    candidates: List["RetrievedChunk"] = []
+    for name, chunks in groups.items():
+        for chunk in chunks:
+            if chunk.score <= 0:
+                continue
+            group_of[id(chunk)] = name
+            candidates.append(chunk)
+
+    items = []
+    for chunk in dedupe_overlapping(candidates):
+        group = group_of[id(chunk)]
+        trimmed = trim_chunk(chunk, terms, max_chunk_lines, context_lines)
+        cost = estimate_tokens(chunk_entry(trimmed))
+        items.append((chunk.score / cost, chunk.score, cost, group, trimmed))
+    items.sort(key=lambda item: (-item[0], -item[1]))
+
+    selected: Dict[str, List["RetrievedChunk"]] = {name: [] for name in groups}
+    used = 0
+    for _, _, cost, group, chunk in items:
+        if used + cost > token_budget:
+            continue
+        if group in caps and len(selected[group]) >= caps[group]:
+            continue
+        selected[group].append(chunk)
+        used += cost
+    for chunks in selected.values():
+        chunks.sort(key=lambda c: c.score, reverse=True)
+    return selected, used
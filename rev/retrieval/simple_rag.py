@@ -31,16 +31,18 @@ class SimpleCodeRetriever(BaseCodeRetriever):
     by relevance to a natural language query.
     """
 
-    def __init__(self, root: Path = None, chunk_size: int = 50, enable_code_aware: bool = True):
+    def __init__(self, root: Path = None, chunk_size: int = 50, enable_code_aware: bool = True, verbose: bool = True):
         """Initialize the simple retriever.
 
         Args:
             root: Root directory of the codebase
             chunk_size: Number of lines per chunk
             enable_code_aware: Enable code-aware features (symbol indexing, import graph)
+            verbose: Print indexing progress (off for background warm-up)
         """
         super().__init__(root)
         self.chunk_size = chunk_size
+        self.verbose = verbose
         self.chunks: List[CodeChunk] = []
         self.term_document_freq: Dict[str, int] = {}  # IDF calculation
         self.total_documents = 0
@@ -57,6 +59,10 @@ class SimpleCodeRetriever(BaseCodeRetriever):
             self.import_graph = ImportGraph(root)
             self.query_engine = CodeQueryEngine(self.symbol_index, self.import_graph)
 
+    def _log(self, message: str) -> None:
+        if self.verbose:
+            print(message)
+
     def _cache_path(self) -> Path:
         """Location for persisted index cache."""
         cache_dir = config.CACHE_DIR
@@ -80,7 +86,7 @@ class SimpleCodeRetriever(BaseCodeRetriever):
             self.chunks = [CodeChunk(**chunk) for chunk in payload.get("chunks", [])]
             self.index_built = True
             duration = time.perf_counter() - start
-            print(f"    Loaded RAG index from {cache_path} ({len(self.chunks)} chunks, {duration:.2f}s)")
+            self._log(f"    Loaded RAG index from {cache_path} ({len(self.chunks)} chunks, {duration:.2f}s)")
             return True
         except Exception:
             return False
@@ -97,7 +103,7 @@ class SimpleCodeRetriever(BaseCodeRetriever):
                 "chunks": [c.to_dict() for c in self.chunks],
             }
             cache_path.write_text(json.dumps(payload), encoding="utf-8")
-            print(f"    Saved RAG index to {cache_path}")
+            self._log(f"    Saved RAG index to {cache_path}")
         except Exception:
             # Best-effort persistence; ignore failures
             pass
@@ -113,10 +119,10 @@ class SimpleCodeRetriever(BaseCodeRetriever):
 
         file_count = (repo_stats or {}).get("file_count", 0)
         if file_count and file_count > 2000:
-            print("    Skipping RAG index (repo too large)")
+            self._log("    Skipping RAG index (repo too large)")
             return
         if budget and budget.get_remaining().get("tokens", 100) < 10:
-            print("    Skipping RAG index (token budget too low)")
+            self._log("    Skipping RAG index (token budget too low)")
             return
 
         cache_path = self._cache_path()
@@ -136,8 +142,8 @@ class SimpleCodeRetriever(BaseCodeRetriever):
 
         # Index all code files
         for file_path in self.root.rglob("*"):
-            # Skip excluded directories
-            if any(excluded in file_path.parts for excluded in EXCLUDE_DIRS):
+            # Skip excluded directories (and rev's own state, which holds this index's cache)
+            if any(excluded in file_path.parts for excluded in EXCLUDE_DIRS) or ".rev" in file_path.parts:
                 continue
 
             # Only process code files
@@ -159,24 +165,24 @@ class SimpleCodeRetriever(BaseCodeRetriever):
         # Build code-aware indices if enabled
         if self.enable_code_aware:
             try:
-                print("    Building symbol index...")
+                self._log("    Building symbol index...")
                 self.symbol_index.build_index()
 
-                print("    Building import graph...")
+                self._log("    Building import graph...")
                 self.import_graph.build_graph()
 
                 # Update query engine
                 self.query_engine = CodeQueryEngine(self.symbol_index, self.import_graph)
             except Exception as e:
-                print(f"    Warning: Code-aware indexing failed: {e}")
+                self._log(f"    Warning: Code-aware indexing failed: {e}")
                 self.enable_code_aware = False
 
         self.index_built = True
         duration = time.perf_counter() - start
-        print(f"    Built RAG index with {len(self.chunks)} chunks in {duration:.2f}s")
+        self._log(f"    Built RAG index with {len(self.chunks)} chunks in {duration:.2f}s")
         if self.enable_code_aware:
             stats = self.symbol_index.get_stats() if self.symbol_index else {}
-            print(f"    Indexed {stats.get('total_symbols', 0)} symbols across {stats.get('files', 0)} files")
+            self._log(f"    Indexed {stats.get('total_symbols', 0)} symbols across {stats.get('files', 0)} files")
         self._save_cache(cache_path)
 
     def _index_file(self, file_path: Path) -> None:
@@ -480,3 +486,20 @@ class SimpleCodeRetriever(BaseCodeRetriever):
         self.chunks = []
         self.term_document_freq = {}
         self.total_documents = 0
+
+
+def create_code_retriever(root: Path = None, chunk_size: int = 50, verbose: bool = True) -> BaseCodeRetriever:
+    """Retriever for RAG search: lexical TF-IDF, or vector search when enabled.
+
+    With ``config.VECTOR_RETRIEVAL_ENABLED`` the ``VectorCodeRetriever`` is
+    used, fusing its scores with TF-IDF by ``config.VECTOR_FUSION_WEIGHT``.
+    Falls back to the lexical retriever when numpy is not installed.
+    """
+    if config.VECTOR_RETRIEVAL_ENABLED:
+        try:
+            from rev.retrieval.vector_index import VectorCodeRetriever
+
+            return VectorCodeRetriever(root, chunk_size=chunk_size, enable_code_aware=True, verbose=verbose)
+        except ImportError as e:
+            print(f"    Warning: {e}; using lexical retrieval")
+    return SimpleCodeRetriever(root=root, chunk_size=chunk_size, verbose=verbose)
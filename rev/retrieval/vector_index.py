@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Vector code retrieval over a NumPy embedding matrix.
+
+Chunks come from ``SimpleCodeRetriever`` (same files, same line windows) and
+are embedded into one contiguous float32 matrix of L2-normalized rows, so a
+query is a single matrix-vector product followed by ``argpartition`` for the
+top k. The matrix is persisted under ``config.CACHE_DIR`` and reopened with
+``np.memmap``; it is only re-embedded when the chunks or the embedder change.
+
+The default ``HashedEmbedder`` needs nothing beyond NumPy: it splits
+identifiers (``parseConfigFile`` / ``parse_config_file`` -> parse, config,
+file), adds character n-grams for morphological variants, and hashes the
+features into a fixed number of dimensions. A sentence-transformers model can
+be used instead when that package is installed (``REV_VECTOR_EMBEDDER``).
+
+Scores can be fused with the lexical TF-IDF score: the vector top candidates
+are rescored as ``w * cosine + (1 - w) * tfidf / max_tfidf``.
+
+NumPy is an optional dependency: ``pip install rev-agentic[vector]``.
+"""
+
+import dataclasses
+import fnmatch
+import hashlib
+import json
+import math
+import os
+import re
+import time
+import zlib
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from rev import config
+from rev.retrieval.base import BaseCodeRetriever, CodeChunk
+from rev.retrieval.simple_rag import SimpleCodeRetriever
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError(
+            "Vector retrieval requires numpy. Install with: pip install rev-agentic[vector]"
+        )
+
+
+_IDENTIFIER = re.compile(r"[A-Za-z][A-Za-z0-9_]*")
+_WORD_PART = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+_STOP_WORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is",
+    "it", "of", "on", "or", "that", "the", "to", "was", "will", "with",
+    # Python keywords and builtins that appear in nearly every chunk.
+    "def", "self", "return", "import", "none", "true", "false", "if", "else",
+    "not", "str", "int", "dict", "list",
+})
+
+
+def split_identifier(identifier: str) -> List[str]:
+    """Lowercased word parts of a snake_case / camelCase identifier."""
+    return [part.lower() for piece in identifier.split("_") for part in _WORD_PART.findall(piece)]
+
+
+@lru_cache(maxsize=1 << 16)
+def _identifier_words(identifier: str) -> Tuple[str, ...]:
+    return tuple(p for p in split_identifier(identifier) if len(p) > 1 and p not in _STOP_WORDS)
+
+
+def _bucket(feature: str, dim: int) -> Tuple[int, float]:
+    # CRC32 is stable across processes (unlike hash()), so cached matrices stay valid.
+    h = zlib.crc32(feature.encode("utf-8"))
+    return h % dim, (1.0 if (h >> 31) & 1 else -1.0)
+
+
+@lru_cache(maxsize=1 << 16)
+def _word_buckets(word: str, dim: int, ngram: int, ngram_weight: float) -> Tuple[Tuple[int, float], ...]:
+    """Signed bucket contributions of one word: the word itself plus its char n-grams."""
+    contributions = [_bucket("w:" + word, dim)]
+    padded = f"<{word}>"
+    for start in range(len(padded) - ngram + 1):
+        col, sign = _bucket("g:" + padded[start:start + ngram], dim)
+        contributions.append((col, sign * ngram_weight))
+    return tuple(contributions)
+
+
+class HashedEmbedder:
+    """Dependency-free featurizer: identifier parts plus char n-grams, hashed.
+
+    Features are weighted by ``1 + log(tf)``; the sign of each feature comes
+    from its hash so collisions tend to cancel rather than accumulate. Whole
+    compound identifiers are a feature of their own, so an exact name match
+    still beats a chunk that merely shares its parts.
+    """
+
+    def __init__(self, dim: int = 512, ngram: int = 3, ngram_weight: float = 0.3, identifier_weight: float = 0.5):
+        self.dim = dim
+        self.ngram = ngram
+        self.ngram_weight = ngram_weight
+        self.identifier_weight = identifier_weight
+        self.name = f"hashed-{dim}-{ngram}-{ngram_weight}-{identifier_weight}"
+
+    def features(self, text: str) -> Dict[int, float]:
+        """Sparse ``{bucket: value}`` vector for ``text`` (not normalized)."""
+        words: Counter = Counter()
+        compounds: Dict[str, int] = {}
+        for identifier, tf in Counter(_IDENTIFIER.findall(text)).items():
+            parts = _identifier_words(identifier)
+            for part in parts:
+                words[part] += tf
+            if len(parts) > 1:
+                key = identifier.lower()
+                compounds[key] = compounds.get(key, 0) + tf
+
+        vector: Dict[int, float] = {}
+        for word, tf in words.items():
+            weight = 1.0 + math.log(tf)
+            for col, value in _word_buckets(word, self.dim, self.ngram, self.ngram_weight):
+                vector[col] = vector.get(col, 0.0) + weight * value
+        for identifier, tf in compounds.items():
+            col, sign = _bucket("i:" + identifier, self.dim)
+            vector[col] = vector.get(col, 0.0) + sign * (1.0 + math.log(tf)) * self.identifier_weight
+        return vector
+
+    def embed(self, texts: Sequence[str]) -> "np.ndarray":
+        """Embed texts as rows of a float32 matrix with unit L2 norm."""
+        _require_numpy()
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            vector = self.features(text)
+            if vector:
+                matrix[row, list(vector)] = list(vector.values())
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.maximum(norms, 1e-12)
+        return matrix
+
+
+class SentenceTransformerEmbedder:
+    """Local sentence-transformers model (optional ``sentence-transformers`` package)."""
+
+    def __init__(self, model_name: str, batch_size: int = 32):
+        _require_numpy()
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            raise ImportError(
+                "sentence-transformers package not installed. Install with: pip install sentence-transformers"
+            )
+        self.model = SentenceTransformer(model_name)
+        self.batch_size = batch_size
+        self.dim = int(self.model.get_sentence_embedding_dimension())
+        self.name = f"st-{model_name}"
+
+    def embed(self, texts: Sequence[str]) -> "np.ndarray":
+        vectors = self.model.encode(
+            list(texts),
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+        return np.ascontiguousarray(vectors, dtype=np.float32)
+
+
+def get_embedder(spec: Optional[str] = None):
+    """Embedder for ``spec`` ("hashed" or a sentence-transformers model name).
+
+    Falls back to the hashed embedder when the model package is missing.
+    """
+    spec = (spec if spec is not None else config.VECTOR_EMBEDDER) or "hashed"
+    if spec == "hashed":
+        return HashedEmbedder(dim=config.VECTOR_DIM)
+    try:
+        return SentenceTransformerEmbedder(spec)
+    except ImportError as e:
+        print(f"    Warning: {e}; using the hashed embedder")
+        return HashedEmbedder(dim=config.VECTOR_DIM)
+
+
+def _chunk_filter(filters: Optional[Dict[str, Any]], use_file_pattern: bool = True) -> Optional[Callable[[CodeChunk], bool]]:
+    """Predicate for SimpleCodeRetriever-style filters (language, chunk_type, file_pattern)."""
+    if not filters:
+        return None
+    pattern = None
+    if use_file_pattern and filters.get("file_pattern"):
+        normalized = str(filters["file_pattern"]).strip().replace("\\", "/")
+        try:
+            pattern = re.compile(normalized)
+        except re.error:
+            try:
+                pattern = re.compile(fnmatch.translate(normalized))
+            except re.error:
+                pattern = None
+
+    def passes(chunk: CodeChunk) -> bool:
+        if "language" in filters and chunk.metadata.get("language") != filters["language"]:
+            return False
+        if "chunk_type" in filters and chunk.chunk_type != filters["chunk_type"]:
+            return False
+        if pattern is not None and not pattern.search(chunk.path.replace("\\", "/")):
+            return False
+        return True
+
+    return passes
+
+
+def top_indices(scores: "np.ndarray", k: int) -> "np.ndarray":
+    """Indices of the ``k`` highest finite scores, best first."""
+    n = scores.shape[0]
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.int64)
+    if k < n:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(n)
+    ordered = candidates[np.argsort(-scores[candidates], kind="stable")]
+    return ordered[np.isfinite(scores[ordered])]
+
+
+_STRUCTURE_QUERY = re.compile(r"^\s*find (callers|implementers|usages):", re.IGNORECASE)
+
+
+class VectorCodeRetriever(BaseCodeRetriever):
+    """Embedding-based code retriever with optional TF-IDF score fusion."""
+
+    cache_version = 1
+
+    def __init__(
+        self,
+        root: Path = None,
+        chunk_size: int = 50,
+        embedder=None,
+        fusion_weight: Optional[float] = None,
+        lexical: Optional[SimpleCodeRetriever] = None,
+        enable_code_aware: bool = False,
+        batch_size: int = 256,
+        verbose: bool = True,
+    ):
+        """Initialize the vector retriever.
+
+        Args:
+            root: Root directory of the codebase
+            chunk_size: Number of lines per chunk (passed to the lexical chunker)
+            embedder: Object with ``name``, ``dim`` and ``embed(texts)``; defaults to ``get_embedder()``
+            fusion_weight: Share of the vector score in fused ranking (1.0 = vector only)
+            lexical: Existing SimpleCodeRetriever to share chunks and TF-IDF statistics with
+            enable_code_aware: Let the lexical retriever answer "find callers:"-style queries
+            batch_size: Chunks embedded per batch while building
+            verbose: Print indexing progress
+        """
+        _require_numpy()
+        super().__init__(root)
+        self.verbose = verbose
+        self.embedder = embedder or get_embedder()
+        self.fusion_weight = config.VECTOR_FUSION_WEIGHT if fusion_weight is None else fusion_weight
+        self.lexical = lexical or SimpleCodeRetriever(
+            self.root, chunk_size=chunk_size, enable_code_aware=enable_code_aware, verbose=verbose
+        )
+        self.batch_size = batch_size
+        self.chunks: List[CodeChunk] = []
+        self._matrix = np.zeros((0, self.embedder.dim), dtype=np.float32)
+
+    def _log(self, message: str) -> None:
+        if self.verbose:
+            print(message)
+
+    def _cache_paths(self) -> Tuple[Path, Path]:
+        cache_dir = config.CACHE_DIR
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        root_id = hashlib.sha1(str(self.root.resolve()).encode("utf-8")).hexdigest()[:12]
+        embedder_id = hashlib.sha1(self.embedder.name.encode("utf-8")).hexdigest()[:8]
+        stem = f"vector_index_{root_id}_{self.lexical.chunk_size}_{embedder_id}"
+        return cache_dir / f"{stem}.f32", cache_dir / f"{stem}.json"
+
+    def _fingerprint(self) -> str:
+        digest = hashlib.sha1(self.embedder.name.encode("utf-8"))
+        for chunk in self.chunks:
+            digest.update(f"\0{chunk.path}\0{chunk.start_line}\0{chunk.end_line}\0".encode("utf-8"))
+            digest.update(chunk.content.encode("utf-8", errors="ignore"))
+        return digest.hexdigest()
+
+    def _open_matrix(self, data_path: Path, rows: int, dim: int) -> "np.ndarray":
+        if rows == 0:
+            return np.zeros((0, dim), dtype=np.float32)
+        return np.memmap(data_path, dtype=np.float32, mode="r", shape=(rows, dim))
+
+    def _load_cache(self, fingerprint: str) -> bool:
+        data_path, meta_path = self._cache_paths()
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        rows, dim = len(self.chunks), self.embedder.dim
+        if (
+            meta.get("version") != self.cache_version
+            or meta.get("fingerprint") != fingerprint
+            or meta.get("shape") != [rows, dim]
+        ):
+            return False
+        try:
+            if rows and data_path.stat().st_size != rows * dim * 4:
+                return False
+            self._matrix = self._open_matrix(data_path, rows, dim)
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def _embed_to_cache(self, fingerprint: str) -> None:
+        data_path, meta_path = self._cache_paths()
+        rows, dim = len(self.chunks), self.embedder.dim
+        if rows == 0:
+            self._matrix = np.zeros((0, dim), dtype=np.float32)
+            return
+        # Embed straight into a memmap so the full matrix never sits in RAM twice;
+        # the temp file is swapped in only once complete.
+        tmp_path = data_path.with_suffix(f".{os.getpid()}.tmp")
+        out = np.memmap(tmp_path, dtype=np.float32, mode="w+", shape=(rows, dim))
+        for start in range(0, rows, self.batch_size):
+            batch = self.chunks[start:start + self.batch_size]
+            out[start:start + len(batch)] = self.embedder.embed([self._chunk_text(c) for c in batch])
+        out.flush()
+        del out
+        os.replace(tmp_path, data_path)
+        meta = {"version": self.cache_version, "fingerprint": fingerprint, "shape": [rows, dim],
+                "embedder": self.embedder.name, "root": str(self.root)}
+        try:
+            meta_path.write_text(json.dumps(meta), encoding="utf-8")
+        except OSError:
+            pass
+        self._matrix = self._open_matrix(data_path, rows, dim)
+
+    @staticmethod
+    def _chunk_text(chunk: CodeChunk) -> str:
+        # The path carries module names ("retrieval/context_builder") worth matching on.
+        return f"{chunk.path}\n{chunk.content}"
+
+    def build_index(self, root: Optional[Path] = None, repo_stats: Optional[Dict[str, Any]] = None, budget=None) -> None:
+        """Chunk the codebase (via the lexical retriever) and embed the chunks.
+
+        Args:
+            root: Root directory to index
+        """
+        if root:
+            self.root = Path(root)
+        if root or not self.lexical.index_built:
+            self.lexical.build_index(self.root, repo_stats=repo_stats, budget=budget)
+        if not self.lexical.index_built:
+            return
+
+        start = time.perf_counter()
+        self.chunks = self.lexical.chunks
+        fingerprint = self._fingerprint()
+        if self._load_cache(fingerprint):
+            self._log(f"    Loaded vector index ({len(self.chunks)} chunks, {time.perf_counter() - start:.2f}s)")
+        else:
+            try:
+                self._embed_to_cache(fingerprint)
+            except OSError:
+                # Unwritable cache dir: keep the matrix in memory only.
+                self._matrix = np.concatenate(
+                    [self.embedder.embed([self._chunk_text(c) for c in self.chunks[i:i + self.batch_size]])
+                     for i in range(0, len(self.chunks), self.batch_size)]
+                ) if self.chunks else np.zeros((0, self.embedder.dim), dtype=np.float32)
+            self._log(f"    Built vector index with {len(self.chunks)} chunks in {time.perf_counter() - start:.2f}s")
+        self.index_built = True
+
+    def _mask(self, filters: Optional[Dict[str, Any]]) -> Optional["np.ndarray"]:
+        passes = _chunk_filter(filters)
+        if passes is None:
+            return None
+        mask = np.fromiter((passes(c) for c in self.chunks), dtype=bool, count=len(self.chunks))
+        if not mask.any() and filters.get("file_pattern"):
+            # Like the lexical retriever: don't assume code lives where the pattern says.
+            passes = _chunk_filter(filters, use_file_pattern=False)
+            mask = np.fromiter((passes(c) for c in self.chunks), dtype=bool, count=len(self.chunks))
+        return mask
+
+    def search(
+        self,
+        questions: Sequence[str],
+        k: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        fusion_weight: Optional[float] = None,
+    ) -> List[List[CodeChunk]]:
+        """Answer several queries with one (chunks x dim) @ (dim x queries) product."""
+        if not self.index_built:
+            raise RuntimeError("Index not built. Call build_index() first.")
+        if not questions:
+            return []
+        weight = self.fusion_weight if fusion_weight is None else fusion_weight
+        scores = self._matrix @ self.embedder.embed(list(questions)).T
+        mask = self._mask(filters)
+        if mask is not None:
+            scores[~mask] = -np.inf
+
+        results = []
+        for column, question in enumerate(questions):
+            column_scores = scores[:, column]
+            if weight >= 1.0:
+                ranked = [(int(i), float(column_scores[i])) for i in top_indices(column_scores, k)]
+            else:
+                pool = top_indices(column_scores, max(k * 5, 50))
+                ranked = self._fuse(question, pool, column_scores, weight)[:k]
+            results.append([
+                dataclasses.replace(self.chunks[i], score=score) for i, score in ranked if score > 0
+            ])
+        return results
+
+    def _fuse(self, question: str, pool: "np.ndarray", scores: "np.ndarray", weight: float) -> List[Tuple[int, float]]:
+        """Rescore the vector candidates with normalized TF-IDF."""
+        terms = self.lexical._tokenize(question)
+        lexical = [self.lexical._compute_tfidf_score(terms, self.chunks[i]) for i in pool] if terms else []
+        top_lexical = max(lexical, default=0.0)
+        fused = []
+        for position, index in enumerate(pool):
+            vector_score = max(float(scores[index]), 0.0)
+            lexical_score = lexical[position] / top_lexical if top_lexical > 0 else 0.0
+            fused.append((int(index), weight * vector_score + (1.0 - weight) * lexical_score))
+        fused.sort(key=lambda item: -item[1])
+        return fused
+
+    def query(self, question: str, k: int = 10, filters: Optional[Dict[str, Any]] = None) -> List[CodeChunk]:
+        """Query for relevant code chunks.
+
+        Args:
+            question: Natural language question or search query
+            k: Number of top results to return
+            filters: Optional filters (language, chunk_type, file_pattern)
+
+        Returns:
+            List of top-k code chunks ranked by (fused) similarity
+        """
+        if self.lexical.enable_code_aware and _STRUCTURE_QUERY.match(question):
+            return self.lexical.query(question, k, filters)
+        return self.search([question], k, filters)[0]
+
+    def get_index_stats(self) -> Dict[str, Any]:
+        """Get statistics about the current index."""
+        stats = super().get_index_stats()
+        stats.update({
+            "total_chunks": len(self.chunks),
+            "embedder": self.embedder.name,
+            "dim": self.embedder.dim,
+            "matrix_mb": round(self._matrix.nbytes / (1024 * 1024), 2),
+            "memmapped": isinstance(self._matrix, np.memmap),
+            "fusion_weight": self.fusion_weight,
+        })
+        return stats
+
+    def clear_index(self) -> None:
+        """Clear the current index."""
+        super().clear_index()
+        self.chunks = []
+        self._matrix = np.zeros((0, self.embedder.dim), dtype=np.float32)
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Session warm-up: build retrieval indexes in the background.
+
+The RAG index, the ContextBuilder corpora and the repository context are all
+built lazily on first use, which puts several seconds of file walking in the
+critical path of the first task. ``start_session_warmup`` schedules those
+builds on background workers right after the caches are initialised so they
+overlap with argument parsing, provider setup and the user typing a prompt.
+
+Consumers call :func:`await_warmup` (or ``WarmupScheduler.result``) with a
+timeout: a finished task returns its result, a task that is still running
+returns the default so the caller can degrade (e.g. research without RAG)
+instead of blocking the planner.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from rev import config
+from rev.debug_logger import get_logger
+
+PENDING = "pending"
+RUNNING = "running"
+READY = "ready"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+@dataclass
+class WarmupTask:
+    """A single background warm-up job."""
+
+    name: str
+    fn: Callable[[], Any]
+    priority: int = 0
+    status: str = PENDING
+    result: Any = None
+    error: Optional[str] = None
+    queued_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    _done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the task finished (any outcome); False on timeout."""
+        return self._done.wait(timeout)
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def timings(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "status": self.status,
+            "priority": self.priority,
+            "queued_s": round((self.started_at or now) - self.queued_at, 4),
+            "duration_s": round((self.finished_at or now) - self.started_at, 4) if self.started_at else None,
+            "error": self.error,
+        }
+
+
+class WarmupScheduler:
+    """Priority-ordered background runner for warm-up tasks.
+
+    Higher ``priority`` runs first. Workers are daemon threads so an
+    unfinished warm-up never delays interpreter exit.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self.max_workers = max(1, int(max_workers))
+        self._tasks: Dict[str, WarmupTask] = {}
+        self._heap: List[tuple] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._workers: List[threading.Thread] = []
+        self._closed = False
+        self._started_at: Optional[float] = None
+
+    def add(self, name: str, fn: Callable[[], Any], priority: int = 0) -> WarmupTask:
+        """Register ``fn`` under ``name``; re-adding a name replaces a pending task."""
+        with self._cond:
+            existing = self._tasks.get(name)
+            if existing is not None and existing.status != PENDING:
+                return existing
+            task = WarmupTask(name=name, fn=fn, priority=priority)
+            self._tasks[name] = task
+            heapq.heappush(self._heap, (-priority, next(self._seq), name))
+            self._cond.notify()
+        return task
+
+    def start(self) -> "WarmupScheduler":
+        with self._cond:
+            if self._workers or self._closed:
+                return self
+            self._started_at = time.monotonic()
+            for i in range(self.max_workers):
+                worker = threading.Thread(target=self._worker, name=f"rev-warmup-{i}", daemon=True)
+                self._workers.append(worker)
+                worker.start()
+        return self
+
+    def _next_task(self) -> Optional[WarmupTask]:
+        with self._cond:
+            while True:
+                while self._heap:
+                    _, _, name = heapq.heappop(self._heap)
+                    task = self._tasks.get(name)
+                    if task is not None and task.status == PENDING:
+                        task.status = RUNNING
+                        task.started_at = time.monotonic()
+                        return task
+                if self._closed:
+                    return None
+                self._cond.wait()
+
+    def _worker(self) -> None:
+        while True:
+            task = self._next_task()
+            if task is None:
+                return
+            try:
+                task.result = task.fn()
+                task.status = READY
+            except Exception as e:
+                task.error = f"{type(e).__name__}: {e}"
+                task.status = FAILED
+            task.finished_at = time.monotonic()
+            task._done.set()
+            try:
+                get_logger().log("warmup", "TASK_FINISHED", {"name": task.name, **task.timings()}, "DEBUG")
+            except Exception:
+                pass
+
+    def get(self, name: str) -> Optional[WarmupTask]:
+        return self._tasks.get(name)
+
+    def wait(self, name: str, timeout: Optional[float] = None) -> bool:
+        """True once ``name`` finished successfully; False if unknown, failed or still running."""
+        task = self._tasks.get(name)
+        if task is None:
+            return False
+        task.wait(timeout)
+        return task.status == READY
+
+    def result(self, name: str, timeout: Optional[float] = None, default: Any = None) -> Any:
+        """Result of ``name`` if it completed within ``timeout``, otherwise ``default``."""
+        if self.wait(name, timeout):
+            return self._tasks[name].result
+        return default
+
+    def wait_all(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for task in list(self._tasks.values()):
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not task.wait(remaining):
+                return False
+        return True
+
+    def get_timings(self) -> Dict[str, Any]:
+        """Per-task status and timings plus the wall time since ``start``."""
+        tasks = {name: task.timings() for name, task in self._tasks.items()}
+        finished = [t.finished_at for t in self._tasks.values() if t.finished_at]
+        wall = None
+        if self._started_at is not None and finished and all(t.done for t in self._tasks.values()):
+            wall = round(max(finished) - self._started_at, 4)
+        return {"tasks": tasks, "wall_s": wall, "workers": self.max_workers}
+
+    def shutdown(self) -> None:
+        """Drop tasks that have not started; running tasks finish in the background."""
+        with self._cond:
+            self._closed = True
+            for task in self._tasks.values():
+                if task.status == PENDING:
+                    task.status = CANCELLED
+                    task._done.set()
+            self._heap.clear()
+            self._cond.notify_all()
+
+
+_RAG_MAX_FILES = 1500
+
+_SCHEDULER: Optional[WarmupScheduler] = None
+_LOCK = threading.Lock()
+
+
+def get_warmup() -> Optional[WarmupScheduler]:
+    """The session warm-up scheduler, or None when warm-up was not started."""
+    return _SCHEDULER
+
+
+def await_warmup(name: str, timeout: Optional[float] = None, default: Any = None) -> Any:
+    """Result of warm-up task ``name`` or ``default`` (not scheduled, failed or still running)."""
+    scheduler = _SCHEDULER
+    if scheduler is None:
+        return default
+    if timeout is None:
+        timeout = config.WARMUP_WAIT_TIMEOUT
+    return scheduler.result(name, timeout=timeout, default=default)
+
+
+def _warm_repo_context() -> int:
+    from rev.tools.git_ops import get_repo_context
+
+    return len(get_repo_context() or "")
+
+
+def _warm_context_builder(root: Path) -> Dict[str, Any]:
+    from rev.agents.context_provider import get_context_builder
+
+    builder = get_context_builder(root)
+    builder.code.build()
+    builder.docs.build()
+    return {"code_chunks": len(builder.code._chunks), "docs_chunks": len(builder.docs._chunks)}
+
+
+def _count_files(root: Path, limit: int) -> int:
+    count = 0
+    for _dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in config.EXCLUDE_DIRS]
+        count += len(filenames)
+        if count >= limit:
+            break
+    return count
+
+
+def _warm_rag_index(root: Path):
+    from rev.retrieval.simple_rag import create_code_retriever
+
+    # Same ceiling the researcher applies before building synchronously.
+    if _count_files(root, _RAG_MAX_FILES + 1) > _RAG_MAX_FILES:
+        raise RuntimeError("repository too large for the lightweight RAG index")
+    retriever = create_code_retriever(root=root, chunk_size=50, verbose=False)
+    retriever.build_index()
+    if not retriever.index_built:
+        raise RuntimeError("RAG index was not built")
+    return retriever
+
+
+def start_session_warmup(root: Optional[Path] = None, *, max_workers: Optional[int] = None) -> Optional[WarmupScheduler]:
+    """Start (once) the session warm-up for ``root``; returns the scheduler."""
+    global _SCHEDULER
+    if not config.WARMUP_ENABLED:
+        return None
+    root = Path(root or config.ROOT).resolve()
+    with _LOCK:
+        if _SCHEDULER is not None:
+            return _SCHEDULER
+        scheduler = WarmupScheduler(max_workers=max_workers or config.WARMUP_WORKERS)
+        # Repo context feeds routing and the first planner prompt; the
+        # ContextBuilder corpora are used by every sub-agent; RAG only by research.
+        scheduler.add("repo_context", _warm_repo_context, priority=30)
+        scheduler.add("context_index", lambda: _warm_context_builder(root), priority=20)
+        scheduler.add("rag_index", lambda: _warm_rag_index(root), priority=10)
+        _SCHEDULER = scheduler.start()
+        return _SCHEDULER
+
+
+def stop_session_warmup() -> None:
+    global _SCHEDULER
+    with _LOCK:
+        scheduler, _SCHEDULER = _SCHEDULER, None
+    if scheduler is not None:
+        scheduler.shutdown()
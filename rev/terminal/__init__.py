@@ -2,14 +2,20 @@
 # -*- coding: utf-8 -*-
 """Terminal input and REPL utilities for rev."""
 
-from rev.terminal.input import get_input_with_escape
-from rev.terminal.commands import execute_command, COMMAND_HANDLERS
-from rev.terminal.repl import repl_mode
-from rev.terminal.formatting import (
-    colorize, create_header, create_section, create_item,
-    create_bullet_item, create_tree_item, Colors, Symbols,
-    get_color_status
-)
+from rev._lazy import exports_from, lazy_exports
+
+# Submodules are imported on first use: the REPL pulls in the orchestrator,
+# which itself needs ``rev.terminal.formatting``.
+__getattr__, __dir__ = lazy_exports(__name__, exports_from({
+    "rev.terminal.input": ["get_input_with_escape"],
+    "rev.terminal.commands": ["execute_command", "COMMAND_HANDLERS"],
+    "rev.terminal.repl": ["repl_mode"],
+    "rev.terminal.formatting": [
+        "colorize", "create_header", "create_section", "create_item",
+        "create_bullet_item", "create_tree_item", "Colors", "Symbols",
+        "get_color_status",
+    ],
+}), globals())
 
 __all__ = [
     "get_input_with_escape",
@@ -681,14 +681,17 @@ def analyze_semantic_diff(file_path: str, compare_to: str = "HEAD") -> str:
             "summary": {}
         }
 
-        # Get old version from git
-        old_cmd = f"git show {compare_to}:{rel_path}"
-        old_proc = _run_shell(old_cmd, timeout=30)
+        # Get old version from git (served by the shared cat-file process)
+        from rev.tools.git_access import get_git_repo
 
-        if old_proc.returncode != 0:
+        try:
+            old_blob = get_git_repo(config.ROOT).cat_file(f"{compare_to}:{rel_path}")
+        except ValueError:
+            old_blob = None
+        if old_blob is None:
             return json.dumps({"error": "Could not retrieve old version from git"})
 
-        old_content = old_proc.stdout
+        old_content = old_blob.decode("utf-8", errors="replace").replace("\r\n", "\n")
 
         # Get current version
         with open(file, 'r', encoding='utf-8') as f:
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""File-level coordination for tasks running in parallel.
+
+Two layers keep concurrent tasks from clobbering each other's edits:
+
+* ``LeaseTable``: per-path read/write leases. The concurrent scheduler only
+  starts a task once the paths it declares or is inferred to touch are
+  free, so tasks known to edit the same file never run at the same time.
+* Optimistic concurrency for everything the leases cannot predict: while a
+  worker runs with ``track_file_versions()``, ``read_file`` remembers the
+  content hash it returned, and the write tools only write if the file still
+  has that hash (checked under a per-path lock). Otherwise they return a
+  ``conflict`` error so the task re-reads the file and retries its edit.
+
+Outside ``track_file_versions()`` (sequential execution) all checks are
+no-ops.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+from rev import config
+
+
+# Action types that only read the files they mention.
+READ_ONLY_ACTIONS = frozenset({"read", "analyze", "review", "research", "investigate", "test", "verify"})
+
+
+def path_key(path: "str | Path") -> str:
+    """Normalized absolute path used to compare leases and versions."""
+    p = Path(path)
+    if not p.is_absolute():
+        p = config.ROOT / p
+    return os.path.normcase(os.path.normpath(str(p)))
+
+
+class LeaseTable:
+    """Shared read / exclusive write leases on paths, held by task owners."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._readers: Dict[str, Set[Hashable]] = {}
+        self._writers: Dict[str, Hashable] = {}
+        self._held: Dict[Hashable, Tuple[List[str], List[str]]] = {}
+
+    def _conflicts(self, owner: Hashable, reads: List[str], writes: List[str]) -> bool:
+        for key in writes:
+            writer = self._writers.get(key, owner)
+            if writer != owner or self._readers.get(key, set()) - {owner}:
+                return True
+        return any(self._writers.get(key, owner) != owner for key in reads)
+
+    def try_acquire(self, owner: Hashable, reads: Iterable[str] = (), writes: Iterable[str] = ()) -> bool:
+        """Take all leases for ``owner`` or none of them."""
+        write_keys = sorted({path_key(p) for p in writes})
+        read_keys = sorted({path_key(p) for p in reads} - set(write_keys))
+        with self._lock:
+            if self._conflicts(owner, read_keys, write_keys):
+                return False
+            for key in read_keys:
+                self._readers.setdefault(key, set()).add(owner)
+            for key in write_keys:
+                self._writers[key] = owner
+            held_reads, held_writes = self._held.setdefault(owner, ([], []))
+            held_reads.extend(read_keys)
+            held_writes.extend(write_keys)
+            return True
+
+    def release(self, owner: Hashable) -> None:
+        with self._lock:
+            reads, writes = self._held.pop(owner, ([], []))
+            for key in reads:
+                readers = self._readers.get(key)
+                if readers is not None:
+                    readers.discard(owner)
+                    if not readers:
+                        del self._readers[key]
+            for key in writes:
+                if self._writers.get(key) == owner:
+                    del self._writers[key]
+
+    def held(self) -> Dict[Hashable, Tuple[List[str], List[str]]]:
+        with self._lock:
+            return {owner: (list(r), list(w)) for owner, (r, w) in self._held.items()}
+
+
+def task_leases(task, paths: Iterable[str]) -> Tuple[List[str], List[str]]:
+    """(reads, writes) for a task: read-only actions share, everything else is exclusive."""
+    paths = [p for p in paths if isinstance(p, str) and p.strip()]
+    action = str(getattr(task, "action_type", "") or "").lower()
+    if action in READ_ONLY_ACTIONS:
+        return paths, []
+    return [], paths
+
+
+# -- optimistic concurrency ----------------------------------------------------
+
+class WriteConflict(Exception):
+    """The file changed since the current task read it."""
+
+    def __init__(self, path: Path):
+        super().__init__(f"{path} was modified by another task since it was read")
+        self.path = path
+
+    def to_result(self) -> Dict[str, object]:
+        return {
+            "error": f"Conflict: {self.path} was modified by a concurrent task since you read it. "
+                     "Re-read the file and apply your change again.",
+            "conflict": True,
+            "path_abs": str(self.path),
+        }
+
+
+# The versions the running task has seen. A context variable rather than a
+# thread-local so helper threads started with ``contextvars.copy_context()``
+# (streaming tool prefetch) record into the task that issued the read.
+_VERSIONS: "ContextVar[Optional[Dict[str, Optional[str]]]]" = ContextVar("rev_file_versions", default=None)
+_PATH_LOCKS: Dict[str, threading.RLock] = {}
+_PATH_LOCKS_GUARD = threading.Lock()
+
+
+def _path_lock(key: str) -> threading.RLock:
+    with _PATH_LOCKS_GUARD:
+        lock = _PATH_LOCKS.get(key)
+        if lock is None:
+            lock = _PATH_LOCKS[key] = threading.RLock()
+        return lock
+
+
+@contextmanager
+def track_file_versions() -> Iterator[None]:
+    """Enable read-version tracking for the current context (one task)."""
+    token = _VERSIONS.set({})
+    try:
+        yield
+    finally:
+        _VERSIONS.reset(token)
+
+
+def tracking_active() -> bool:
+    return _VERSIONS.get() is not None
+
+
+def seen_version(path: "str | Path") -> Optional[str]:
+    """Digest of ``path`` as last read or written by the current task."""
+    seen = _VERSIONS.get()
+    return None if seen is None else seen.get(path_key(path))
+
+
+_UNSET = object()
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def file_digest(path: Path) -> Optional[str]:
+    """Content hash of ``path``; None if it does not exist."""
+    try:
+        return content_digest(Path(path).read_bytes())
+    except FileNotFoundError:
+        return None
+
+
+def note_read(path: Path, digest=_UNSET) -> None:
+    """Remember the version of ``path`` the current task has seen.
+
+    ``digest`` is the version of the content actually returned to the task
+    (e.g. a cached copy); by default the file's current version.
+    """
+    seen = _VERSIONS.get()
+    if seen is not None:
+        seen[path_key(path)] = file_digest(path) if digest is _UNSET else digest
+
+
+@contextmanager
+def guarded_write(path: Path, expected=_UNSET) -> Iterator[None]:
+    """Hold ``path``'s write lock and verify it still has the expected version.
+
+    ``expected`` is the digest the caller based its edit on; by default the
+    version this task last read (blind writes to unread files are allowed).
+    Raises ``WriteConflict`` instead of entering the block on mismatch.
+    """
+    seen = _VERSIONS.get()
+    if seen is None:
+        yield
+        return
+    key = path_key(path)
+    if expected is _UNSET:
+        expected = seen.get(key, _UNSET)
+    with _path_lock(key):
+        if expected is not _UNSET and file_digest(path) != expected:
+            raise WriteConflict(Path(path))
+        yield
+        seen[key] = file_digest(path)
+
+
+def check_conflicts(paths: Iterable[str]) -> Optional[Dict[str, object]]:
+    """Conflict result for the first path that changed since this task read it."""
+    seen = _VERSIONS.get()
+    if seen is None:
+        return None
+    for raw in paths:
+        key = path_key(raw)
+        if key in seen and file_digest(Path(key)) != seen[key]:
+            return WriteConflict(Path(key)).to_result()
+    return None
+
+
+def note_written(paths: Iterable[str]) -> None:
+    """Record the current versions of files this task just wrote."""
+    seen = _VERSIONS.get()
+    if seen is None:
+        return
+    for raw in paths:
+        key = path_key(raw)
+        seen[key] = file_digest(Path(key))
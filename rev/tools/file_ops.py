@@ -23,6 +23,14 @@ from rev.config import (
     SIMILARITY_THRESHOLD,
 )
 from rev.cache import get_file_cache, get_repo_cache
+from rev.tools.file_leases import (
+    WriteConflict,
+    content_digest,
+    file_digest,
+    guarded_write,
+    note_read,
+    tracking_active,
+)
 from rev.tools.workspace_resolver import resolve_workspace_path
 from rev.workspace import get_workspace
 
@@ -356,11 +364,15 @@ def read_file(path: str) -> str:
     if file_cache is not None:
         cached_content = file_cache.get_file(p)
         if cached_content is not None:
+            note_read(p)
             return cached_content
 
     try:
+        data = p.read_bytes()
+        # Record the version of exactly the bytes returned, not a later re-read.
+        note_read(p, content_digest(data))
         # Use utf-8-sig to automatically handle and strip BOM if present
-        txt = p.read_text(encoding="utf-8-sig", errors="ignore")
+        txt = data.decode("utf-8-sig", errors="ignore").replace("\r\n", "\n").replace("\r", "\n")
         if len(txt) > READ_RETURN_LIMIT:
             txt = txt[:READ_RETURN_LIMIT] + "\n...[truncated]..."
 
@@ -392,7 +404,8 @@ def write_file(path: str, content: str) -> str:
                     print(f"    {warning}")
 
         p.parent.mkdir(parents=True, exist_ok=True)
-        p.write_text(content, encoding="utf-8")
+        with guarded_write(p):
+            p.write_text(content, encoding="utf-8")
 
         # Invalidate cache for this file
         file_cache = get_file_cache()
@@ -425,6 +438,8 @@ def write_file(path: str, content: str) -> str:
             result['is_new_file'] = True
 
         return json.dumps(result)
+    except WriteConflict as e:
+        return json.dumps(e.to_result())
     except Exception as e:
         return json.dumps({"error": f"{type(e).__name__}: {e}"})
 
@@ -480,6 +495,65 @@ def search_code(pattern: str, include: str = "**/*", regex: bool = True,
     return json.dumps({"matches": matches, "truncated": False})
 
 
+def search_code_multi(patterns: List[str], include: str = "**/*", regex: bool = False,
+                      case_sensitive: bool = False, max_matches_per_pattern: int = SEARCH_MATCH_LIMIT) -> str:
+    """Search code for several patterns in a single pass over the tree.
+
+    All patterns are combined into one alternation used to reject lines that
+    match none of them; only lines that pass are checked against each pattern
+    so results can be bucketed per pattern (a line may land in several
+    buckets). The walk stops early once every bucket is full.
+    """
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    patterns = list(dict.fromkeys(p for p in patterns or [] if p))
+    if not patterns:
+        return json.dumps({"error": "No patterns given"})
+
+    flags = 0 if case_sensitive else re.IGNORECASE
+    sources = [p if regex else re.escape(p) for p in patterns]
+    try:
+        compiled = [re.compile(src, flags) for src in sources]
+        combined = re.compile("|".join(f"(?:{src})" for src in sources), flags)
+    except re.error as e:
+        return json.dumps({"error": f"Invalid regex: {e}"})
+
+    buckets = {p: [] for p in patterns}
+    open_patterns = list(zip(patterns, compiled))
+    files_scanned = 0
+    for p in _iter_files(include, include_dirs=False):
+        if not open_patterns:
+            break
+        if p.stat().st_size > MAX_FILE_BYTES or not _is_text_file(p):
+            continue
+        rel = _rel_to_root(p).replace("\\", "/")
+        files_scanned += 1
+        try:
+            with open(p, "r", encoding="utf-8", errors="ignore") as f:
+                for i, line in enumerate(f, 1):
+                    if not combined.search(line):
+                        continue
+                    text = line.rstrip("\n")
+                    for pattern, rex in open_patterns:
+                        if rex.search(line):
+                            buckets[pattern].append({"file": rel, "line": i, "text": text})
+                    full = [pat for pat, _ in open_patterns if len(buckets[pat]) >= max_matches_per_pattern]
+                    if full:
+                        open_patterns = [(pat, rex) for pat, rex in open_patterns if pat not in full]
+                        if not open_patterns:
+                            break
+        except Exception:
+            pass
+
+    return json.dumps({
+        "results": {
+            pattern: {"matches": matches, "truncated": len(matches) >= max_matches_per_pattern}
+            for pattern, matches in buckets.items()
+        },
+        "files_scanned": files_scanned,
+    })
+
+
 # ========== Additional File Operations ==========
 
 def delete_file(path: str) -> str:
@@ -609,6 +683,9 @@ def replace_in_file(path: str, find: str, replace: str, regex: bool = False) ->
         if not p.exists():
             return json.dumps({"error": f"Not found: {path}"})
         
+        # The edit is only written if the file is still the version read here.
+        base_digest = file_digest(p) if tracking_active() else None
+
         # Read with BOM handling if possible
         try:
             content = p.read_text(encoding="utf-8-sig") # Handles BOM automatically
@@ -679,7 +756,8 @@ def replace_in_file(path: str, find: str, replace: str, regex: bool = False) ->
                     }
                 )
 
-        p.write_text(new_content, encoding="utf-8")
+        with guarded_write(p, expected=base_digest):
+            p.write_text(new_content, encoding="utf-8")
 
         # Invalidate cache for this file
         file_cache = get_file_cache()
@@ -695,6 +773,8 @@ def replace_in_file(path: str, find: str, replace: str, regex: bool = False) ->
                 "path_rel": _rel_to_root_posix(p),
             }
         )
+    except WriteConflict as e:
+        return json.dumps(e.to_result())
     except Exception as e:
         return json.dumps({"error": f"{type(e).__name__}: {e}"})
 
@@ -785,6 +865,7 @@ def read_file_lines(path: str, start: int = 1, end: int = None) -> str:
         if p.stat().st_size > MAX_FILE_BYTES:
             return json.dumps({"error": f"Too large (> {MAX_FILE_BYTES} bytes): {path}"})
 
+        note_read(p)
         lines = p.read_text(encoding="utf-8", errors="ignore").splitlines()
         start_idx = max(0, start - 1)  # Convert to 0-based index
         end_idx = len(lines) if end is None else min(len(lines), end)
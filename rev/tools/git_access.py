@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Low-overhead git queries for rev.
+
+Every ``git`` invocation pays process start-up plus index/refs loading, and
+``git status`` on a large repository can take seconds. ``GitRepo`` keeps that
+cost off the hot path:
+
+- HEAD and blob lookups go through long-lived ``git cat-file --batch`` /
+  ``--batch-check`` processes instead of one process per query;
+- ``HEAD`` is memoised and only re-resolved when the HEAD file, the branch
+  ref or ``packed-refs`` changes on disk;
+- ``git log`` output is memoised per HEAD;
+- ``status`` enables the untracked cache (and fsmonitor when opted in).
+
+Use :func:`get_git_repo` to share one instance per repository root.
+"""
+
+from __future__ import annotations
+
+import atexit
+import re
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from rev import config
+
+_GIT_TIMEOUT = 30
+
+
+class _BatchProcess:
+    """A long-lived ``git cat-file --batch`` or ``--batch-check`` process."""
+
+    def __init__(self, root: Path, with_contents: bool):
+        self.root = root
+        self.with_contents = with_contents
+        self._proc: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    def _ensure(self) -> subprocess.Popen:
+        if self._proc is None or self._proc.poll() is not None:
+            mode = "--batch" if self.with_contents else "--batch-check"
+            self._proc = subprocess.Popen(
+                ["git", "cat-file", mode],
+                cwd=str(self.root),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        return self._proc
+
+    def query(self, spec: str) -> Tuple[Optional[Tuple[str, str, int]], Optional[bytes]]:
+        """Return ``((sha, type, size), contents)`` or ``(None, None)`` if missing."""
+        if not spec or "\n" in spec or "\r" in spec:
+            raise ValueError(f"Invalid object spec: {spec!r}")
+        with self._lock:
+            for attempt in range(2):
+                proc = self._ensure()
+                try:
+                    proc.stdin.write(spec.encode("utf-8") + b"\n")
+                    proc.stdin.flush()
+                    header = proc.stdout.readline()
+                    if not header:
+                        raise BrokenPipeError("git cat-file exited")
+                    parts = header.decode("utf-8", "replace").split()
+                    if len(parts) != 3 or parts[1] in {"missing", "ambiguous"}:
+                        return None, None
+                    sha, obj_type, size = parts[0], parts[1], int(parts[2])
+                    data = None
+                    if self.with_contents:
+                        data = proc.stdout.read(size)
+                        proc.stdout.read(1)  # trailing LF
+                    return (sha, obj_type, size), data
+                except (BrokenPipeError, OSError, ValueError):
+                    self._close_locked()
+                    if attempt:
+                        raise
+        return None, None
+
+    def _close_locked(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+        except Exception:
+            pass
+        try:
+            proc.wait(timeout=2)
+        except Exception:
+            proc.kill()
+        try:
+            proc.stdout.close()
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_locked()
+
+
+def _git_version() -> Tuple[int, ...]:
+    try:
+        out = subprocess.run(["git", "--version"], capture_output=True, text=True, timeout=5).stdout
+    except Exception:
+        return ()
+    match = re.search(r"(\d+)\.(\d+)", out)
+    return tuple(int(x) for x in match.groups()) if match else ()
+
+
+_FSMONITOR_SUPPORTED: Optional[bool] = None
+
+
+def _fsmonitor_supported() -> bool:
+    """Built-in fsmonitor needs git >= 2.36 on macOS/Windows."""
+    global _FSMONITOR_SUPPORTED
+    if _FSMONITOR_SUPPORTED is None:
+        _FSMONITOR_SUPPORTED = sys.platform in {"darwin", "win32"} and _git_version() >= (2, 36)
+    return _FSMONITOR_SUPPORTED
+
+
+class GitRepo:
+    """Cached git queries for one working tree."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root).resolve()
+        self._git_dir: Optional[Path] = None
+        self._common_dir: Optional[Path] = None
+        self._probed = False
+        self._lock = threading.Lock()
+        self._check = _BatchProcess(self.root, with_contents=False)
+        self._batch = _BatchProcess(self.root, with_contents=True)
+        self._head: Optional[str] = None
+        self._head_signature: Optional[tuple] = None
+        self._log_cache: Dict[Tuple[str, int], str] = {}
+
+    # ------------------------------------------------------------------ setup
+    def _probe(self) -> None:
+        if self._probed:
+            return
+        with self._lock:
+            if self._probed:
+                return
+            try:
+                proc = subprocess.run(
+                    ["git", "rev-parse", "--absolute-git-dir", "--git-common-dir"],
+                    cwd=str(self.root), capture_output=True, text=True, timeout=_GIT_TIMEOUT,
+                )
+                if proc.returncode == 0:
+                    lines = proc.stdout.splitlines()
+                    self._git_dir = Path(lines[0])
+                    common = Path(lines[1]) if len(lines) > 1 else self._git_dir
+                    self._common_dir = (common if common.is_absolute() else self.root / common).resolve()
+            except Exception:
+                pass
+            self._probed = True
+
+    @property
+    def is_repo(self) -> bool:
+        self._probe()
+        return self._git_dir is not None
+
+    # ------------------------------------------------------------------- HEAD
+    def _ref_signature(self) -> tuple:
+        """Identity of the files HEAD resolution depends on.
+
+        Git updates refs by renaming a lock file into place, so the inode
+        changes on every update even when mtime granularity is coarse.
+        """
+        head_file = self._git_dir / "HEAD"
+        paths = [head_file, self._common_dir / "packed-refs", self._common_dir / "reftable" / "tables.list"]
+        try:
+            content = head_file.read_text(encoding="utf-8").strip()
+        except OSError:
+            content = ""
+        if content.startswith("ref:"):
+            paths.append(self._common_dir / content[4:].strip())
+        signature = [content]
+        for path in paths:
+            try:
+                st = path.stat()
+                signature.append((st.st_ino, st.st_mtime_ns, st.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def head(self) -> Optional[str]:
+        """Current HEAD commit, or None outside a repository / on an unborn branch."""
+        if not self.is_repo:
+            return None
+        signature = self._ref_signature()
+        if signature == self._head_signature:
+            return self._head
+        try:
+            info, _ = self._check.query("HEAD")
+        except Exception:
+            info = None
+        self._head = info[0] if info else None
+        self._head_signature = signature
+        return self._head
+
+    # ---------------------------------------------------------------- objects
+    def cat_file(self, spec: str) -> Optional[bytes]:
+        """Raw contents of ``spec`` (e.g. ``HEAD:rev/main.py``), or None if missing."""
+        if not self.is_repo:
+            return None
+        _, data = self._batch.query(spec)
+        return data
+
+    # ------------------------------------------------------------ porcelain
+    def _run(self, args: list, timeout: int = _GIT_TIMEOUT) -> subprocess.CompletedProcess:
+        try:
+            return subprocess.run(
+                ["git", *args], cwd=str(self.root), capture_output=True, text=True,
+                encoding="utf-8", errors="replace", timeout=timeout,
+            )
+        except (OSError, subprocess.TimeoutExpired) as exc:
+            return subprocess.CompletedProcess(["git", *args], 1, "", str(exc))
+
+    def status(self, *, short: bool = False) -> subprocess.CompletedProcess:
+        """``git status --porcelain`` (or ``-s``)."""
+        args = ["-c", "core.untrackedCache=true"]
+        if config.GIT_FSMONITOR and _fsmonitor_supported():
+            args += ["-c", "core.fsmonitor=true"]
+        args += ["status", "-s" if short else "--porcelain"]
+        return self._run(args)
+
+    def log(self, count: int) -> subprocess.CompletedProcess:
+        """``git log -n <count> --oneline``, memoised until HEAD moves."""
+        head = self.head()
+        key = (head or "", int(count))
+        if head and key in self._log_cache:
+            return subprocess.CompletedProcess(["git", "log"], 0, self._log_cache[key], "")
+        proc = self._run(["log", "-n", str(int(count)), "--oneline"])
+        if head and proc.returncode == 0:
+            self._log_cache = {k: v for k, v in self._log_cache.items() if k[0] == head}
+            self._log_cache[key] = proc.stdout
+        return proc
+
+    def close(self) -> None:
+        self._check.close()
+        self._batch.close()
+
+
+_REPOS: Dict[Path, GitRepo] = {}
+_REPOS_LOCK = threading.Lock()
+
+
+def get_git_repo(root: Optional[Path] = None) -> GitRepo:
+    """Shared :class:`GitRepo` for ``root`` (defaults to the workspace root)."""
+    key = Path(root or config.ROOT).resolve()
+    with _REPOS_LOCK:
+        repo = _REPOS.get(key)
+        if repo is None:
+            repo = _REPOS[key] = GitRepo(key)
+        return repo
+
+
+def close_all() -> None:
+    """Terminate all persistent ``git cat-file`` processes."""
+    with _REPOS_LOCK:
+        repos = list(_REPOS.values())
+        _REPOS.clear()
+    for repo in repos:
+        repo.close()
+
+
+atexit.register(close_all)
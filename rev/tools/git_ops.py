@@ -19,6 +19,7 @@ _LARGE_PATCH_HINT_THRESHOLD = 120_000
 
 from rev import config
 from rev.debug_logger import prune_old_logs
+from rev.tools.file_leases import check_conflicts, note_written
 from rev.tools.utils import quote_cmd_arg
 from rev.llm.client import ollama_chat
 from rev.tools.command_runner import run_command_safe, run_command_background, list_background_processes, kill_background_process
@@ -395,39 +396,18 @@ def _maybe_retry_timeout(
 
 
 def _working_tree_snapshot() -> str:
-
-
     """Return a lightweight snapshot of working tree changes.
 
-
-
-
-
     We use ``git status --porcelain`` so we can detect when an apply operation
-
-
     reports success but does not actually modify the tree (for example, when an
-
-
     empty or already-applied patch slips through).
-
-
     """
-
-
     if not is_git_repo():
-
-
         return ""
 
+    from rev.tools.git_access import get_git_repo
 
-
-
-
-    proc = _run_shell("git status --porcelain")
-
-
-    return proc.stdout
+    return get_git_repo(config.ROOT).status().stdout
 
 
 def _extract_patch_paths(lines: list[str]) -> set[str]:
@@ -1095,7 +1075,17 @@ def apply_patch(patch: str, dry_run: bool = False, *, _allow_chunking: bool = Tr
             }
         )
 
-    pre_status = _working_tree_snapshot()
+    # In parallel execution, refuse to patch files another task changed after
+    # this one read them; hunk context checks cover the remaining window.
+    conflict = None if dry_run else check_conflicts(patch_paths)
+    if conflict:
+        conflict.update({"success": False, "dry_run": dry_run, "phase": "check"})
+        return json.dumps(conflict)
+
+    # With known target paths the content snapshots decide whether the tree
+    # changed, so the (potentially slow) full status scan is only needed when
+    # the patch headers could not be parsed.
+    pre_status = "" if patch_paths else _working_tree_snapshot()
     pre_contents = _snapshot_paths(patch_paths)
 
     with tempfile.NamedTemporaryFile("w+", delete=False, encoding="utf-8") as tf:
@@ -1270,13 +1260,12 @@ def apply_patch(patch: str, dry_run: bool = False, *, _allow_chunking: bool = Tr
                 apply_proc = _run_shell(["patch", "--batch", "--forward", "-p1", "-i", tfp])
 
         if apply_proc.returncode == 0:
-            post_status = _working_tree_snapshot()
             post_contents = _snapshot_paths(patch_paths)
 
             if patch_paths:
                 tree_changed = pre_contents != post_contents
             else:
-                tree_changed = pre_status != post_status
+                tree_changed = pre_status != _working_tree_snapshot()
 
             if not tree_changed:
                 return json.dumps(
@@ -1303,6 +1292,7 @@ def apply_patch(patch: str, dry_run: bool = False, *, _allow_chunking: bool = Tr
             if file_cache is not None:
                 for path_str in patch_paths:
                     file_cache.invalidate_file(config.ROOT / path_str)
+            note_written(patch_paths)
 
         if apply_proc.returncode != 0 and _allow_chunking and not dry_run and len(chunked_parts) > 1:
             chunk_result = _apply_patch_in_chunks(chunked_parts, dry_run=dry_run)
@@ -1695,8 +1685,11 @@ def get_repo_context(commits: int = 6) -> str:
 
     # Generate context
     if is_git_repo():
-        st = _run_shell("git status -s")
-        lg = _run_shell(f"git log -n {int(commits)} --oneline")
+        from rev.tools.git_access import get_git_repo
+
+        repo = get_git_repo(config.ROOT)
+        st = repo.status(short=True)
+        lg = repo.log(commits)
 
         # If git commands failed (e.g., low memory / paging file error), surface a minimal context and skip crashing.
         if st.returncode != 0 or lg.returncode != 0:
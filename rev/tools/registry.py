@@ -15,6 +15,7 @@ from typing import Dict, Any, TYPE_CHECKING, List, Callable, Optional
 
 from rev import config
 from rev.debug_logger import get_logger
+from rev.profiler import span as profile_span
 from rev.tools.permissions import get_permission_manager
 from rev.workspace import get_workspace
 from rev.tools.workspace_resolver import resolve_workspace_path, WorkspacePathError
@@ -27,7 +28,7 @@ if TYPE_CHECKING:  # pragma: no cover - used only for type hints
 from rev.tools.file_ops import (
     read_file, write_file, list_dir, delete_file, move_file,
     append_to_file, replace_in_file, create_directory, get_file_info,
-    copy_file, file_exists, read_file_lines, tree_view, search_code
+    copy_file, file_exists, read_file_lines, tree_view, search_code, search_code_multi
 )
 from rev.tools.code_ops import (
     remove_unused_imports, extract_constants, simplify_conditionals
@@ -108,10 +109,10 @@ def rag_search(query: str, k: int = 10, filters: dict = None) -> str:
     """
     try:
         from pathlib import Path
-        from rev.retrieval import SimpleCodeRetriever
+        from rev.retrieval import create_code_retriever
 
         # Initialize or reuse retriever
-        retriever = SimpleCodeRetriever(root=Path.cwd(), chunk_size=50)
+        retriever = create_code_retriever(root=Path.cwd(), chunk_size=50)
 
         if not retriever.index_built:
             retriever.build_index()
@@ -159,6 +160,7 @@ _TIMEOUT_PROTECTED_TOOLS = {
     "read_file",
     "list_dir",
     "search_code",
+    "search_code_multi",
     "write_file",
     "replace_in_file",
     "run_cmd",
@@ -415,6 +417,13 @@ def _enforce_registry_guard(tools: list[dict]) -> None:
         _write_registry_snapshot(current)
 
 
+def _read_tool_output(ref: str, start: int = 1, end: Optional[int] = None) -> str:
+    # Lazy import: rev.execution imports the registry.
+    from rev.execution.artifacts import read_tool_output
+
+    return read_tool_output(ref, start, end)
+
+
 # Tool dispatch table for O(1) lookup
 def _build_tool_dispatch() -> Dict[str, callable]:
     """Build the tool dispatch dictionary for fast O(1) lookup."""
@@ -424,6 +433,13 @@ def _build_tool_dispatch() -> Dict[str, callable]:
         "write_file": lambda args: write_file(args["path"], args["content"]),
         "list_dir": lambda args: list_dir(args.get("pattern", "**/*")),
         "search_code": lambda args: search_code(args["pattern"], args.get("include", "**/*")),
+        "search_code_multi": lambda args: search_code_multi(
+            args["patterns"],
+            args.get("include", "**/*"),
+            args.get("regex", False),
+            args.get("case_sensitive", False),
+            args.get("max_matches_per_pattern", 20),
+        ),
         "rag_search": lambda args: rag_search(args["query"], args.get("k", 10), args.get("filters")),
         "delete_file": lambda args: delete_file(args["path"]),
         "move_file": lambda args: move_file(args["src"], args["dest"]),
@@ -470,6 +486,7 @@ def _build_tool_dispatch() -> Dict[str, callable]:
         "copy_file": lambda args: copy_file(args["src"], args["dest"]),
         "file_exists": lambda args: file_exists(args["path"]),
         "read_file_lines": lambda args: read_file_lines(args["path"], args.get("start", 1), args.get("end")),
+        "read_tool_output": lambda args: _read_tool_output(args["ref"], args.get("start", 1), args.get("end")),
         "tree_view": lambda args: tree_view(args.get("path", "."), args.get("max_depth", 3), args.get("max_files", 100)),
         "set_workdir": _set_workdir_tool,
 
@@ -686,6 +703,7 @@ def _format_description(name: str, args: Dict[str, Any]) -> str:
         "write_file": f"Writing file: {args.get('path', '')}",
         "list_dir": f"Listing directory: {args.get('pattern', '**/*')}",
         "search_code": f"Searching code: {args.get('pattern', '')} in {args.get('include', '**/*')}",
+        "search_code_multi": f"Searching code for {len(args.get('patterns') or [])} patterns in {args.get('include', '**/*')}",
         "rag_search": f"RAG semantic search: {args.get('query', '')}",
         "delete_file": f"Deleting file: {args.get('path', '')}",
         "move_file": f"Moving file: {args.get('src', '')} → {args.get('dest', '')}",
@@ -696,6 +714,7 @@ def _format_description(name: str, args: Dict[str, Any]) -> str:
         "copy_file": f"Copying file: {args.get('src', '')} → {args.get('dest', '')}",
         "file_exists": f"Checking file exists: {args.get('path', '')}",
         "read_file_lines": f"Reading lines from file: {args.get('path', '')}",
+        "read_tool_output": f"Reading stored tool output: {args.get('ref', '')}",
         "tree_view": f"Displaying tree view: {args.get('path', '.')}",
         "set_workdir": "Working directory changes are disabled; using workspace root."
         if config.WORKSPACE_ROOT_ONLY
@@ -934,6 +953,11 @@ def execute_tool(name: str, args: Dict[str, Any], agent_name: str = "executor")
     Returns:
         Tool execution result as JSON string
     """
+    with profile_span("tool", name):
+        return _execute_tool(name, args, agent_name)
+
+
+def _execute_tool(name: str, args: Dict[str, Any], agent_name: str) -> str:
     # Normalize agent name to avoid permission denials for anonymous callers.
     if not agent_name or agent_name == "unknown":
         agent_name = "executor"
@@ -1271,6 +1295,23 @@ def get_available_tools() -> list:
                 }
             }
         },
+        {
+            "type": "function",
+            "function": {
+                "name": "search_code_multi",
+                "description": "Search code for several keywords/patterns in one pass; results are grouped per pattern. Prefer this over repeated search_code calls.",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "patterns": {"type": "array", "items": {"type": "string"}, "description": "Keywords (or regexes when regex=true) to search for"},
+                        "include": {"type": "string", "description": "Glob pattern for files to search", "default": "**/*"},
+                        "regex": {"type": "boolean", "description": "Treat patterns as regular expressions", "default": False},
+                        "max_matches_per_pattern": {"type": "integer", "description": "Maximum matches kept per pattern", "default": 20}
+                    },
+                    "required": ["patterns"]
+                }
+            }
+        },
         {
             "type": "function",
             "function": {
@@ -1567,6 +1608,22 @@ def get_available_tools() -> list:
                 }
             }
         },
+        {
+            "type": "function",
+            "function": {
+                "name": "read_tool_output",
+                "description": "Read the full output of an earlier tool call that was shown summarized (pass the [full output: ...] reference)",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "ref": {"type": "string", "description": "Reference from a [full output: ...] note"},
+                        "start": {"type": "integer", "description": "Starting line number", "default": 1},
+                        "end": {"type": "integer", "description": "Ending line number (optional)"}
+                    },
+                    "required": ["ref"]
+                }
+            }
+        },
         {
             "type": "function",
             "function": {
@@ -2842,6 +2899,7 @@ def get_tool_stats() -> Dict[str, Any]:
         from rev.mcp.client import mcp_client  # type: ignore
 
         stats["mcp_server_count"] = len(getattr(mcp_client, "servers", {}))
+        stats["mcp_servers"] = mcp_client.get_tool_stats()
     except Exception:
         stats["mcp_server_count"] = None
 
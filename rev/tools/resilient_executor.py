@@ -6,9 +6,12 @@ Provides robust tool execution with retries, exponential backoff, jitter, and id
 Handles transient failures to stabilize agent coordination.
 """
 
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Callable, Any, Dict, Optional, List
+from typing import Callable, Any, Dict, Optional, List, Tuple
 from enum import Enum
+import os
+import threading
 import time
 import random
 import hashlib
@@ -64,79 +67,155 @@ class ToolCallResult:
 
 
 class IdempotencyStore:
-    """Store for idempotency keys to prevent duplicate execution."""
+    """Store for idempotency keys to prevent duplicate execution.
 
-    def __init__(self, storage_path: Optional[Path] = None):
+    Entries are bounded by count (least recently used are evicted) and age.
+    When persisted, each ``set`` appends one JSON line to ``storage_path``;
+    the log is compacted to the live entries once it holds more than twice
+    as many lines as entries. All methods are safe to call from multiple
+    threads.
+    """
+
+    def __init__(
+        self,
+        storage_path: Optional[Path] = None,
+        max_entries: int = 10_000,
+        ttl_seconds: Optional[float] = 24 * 3600
+    ):
         """
         Initialize idempotency store.
 
         Args:
             storage_path: Optional path to persist idempotency keys
+            max_entries: Maximum number of cached results
+            ttl_seconds: Age after which a cached result is ignored (None: never)
         """
         self.storage_path = storage_path
-        self._cache: Dict[str, ToolCallResult] = {}
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        # key -> (stored_at, result), least recently used first
+        self._cache: "OrderedDict[str, Tuple[float, ToolCallResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._log_lines = 0
 
         # Load from disk if storage path exists
         if self.storage_path and self.storage_path.exists():
             self._load_from_disk()
 
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._cache)
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - stored_at > self.ttl_seconds
+
+    def _insert(self, key: str, stored_at: float, result: ToolCallResult):
+        self._cache.pop(key, None)
+        self._cache[key] = (stored_at, result)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
     def get(self, key: str) -> Optional[ToolCallResult]:
         """Get cached result for idempotency key."""
-        return self._cache.get(key)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry[0], time.time()):
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return entry[1]
 
     def set(self, key: str, result: ToolCallResult):
         """Store result for idempotency key."""
-        self._cache[key] = result
+        with self._lock:
+            stored_at = time.time()
+            self._insert(key, stored_at, result)
 
-        # Persist to disk
-        if self.storage_path:
-            self._save_to_disk()
+            # Persist to disk
+            if self.storage_path:
+                self._append_to_disk(key, stored_at, result)
 
     def clear(self):
         """Clear all cached results."""
-        self._cache.clear()
-
-        if self.storage_path and self.storage_path.exists():
-            self.storage_path.unlink()
+        with self._lock:
+            self._cache.clear()
+            self._log_lines = 0
+
+            if self.storage_path and self.storage_path.exists():
+                self.storage_path.unlink()
+
+    @staticmethod
+    def _record(key: str, stored_at: float, result: ToolCallResult) -> str:
+        return json.dumps({
+            "key": key,
+            "success": result.success,
+            "error": result.error,
+            "attempts": result.attempts,
+            "total_time_ms": result.total_time_ms,
+            "stored_at": stored_at
+        })
 
     def _load_from_disk(self):
-        """Load idempotency cache from disk."""
+        """Load idempotency cache from disk (later lines win)."""
+        now = time.time()
+        lines = 0
         try:
             with open(self.storage_path, "r") as f:
-                data = json.load(f)
-                # Note: We only cache success/error, not the full result object
-                # to avoid serialization issues
-                for key, value in data.items():
-                    self._cache[key] = ToolCallResult(
-                        success=value["success"],
-                        error=value.get("error"),
-                        attempts=value.get("attempts", 1),
-                        total_time_ms=value.get("total_time_ms", 0.0),
-                        idempotency_key=key
-                    )
+                for line in f:
+                    lines += 1
+                    try:
+                        value = json.loads(line)
+                        key = value["key"]
+                        stored_at = float(value.get("stored_at", now))
+                        # Note: We only cache success/error, not the full result object
+                        # to avoid serialization issues
+                        result = ToolCallResult(
+                            success=value["success"],
+                            error=value.get("error"),
+                            attempts=value.get("attempts", 1),
+                            total_time_ms=value.get("total_time_ms", 0.0),
+                            idempotency_key=key
+                        )
+                    except (ValueError, KeyError, TypeError):
+                        # Skip torn or foreign lines (e.g. the old single-document format)
+                        continue
+                    if self._expired(stored_at, now):
+                        self._cache.pop(key, None)
+                    else:
+                        self._insert(key, stored_at, result)
         except Exception:
             # Ignore load errors - start fresh
             pass
 
-    def _save_to_disk(self):
-        """Save idempotency cache to disk."""
-        if not self.storage_path:
-            return
+        self._log_lines = lines
+        if lines != len(self._cache):
+            self._compact()
 
+    def _append_to_disk(self, key: str, stored_at: float, result: ToolCallResult):
+        """Append one entry to the log, compacting it first when mostly stale."""
         try:
+            if self._log_lines > 2 * len(self._cache) + 100:
+                self._compact()
             self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.storage_path, "a") as f:
+                f.write(self._record(key, stored_at, result) + "\n")
+            self._log_lines += 1
+        except Exception:
+            # Ignore save errors
+            pass
 
-            data = {}
-            for key, result in self._cache.items():
-                data[key] = {
-                    "success": result.success,
-                    "error": result.error,
-                    "attempts": result.attempts,
-                    "total_time_ms": result.total_time_ms
-                }
-
-            with open(self.storage_path, "w") as f:
-                json.dump(data, f, indent=2)
+    def _compact(self):
+        """Rewrite the log with only the live entries, least recently used first."""
+        try:
+            self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.storage_path.with_name(self.storage_path.name + ".tmp")
+            with open(tmp_path, "w") as f:
+                for key, (stored_at, result) in self._cache.items():
+                    f.write(self._record(key, stored_at, result) + "\n")
+            os.replace(tmp_path, self.storage_path)
+            self._log_lines = len(self._cache)
         except Exception:
             # Ignore save errors
             pass
@@ -382,7 +461,7 @@ def create_default_executor(workspace_root: Optional[Path] = None) -> ResilientE
     # Idempotency store
     storage_path = None
     if workspace_root:
-        storage_path = workspace_root / ".rev" / "idempotency_cache.json"
+        storage_path = workspace_root / ".rev" / "idempotency_cache.jsonl"
 
     idempotency_store = IdempotencyStore(storage_path=storage_path)
 
@@ -5,7 +5,7 @@
 import json
 from typing import Dict, Any
 
-from rev.config import SSH_AVAILABLE, paramiko
+from rev.config import SSH_AVAILABLE
 
 
 class SSHConnectionManager:
@@ -27,6 +27,8 @@ class SSHConnectionManager:
             if connection_id in self.connections:
                 self.disconnect(connection_id)
 
+            import paramiko
+
             client = paramiko.SSHClient()
             client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
 
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Per-agent, per-action tool schema selection.
+
+The full tool catalogue from ``get_available_tools()`` is large; sending all of
+it on every LLM call inflates prompt tokens and serialization cost. This module
+narrows the catalogue to the tools relevant for a task's action type (plus a
+few query-matched extras from ``ToolsCorpus``) and caches each subset together
+with its token estimate.
+
+Subsets are cached as stable list objects so downstream id-keyed caches (for
+example ``LLMResponseCache._hash_tools``) hit on repeated calls.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from rev import config
+from rev.execution.tool_constraints import WRITE_ACTIONS, WRITE_TOOLS
+
+
+# Mirrors rev.llm.client._CHARS_PER_TOKEN_ESTIMATE (kept local to avoid an
+# import cycle between the tools and llm packages).
+_CHARS_PER_TOKEN_ESTIMATE = 3
+
+# Coordination tools every agent may need regardless of action type.
+COORDINATION_TOOLS: FrozenSet[str] = frozenset({
+    "request_replanning",
+    "request_research",
+    "request_user_guidance",
+    "inject_tasks",
+    "escalate_strategy",
+    "add_insight",
+})
+
+# Minimal navigation set included in every profile.
+CORE_READ_TOOLS: FrozenSet[str] = frozenset({
+    "read_file",
+    "read_file_lines",
+    "read_tool_output",
+    "list_dir",
+    "search_code",
+    "file_exists",
+})
+
+RESEARCH_TOOLS: FrozenSet[str] = CORE_READ_TOOLS | frozenset({
+    "tree_view",
+    "get_file_info",
+    "find_files",
+    "search_code_multi",
+    "rag_search",
+    "find_symbol_usages",
+    "analyze_code_context",
+    "analyze_code_structures",
+    "get_repo_context",
+    "git_diff",
+    "git_status",
+    "git_log",
+})
+
+TEST_TOOLS: FrozenSet[str] = CORE_READ_TOOLS | frozenset({
+    "run_tests",
+    "run_cmd",
+    "analyze_test_coverage",
+    "detect_flaky_tests",
+    "analyze_error_traces",
+})
+
+REVIEW_TOOLS: FrozenSet[str] = RESEARCH_TOOLS | frozenset({
+    "analyze_ast_patterns",
+    "run_linters",
+    "run_type_checks",
+    "scan_security_issues",
+    "analyze_semantic_diff",
+})
+
+WRITE_PROFILE_TOOLS: FrozenSet[str] = CORE_READ_TOOLS | frozenset(WRITE_TOOLS) | frozenset({"run_cmd"})
+
+DOC_TOOLS: FrozenSet[str] = CORE_READ_TOOLS | frozenset({
+    "write_file",
+    "append_to_file",
+    "replace_in_file",
+})
+
+# Action type -> tool names. Action types not listed here (e.g. "tool",
+# "general") get the full catalogue.
+ACTION_TOOL_PROFILES: Dict[str, FrozenSet[str]] = {
+    "read": RESEARCH_TOOLS,
+    "research": RESEARCH_TOOLS,
+    "investigate": RESEARCH_TOOLS,
+    "analyze": REVIEW_TOOLS,
+    "review": REVIEW_TOOLS,
+    "test": TEST_TOOLS,
+    "doc": DOC_TOOLS,
+}
+for _action in WRITE_ACTIONS:
+    ACTION_TOOL_PROFILES.setdefault(_action, WRITE_PROFILE_TOOLS)
+
+# Number of query-matched tools added on top of the action profile.
+DEFAULT_QUERY_EXTRAS = 3
+
+# Bound on cached subsets per selector (query extras create new combinations).
+_MAX_SUBSETS = 256
+
+
+def _tool_name(tool: Any) -> Optional[str]:
+    if not isinstance(tool, dict):
+        return None
+    fn = tool.get("function")
+    if not isinstance(fn, dict):
+        return None
+    name = fn.get("name")
+    return name if isinstance(name, str) else None
+
+
+def _serialize(obj: Any) -> str:
+    return json.dumps(obj, separators=(",", ":"), sort_keys=True, default=str)
+
+
+def _estimate_tokens(blob: str) -> int:
+    return max(1, len(blob) // _CHARS_PER_TOKEN_ESTIMATE)
+
+
+@dataclass(frozen=True)
+class ToolSubset:
+    """A cached selection of tool schemas."""
+
+    names: Tuple[str, ...]
+    schemas: List[Dict[str, Any]]
+    tokens: int
+    full_tokens: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.full_tokens - self.tokens)
+
+
+class ToolSchemaSelector:
+    """Select and cache tool-schema subsets for a fixed tool universe."""
+
+    def __init__(self, tool_universe: Sequence[Dict[str, Any]]):
+        self._schemas: Dict[str, Dict[str, Any]] = {}
+        self._tokens: Dict[str, int] = {}
+        for tool in tool_universe:
+            name = _tool_name(tool)
+            if name is None or name in self._schemas:
+                continue
+            self._schemas[name] = tool
+            self._tokens[name] = _estimate_tokens(_serialize(tool))
+        self.universe_key: Tuple[str, ...] = tuple(self._schemas)
+        self.full_tokens = sum(self._tokens.values())
+        self._subsets: Dict[Tuple[Any, ...], ToolSubset] = {}
+        # id(subset.schemas) -> subset, so callers holding only the list can
+        # recover what it was pruned from.
+        self._by_schemas: Dict[int, ToolSubset] = {}
+        self._corpus = None
+        self._lock = threading.Lock()
+
+    def estimate_tokens(self, tools: Optional[Sequence[Dict[str, Any]]]) -> int:
+        """Estimate prompt tokens for ``tools`` using precomputed per-tool costs."""
+        total = 0
+        for tool in tools or []:
+            name = _tool_name(tool)
+            cost = self._tokens.get(name) if name else None
+            if cost is None:
+                cost = _estimate_tokens(_serialize(tool))
+            total += cost
+        return total
+
+    def subset_for(self, tools: Any) -> Optional[ToolSubset]:
+        """Return the cached subset whose ``schemas`` list is ``tools``, if any."""
+        subset = self._by_schemas.get(id(tools))
+        if subset is None or subset.schemas is not tools:
+            return None
+        return subset
+
+    def _query_extras(self, query: str, k: int, exclude: FrozenSet[str]) -> FrozenSet[str]:
+        if not query or k <= 0:
+            return frozenset()
+        corpus = self._corpus
+        if corpus is None:
+            from rev.retrieval.context_builder import ToolsCorpus
+
+            corpus = ToolsCorpus()
+            corpus.build(list(self._schemas.values()))
+            with self._lock:
+                if self._corpus is None:
+                    self._corpus = corpus
+                corpus = self._corpus
+        ranked = corpus.query(query, k=k + len(exclude))
+        extras = [t.name for t in ranked if t.name not in exclude]
+        return frozenset(extras[:k])
+
+    def _make_subset(self, names: Sequence[str]) -> ToolSubset:
+        ordered = tuple(n for n in self._schemas if n in set(names))
+        return ToolSubset(
+            names=ordered,
+            schemas=[self._schemas[n] for n in ordered],
+            tokens=sum(self._tokens[n] for n in ordered),
+            full_tokens=self.full_tokens,
+        )
+
+    def select(
+        self,
+        action_type: Optional[str],
+        *,
+        agent_name: Optional[str] = None,
+        query: Optional[str] = None,
+        extra_names: Optional[Sequence[str]] = None,
+        query_extras: int = DEFAULT_QUERY_EXTRAS,
+    ) -> ToolSubset:
+        """Return the cached subset for an agent/action/query combination.
+
+        Action types without a profile return the full catalogue.
+        """
+        action = (action_type or "").strip().lower()
+        profile = ACTION_TOOL_PROFILES.get(action)
+        if profile is None:
+            base: FrozenSet[str] = frozenset(self._schemas)
+        else:
+            base = profile | COORDINATION_TOOLS | frozenset(extra_names or ())
+
+        extras: FrozenSet[str] = frozenset()
+        if profile is not None:
+            extras = self._query_extras(query or "", query_extras, base)
+        key = (agent_name or "", action, base, extras)
+        subset = self._subsets.get(key)
+        if subset is not None:
+            return subset
+
+        subset = self._make_subset(base | extras)
+        with self._lock:
+            # Another thread may have built the same subset meanwhile; keep the
+            # first one so callers share a stable list object.
+            cached = self._subsets.get(key)
+            if cached is not None:
+                return cached
+            if len(self._subsets) >= _MAX_SUBSETS:
+                self._subsets.clear()
+                self._by_schemas.clear()
+            self._subsets[key] = subset
+            self._by_schemas[id(subset.schemas)] = subset
+        return subset
+
+
+_SELECTORS: Dict[Tuple[str, ...], ToolSchemaSelector] = {}
+_DEFAULT_SELECTOR: Optional[ToolSchemaSelector] = None
+_SELECTOR_LOCK = threading.Lock()
+_MAX_SELECTORS = 8
+
+
+def get_tool_selector(tool_universe: Optional[Sequence[Dict[str, Any]]] = None) -> ToolSchemaSelector:
+    """Return the selector for ``tool_universe``, building it on first use.
+
+    Without an explicit ``tool_universe`` the selector for the registry
+    catalogue is returned.
+    """
+    global _DEFAULT_SELECTOR
+    is_default = tool_universe is None
+    if is_default:
+        if _DEFAULT_SELECTOR is not None:
+            return _DEFAULT_SELECTOR
+        from rev.tools.registry import get_available_tools
+
+        tool_universe = get_available_tools()
+    universe_key = tuple(dict.fromkeys(n for n in (_tool_name(t) for t in tool_universe) if n))
+    with _SELECTOR_LOCK:
+        selector = _SELECTORS.get(universe_key)
+        if selector is None:
+            if len(_SELECTORS) >= _MAX_SELECTORS:
+                _SELECTORS.clear()
+            selector = ToolSchemaSelector(tool_universe)
+            _SELECTORS[universe_key] = selector
+        if is_default:
+            _DEFAULT_SELECTOR = selector
+        return selector
+
+
+def tool_schema_usage(tools: Optional[Sequence[Dict[str, Any]]]) -> Tuple[int, int]:
+    """Return (estimated schema tokens sent, tokens saved by pruning) for ``tools``.
+
+    Savings are measured against the unpruned tool set the subset was selected
+    from; lists that did not come from a selector count as unpruned.
+    """
+    if not tools:
+        return 0, 0
+    with _SELECTOR_LOCK:
+        selectors = list(_SELECTORS.values())
+    for selector in selectors:
+        subset = selector.subset_for(tools)
+        if subset is not None:
+            return subset.tokens, subset.tokens_saved
+    return sum(_estimate_tokens(_serialize(tool)) for tool in tools), 0
+
+
+def select_tools_for_action(
+    action_type: Optional[str],
+    *,
+    tool_universe: Optional[Sequence[Dict[str, Any]]] = None,
+    agent_name: Optional[str] = None,
+    query: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Return the tool schemas relevant to ``action_type`` (stable list object).
+
+    Falls back to the whole universe when pruning is disabled or when the
+    action profile does not intersect it.
+    """
+    selector = get_tool_selector(tool_universe)
+    if not getattr(config, "TOOL_SCHEMA_PRUNING_ENABLED", True):
+        return selector.select(None).schemas
+    subset = selector.select(action_type, agent_name=agent_name, query=query)
+    if not subset.schemas:
+        return selector.select(None).schemas
+    return subset.schemas
+
+
+def reset_tool_selector() -> None:
+    """Drop cached selectors (mainly for tests)."""
+    global _DEFAULT_SELECTOR
+    with _SELECTOR_LOCK:
+        _SELECTORS.clear()
+        _DEFAULT_SELECTOR = None
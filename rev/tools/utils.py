@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 """Utility functions for rev tools."""
 
+import importlib.util
 import json
 import os
 import re
@@ -17,12 +18,7 @@ try:
 except ImportError:
     requests = None
 
-try:
-    import paramiko
-    SSH_AVAILABLE = True
-except ImportError:
-    SSH_AVAILABLE = False
-    paramiko = None
+SSH_AVAILABLE = importlib.util.find_spec("paramiko") is not None
 
 # Import configuration from rev.config
 from rev.config import EXCLUDE_DIRS, MAX_FILE_BYTES
@@ -104,6 +104,10 @@ setup(
             'mypy>=1.0.0',
             'pylint>=2.16.0',
         ],
+        # Vector code retrieval (rev.retrieval.vector_index)
+        'vector': [
+            'numpy>=1.21',
+        ],
     },
     packages=find_packages(
         exclude=[
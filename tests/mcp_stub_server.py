@@ -0,0 +1,68 @@
+"""Minimal stdio MCP server used by the MCP transport tests.
+
+Tools:
+- ``echo``: returns its ``text`` argument.
+- ``sleep``: sleeps ``seconds`` (in a thread, so other requests proceed).
+- ``pid``: returns the server process id.
+- ``crash``: exits the process without replying.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+_write_lock = threading.Lock()
+TOOLS = [{"name": name, "inputSchema": {"type": "object"}} for name in ("echo", "sleep", "pid", "crash")]
+
+
+def send(message):
+    with _write_lock:
+        sys.stdout.write(json.dumps(message) + "\n")
+        sys.stdout.flush()
+
+
+def text_result(request_id, text):
+    send({"jsonrpc": "2.0", "id": request_id, "result": {"content": [{"type": "text", "text": text}]}})
+
+
+def handle_call(request_id, params):
+    name = params.get("name")
+    args = params.get("arguments") or {}
+    if name == "echo":
+        text_result(request_id, str(args.get("text", "")))
+    elif name == "sleep":
+        time.sleep(float(args.get("seconds", 0)))
+        text_result(request_id, "slept")
+    elif name == "pid":
+        text_result(request_id, str(os.getpid()))
+    elif name == "crash":
+        os._exit(3)
+    else:
+        send({"jsonrpc": "2.0", "id": request_id, "error": {"code": -32602, "message": f"Unknown tool: {name}"}})
+
+
+def main():
+    print("stub server starting (non-JSON noise on stdout)", flush=True)
+    for line in sys.stdin:
+        message = json.loads(line)
+        method = message.get("method")
+        request_id = message.get("id")
+        if request_id is None:
+            continue
+        if method == "initialize":
+            send({"jsonrpc": "2.0", "id": request_id, "result": {
+                "protocolVersion": "2024-11-05", "capabilities": {"tools": {}}, "serverInfo": {"name": "stub"}}})
+        elif method == "tools/list":
+            with open(os.environ["STUB_LIST_LOG"], "a") if os.environ.get("STUB_LIST_LOG") else open(os.devnull, "w") as log:
+                log.write("list\n")
+            send({"jsonrpc": "2.0", "id": request_id, "result": {"tools": TOOLS}})
+        elif method == "tools/call":
+            threading.Thread(target=handle_call, args=(request_id, message.get("params") or {}), daemon=True).start()
+        else:
+            send({"jsonrpc": "2.0", "id": request_id, "error": {"code": -32601, "message": "Method not found"}})
+
+
+if __name__ == "__main__":
+    main()
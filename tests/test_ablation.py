@@ -6,6 +6,7 @@ import pytest
 from pathlib import Path
 import tempfile
 import json
+import sys
 
 from rev.ablation.feature_flags import (
     Features,
@@ -19,6 +20,7 @@ from rev.ablation.benchmark import (
     BenchmarkTask,
     BenchmarkResult,
     BenchmarkRunner,
+    evaluate_success_criteria,
     load_tasks_from_directory,
 )
 from rev.ablation.metrics import (
@@ -220,6 +222,114 @@ class TestBenchmarkRunner:
             assert loaded[0].task_name == "Test"
 
 
+class TestBenchmarkExecution:
+    """Test isolated, parallel task execution with a stand-in worker."""
+
+    # Writes greet.py into the workspace and reports a fake result.
+    FAKE_WORKER = (
+        "import json, os, sys, time\n"
+        "spec = json.load(open(sys.argv[1]))\n"
+        "time.sleep(float(os.environ.get('FAKE_WORKER_SLEEP', '0')))\n"
+        "open(os.path.join(spec['workspace'], 'greet.py'), 'w').write("
+        "'def greet(name):\\n    return f\"Hello, {name}\"\\n')\n"
+        "json.dump({'agent_success': True, 'iterations': 3, 'llm_calls': 7, 'loops_avoided': 1,"
+        " 'features': spec['features'],"
+        " 'tokens': {'total': 42}}, open(spec['result_path'], 'w'))\n"
+    )
+
+    def _task(self, **overrides):
+        fields = dict(
+            name="Add greeting",
+            description="Test",
+            initial_files={"greet.py": "def greet(name):\n    print(name)\n"},
+            user_request="Return the greeting",
+            success_criteria=[
+                "greet.py contains 'return' statement",
+                "greet.py does not contain 'print'",
+                "greet.py exists",
+                "Code is idiomatic",
+            ],
+            expected_files=["greet.py"],
+            timeout_seconds=30,
+        )
+        fields.update(overrides)
+        return BenchmarkTask(**fields)
+
+    def _runner(self, tmp_path, tasks, **kwargs):
+        script = tmp_path / "fake_worker.py"
+        script.write_text(self.FAKE_WORKER)
+        return BenchmarkRunner(tasks, tmp_path / "out", worker_command=[sys.executable, str(script)], **kwargs)
+
+    def test_runs_each_task_in_its_own_workspace(self, tmp_path):
+        tasks = [self._task(name=f"Task {i}") for i in range(3)]
+        runner = self._runner(tmp_path, tasks, pool_size=3)
+        configs = [{Features.BASELINE}, {Features.ANCHORING}]
+
+        results = runner.run_ablation(configs)
+
+        assert [r.task_name for r in results] == ["Task 0", "Task 1", "Task 2"] * 2
+        assert all(r.success for r in results)
+        assert all(r.iterations == 3 and r.tokens_used == 42 for r in results)
+        assert all(r.loops_avoided == 1 and r.metadata["llm_calls"] == 7 for r in results)
+        statuses = [c["status"] for c in results[0].metadata["criteria"]]
+        assert statuses == ["passed", "passed", "passed", "unchecked"]
+        assert len(runner.results) == 6
+        # The parent process's feature flags are untouched.
+        assert FeatureRegistry.get_config() is None
+
+    def test_timeout_kills_the_worker(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("FAKE_WORKER_SLEEP", "30")
+        runner = self._runner(tmp_path, [self._task(timeout_seconds=1)])
+
+        result = runner._run_single_task(runner.tasks[0], {Features.BASELINE})
+
+        assert not result.success
+        assert result.metadata["timed_out"]
+        assert result.time_seconds < 15
+        assert "Timed out" in result.error_message
+
+    def test_criteria_evaluation(self, tmp_path):
+        (tmp_path / "service.py").write_text("from auth import login\n\ndef handler():\n    pass\n")
+        task = self._task(success_criteria=[
+            "service.py imports from auth",
+            "service.py contains handler function",
+            "service.py contains 'print'",
+            "missing.py exists",
+        ])
+
+        statuses = [c["status"] for c in evaluate_success_criteria(task, tmp_path)]
+
+        assert statuses == ["passed", "passed", "failed", "failed"]
+
+    def test_worker_reports_orchestrator_iterations_and_loop_interventions(self, tmp_path, monkeypatch):
+        from types import SimpleNamespace
+
+        from rev import config
+        from rev.ablation import worker
+        from rev.core.context import ResourceBudget
+        from rev.execution import orchestrator
+        from rev.profiler import get_profiler
+
+        budget = ResourceBudget()
+        budget.update_step(4)
+        fake = SimpleNamespace(
+            success=True, phase_reached="complete", errors=[], resource_budget=budget,
+            agent_insights={"loops_avoided": {"blocked_action": 2, "loop_guard": 1}},
+        )
+        monkeypatch.setattr(orchestrator, "run_orchestrated", lambda *args, **kwargs: fake)
+        monkeypatch.setattr(get_profiler(), "enabled", get_profiler().enabled)
+        previous_root = config.ROOT
+        try:
+            payload = worker._run({"workspace": str(tmp_path), "user_request": "r", "features": []})
+        finally:
+            config.set_workspace_root(previous_root, allow_external=True)
+            FeatureRegistry.set_config(None)
+
+        assert payload["iterations"] == 4
+        assert payload["loops_avoided"] == 3
+        assert payload["loops_avoided_by_guard"] == {"blocked_action": 2, "loop_guard": 1}
+
+
 class TestMetrics:
     """Test metrics calculation."""
 
@@ -2,7 +2,7 @@ import os
 from pathlib import Path
 
 from rev import config
-from rev.execution.artifacts import write_tool_output_artifact
+from rev.execution.artifacts import get_tool_output_store, write_tool_output_artifact
 
 
 def _reset_env(key: str, original: str | None):
@@ -30,8 +30,9 @@ def test_tool_output_retention_limits_total_count():
             task_id=f"t{i}",
         )
 
-    files = list((config.TOOL_OUTPUTS_DIR).glob("*.json"))
-    assert len(files) == 3
+    store = get_tool_output_store()
+    store.flush()
+    assert len(store.entries()) == 3
 
     _reset_env("REV_TOOL_OUTPUTS_MAX_KEEP", original)
 
@@ -68,11 +69,10 @@ def test_tool_output_retention_preserves_current_session():
 
     _prune_old_tool_outputs(2, keep_sessions={"sess-current"})
 
-    files = list((config.TOOL_OUTPUTS_DIR).glob("*.json"))
+    sessions = [session for _record_id, session in get_tool_output_store().entries()]
     # At most max_keep artifacts are retained, but at least one from current session is preserved.
-    assert len(files) == 2
-    names = [p.name for p in files]
-    assert any("sess-current" in n for n in names)
-    assert sum("sess-old" in n for n in names) <= 1
+    assert len(sessions) == 2
+    assert "sess-current" in sessions
+    assert sessions.count("sess-old") <= 1
 
     _reset_env("REV_TOOL_OUTPUTS_MAX_KEEP", original)
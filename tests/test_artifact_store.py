@@ -0,0 +1,110 @@
+import json
+import threading
+
+import pytest
+
+from rev.execution import artifacts
+from rev.execution.artifacts import ToolOutputStore, read_tool_output_artifact
+
+
+def _submit(store, n, output, session="s", max_keep=20):
+    payload_json = artifacts._canonical_json(output)
+    digest = artifacts._sha256_bytes(payload_json.encode("utf-8"))
+    record = {"tool": "run_cmd", "session_id": session, "output_digest_redacted": digest}
+    return store.submit(
+        record_id=f"{n:06d}_{session}",
+        record=record,
+        digest=digest,
+        content_type="text/plain",
+        payload_json=payload_json,
+        session_id=session,
+        max_keep=max_keep,
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ToolOutputStore(tmp_path / "tool_outputs")
+    yield store
+    store.close()
+
+
+def _lines(directory):
+    return [json.loads(line) for path in sorted(directory.glob("*.jsonl")) for line in path.read_text().splitlines()]
+
+
+def test_identical_outputs_are_stored_once(store):
+    first = _submit(store, 1, "same output")
+    second = _submit(store, 2, "same output")
+    _submit(store, 3, "other output")
+    assert store.flush(timeout=5)
+
+    records = _lines(store.directory)
+    assert [r["kind"] for r in records].count("blob") == 2
+    assert [r["kind"] for r in records].count("call") == 3
+    assert read_tool_output_artifact(first)["output"] == "same output"
+    assert read_tool_output_artifact(second)["output"] == "same output"
+
+
+def test_submit_does_not_wait_for_disk(store, monkeypatch):
+    gate = threading.Event()
+    original = store._apply
+
+    def slow_apply(op):
+        gate.wait(5)
+        return original(op)
+
+    monkeypatch.setattr(store, "_apply", slow_apply)
+    ref = _submit(store, 1, "queued")
+    assert not store.flush(timeout=0.05)
+    gate.set()
+    assert store.flush(timeout=5)
+    assert read_tool_output_artifact(ref)["output"] == "queued"
+
+
+def test_retention_drops_dead_segments(tmp_path):
+    store = ToolOutputStore(tmp_path, segment_max_bytes=200)
+    try:
+        refs = [_submit(store, i, f"output {i} " + "x" * 100, max_keep=2) for i in range(10)]
+        assert store.flush(timeout=5)
+        assert len(store.entries()) == 2
+        assert len(list(tmp_path.glob("*.jsonl"))) <= 3
+        assert read_tool_output_artifact(refs[-1])["output"].startswith("output 9")
+        assert read_tool_output_artifact(refs[0]) is None
+    finally:
+        store.close()
+
+
+def test_shared_blob_keeps_its_segment_alive(tmp_path):
+    store = ToolOutputStore(tmp_path, segment_max_bytes=200)
+    try:
+        _submit(store, 0, "shared " + "x" * 200, max_keep=2)
+        for i in range(1, 5):
+            _submit(store, i, f"filler {i} " + "y" * 200, max_keep=2)
+        ref = _submit(store, 5, "shared " + "x" * 200, max_keep=2)
+        assert store.flush(timeout=5)
+        assert read_tool_output_artifact(ref)["output"].startswith("shared")
+    finally:
+        store.close()
+
+
+def test_previous_sessions_are_indexed_for_retention(tmp_path):
+    legacy = tmp_path / "2024-01-01T00-00-00Z_000001_1_old_task_tool.json"
+    legacy.write_text(json.dumps({"schema_version": "tool_output@1", "output": "legacy"}), encoding="utf-8")
+    previous = ToolOutputStore(tmp_path)
+    for i in range(3):
+        _submit(previous, i, f"previous {i}", session="prev")
+    previous.close()
+
+    store = ToolOutputStore(tmp_path)
+    try:
+        assert read_tool_output_artifact(str(legacy))["output"] == "legacy"
+        _submit(store, 10, "current", max_keep=2)
+        assert store.flush(timeout=5)
+        store.prune(2)
+        assert store.flush(timeout=5)
+        sessions = [session for _rid, session in store.entries()]
+        assert sessions == ["prev", "s"]
+        assert not legacy.exists()
+    finally:
+        store.close()
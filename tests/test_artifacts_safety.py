@@ -2,9 +2,8 @@
 
 import json
 import threading
-from pathlib import Path
 
-from rev.execution.artifacts import write_tool_output_artifact
+from rev.execution.artifacts import read_tool_output_artifact, write_tool_output_artifact
 from rev import config
 
 
@@ -19,7 +18,9 @@ def test_failure_path_artifact_written() -> None:
         agent_name="tester",
         truncated=False,
     )
-    assert Path(config.ROOT, ref.as_posix()).exists()
+    stored = read_tool_output_artifact(ref)
+    assert stored["tool"] == "run_cmd"
+    assert stored["output"]["rc"] == 1
     assert meta["schema_version"].startswith("tool_output@")
 
 
@@ -34,9 +35,9 @@ def test_atomic_write_no_tmp_left_behind() -> None:
         step_id=2,
         agent_name="tester",
     )
+    assert read_tool_output_artifact(ref)["output"] == "some output"
     after = set(config.TOOL_OUTPUTS_DIR.glob("*.tmp")) if config.TOOL_OUTPUTS_DIR.exists() else set()
     assert after == before
-    assert Path(config.ROOT, ref.as_posix()).exists()
 
 
 def test_concurrent_writes_do_not_collide() -> None:
@@ -0,0 +1,71 @@
+import pytest
+
+from rev import config
+from rev.retrieval.bm25 import BM25Index
+from rev.retrieval.context_builder import ContextBuilder, MemoryCorpus, _tokenize
+
+
+def test_bm25_prefers_rare_terms_and_shorter_documents():
+    docs = [
+        "parse config file and load settings",
+        "load user settings from the database and cache them for later lookups by id",
+        "render template",
+        "load settings",
+    ]
+    index = BM25Index(_tokenize(d) for d in docs)
+
+    ranked = index.top_k(_tokenize("load settings"), k=3)
+    assert [doc_id for doc_id, _ in ranked][0] == 3
+    assert 2 not in dict(ranked)
+    assert all(0 < score < 1 for _, score in ranked)
+
+    # "parse" appears once, so it outweighs the common terms.
+    assert index.top_k(_tokenize("parse settings"), k=1)[0][0] == 0
+
+
+def test_bm25_empty_and_unknown_queries():
+    assert BM25Index([]).top_k(["anything"], k=3) == []
+    index = BM25Index([["alpha"], ["beta"]])
+    assert index.top_k(["gamma"], k=3) == []
+    assert index.top_k(["alpha"], k=0) == []
+
+
+def test_memory_corpus_reuses_index_until_items_change():
+    corpus = MemoryCorpus()
+    items = [("last_error", "ImportError in payments module"), ("plan", "refactor billing")]
+    first = corpus.query("payments import error", items, k=2)
+    index = corpus._index
+    assert first[0].source == "last_error"
+
+    corpus.query("billing", items, k=2)
+    assert corpus._index is index
+    corpus.query("billing", items + [("note", "billing tests flaky")], k=2)
+    assert corpus._index is not index
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    previous = config.ROOT
+    config.set_workspace_root(tmp_path, allow_external=True)
+    yield tmp_path
+    config.set_workspace_root(previous, allow_external=True)
+
+
+def test_context_builder_ranks_matching_code_first(workspace):
+    (workspace / "billing.py").write_text("def compute_invoice_total(items):\n    return sum(items)\n", encoding="utf-8")
+    (workspace / "users.py").write_text("def load_user(user_id):\n    return None\n", encoding="utf-8")
+    (workspace / "README.md").write_text("# Billing\nInvoices are computed in billing.py\n", encoding="utf-8")
+    tools = [
+        {"function": {"name": "read_file", "description": "Read a file", "parameters": {"properties": {"path": {"type": "string"}}}}},
+        {"function": {"name": "run_tests", "description": "Run the test suite", "parameters": {}}},
+    ]
+
+    bundle = ContextBuilder(workspace).build(
+        query="fix compute_invoice_total rounding in billing",
+        tool_universe=tools,
+        memory_items=[("last_error", "billing total off by one cent")],
+    )
+
+    assert bundle.selected_code_chunks[0].source == "billing.py"
+    assert bundle.selected_docs_chunks[0].source == "README.md"
+    assert bundle.selected_memory_items[0].source == "last_error"
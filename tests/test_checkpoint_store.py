@@ -0,0 +1,77 @@
+import json
+
+from rev.execution.checkpoint_store import CheckpointStore, apply_plan_delta, diff_plan, parse_ref
+from rev.execution.state_manager import StateManager
+from rev.models.task import ExecutionPlan, TaskStatus
+
+
+def _plan(*descriptions):
+    plan = ExecutionPlan()
+    for description in descriptions:
+        plan.add_task(description, "edit")
+    return plan
+
+
+def test_plan_delta_round_trips_inserted_tasks_and_growing_events():
+    plan = _plan("write parser", "add tests")
+    old = json.loads(json.dumps(plan.to_dict()))
+    plan.tasks[0].status = TaskStatus.COMPLETED
+    plan.tasks[0].tool_events = [{"tool": "read_file", "args": {"path": "a.py"}}]
+    plan.tasks.insert(1, _plan("fix import").tasks[0])
+    new = json.loads(json.dumps(plan.to_dict()))
+
+    delta = diff_plan(old, new)
+    assert apply_plan_delta(json.loads(json.dumps(old)), delta) == new
+    assert len(json.dumps(delta)) < len(json.dumps(new))
+
+
+def test_store_appends_deltas_and_loads_any_checkpoint(tmp_path):
+    store = CheckpointStore(tmp_path, snapshot_interval=3)
+    plan = _plan(*(f"task {i} " + "x" * 200 for i in range(10)))
+    refs, states = [], []
+    for step in range(7):
+        plan.tasks[step].status = TaskStatus.COMPLETED
+        refs.append(store.append("s1", plan.to_dict(), reason=f"step {step}"))
+        states.append(json.loads(json.dumps(plan.to_dict())))
+
+    log, number = parse_ref(refs[-1])
+    assert number == 7 and len(set(parse_ref(r)[0] for r in refs)) == 1
+    records = [json.loads(line) for line in log.read_text().splitlines()]
+    assert [r["type"] for r in records] == ["snapshot", "delta", "delta", "snapshot", "delta", "delta", "snapshot"]
+
+    index = json.loads((tmp_path / "index.json").read_text())
+    assert [n for n, _ in index["sessions"]["s1"]["snapshots"]] == [1, 4, 7]
+    for ref, state in zip(refs, states):
+        loaded = store.load(ref)
+        assert loaded["plan"] == state
+        assert loaded["reason"] == f"step {refs.index(ref)}"
+
+    assert store.latest() == refs[-1]
+    assert [e["ref"] for e in store.list(2)] == [refs[-1], refs[-2]]
+    assert store.list(1)[0]["tasks_completed"] == 0 and store.list(1)[0]["tasks_total"] == 10
+
+
+def test_state_manager_checkpoints_resume_from_log(tmp_path):
+    plan = _plan("first", "second")
+    manager = StateManager(plan, checkpoint_dir=str(tmp_path))
+    manager.save_checkpoint(reason="start", force=True)
+    plan.tasks[0].status = TaskStatus.COMPLETED
+    ref = manager.save_checkpoint(reason="progress", force=True)
+
+    assert ref.endswith("#2") and manager.session_id in ref
+    assert StateManager.find_latest_checkpoint(str(tmp_path)) == ref
+    restored = StateManager.load_from_checkpoint(ref)
+    assert [t.status for t in restored.tasks] == [TaskStatus.COMPLETED, TaskStatus.PENDING]
+    listed = manager.list_checkpoints(limit=5)
+    assert [cp["reason"] for cp in listed] == ["progress", "start"]
+    assert listed[0]["tasks_completed"] == 1
+
+
+def test_prune_removes_logs_outside_recent_checkpoints(tmp_path):
+    store = CheckpointStore(tmp_path)
+    old = store.append("old", _plan("a").to_dict())
+    new = store.append("new", _plan("b").to_dict())
+
+    assert CheckpointStore(tmp_path).prune(keep_last=1) == [parse_ref(old)[0]]
+    assert not parse_ref(old)[0].exists() and parse_ref(new)[0].exists()
+    assert [e["ref"] for e in CheckpointStore(tmp_path).list()] == [new]
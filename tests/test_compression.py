@@ -1,12 +1,12 @@
 #!/usr/bin/env python3
 
 import json
-from pathlib import Path
 
+from rev.execution.artifacts import read_tool_output_artifact
 from rev.execution.executor import _tool_message_content
 from rev.execution.session import SessionTracker
-from rev import config
 from rev.execution.redaction import REDACTION_RULES_VERSION
+from rev.tools.registry import execute_tool
 
 
 def test_tool_output_compression_writes_artifact_and_inlines_evidence() -> None:
@@ -29,9 +29,8 @@ def test_tool_output_compression_writes_artifact_and_inlines_evidence() -> None:
     assert "artifact_meta" in evidence
     assert evidence["artifact_meta"]["schema_version"].startswith("tool_output@")
     assert evidence["artifact_meta"]["redaction_rules_version"] == REDACTION_RULES_VERSION
-    artifact_path = Path(config.ROOT) / evidence["artifact_ref"]
-    assert artifact_path.exists()
-    artifact_payload = json.loads(artifact_path.read_text(encoding="utf-8", errors="replace"))
+    artifact_payload = read_tool_output_artifact(evidence["artifact_ref"])
+    assert artifact_payload is not None
     assert artifact_payload["schema_version"] == evidence["artifact_meta"]["schema_version"]
     assert artifact_payload["redaction_rules_version"] == REDACTION_RULES_VERSION
 
@@ -49,9 +48,28 @@ def test_redaction_scrubs_tokens_in_artifacts() -> None:
     result = json.dumps({"rc": 1, "stdout": leaked, "stderr": ""})
     content = _tool_message_content("run_tests", {"cmd": "pytest -q"}, result, tracker, task_id="t3")
     evidence = json.loads(content)
-    artifact_path = Path(config.ROOT) / evidence["artifact_ref"]
-    artifact_payload = json.loads(artifact_path.read_text(encoding="utf-8", errors="replace"))
+    artifact_payload = read_tool_output_artifact(evidence["artifact_ref"])
     stored = json.dumps(artifact_payload, ensure_ascii=False)
     assert "sk-THISISNOTREAL" not in stored
     assert "Bearer [REDACTED]" in stored or "sk-[REDACTED]" in stored
 
+
+
+def test_reduced_tool_output_references_full_artifact() -> None:
+    tracker = SessionTracker(session_id="test_session4")
+    stdout = "F\n=== FAILURES ===\n___ test_a ___\nE   assert 1 == 2\n\nt.py:3: AssertionError\n" + "noise\n" * 500
+    stdout += "1 failed in 0.01s\n"
+    result = json.dumps({"rc": 1, "stdout": stdout, "stderr": ""})
+
+    content = _tool_message_content("run_tests", {"cmd": "pytest -q"}, result, tracker, task_id="t4")
+    assert "E   assert 1 == 2" in content and "noise" not in content
+    ref = content.rsplit("[full output via read_tool_output: ", 1)[1].rstrip("]")
+    artifact_payload = read_tool_output_artifact(ref)
+    assert artifact_payload is not None
+    assert "noise" in json.dumps(artifact_payload)
+
+    # The model-facing tool pages through the same output.
+    page = json.loads(execute_tool("read_tool_output", {"ref": ref, "start": 2, "end": 3}))
+    assert page["content"] == "--- stdout ---\nF"
+    assert page["line_count"] > 500 and page["next_start"] == 4
+    assert "error" in json.loads(execute_tool("read_tool_output", {"ref": "rev/config.py#x"}))
@@ -0,0 +1,80 @@
+from rev import config
+from rev.retrieval.context_builder import ContextBuilder, RetrievedChunk
+from rev.retrieval.context_packing import dedupe_overlapping, estimate_tokens, chunk_entry, pack_chunks, trim_chunk
+
+
+def _chunk(source, start, end, score, content=None, corpus="code"):
+    content = content if content is not None else "\n".join(f"line {i}" for i in range(start, end + 1))
+    return RetrievedChunk(
+        corpus=corpus,
+        source=source,
+        location=f"{source}:{start}",
+        score=score,
+        content=content,
+        metadata={"file": source, "start_line": start, "end_line": end},
+    )
+
+
+def test_dedupe_keeps_best_of_overlapping_ranges():
+    best = _chunk("a.py", 10, 40, 0.9)
+    overlapping = _chunk("a.py", 30, 60, 0.5)
+    disjoint = _chunk("a.py", 61, 80, 0.4)
+    other_file = _chunk("b.py", 10, 40, 0.3)
+    excerpt = RetrievedChunk("code", "b.py", "b.py:1", 0.2, "whole file", {"file": "b.py"})
+
+    assert dedupe_overlapping([overlapping, disjoint, best, other_file, excerpt]) == [best, disjoint, other_file]
+
+
+def test_trim_keeps_signature_and_match_windows():
+    lines = ["def handler(request):"] + [f"    step_{i} = {i}" for i in range(1, 100)]
+    lines[60] = "    total = compute_invoice_total(items)"
+    chunk = _chunk("billing.py", 1, 100, 1.0, content="\n".join(lines))
+
+    trimmed = trim_chunk(chunk, ["invoice"], max_lines=10, context=2)
+    text = trimmed.content.splitlines()
+    assert text[0] == "def handler(request):"
+    assert "    total = compute_invoice_total(items)" in text
+    assert text[1] == "... (57 lines omitted) ..."
+    assert text[-1] == "... (37 lines omitted) ..."
+    assert trimmed.metadata["windows"] == [(1, 1), (59, 63)]
+    assert trim_chunk(chunk, ["invoice"], max_lines=200) is chunk
+
+
+def test_pack_prefers_relevance_per_token_and_respects_budget_and_caps():
+    small = _chunk("a.py", 1, 3, 0.5)
+    big = _chunk("b.py", 1, 30, 0.6, content="x = 1\n" * 30)
+    memory = RetrievedChunk("memory", "last_error", "last_error", 0.4, "ImportError in billing", {"key": "last_error"})
+    budget = estimate_tokens(chunk_entry(small)) + estimate_tokens(chunk_entry(memory))
+
+    packed, used = pack_chunks({"code": [big, small], "memory": [memory]}, ["billing"], budget)
+    assert packed == {"code": [small], "memory": [memory]}
+    assert used <= budget
+
+    packed, _ = pack_chunks({"code": [big, small], "memory": [memory]}, [], 10_000, caps={"code": 1})
+    assert packed["code"] == [small]
+
+
+def test_build_packs_to_token_budget(tmp_path):
+    previous = config.ROOT
+    config.set_workspace_root(tmp_path, allow_external=True)
+    try:
+        body = "\n".join(f"    value_{i} = {i}" for i in range(300))
+        (tmp_path / "billing.py").write_text(
+            f"def compute_invoice_total(items):\n{body}\n    return sum(items)  # invoice total\n", encoding="utf-8"
+        )
+        (tmp_path / "users.py").write_text("def load_user(user_id):\n    return None\n", encoding="utf-8")
+        builder = ContextBuilder(tmp_path)
+        tools = [{"function": {"name": "read_file", "description": "Read a file", "parameters": {}}}]
+
+        bundle = builder.build(query="fix compute_invoice_total", tool_universe=tools, token_budget=400)
+        assert bundle.token_budget == 400
+        assert bundle.estimated_tokens <= 400
+        assert bundle.selected_code_chunks[0].source == "billing.py"
+        assert "lines omitted" in bundle.selected_code_chunks[0].content
+        assert estimate_tokens(builder.render(bundle)) <= 450
+
+        legacy = builder.build(query="fix compute_invoice_total", tool_universe=tools, token_budget=0)
+        assert legacy.token_budget is None
+        assert len(legacy.selected_code_chunks[0].content.splitlines()) == 240
+    finally:
+        config.set_workspace_root(previous, allow_external=True)
@@ -0,0 +1,149 @@
+import threading
+import time
+
+from rev.execution.dag_scheduler import DAGScheduler
+from rev.models.task import ExecutionPlan, TaskStatus
+
+
+def _runner(plan, order=None, fail=(), delay=0.0):
+    lock = threading.Lock()
+
+    def run(task):
+        with lock:
+            if order is not None:
+                order.append(task.task_id)
+        plan.mark_task_in_progress(task)
+        if delay:
+            time.sleep(delay)
+        if task.task_id in fail:
+            plan.mark_task_failed(task, "boom")
+            return False
+        plan.mark_task_completed(task)
+        return True
+
+    return run
+
+
+def test_runs_all_tasks_in_dependency_order():
+    plan = ExecutionPlan()
+    plan.add_task("a")
+    plan.add_task("b", dependencies=[0])
+    plan.add_task("c", dependencies=[0])
+    plan.add_task("d", dependencies=[1, 2])
+    order = []
+
+    stats = DAGScheduler(plan, max_workers=2).run(_runner(plan, order))
+
+    assert all(t.status == TaskStatus.COMPLETED for t in plan.tasks)
+    assert order[0] == 0 and order[-1] == 3
+    assert stats.completed == 4 and stats.blocked == 0
+    assert stats.critical_path_length == 3
+
+
+def test_dependents_of_failed_tasks_are_blocked_without_waiting():
+    plan = ExecutionPlan()
+    plan.add_task("a")
+    plan.add_task("b", dependencies=[0])
+    plan.add_task("c")
+
+    start = time.perf_counter()
+    stats = DAGScheduler(plan, max_workers=2).run(_runner(plan, fail={0}))
+
+    assert time.perf_counter() - start < 1.0
+    assert stats.failed == 1 and stats.completed == 1 and stats.blocked == 1
+    assert plan.tasks[1].status == TaskStatus.PENDING
+
+
+def test_priority_then_critical_path_ordering():
+    plan = ExecutionPlan()
+    plan.add_task("leaf")                    # 0: nothing depends on it
+    plan.add_task("chain head")              # 1: heads a 3-task chain
+    plan.add_task("chain", dependencies=[1])
+    plan.add_task("chain tail", dependencies=[2])
+    plan.add_task("urgent")                  # 4
+    plan.tasks[4].priority = 5
+    order = []
+
+    DAGScheduler(plan, max_workers=1).run(_runner(plan, order))
+
+    assert order[:2] == [4, 1]
+
+
+def test_dependents_start_immediately_and_parallel_work_overlaps():
+    plan = ExecutionPlan()
+    for i in range(8):
+        plan.add_task(f"root {i}")
+    for i in range(8):
+        plan.add_task(f"child {i}", dependencies=[i])
+
+    stats = DAGScheduler(plan, max_workers=4).run(_runner(plan, delay=0.02))
+
+    assert stats.completed == 16
+    assert stats.max_concurrency == 4
+    # 16 tasks x 20ms on 4 workers: no polling gaps between waves.
+    assert stats.wall_seconds < 0.3
+    assert stats.utilization > 0.5
+
+
+def test_tasks_added_during_execution_are_scheduled():
+    plan = ExecutionPlan()
+    plan.add_task("discover")
+    run = _runner(plan)
+
+    def discovering(task):
+        if task.task_id == 0:
+            plan.add_subtasks_to_pending([{"description": "late"}], after_task_id=0)
+        return run(task)
+
+    stats = DAGScheduler(plan, max_workers=2).run(discovering)
+    assert stats.completed == 2
+    assert plan.tasks[1].status == TaskStatus.COMPLETED
+
+
+def test_invalid_dependency_fails_the_task():
+    plan = ExecutionPlan()
+    plan.add_task("a", dependencies=[7])
+    plan.add_task("b")
+    stats = DAGScheduler(plan).run(_runner(plan))
+    assert plan.tasks[0].status == TaskStatus.FAILED
+    assert plan.tasks[0].error == "invalid dependency: 7"
+    assert plan.tasks[1].status == TaskStatus.COMPLETED
+    assert stats.invalid == 1 and stats.completed == 1
+
+
+def test_initial_dependency_cycle_fails_its_tasks_and_runs_the_rest():
+    plan = ExecutionPlan()
+    plan.add_task("a", dependencies=[2])
+    plan.add_task("b", dependencies=[0])
+    plan.add_task("c", dependencies=[1])
+    plan.add_task("after cycle", dependencies=[2])
+    plan.add_task("independent")
+    plan.add_task("self", dependencies=[5])
+
+    start = time.perf_counter()
+    stats = DAGScheduler(plan, max_workers=2).run(_runner(plan))
+
+    assert time.perf_counter() - start < 1.0
+    assert [t.status for t in plan.tasks] == [
+        TaskStatus.FAILED, TaskStatus.FAILED, TaskStatus.FAILED,
+        TaskStatus.PENDING, TaskStatus.COMPLETED, TaskStatus.FAILED,
+    ]
+    assert plan.tasks[0].error == "dependency cycle: 0 -> 2 -> 1 -> 0"
+    assert plan.tasks[5].error == "dependency cycle: 5 -> 5"
+    assert stats.invalid == 4 and stats.completed == 1 and stats.blocked == 1
+
+
+def test_should_stop_prevents_new_dispatches():
+    plan = ExecutionPlan()
+    plan.add_task("a")
+    plan.add_task("b", dependencies=[0])
+    stop = threading.Event()
+    run = _runner(plan)
+
+    def stopping(task):
+        stop.set()
+        return run(task)
+
+    stats = DAGScheduler(plan, max_workers=1).run(stopping, should_stop=stop.is_set)
+    assert stats.dispatched == 1
+    assert plan.tasks[1].status == TaskStatus.PENDING
@@ -1,3 +1,4 @@
+import json
 from pathlib import Path
 
 import pytest
@@ -67,10 +68,59 @@ def test_llm_transaction_logging(tmp_path: Path, monkeypatch):
         messages=[{"role": "user", "content": "hello"}],
         response={"message": {"role": "assistant", "content": "hi"}}
     )
-    
+    logger.flush()
+
     assert log_path.exists()
     content = log_path.read_text(encoding="utf-8")
     assert "LLM TRANSCRIPT" in content
     assert "test-model" in content
     assert "hello" in content
     assert "hi" in content
+
+
+def test_events_are_written_as_compact_json_lines(tmp_path: Path):
+    logger = DebugLogger.initialize(enabled=True, log_dir=tmp_path)
+    logger.log("executor", "TASK_STARTED", {"task_id": 7}, "INFO")
+    logger.close()
+
+    assert logger.log_file_path.suffix == ".jsonl"
+    records = [json.loads(line) for line in logger.log_file_path.read_text(encoding="utf-8").splitlines()]
+    started = [r for r in records if r.get("event") == "TASK_STARTED"]
+    assert started == [{"ts": started[0]["ts"], "name": "rev.executor", "level": "INFO", "event": "TASK_STARTED", "data": {"task_id": 7}}]
+    assert records[0]["event"] == "DEBUG_SESSION_START"
+
+
+def test_component_levels_and_lazy_payloads(tmp_path: Path, monkeypatch):
+    from rev import config
+
+    monkeypatch.setattr(config, "DEBUG_LOG_LEVELS", "llm=WARNING,*=INFO")
+    logger = DebugLogger.initialize(enabled=True, log_dir=tmp_path)
+    built = []
+
+    logger.log("llm", "LLM_REQUEST", lambda: built.append("llm") or {"x": 1}, "DEBUG")
+    logger.log("tools", "TOOL_EXECUTION", lambda: built.append("debug") or {"x": 2}, "DEBUG")
+    logger.log("tools", "TOOL_EXECUTION", lambda: built.append("info") or {"x": 3}, "INFO")
+    assert built == ["info"]
+    assert not logger.is_enabled_for("llm", "INFO")
+    assert logger.is_enabled_for("llm", "ERROR")
+    logger.close()
+
+    events = [json.loads(line) for line in logger.log_file_path.read_text(encoding="utf-8").splitlines()]
+    assert [e["data"] for e in events if e.get("event") == "TOOL_EXECUTION"] == [{"x": 3}]
+
+
+def test_high_frequency_events_are_sampled(tmp_path: Path, monkeypatch):
+    from rev import config
+
+    monkeypatch.setattr(config, "DEBUG_LOG_SAMPLING", "TOOL_EXECUTION=0.25")
+    logger = DebugLogger.initialize(enabled=True, log_dir=tmp_path)
+    for i in range(8):
+        logger.log_tool_execution("read_file", {"path": f"f{i}"}, result="ok")
+    logger.log_tool_execution("read_file", {"path": "bad"}, error="boom")
+    logger.close()
+
+    events = [json.loads(line) for line in logger.log_file_path.read_text(encoding="utf-8").splitlines()]
+    tools = [e for e in events if e.get("event") == "TOOL_EXECUTION"]
+    assert [e["data"]["arguments"]["path"] for e in tools] == ["f0", "f4", "bad"]
+    assert tools[0]["sample_interval"] == 4
+    assert tools[-1]["level"] == "ERROR"
@@ -0,0 +1,145 @@
+import json
+import threading
+import time
+
+import pytest
+
+from rev import config
+from rev.execution.dag_scheduler import DAGScheduler
+from rev.models.task import ExecutionPlan
+from rev.tools import file_ops
+from rev.tools.file_leases import LeaseTable, task_leases, track_file_versions
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    previous = config.ROOT
+    config.set_workspace_root(tmp_path, allow_external=True)
+    yield tmp_path
+    config.set_workspace_root(previous, allow_external=True)
+
+
+def test_lease_table_shares_reads_and_excludes_writes():
+    table = LeaseTable()
+    assert table.try_acquire("a", reads=["src/x.py"])
+    assert table.try_acquire("b", reads=["src/x.py"])
+    assert not table.try_acquire("c", writes=["src/x.py"])
+    assert table.try_acquire("c", writes=["src/y.py"])
+    assert not table.try_acquire("d", reads=["src/y.py"], writes=["src/z.py"])
+    assert table.try_acquire("d", writes=["src/z.py"])
+
+    table.release("a")
+    table.release("b")
+    assert table.try_acquire("e", writes=["./src/x.py"])
+
+
+def test_task_leases_follow_action_type():
+    plan = ExecutionPlan()
+    review = plan.add_task("review", action_type="review")
+    edit = plan.add_task("edit", action_type="edit")
+    assert task_leases(review, ["a.py"]) == (["a.py"], [])
+    assert task_leases(edit, ["a.py", ""]) == ([], ["a.py"])
+
+
+def test_scheduler_does_not_overlap_tasks_writing_the_same_file():
+    plan = ExecutionPlan()
+    for i in range(4):
+        plan.add_task(f"edit shared.py #{i}", action_type="edit")
+    plan.add_task("edit other.py", action_type="edit")
+    active = set()
+    overlaps = []
+    lock = threading.Lock()
+
+    def run(task):
+        target = "other.py" if "other" in task.description else "shared.py"
+        with lock:
+            if target in active:
+                overlaps.append(task.task_id)
+            active.add(target)
+        plan.mark_task_in_progress(task)
+        time.sleep(0.01)
+        with lock:
+            active.discard(target)
+        plan.mark_task_completed(task)
+        return True
+
+    def leases(task):
+        return task_leases(task, ["other.py" if "other" in task.description else "shared.py"])
+
+    stats = DAGScheduler(plan, max_workers=4, leases=leases).run(run)
+    assert stats.completed == 5
+    assert overlaps == []
+    assert stats.lease_waits > 0
+    assert stats.max_concurrency == 2
+
+
+def test_write_after_concurrent_change_is_a_conflict(workspace):
+    target = workspace / "mod.py"
+    target.write_text("x = 1\n", encoding="utf-8")
+
+    with track_file_versions():
+        assert "x = 1" in file_ops.read_file("mod.py")
+        target.write_text("x = 2\n", encoding="utf-8")  # another task's edit
+
+        result = json.loads(file_ops.write_file("mod.py", "x = 3\n"))
+        assert result["conflict"] is True
+        assert target.read_text(encoding="utf-8") == "x = 2\n"
+
+        # Re-reading picks up the new version, after which the write goes through.
+        file_ops.read_file("mod.py")
+        assert "wrote" in json.loads(file_ops.write_file("mod.py", "x = 3\n"))
+        # Its own write does not conflict with itself.
+        assert json.loads(file_ops.replace_in_file("mod.py", "x = 3", "x = 4"))["replaced"] == 1
+    assert target.read_text(encoding="utf-8") == "x = 4\n"
+
+
+def test_writes_are_unchecked_outside_parallel_tasks(workspace):
+    target = workspace / "mod.py"
+    target.write_text("x = 1\n", encoding="utf-8")
+    file_ops.read_file("mod.py")
+    target.write_text("x = 2\n", encoding="utf-8")
+    assert "wrote" in json.loads(file_ops.write_file("mod.py", "x = 3\n"))
+
+
+def test_cached_reads_guard_concurrent_writes(workspace):
+    from rev.execution.executor import ExecutionContext
+
+    target = workspace / "shared.py"
+    target.write_text("x = 1\n", encoding="utf-8")
+    shared = ExecutionContext(ExecutionPlan())
+    first_read, second_read, first_wrote = threading.Event(), threading.Event(), threading.Event()
+    results = {}
+
+    def read_through_cache():
+        content = shared.get_code("shared.py")
+        if content is None:
+            content = file_ops.read_file("shared.py")
+            shared.set_code("shared.py", content)
+        return content
+
+    def task_a():
+        with track_file_versions():
+            read_through_cache()
+            first_read.set()
+            second_read.wait(5)
+            results["a"] = json.loads(file_ops.write_file("shared.py", "x = 2\n"))
+            first_wrote.set()
+
+    def task_b():
+        with track_file_versions():
+            first_read.wait(5)
+            results["b_read"] = read_through_cache()  # served from the cache
+            second_read.set()
+            first_wrote.wait(5)
+            results["b"] = json.loads(file_ops.write_file("shared.py", "x = 3\n"))
+
+    threads = [threading.Thread(target=task_a), threading.Thread(target=task_b)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert results["b_read"] == "x = 1\n"
+    assert "wrote" in results["a"]
+    assert results["b"]["conflict"] is True
+    assert target.read_text(encoding="utf-8") == "x = 2\n"
@@ -0,0 +1,101 @@
+import json
+import subprocess
+
+import pytest
+
+from rev import config
+from rev.tools import git_access
+from rev.tools.git_access import GitRepo
+
+
+def _git(root, *args):
+    subprocess.run(["git", *args], cwd=root, check=True, capture_output=True)
+
+
+def _commit(root, name, content):
+    (root / name).write_text(content, encoding="utf-8")
+    _git(root, "add", name)
+    _git(root, "-c", "user.email=t@example.com", "-c", "user.name=t", "commit", "-q", "-m", f"add {name}")
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _git(tmp_path, "init", "-q")
+    _commit(tmp_path, "a.txt", "alpha\n")
+    repo = GitRepo(tmp_path)
+    yield repo
+    repo.close()
+
+
+def test_head_is_memoised_until_refs_change(repo, monkeypatch):
+    first = repo.head()
+    assert first and len(first) == 40
+
+    queries = []
+    original = repo._check.query
+    monkeypatch.setattr(repo._check, "query", lambda spec: queries.append(spec) or original(spec))
+    assert repo.head() == first
+    assert queries == []
+
+    _commit(repo.root, "b.txt", "beta\n")
+    second = repo.head()
+    assert second != first
+    assert queries == ["HEAD"]
+
+
+def test_object_queries_reuse_one_process(repo):
+    assert repo.cat_file("HEAD:a.txt") == b"alpha\n"
+    pid = repo._batch._proc.pid
+    assert repo.cat_file("HEAD:missing.txt") is None
+    assert repo.cat_file("HEAD:a.txt") == b"alpha\n"
+    assert repo._batch._proc.pid == pid
+    with pytest.raises(ValueError):
+        repo.cat_file("HEAD\nHEAD")
+
+
+def test_semantic_diff_reads_the_old_version_through_cat_file(repo, monkeypatch):
+    from rev.tools import advanced_analysis
+
+    _commit(repo.root, "mod.py", "def f(a):\n    return a\n")
+    (repo.root / "mod.py").write_text("def f(a, b):\n    return a + b\n", encoding="utf-8")
+    old_root = config.ROOT
+    config.set_workspace_root(repo.root)
+    monkeypatch.setattr(git_access, "_REPOS", {repo.root: repo})
+    monkeypatch.setattr(advanced_analysis, "_run_shell", lambda *a, **kw: pytest.fail("spawned git show"))
+
+    try:
+        result = json.loads(advanced_analysis.analyze_semantic_diff("mod.py"))
+        missing = json.loads(advanced_analysis.analyze_semantic_diff("mod.py", compare_to="nope"))
+    finally:
+        config.set_workspace_root(old_root)
+
+    assert result["file"] == "mod.py" and result["summary"]["total_changes"] >= 1
+    assert repo._batch._proc is not None
+    assert "Could not retrieve old version" in missing["error"]
+
+
+def test_log_is_memoised_per_head(repo, monkeypatch):
+    assert "add a.txt" in repo.log(5).stdout
+    runs = []
+    original = repo._run
+    monkeypatch.setattr(repo, "_run", lambda args, **kw: runs.append(args) or original(args, **kw))
+    repo.log(5)
+    assert runs == []
+
+    _commit(repo.root, "b.txt", "beta\n")
+    assert "add b.txt" in repo.log(5).stdout
+    assert len(runs) == 1
+
+
+def test_outside_a_repository(tmp_path):
+    repo = GitRepo(tmp_path)
+    assert not repo.is_repo
+    assert repo.head() is None
+    assert repo.cat_file("HEAD:a.txt") is None
+
+
+def test_shared_instance_per_root(repo, monkeypatch):
+    monkeypatch.setattr(config, "ROOT", repo.root)
+    shared = git_access.get_git_repo()
+    assert git_access.get_git_repo(repo.root) is shared
+    assert shared.head() == repo.head()
@@ -0,0 +1,227 @@
+import json
+import os
+import time
+
+import pytest
+
+from rev.ide import api_server as api_mod
+from rev.ide.task_pool import CANCELLED, COMPLETED, FAILED, TaskPool, TaskQueueFull
+
+
+def _sleepy_runner(spec):
+    time.sleep(float(spec["config_overrides"].get("SLEEP", 0)))
+    return {"task": spec["task"]}
+
+
+def _workspace_runner(spec):
+    os.chdir(spec["workspace_root"])
+    print(f"working in {spec['workspace_root']}")
+    return {"cwd": os.getcwd(), "pid": os.getpid()}
+
+
+def _failing_runner(spec):
+    raise RuntimeError("boom")
+
+
+def _pool(runner, **kwargs):
+    return TaskPool(runner=runner, start_method="fork", kill_grace=0.5, **kwargs)
+
+
+def test_tasks_run_in_separate_processes_with_own_workspace(tmp_path):
+    logs = []
+    pool = _pool(_workspace_runner, max_workers=2, on_log=lambda t, stream, line: logs.append((t.task_id, line)))
+    roots = [tmp_path / "a", tmp_path / "b"]
+    for root in roots:
+        root.mkdir()
+    tasks = [pool.submit(f"t{i}", "go", workspace_root=str(root)) for i, root in enumerate(roots)]
+    try:
+        for t in tasks:
+            assert t.wait(30)
+        assert [t.status for t in tasks] == [COMPLETED, COMPLETED]
+        assert [t.result["cwd"] for t in tasks] == [str(r) for r in roots]
+        assert all(t.result["pid"] != os.getpid() for t in tasks)
+        assert os.getcwd() != str(roots[0])
+        assert ("t0", f"working in {roots[0]}") in logs
+    finally:
+        pool.shutdown()
+
+
+def test_higher_priority_tasks_start_first():
+    pool = _pool(_sleepy_runner, max_workers=1)
+    try:
+        blocker = pool.submit("blocker", "block", config_overrides={"SLEEP": 0.5})
+        low = pool.submit("low", "low", priority=0)
+        high = pool.submit("high", "high", priority=5)
+        assert low.wait(30) and high.wait(30) and blocker.wait(30)
+        assert high.started_at < low.started_at
+    finally:
+        pool.shutdown()
+
+
+def test_full_queue_rejects_submissions():
+    pool = _pool(_sleepy_runner, max_workers=1, max_queue=1)
+    try:
+        running = pool.submit("running", "r", config_overrides={"SLEEP": 1})
+        deadline = time.monotonic() + 10
+        while running.status != "running" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        pool.submit("queued", "q")
+        with pytest.raises(TaskQueueFull):
+            pool.submit("rejected", "x")
+        assert pool.get_metrics()["rejected"] == 1
+        assert pool.get_metrics()["queue_depth"] == 1
+    finally:
+        pool.shutdown()
+
+
+def test_cancel_kills_running_worker_process():
+    pool = _pool(_sleepy_runner, max_workers=1)
+    try:
+        task = pool.submit("long", "long", config_overrides={"SLEEP": 60})
+        deadline = time.monotonic() + 10
+        while task.pid is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert pool.cancel("long") is True
+        assert task.wait(10)
+        assert task.status == CANCELLED
+        with pytest.raises(OSError):
+            os.kill(task.pid, 0)
+    finally:
+        pool.shutdown()
+
+
+def test_failures_and_latency_metrics_are_reported():
+    pool = _pool(_failing_runner, max_workers=1)
+    try:
+        task = pool.submit("bad", "bad")
+        assert task.wait(30)
+        assert task.status == FAILED
+        assert "RuntimeError: boom" in task.error
+        metrics = pool.get_metrics()
+        assert metrics["failed"] == 1
+        assert metrics["queue_wait"]["count"] == 1
+        assert metrics["run_time"]["count"] == 1
+    finally:
+        pool.shutdown()
+
+
+def test_config_overrides_only_accept_allowlisted_settings():
+    overrides = api_mod._config_overrides({
+        "model": "m1",
+        "config": {"EXECUTION_MODE": "linear", "TEMPERATURE": 0, "TDD_ENABLED": True},
+    })
+    assert overrides == {
+        "EXECUTION_MODE": "linear",
+        "TEMPERATURE": 0.0,
+        "TDD_ENABLED": True,
+        "EXECUTION_MODEL": "m1",
+        "PLANNING_MODEL": "m1",
+        "RESEARCH_MODEL": "m1",
+    }
+    for config in (
+        {"OLLAMA_BASE_URL": "http://attacker:11434"},
+        {"OPENAI_API_KEY": "sk-x"},
+        {"LOOP_GUARD_ENABLED": False},
+        {"MAX_LLM_TOKENS_PER_RUN": 10**9},
+        {"EXECUTION_MODE": "yolo"},
+        {"TDD_ENABLED": "yes"},
+    ):
+        with pytest.raises(api_mod.ConfigOverrideError):
+            api_mod._config_overrides({"config": config})
+
+
+@pytest.mark.parametrize("payload, reason", [
+    ({"task": "t", "config": {"ENABLE_CONTEXT_GUARD": False}}, "ENABLE_CONTEXT_GUARD"),
+    ({"task": "t", "priority": "high"}, "priority"),
+    ({"task": "t", "priority": [1]}, "priority"),
+])
+def test_execute_rejects_invalid_requests_with_400(payload, reason):
+    from aiohttp.test_utils import make_mocked_request
+
+    server = api_mod.RevAPIServer(config=api_mod.rev_config)
+    submitted = []
+
+    async def fake_submit(*args, **kwargs):
+        submitted.append(args)
+
+    server._submit_task = fake_submit
+    request = make_mocked_request("POST", "/api/v1/execute")
+
+    async def json_payload():
+        return payload
+
+    request.json = json_payload
+    response = api_mod.asyncio.run(server.handle_execute(request))
+    assert response.status == 400
+    assert reason in json.loads(response.text)["message"]
+    assert submitted == []
+
+
+def test_task_priority_accepts_integers_and_defaults_to_zero():
+    assert api_mod._task_priority({}) == 0
+    assert api_mod._task_priority({"priority": 3}) == 3
+    assert api_mod._task_priority({"priority": "-2"}) == -2
+    with pytest.raises(api_mod.InvalidRequestError):
+        api_mod._task_priority({"priority": True})
+
+
+def _config_runner(spec):
+    from rev import config as rev_config
+    from rev.ide.task_pool import apply_spec_config
+
+    apply_spec_config(spec)
+    return {key: getattr(rev_config, key) for key in ("OLLAMA_BASE_URL", "LLM_PROVIDER", "EXECUTION_MODEL", "PLANNING_MODEL")}
+
+
+def test_spawned_workers_inherit_the_servers_effective_config(monkeypatch):
+    from rev import config as rev_config
+
+    monkeypatch.setattr(rev_config, "OLLAMA_BASE_URL", "http://gpu-box:11434")
+    monkeypatch.setattr(rev_config, "LLM_PROVIDER", "ollama")
+    for key in ("OLLAMA_MODEL", "EXECUTION_MODEL", "PLANNING_MODEL", "RESEARCH_MODEL"):
+        monkeypatch.setattr(rev_config, key, "cli-model")
+    pool = TaskPool(runner=_config_runner, start_method="spawn", kill_grace=0.5, max_workers=1)
+    try:
+        task = pool.submit("cfg", "go", config_overrides={"PLANNING_MODEL": "per-task"})
+        assert task.wait(60)
+        assert task.status == COMPLETED, task.error
+        assert task.result == {
+            "OLLAMA_BASE_URL": "http://gpu-box:11434",
+            "LLM_PROVIDER": "ollama",
+            "EXECUTION_MODEL": "cli-model",
+            "PLANNING_MODEL": "per-task",
+        }
+    finally:
+        pool.shutdown()
+
+
+def test_pool_updates_are_applied_on_the_event_loop():
+    import asyncio
+    import threading
+
+    server = api_mod.RevAPIServer(config=api_mod.rev_config)
+    loop = asyncio.new_event_loop()
+    loop_thread = threading.Thread(target=loop.run_forever, daemon=True)
+    loop_thread.start()
+    server._loop = loop
+    applied_on = []
+    apply = server._apply_pool_update
+
+    def recording_apply(snapshot, done):
+        applied_on.append(threading.current_thread())
+        apply(snapshot, done)
+
+    server._apply_pool_update = recording_apply
+    pool = _pool(_sleepy_runner, max_workers=1, on_update=server._on_pool_update)
+    try:
+        task = pool.submit("t1", "go")
+        assert task.wait(30)
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0), loop).result(5)
+        assert applied_on and all(thread is loop_thread for thread in applied_on)
+        assert server.active_tasks["t1"]["status"] == COMPLETED
+        assert "completed_at" in server.active_tasks["t1"]
+    finally:
+        pool.shutdown()
+        loop.call_soon_threadsafe(loop.stop)
+        loop_thread.join(5)
+        loop.close()
@@ -0,0 +1,53 @@
+import re
+import subprocess
+import sys
+
+import pytest
+
+import rev
+
+# Generous enough for slow CI machines; the eager package init took ~650ms.
+IMPORT_BUDGET_US = 150_000
+
+
+def _run(code):
+    return subprocess.run([sys.executable, *code], capture_output=True, text=True, timeout=60)
+
+
+def _cumulative_us(stderr, module):
+    for line in stderr.splitlines():
+        m = re.match(r"import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)$", line)
+        if m and m.group(2) == module:
+            return int(m.group(1))
+    raise AssertionError(f"{module} not in -X importtime output")
+
+
+def test_import_rev_is_within_budget():
+    proc = _run(["-X", "importtime", "-c", "import rev"])
+    assert proc.returncode == 0, proc.stderr
+    assert _cumulative_us(proc.stderr, "rev") < IMPORT_BUDGET_US
+
+
+def test_import_rev_does_not_load_heavy_modules():
+    heavy = ["rev.execution.orchestrator", "rev.tools.registry", "rev.llm.client", "paramiko", "requests"]
+    proc = _run(["-c", f"import sys, rev, rev.main; print([m for m in {heavy!r} if m in sys.modules])"])
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip() == "[]"
+
+
+def test_lazy_exports_resolve_and_cache():
+    from rev.tools import git_diff
+    from rev.tools.git_ops import git_diff as direct
+
+    assert rev.git_diff is direct is git_diff
+    assert "git_diff" in vars(rev)
+    assert rev.scan_code_security is rev.scan_security_issues
+    assert rev.config.ROOT == rev.ROOT
+    assert "read_file" in dir(rev)
+
+
+def test_unknown_attribute_raises_attribute_error():
+    with pytest.raises(AttributeError):
+        rev.definitely_not_exported
+    with pytest.raises(AttributeError):
+        rev.tools.definitely_not_exported
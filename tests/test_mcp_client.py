@@ -1,9 +1,14 @@
 """Comprehensive tests for MCP (Model Context Protocol) client."""
 import json
+import sys
+from pathlib import Path
+
 import pytest
 import rev
 from rev.mcp import MCPClient, mcp_client
 
+STUB_SERVER = str(Path(__file__).with_name("mcp_stub_server.py"))
+
 
 class TestMCPClient:
     """Test MCP client functionality."""
@@ -66,15 +71,18 @@ class TestMCPClient:
     def test_call_mcp_tool_success(self):
         """Test calling tool on existing server."""
         client = MCPClient()
-        client.add_server("test_server", "python")
+        client.add_server("test_server", sys.executable, [STUB_SERVER])
 
-        result = client.call_mcp_tool("test_server", "test_tool", {"arg": "value"})
+        try:
+            result = client.call_mcp_tool("test_server", "echo", {"text": "value"})
+        finally:
+            client.close()
 
-        assert "error" not in result or "mcp_call" in result
-        if "mcp_call" in result:
-            assert result["mcp_call"] == True
-            assert result["server"] == "test_server"
-            assert result["tool"] == "test_tool"
+        assert "error" not in result
+        assert result["mcp_call"] == True
+        assert result["server"] == "test_server"
+        assert result["tool"] == "echo"
+        assert result["content"][0]["text"] == "value"
 
 
 class TestMCPFunctions:
@@ -107,7 +115,7 @@ class TestMCPFunctions:
     def test_mcp_call_tool_function(self):
         """Test mcp_call_tool function."""
         # First add a server
-        rev.mcp_add_server("test_server2", "python")
+        rev.mcp_add_server("test_server2", sys.executable, STUB_SERVER)
 
         # Then call a tool
         result_str = rev.mcp_call_tool("test_server2", "test_tool", '{"key": "value"}')
@@ -0,0 +1,122 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from rev import config
+from rev.mcp.client import MCPClient
+from rev.mcp.transport import MCPError, MCPTimeoutError, StdioMCPSession, iter_sse_events
+
+STUB = str(Path(__file__).with_name("mcp_stub_server.py"))
+
+
+def _session(**kwargs):
+    return StdioMCPSession("stub", sys.executable, [STUB], **kwargs)
+
+
+def _text(result):
+    return result["content"][0]["text"]
+
+
+def test_concurrent_calls_share_one_process_and_correlate_ids():
+    session = _session()
+    try:
+        results = {}
+
+        def call(i):
+            results[i] = _text(session.call_tool("echo", {"text": f"msg-{i}"}))
+
+        slow = threading.Thread(target=lambda: results.setdefault("slow", session.call_tool("sleep", {"seconds": 3})))
+        slow.start()
+        started = time.monotonic()
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(10)
+        # Fast calls are not queued behind the slow one on the shared pipe.
+        assert time.monotonic() - started < 2.5
+        slow.join(10)
+
+        assert results == {**{i: f"msg-{i}" for i in range(8)}, "slow": results["slow"]}
+        assert len({_text(session.call_tool("pid")) for _ in range(3)}) == 1
+        assert session.get_stats()["calls"] == 12
+    finally:
+        session.close()
+
+
+def test_tool_list_is_cached(tmp_path):
+    log = tmp_path / "lists.log"
+    session = _session(env={"STUB_LIST_LOG": str(log)})
+    try:
+        names = [t["name"] for t in session.list_tools()]
+        assert names == ["echo", "sleep", "pid", "crash"]
+        session.list_tools()
+        assert log.read_text().count("list") == 1
+        session.list_tools(refresh=True)
+        assert log.read_text().count("list") == 2
+    finally:
+        session.close()
+
+
+def test_call_timeout_does_not_poison_session():
+    session = _session()
+    try:
+        with pytest.raises(MCPTimeoutError):
+            session.call_tool("sleep", {"seconds": 2}, timeout=0.2)
+        assert _text(session.call_tool("echo", {"text": "still here"})) == "still here"
+        assert session.get_stats()["timeouts"] == 1
+    finally:
+        session.close()
+
+
+def test_crashed_server_is_restarted():
+    session = _session(max_restarts=1)
+    try:
+        first_pid = _text(session.call_tool("pid"))
+        with pytest.raises(MCPError):
+            session.call_tool("crash", timeout=5)
+        assert _text(session.call_tool("pid")) != first_pid
+        assert session.get_stats()["restarts"] == 1
+
+        with pytest.raises(MCPError):
+            session.call_tool("crash", timeout=5)
+        with pytest.raises(MCPError, match="restarts"):
+            session.call_tool("pid")
+    finally:
+        session.close()
+
+
+def test_client_calls_stub_server_and_reports_latency(monkeypatch):
+    monkeypatch.setattr(config, "MCP_REQUEST_TIMEOUT", 10.0)
+    client = MCPClient(load_defaults=False)
+    client.add_server("stub", sys.executable, [STUB])
+    try:
+        result = client.call_mcp_tool("stub", "echo", {"text": "hi"})
+        assert result["mcp_call"] is True
+        assert result["content"] == [{"type": "text", "text": "hi"}]
+        assert result["is_error"] is False
+
+        assert "error" in client.call_mcp_tool("stub", "missing", {})
+        assert [t["name"] for t in client.list_mcp_tools("stub")["tools"]][0] == "echo"
+
+        stats = client.get_tool_stats()["stub"]
+        assert stats["calls"] == 2 and stats["errors"] == 1
+        assert stats["avg_latency"] > 0
+    finally:
+        client.close()
+    assert client.get_tool_stats() == {}
+
+
+def test_missing_command_returns_error():
+    client = MCPClient(load_defaults=False)
+    client.add_server("nope", "definitely-not-a-real-mcp-binary")
+    result = client.call_mcp_tool("nope", "tool", {})
+    assert "Failed to start" in result["error"]
+
+
+def test_iter_sse_events_parses_multiline_data():
+    lines = ["event: endpoint", "data: /messages?id=1", "", ": comment", "data: {\"a\":", "data: 1}", ""]
+    assert list(iter_sse_events(lines)) == [("endpoint", "/messages?id=1"), ("message", "{\"a\":\n1}")]
@@ -1,4 +1,6 @@
 from rev.execution import executor
+from rev.execution.history import MessageHistory, TokenCountedMessages, estimate_message_tokens
+from rev.llm.providers import ollama
 
 
 def test_trim_history_with_notice_emits_message(capsys):
@@ -16,3 +18,61 @@ def test_trim_history_with_notice_emits_message(capsys):
     assert "Context window trimmed" in captured
     assert "26 → 22" in captured
     assert "keeping last 20" in captured
+
+
+def _turns(count):
+    for idx in range(count):
+        yield {"role": "user", "content": f"Task: step {idx % 7}\nDo it."}
+        yield {"role": "tool", "name": f"tool_{idx % 3}", "content": "x" * (idx * 10)}
+
+
+def test_message_history_window_matches_legacy_and_folds_each_message_once():
+    system = {"role": "system", "content": "system"}
+    history = MessageHistory([system])
+    legacy = [system]
+    for message in _turns(12):
+        history.append(message)
+        legacy.append(message)
+        window = history.window(6)
+        assert window == executor._manage_message_history(legacy, max_recent=6)
+        assert window.estimated_tokens == sum(estimate_message_tokens(m) for m in window)
+
+    assert history.summary.messages == 24 - 6
+
+    assert history.compact(6) == 24 - 6
+    assert len(history) == 7 and history[0] is system
+    compacted = history.window(6)
+    assert compacted == window and compacted.estimated_tokens == window.estimated_tokens
+    assert history.compact(6) == 0
+    assert history.total_tokens == sum(estimate_message_tokens(m) for m in history)
+
+
+def test_trim_history_with_notice_compacts_message_history(capsys):
+    history = MessageHistory([{"role": "system", "content": "system"}])
+    for idx in range(25):
+        history.append({"role": "user", "content": f"msg-{idx}"})
+
+    trimmed, trimmed_flag = executor._trim_history_with_notice(history, max_recent=20)
+    assert trimmed is history and trimmed_flag is True
+    assert len(history) == 21
+    assert "26 → 22" in capsys.readouterr().out
+
+    # Nothing new left the window: no second notice, summary still sent.
+    assert executor._trim_history_with_notice(history, max_recent=20) == (history, False)
+    assert capsys.readouterr().out == ""
+    assert executor._manage_message_history(history, max_recent=20)[1]["content"].startswith("[Summary of previous work]")
+
+
+def test_token_counted_messages_short_circuit_enforce_token_limit(monkeypatch):
+    messages = TokenCountedMessages([{"role": "system", "content": "s" * 30}])
+    messages.append({"role": "user", "content": "u" * 60})
+    assert messages.estimated_tokens == 30
+
+    monkeypatch.setattr(ollama, "_estimate_message_tokens", lambda message: 1 / 0)
+    assert ollama._enforce_token_limit(messages, 100) == (messages, 30, 30, False)
+
+    messages[1] = {"role": "user", "content": "u" * 600}
+    assert messages.estimated_tokens is None
+    monkeypatch.undo()
+    trimmed, original, _, truncated = ollama._enforce_token_limit(messages, 100)
+    assert original == 210 and truncated is True
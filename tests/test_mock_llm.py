@@ -0,0 +1,99 @@
+import json
+
+import requests
+
+from rev.llm.mock_server import MockLLMServer
+from rev.llm.providers.mock_provider import LatencyModel, MockProvider, MockResponder, MockScript
+from rev.llm.providers.ollama import OllamaProvider
+
+
+MESSAGES = [{"role": "user", "content": "Fix the bug in app.py"}]
+
+
+def _script(**kwargs):
+    return MockScript([
+        {"content": "Reading", "tool_calls": [{"name": "read_file", "arguments": {"path": "app.py"}}]},
+        {"content": "Fixed."},
+        {"match": r"^ping$", "content": "pong"},
+    ], **kwargs)
+
+
+def test_script_replays_in_order_with_rules_and_fallback():
+    script = _script()
+    assert script.next_turn(MESSAGES).tool_calls == [{"name": "read_file", "arguments": {"path": "app.py"}}]
+    assert script.next_turn([{"role": "user", "content": "ping"}]).content == "pong"
+    assert script.next_turn(MESSAGES).content == "Fixed."
+    assert script.next_turn(MESSAGES).content == "Done."
+
+    looping = _script(loop=True)
+    assert [looping.next_turn(MESSAGES).content for _ in range(3)] == ["Reading", "Fixed.", "Reading"]
+
+
+def test_script_loads_recorded_run_bundle(tmp_path):
+    bundle = {
+        "request": "Fix the bug",
+        "llm_calls": [
+            {"messages": [], "model": "m", "response": {"message": {
+                "role": "assistant", "content": "",
+                "tool_calls": [{"function": {"name": "read_file", "arguments": "{\"path\": \"a.py\"}"}}],
+            }}},
+            {"messages": [], "model": "m", "response": {"message": {"role": "assistant", "content": "ok"}}},
+        ],
+    }
+    path = tmp_path / "bundle.json"
+    path.write_text(json.dumps(bundle), encoding="utf-8")
+
+    script = MockScript.load(path)
+    assert script.next_turn(MESSAGES).tool_calls == [{"name": "read_file", "arguments": {"path": "a.py"}}]
+    assert script.next_turn(MESSAGES).content == "ok"
+
+
+def test_provider_reports_deterministic_usage_and_streams():
+    provider = MockProvider(MockResponder(_script(), LatencyModel(tokens_per_second=10_000)))
+    first = provider.chat(MESSAGES)
+    assert first["message"]["tool_calls"][0]["function"]["name"] == "read_file"
+    assert first["usage"]["prompt"] == provider.count_tokens(MESSAGES)
+    assert first["eval_duration"] > 0
+
+    chunks = []
+    second = provider.chat_stream(MESSAGES, on_chunk=chunks.append)
+    assert "".join(chunks) == second["message"]["content"] == "Fixed."
+    assert provider.responder.requests == 2
+
+
+def test_ollama_provider_against_mock_server():
+    with MockLLMServer(MockResponder(_script())) as server:
+        provider = OllamaProvider(base_url=server.url)
+        assert provider.get_model_list() == ["mock"]
+
+        response = provider.chat(MESSAGES, tools=None, model="mock", supports_tools=False)
+        calls = response["message"]["tool_calls"]
+        assert calls[0]["function"]["arguments"] == {"path": "app.py"}
+        assert response["usage"]["completion"] > 0
+
+        chunks = []
+        streamed = provider.chat_stream(MESSAGES, model="mock", supports_tools=False, on_chunk=chunks.append)
+        assert "".join(chunks) == "Fixed."
+        assert streamed["message"]["content"] == "Fixed."
+
+
+def test_openai_compatible_streaming_endpoint():
+    with MockLLMServer(MockResponder(_script())) as server:
+        resp = requests.post(
+            f"{server.openai_url}/chat/completions",
+            json={"model": "mock", "messages": MESSAGES, "stream": True},
+            stream=True,
+            timeout=10,
+        )
+        events = [line[len(b"data: "):] for line in resp.iter_lines() if line.startswith(b"data: ")]
+        assert events[-1] == b"[DONE]"
+        chunks = [json.loads(e)["choices"][0] for e in events[:-1]]
+        tool_calls = [c["delta"]["tool_calls"] for c in chunks if "tool_calls" in c["delta"]]
+        assert json.loads(tool_calls[0][0]["function"]["arguments"]) == {"path": "app.py"}
+        assert chunks[-1]["finish_reason"] == "tool_calls"
+
+        completion = requests.post(
+            f"{server.openai_url}/chat/completions", json={"model": "mock", "messages": MESSAGES}, timeout=10,
+        ).json()
+        assert completion["choices"][0]["message"]["content"] == "Fixed."
+        assert completion["usage"]["total_tokens"] > 0
@@ -0,0 +1,114 @@
+import json
+import threading
+import time
+
+from rev.cache.implementations import LLMResponseCache
+from rev.profiler import Profiler, record_llm_phases
+
+
+def test_disabled_profiler_returns_noop_span():
+    profiler = Profiler(enabled=False)
+    with profiler.span("tool", "read_file") as span:
+        span.add("prefill", 1.0)
+    assert span.active is False
+    assert profiler.collapsed() == []
+    assert profiler.summary()["categories"] == {}
+
+
+def test_nested_spans_produce_collapsed_stacks_with_self_time():
+    profiler = Profiler(enabled=True)
+    profiler.set_phase("execution")
+    with profiler.span("context", "build"):
+        with profiler.span("index", "code"):
+            time.sleep(0.02)
+        time.sleep(0.01)
+    with profiler.span("tool", "run_tests"):
+        with profiler.span("tool", "run_cmd"):
+            time.sleep(0.01)
+
+    folded = dict(line.rsplit(" ", 1) for line in profiler.collapsed())
+    assert int(folded["phase:execution;context:build;index:code"]) >= 20_000
+    assert 5_000 <= int(folded["phase:execution;context:build"]) < 20_000
+
+    categories = profiler.summary()["categories"]
+    assert categories["context"]["count"] == 1
+    assert categories["index"]["total_seconds"] >= 0.02
+    # The nested tool call does not count twice towards the category.
+    assert categories["tool"]["count"] == 1
+    assert categories["tool"]["total_seconds"] < 0.05
+
+
+def test_worker_threads_get_their_own_stack():
+    profiler = Profiler(enabled=True)
+    profiler.set_phase("research")
+
+    def work():
+        with profiler.span("index", "code"):
+            time.sleep(0.005)
+
+    thread = threading.Thread(target=work, name="research-1")
+    with profiler.span("llm", "model"):
+        thread.start()
+        thread.join()
+
+    stacks = {line.rsplit(" ", 1)[0] for line in profiler.collapsed()}
+    assert "phase:research;thread:research-1;index:code" in stacks
+    assert "phase:research;llm:model" in stacks
+
+
+def test_llm_phases_from_ollama_timings_and_streams():
+    profiler = Profiler(enabled=True)
+    with profiler.span("llm", "qwen") as span:
+        time.sleep(0.01)
+        record_llm_phases(span, {"load_duration": 1_000_000, "prompt_eval_duration": 2_000_000, "eval_duration": 3_000_000})
+    with profiler.span("llm", "qwen") as span:
+        time.sleep(0.005)
+        span.mark_first_token()
+        time.sleep(0.005)
+        record_llm_phases(span, {"message": {"content": "ok"}})
+
+    categories = profiler.summary()["categories"]
+    assert categories["llm"]["count"] == 2
+    assert categories["llm.load"]["total_seconds"] == 0.001
+    assert categories["llm.prefill"]["count"] == 2
+    assert categories["llm.generation"]["total_seconds"] >= 0.003
+    assert categories["llm.queue"]["total_seconds"] > 0
+
+
+def test_cache_hits_do_not_report_the_original_server_timings(tmp_path):
+    ollama_reply = {
+        "message": {"content": "ok"},
+        "prompt_eval_duration": 3_000_000_000,
+        "eval_duration": 5_000_000_000,
+    }
+    cache = LLMResponseCache(persist_path=tmp_path / "llm.pkl")
+    messages = [{"role": "user", "content": "hi"}]
+    cache.set_response(messages, ollama_reply, model="qwen")
+
+    profiler = Profiler(enabled=True)
+    with profiler.span("llm", "qwen") as span:
+        cached = cache.get_response(messages, model="qwen")
+        record_llm_phases(span, cached)
+    assert cached["message"] == {"content": "ok"}
+    assert "eval_duration" not in cached and "llm.prefill" not in profiler.summary()["categories"]
+
+    # Timings from elsewhere can never exceed the span they are booked under.
+    with profiler.span("llm", "qwen") as span:
+        record_llm_phases(span, ollama_reply)
+    categories = profiler.summary()["categories"]
+    booked = sum(categories.get(f"llm.{phase}", {}).get("total_seconds", 0) for phase in ("load", "prefill", "generation", "queue"))
+    assert booked <= categories["llm"]["total_seconds"] + 1e-5 < 1
+
+
+def test_write_emits_folded_and_summary(tmp_path):
+    profiler = Profiler(enabled=True)
+    profiler.set_phase("planning")
+    with profiler.span("verification", "edit"):
+        time.sleep(0.002)
+    profiler.set_phase(None)
+
+    paths = profiler.write(tmp_path, run_id="run1")
+    assert paths["folded"].read_text().startswith("phase:planning;verification:edit ")
+    summary = json.loads(paths["summary"].read_text())
+    assert summary["phases"]["planning"] > 0
+    assert "verification" in Profiler.format_summary(summary)
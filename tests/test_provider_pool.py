@@ -0,0 +1,174 @@
+import threading
+
+import pytest
+
+from rev.llm import provider_factory
+from rev.llm.provider_pool import ProviderPool
+from rev.llm.providers.base import ErrorClass, LLMProvider, ProviderError, RetryConfig
+
+
+class FakeProvider(LLMProvider):
+    def __init__(self, label, fail=None, healthy=True, gate=None):
+        super().__init__()
+        self.name = "fake"
+        self.base_url = label
+        self.fail = fail
+        self.healthy = healthy
+        self.gate = gate
+        self.calls = 0
+
+    def chat(self, messages, tools=None, model=None, supports_tools=True, **kwargs):
+        self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.fail:
+            return {"error": self.fail}
+        return {"message": {"role": "assistant", "content": self.base_url}}
+
+    def chat_stream(self, messages, tools=None, model=None, supports_tools=True, on_chunk=None,
+                    check_interrupt=None, check_user_messages=None, **kwargs):
+        return self.chat(messages, tools=tools, model=model)
+
+    def supports_tool_calling(self, model):
+        return True
+
+    def validate_config(self):
+        return self.healthy
+
+    def get_model_list(self):
+        return [f"model-{self.base_url}", "shared"]
+
+    def count_tokens(self, messages):
+        return 1
+
+    def classify_error(self, error):
+        retryable = "connection" in str(error).lower()
+        error_class = ErrorClass.NETWORK_ERROR if retryable else ErrorClass.INVALID_REQUEST
+        return ProviderError(error_class=error_class, message=str(error), retryable=retryable)
+
+    def get_retry_config(self):
+        return RetryConfig(max_retries=2, base_backoff=0.0, max_backoff=0.0)
+
+
+def _content(result):
+    return result["message"]["content"]
+
+
+def test_pool_spreads_concurrent_requests_by_outstanding_count():
+    gate = threading.Event()
+    a, b = FakeProvider("a", gate=gate), FakeProvider("b", gate=gate)
+    pool = ProviderPool([a, b])
+
+    threads = [threading.Thread(target=pool.chat, args=([{"role": "user", "content": "hi"}],)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    while sum(s["outstanding"] for s in pool.get_stats()) < 4:
+        pass
+    assert [s["outstanding"] for s in pool.get_stats()] == [2, 2]
+    gate.set()
+    for t in threads:
+        t.join()
+    assert a.calls == 2 and b.calls == 2
+    assert all(s["outstanding"] == 0 for s in pool.get_stats())
+
+
+def test_pool_fails_over_on_retryable_error_and_marks_endpoint_unhealthy():
+    down = FakeProvider("down", fail="Connection refused")
+    up = FakeProvider("up")
+    pool = ProviderPool([down, up], health_check_interval=3600)
+
+    assert _content(pool.chat([{"role": "user", "content": "hi"}])) == "up"
+    stats = {s["endpoint"]: s for s in pool.get_stats()}
+    assert stats["down"]["healthy"] is False
+    assert stats["down"]["failures"] == 1
+
+    # The unhealthy endpoint is skipped until it is re-probed.
+    pool.chat([{"role": "user", "content": "again"}])
+    assert down.calls == 1
+
+
+def test_pool_does_not_fail_over_on_non_retryable_error():
+    bad = FakeProvider("bad", fail="invalid request body")
+    other = FakeProvider("other")
+    pool = ProviderPool([bad, other])
+    result = pool.chat([{"role": "user", "content": "hi"}])
+    assert result == {"error": "invalid request body"}
+    assert other.calls == 0
+
+
+
+class MidStreamFailure(FakeProvider):
+    """Streams a chunk and a tool call, then the connection drops."""
+
+    def __init__(self, label, raise_error=False):
+        super().__init__(label)
+        self.raise_error = raise_error
+
+    def chat_stream(self, messages, tools=None, model=None, supports_tools=True, on_chunk=None,
+                    check_interrupt=None, check_user_messages=None, **kwargs):
+        self.calls += 1
+        on_chunk("partial ")
+        kwargs["on_tool_call"]({"function": {"name": "read_file", "arguments": {"path": "a.py"}}})
+        if self.raise_error:
+            raise ConnectionError("connection reset by peer")
+        return {"error": "connection reset by peer"}
+
+
+def test_pool_stream_does_not_fail_over_after_output_was_emitted():
+    for raise_error in (False, True):
+        chunks, calls = [], []
+        broken, other = MidStreamFailure("broken", raise_error=raise_error), FakeProvider("other")
+        pool = ProviderPool([broken, other])
+        stream = lambda: pool.chat_stream(  # noqa: E731
+            [{"role": "user", "content": "hi"}], on_chunk=chunks.append, on_tool_call=calls.append
+        )
+        if raise_error:
+            with pytest.raises(ConnectionError):
+                stream()
+        else:
+            assert stream() == {"error": "connection reset by peer"}
+        assert other.calls == 0
+        assert chunks == ["partial "] and len(calls) == 1
+
+    # Without anything emitted yet, a streaming failure still fails over.
+    pool = ProviderPool([FakeProvider("down", fail="Connection refused"), FakeProvider("up")])
+    assert _content(pool.chat_stream([{"role": "user", "content": "hi"}], on_chunk=chunks.append)) == "up"
+
+def test_pool_retries_rounds_with_backoff_then_gives_up():
+    sleeps = []
+    members = [FakeProvider("a", fail="connection reset"), FakeProvider("b", fail="connection reset")]
+    pool = ProviderPool(members, health_check_interval=0, sleep=sleeps.append)
+    result = pool.chat([{"role": "user", "content": "hi"}])
+    assert result["error"] == "connection reset"
+    assert [m.calls for m in members] == [2, 2]
+    assert sleeps == [0.0]
+
+
+def test_pool_reprobes_unhealthy_endpoint_via_validate_config():
+    flaky = FakeProvider("flaky", fail="connection refused")
+    pool = ProviderPool([flaky, FakeProvider("b")], health_check_interval=0)
+    pool.chat([{"role": "user", "content": "hi"}])
+    assert pool.get_stats()[0]["healthy"] is False
+
+    flaky.fail = None
+    pool.chat([{"role": "user", "content": "hi"}])
+    assert pool.get_stats()[0]["healthy"] is True
+
+
+def test_pool_validate_and_model_list_aggregate_members():
+    pool = ProviderPool([FakeProvider("a"), FakeProvider("b", healthy=False)])
+    assert pool.validate_config() is True
+    assert pool.get_model_list() == ["model-a", "shared"]
+
+
+def test_factory_builds_pool_from_base_urls(monkeypatch):
+    provider_factory.clear_provider_cache()
+    monkeypatch.setenv("OLLAMA_BASE_URLS", "http://h1:11434, http://h2:11434/")
+    try:
+        provider = provider_factory.get_provider("ollama")
+        assert isinstance(provider, ProviderPool)
+        assert [m.base_url for m in provider.members] == ["http://h1:11434", "http://h2:11434"]
+        assert all(m.max_attempts_override == 1 for m in provider.members)
+        assert provider.supports_streaming_tool_calls is True
+    finally:
+        provider_factory.clear_provider_cache()
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 """Tests for resilient tool executor."""
 
+import json
 import pytest
 import time
 import tempfile
@@ -326,6 +327,75 @@ class TestIdempotencyStore:
         assert store.get("key2") is None
         assert not storage_path.exists()
 
+    def test_store_evicts_least_recently_used(self):
+        """Store should keep at most max_entries results."""
+        store = IdempotencyStore(max_entries=2)
+
+        store.set("key1", ToolCallResult(success=True, idempotency_key="key1"))
+        store.set("key2", ToolCallResult(success=True, idempotency_key="key2"))
+        store.get("key1")
+        store.set("key3", ToolCallResult(success=True, idempotency_key="key3"))
+
+        assert store.get("key2") is None
+        assert store.get("key1") is not None
+        assert store.get("key3") is not None
+        assert len(store) == 2
+
+    def test_store_expires_old_results(self, temp_workspace, monkeypatch):
+        """Store should ignore results older than ttl_seconds, also after reload."""
+        import rev.tools.resilient_executor as resilient_executor
+
+        storage_path = temp_workspace / "idempotency.jsonl"
+        store = IdempotencyStore(storage_path=storage_path, ttl_seconds=60)
+        store.set("key1", ToolCallResult(success=True, idempotency_key="key1"))
+
+        now = time.time()
+        monkeypatch.setattr(resilient_executor.time, "time", lambda: now + 120)
+
+        assert store.get("key1") is None
+        assert IdempotencyStore(storage_path=storage_path, ttl_seconds=60).get("key1") is None
+
+    def test_store_appends_and_compacts_log(self, temp_workspace):
+        """Store should append one line per set and compact superseded lines."""
+        storage_path = temp_workspace / "idempotency.jsonl"
+        storage_path.write_text(json.dumps({"old": {"success": True}}, indent=2))
+        store = IdempotencyStore(storage_path=storage_path)
+        assert storage_path.read_text() == ""
+
+        for i in range(150):
+            store.set("key1", ToolCallResult(success=True, attempts=i, idempotency_key="key1"))
+        store.set("key2", ToolCallResult(success=False, error="boom", idempotency_key="key2"))
+
+        lines = storage_path.read_text().splitlines()
+        assert len(lines) < 150
+        assert json.loads(lines[-1])["key"] == "key2"
+
+        reloaded = IdempotencyStore(storage_path=storage_path)
+        assert reloaded.get("key1").attempts == 149
+        assert reloaded.get("key2").error == "boom"
+        assert len(storage_path.read_text().splitlines()) == 2
+
+    def test_store_concurrent_sets(self, temp_workspace):
+        """Store should handle sets from multiple threads."""
+        import threading
+
+        storage_path = temp_workspace / "idempotency.jsonl"
+        store = IdempotencyStore(storage_path=storage_path, max_entries=50)
+
+        def worker(n):
+            for i in range(100):
+                key = f"w{n}-{i}"
+                store.set(key, ToolCallResult(success=True, idempotency_key=key))
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(store) == 50
+        assert len(IdempotencyStore(storage_path=storage_path, max_entries=50)) == 50
+
 
 class TestResumeCapability:
     """Test resumable tool calls with checkpoints."""
@@ -0,0 +1,103 @@
+import json
+import threading
+
+import pytest
+
+from rev import config
+from rev.execution import researcher
+from rev.tools import file_ops
+from rev.tools.registry import execute_tool
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    (tmp_path / "auth.py").write_text(
+        "import token_store\n"
+        "class AuthManager:\n"
+        "    def login(self, user):\n"
+        "        return token_store.issue(user)\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "api.py").write_text("from auth import AuthManager\n\ndef api_login():\n    pass\n", encoding="utf-8")
+    old_root = config.ROOT
+    config.set_workspace_root(tmp_path)
+    yield tmp_path
+    config.set_workspace_root(old_root)
+
+
+def test_results_are_bucketed_per_pattern_in_one_pass(workspace, monkeypatch):
+    walks = []
+    original = file_ops._iter_files
+    monkeypatch.setattr(file_ops, "_iter_files", lambda *a, **k: walks.append(1) or original(*a, **k))
+
+    result = json.loads(file_ops.search_code_multi(["login", "AuthManager", "missing_xyz"]))
+
+    assert len(walks) == 1
+    login = result["results"]["login"]["matches"]
+    assert {(m["file"], m["line"]) for m in login} == {("auth.py", 3), ("api.py", 3)}
+    # A line matching several patterns lands in each bucket.
+    assert [m["file"] for m in result["results"]["AuthManager"]["matches"]] in (["auth.py", "api.py"], ["api.py", "auth.py"])
+    assert result["results"]["missing_xyz"] == {"matches": [], "truncated": False}
+    assert result["files_scanned"] == 2
+
+
+def test_literal_patterns_are_escaped_and_regex_is_opt_in(workspace):
+    literal = json.loads(file_ops.search_code_multi(["issue(user)"]))
+    assert literal["results"]["issue(user)"]["matches"][0]["line"] == 4
+
+    regex = json.loads(file_ops.search_code_multi([r"import.*token", r"def \w+_login"], regex=True))
+    assert regex["results"][r"import.*token"]["matches"][0]["text"] == "import token_store"
+    assert regex["results"][r"def \w+_login"]["matches"][0]["file"] == "api.py"
+
+    assert "error" in json.loads(file_ops.search_code_multi(["("], regex=True))
+    assert "error" in json.loads(file_ops.search_code_multi([]))
+
+
+def test_per_pattern_limit_truncates(workspace):
+    result = json.loads(file_ops.search_code_multi(["auth", "login"], max_matches_per_pattern=1))
+    assert len(result["results"]["auth"]["matches"]) == 1
+    assert result["results"]["auth"]["truncated"] is True
+
+
+def test_registered_as_tool(workspace):
+    result = json.loads(execute_tool("search_code_multi", {"patterns": ["AuthManager"]}))
+    assert len(result["results"]["AuthManager"]["matches"]) == 2
+
+
+def test_research_searches_each_phase_in_a_single_call(monkeypatch):
+    calls = []
+
+    def fake_execute_tool(name, args, agent_name=None):
+        calls.append((name, tuple(args.get("patterns", ()))))
+        return json.dumps({"results": {
+            p: {"matches": [{"file": f"{p}.py", "line": 1, "text": f"import {p}"}]} for p in args["patterns"]
+        }})
+
+    monkeypatch.setattr(researcher, "execute_tool", fake_execute_tool)
+    code = researcher._search_relevant_code(["alpha", "beta", "gamma"])
+    deps = researcher._analyze_dependencies(["alpha", "beta"])
+
+    assert [name for name, _ in calls] == ["search_code_multi", "search_code_multi"]
+    assert [f["path"] for f in code["files"]] == ["alpha.py", "beta.py", "gamma.py"]
+    assert deps["dependencies"] == ["import import.*alpha", "import import.*beta"]
+
+
+def test_research_steps_run_concurrently(monkeypatch):
+    monkeypatch.setattr(config, "RESEARCH_PARALLEL", True)
+    barrier = threading.Barrier(3, timeout=5)
+
+    def step(value):
+        barrier.wait()
+        return value
+
+    def failing():
+        barrier.wait()
+        raise ValueError("boom")
+
+    outcomes = researcher._run_research_steps([
+        ("a", lambda: step(1)),
+        ("b", lambda: step(2)),
+        ("c", failing),
+    ])
+    assert outcomes["a"] == 1 and outcomes["b"] == 2
+    assert isinstance(outcomes["c"], ValueError)
@@ -0,0 +1,93 @@
+import threading
+import time
+
+from rev import config
+from rev.execution import researcher
+from rev.retrieval import warmup as warmup_mod
+from rev.retrieval.context_builder import CodeCorpus
+from rev.retrieval.warmup import FAILED, READY, WarmupScheduler
+
+
+def test_higher_priority_tasks_run_first():
+    order = []
+    gate = threading.Event()
+    scheduler = WarmupScheduler(max_workers=1)
+    scheduler.add("blocker", gate.wait, priority=100)
+    scheduler.add("low", lambda: order.append("low"), priority=1)
+    scheduler.add("high", lambda: order.append("high"), priority=10)
+    scheduler.start()
+    try:
+        gate.set()
+        assert scheduler.wait_all(timeout=5)
+        assert order == ["high", "low"]
+    finally:
+        scheduler.shutdown()
+
+
+def test_result_degrades_while_running_and_reports_timings():
+    gate = threading.Event()
+    scheduler = WarmupScheduler(max_workers=2)
+    scheduler.add("slow", lambda: gate.wait() and "index")
+    scheduler.add("broken", lambda: 1 / 0)
+    scheduler.start()
+    try:
+        assert scheduler.result("slow", timeout=0.05, default="partial") == "partial"
+        assert scheduler.result("missing", timeout=0.05) is None
+        gate.set()
+        assert scheduler.result("slow", timeout=5) == "index"
+        assert scheduler.wait("broken", timeout=5) is False
+
+        timings = scheduler.get_timings()
+        assert timings["tasks"]["slow"]["status"] == READY
+        assert timings["tasks"]["broken"]["status"] == FAILED
+        assert "ZeroDivisionError" in timings["tasks"]["broken"]["error"]
+        assert timings["tasks"]["slow"]["duration_s"] >= 0
+        assert timings["wall_s"] is not None
+    finally:
+        scheduler.shutdown()
+
+
+def test_session_warmup_respects_config(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "WARMUP_ENABLED", False)
+    assert warmup_mod.start_session_warmup(tmp_path) is None
+    assert warmup_mod.get_warmup() is None
+
+
+def test_research_skips_rag_while_index_is_warming(monkeypatch):
+    gate = threading.Event()
+    scheduler = WarmupScheduler(max_workers=1)
+    scheduler.add("rag_index", gate.wait)
+    scheduler.start()
+    monkeypatch.setattr(researcher, "_RAG_RETRIEVER", None)
+    monkeypatch.setattr(researcher, "get_warmup", lambda: scheduler)
+    monkeypatch.setattr(config, "WARMUP_WAIT_TIMEOUT", 0.05)
+    try:
+        started = time.monotonic()
+        assert researcher.get_rag_retriever() is None
+        assert time.monotonic() - started < 2
+    finally:
+        gate.set()
+        scheduler.shutdown()
+
+
+def test_concurrent_corpus_builds_index_once(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "CACHE_DIR", tmp_path / "cache")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "mod.py").write_text("def warm():\n    return 1\n", encoding="utf-8")
+    corpus = CodeCorpus(tmp_path / "src")
+    walks = []
+    original = corpus._iter_files
+
+    def counting_iter():
+        walks.append(1)
+        time.sleep(0.1)
+        return original()
+
+    monkeypatch.setattr(corpus, "_iter_files", counting_iter)
+    threads = [threading.Thread(target=corpus.build) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    assert len(walks) == 1
+    assert corpus.query("warm", k=1)
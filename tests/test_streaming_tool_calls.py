@@ -0,0 +1,166 @@
+import json
+import threading
+from unittest.mock import patch
+
+import rev.llm.client as client
+from rev.execution.streaming import StreamingToolPrefetcher
+import rev.llm.tool_call_parser as tool_call_parser
+from rev.llm.tool_call_parser import IncrementalToolCallParser
+
+
+def _call(name, **args):
+    return {"function": {"name": name, "arguments": json.dumps(args)}}
+
+
+def test_incremental_parser_emits_each_call_when_block_closes():
+    text = (
+        "Looking around.\n```json\n"
+        '{"name": "read_file", "arguments": {"path": "a.py"}}\n'
+        "```\nNext "
+        '{"tool_name": "list_dir", "arguments": {"path": "."}} and '
+        "<tool_call><search_code><pattern>foo</pattern></search_code></tool_call> done"
+    )
+    parser = IncrementalToolCallParser()
+    emitted_at = []
+    for i in range(0, len(text), 5):
+        for call in parser.feed(text[i:i + 5]):
+            emitted_at.append((call["function"]["name"], i + 5))
+
+    names = [name for name, _ in emitted_at]
+    assert names == ["read_file", "list_dir", "search_code"]
+    # The first call is emitted well before the stream finishes.
+    assert emitted_at[0][1] < len(text) // 2
+
+
+def test_incremental_parser_dedupes_native_and_text_calls():
+    parser = IncrementalToolCallParser()
+    native = {"function": {"name": "read_file", "arguments": {"path": "a.py"}}}
+    assert parser.feed_native([native]) == [native]
+    assert parser.feed('{"name": "read_file", "arguments": {"path": "a.py"}}') == []
+
+
+def test_incremental_parser_finds_close_tag_split_across_chunks():
+    parser = IncrementalToolCallParser()
+    chunks = ["<tool_call><read_file><path>a.py</path>", "</read_file>", " " * 40 + "</tool", "_ca", "ll> tail"]
+    results = [parser.feed(chunk) for chunk in chunks]
+
+    assert results[:4] == [[], [], [], []]
+    assert [call["function"]["name"] for call in results[4]] == ["read_file"]
+
+
+def test_incremental_parser_scans_large_inline_json_linearly(monkeypatch):
+    content = "".join(f'line {i} with {{braces}} and \\"quotes\\"\\n' for i in range(600))
+    text = "Writing now " + json.dumps({"name": "write_file", "arguments": {"path": "big.txt", "content": content}})
+    scanned = []
+    original = tool_call_parser._find_json_object_end
+
+    def counting_scan(buf, start, *args):
+        scanned.append(len(buf) - start)
+        return original(buf, start, *args)
+
+    monkeypatch.setattr(tool_call_parser, "_find_json_object_end", counting_scan)
+    parser = IncrementalToolCallParser()
+    calls = []
+    for i in range(0, len(text), 4):
+        calls.extend(parser.feed(text[i:i + 4]))
+
+    assert len(text) > 24 * 1024
+    assert [call["function"]["name"] for call in calls] == ["write_file"]
+    assert json.loads(calls[0]["function"]["arguments"])["content"] == content
+    # Each character of the pending object is scanned about once.
+    assert sum(scanned) <= 2 * len(text)
+
+
+def test_incremental_parser_ignores_braces_in_prose():
+    parser = IncrementalToolCallParser()
+    assert parser.feed("a dict like {x: 1} is not a tool call") == []
+
+
+def test_prefetcher_runs_read_only_calls_and_serves_results():
+    calls = []
+
+    def execute(name, args):
+        calls.append((name, args))
+        return f"result:{args['path']}"
+
+    prefetcher = StreamingToolPrefetcher(execute, allowed_tools={"read_file"})
+    assert prefetcher.submit(_call("read_file", path="a.py")) is True
+    assert prefetcher.submit(_call("read_file", path="a.py")) is False
+    assert prefetcher.take("read_file", {"path": "a.py"}, timeout=5) == "result:a.py"
+    assert prefetcher.take("read_file", {"path": "a.py"}) is None
+    prefetcher.shutdown()
+    assert calls == [("read_file", {"path": "a.py"})]
+
+
+def test_prefetcher_stops_after_write_call():
+    prefetcher = StreamingToolPrefetcher(lambda name, args: "ok", allowed_tools={"read_file"})
+    assert prefetcher.submit(_call("write_file", path="a.py", content="x")) is False
+    assert prefetcher.submit(_call("read_file", path="a.py")) is False
+    prefetcher.shutdown()
+
+
+def test_prefetcher_respects_budget_and_admit_check():
+    prefetcher = StreamingToolPrefetcher(
+        lambda name, args: "ok",
+        allowed_tools={"read_file", "list_dir"},
+        budget={"read_file": 1},
+        admit=lambda name, args: args.get("path") != "secret",
+    )
+    assert prefetcher.submit(_call("read_file", path="a.py")) is True
+    assert prefetcher.submit(_call("read_file", path="b.py")) is False
+    assert prefetcher.submit(_call("list_dir", path="secret")) is False
+    assert prefetcher.submit(_call("list_dir", path=".")) is True
+    prefetcher.shutdown()
+
+
+def test_prefetcher_invalidate_discards_reads_started_before_a_write():
+    started, release = threading.Event(), threading.Event()
+    finished = []
+
+    def execute(name, args):
+        started.set()
+        release.wait(5)
+        finished.append(args["path"])
+        return "stale"
+
+    prefetcher = StreamingToolPrefetcher(execute, allowed_tools={"read_file"})
+    assert prefetcher.submit(_call("read_file", path="a.py")) is True
+    assert started.wait(5)
+    # The final call list has a write the stream parser never saw.
+    assert prefetcher.can_prefetch("write_file") is False
+    threading.Timer(0.05, release.set).start()
+    prefetcher.invalidate()
+    assert finished == ["a.py"]
+    assert prefetcher.take("read_file", {"path": "a.py"}) is None
+    prefetcher.shutdown()
+
+
+def test_ollama_chat_stream_dispatches_tool_calls_before_completion():
+    seen_before_done = []
+    done = threading.Event()
+
+    class FakeProvider:
+        supports_streaming_tool_calls = True
+
+        def chat_stream(self, messages, tools=None, model=None, supports_tools=True,
+                        on_chunk=None, check_interrupt=None, check_user_messages=None, **kwargs):
+            kwargs["on_tool_call"]({"function": {"name": "list_dir", "arguments": {"path": "."}}})
+            on_chunk('{"name": "read_file", "arguments": {"path": "a.py"}}')
+            on_chunk(" trailing prose")
+            done.set()
+            return {"message": {"role": "assistant", "content": "done"}, "usage": {"prompt": 1, "completion": 1}}
+
+    def on_tool_call(call):
+        seen_before_done.append((call["function"]["name"], done.is_set()))
+
+    with patch("rev.llm.client.get_provider_for_model", return_value=FakeProvider()), patch.object(
+        client.config, "LLM_THINKING_MODE", "off"
+    ):
+        result = client.ollama_chat_stream(
+            [{"role": "user", "content": "hi"}],
+            tools=[{"type": "function", "function": {"name": "read_file"}}],
+            on_tool_call=on_tool_call,
+        )
+
+    assert "error" not in result
+    assert seen_before_done == [("list_dir", False), ("read_file", False)]
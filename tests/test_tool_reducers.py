@@ -0,0 +1,130 @@
+import json
+
+from rev.execution.compression_policy import ToolCompressionPolicy
+from rev.execution.tool_reducers import reduce_tool_output, task_paths
+from rev.models.task import Task
+
+
+PYTEST_OUTPUT = """..F.                                                                     [100%]
+=================================== FAILURES ===================================
+__________________________________ test_add ___________________________________
+
+    def test_add():
+>       assert add(1, 2) == 4
+E       assert 3 == 4
+
+tests/test_math.py:5: AssertionError
+----------------------------- Captured stdout call -----------------------------
+debug noise
+=========================== short test summary info ============================
+FAILED tests/test_math.py::test_add - assert 3 == 4
+1 failed, 3 passed in 0.05s
+"""
+
+JEST_OUTPUT = """FAIL src/sum.test.js
+  ● sum › adds numbers
+
+    expect(received).toBe(expected)
+
+    Expected: 4
+    Received: 3
+
+    > 4 |   expect(sum(1, 2)).toBe(4);
+        |                     ^
+
+      at Object.<anonymous> (src/sum.test.js:4:21)
+
+PASS src/other.test.js
+
+Test Suites: 1 failed, 1 passed, 2 total
+Tests:       1 failed, 2 passed, 3 total
+"""
+
+DIFF = """diff --git a/rev/app.py b/rev/app.py
+index 1111111..2222222 100644
+--- a/rev/app.py
++++ b/rev/app.py
+@@ -1,2 +1,2 @@
+-x = 1
++x = 2
+ y = 3
+diff --git a/docs/notes.md b/docs/notes.md
+index 3333333..4444444 100644
+--- a/docs/notes.md
++++ b/docs/notes.md
+@@ -1 +1 @@
+-old
++new
+"""
+
+
+def test_test_runner_output_is_reduced_to_failures_and_summary():
+    reduced = reduce_tool_output("run_tests", json.dumps({"rc": 1, "stdout": PYTEST_OUTPUT, "stderr": "", "cmd": "pytest -q"}))
+    assert reduced.splitlines() == [
+        "rc=1 cmd: pytest -q",
+        "pytest: 1 failed, 3 passed in 0.05s",
+        "FAILED tests/test_math.py::test_add - assert 3 == 4",
+        "",
+        "test_add (tests/test_math.py:5: AssertionError)",
+        ">       assert add(1, 2) == 4",
+        "E       assert 3 == 4",
+    ]
+
+    reduced = reduce_tool_output("run_cmd", json.dumps({"rc": 1, "stdout": "", "stderr": JEST_OUTPUT}), {"cmd": "npx jest"})
+    lines = reduced.splitlines()
+    assert lines[1] == "jest: Test Suites: 1 failed, 1 passed, 2 total | Tests: 1 failed, 2 passed, 3 total"
+    assert "FAIL src/sum.test.js" in lines and "● sum › adds numbers" in lines
+    assert "  Received: 3" in lines and not any("|" in line for line in lines[2:])
+
+    # Unrecognized output is left to the policy's default handling.
+    assert reduce_tool_output("run_cmd", json.dumps({"rc": 0, "stdout": "hello", "stderr": ""})) is None
+
+
+def test_search_and_listing_are_grouped():
+    matches = [
+        {"file": "a.py", "line": 1, "text": "import os"},
+        {"file": "b.py", "line": 3, "text": "x = os.path"},
+        {"file": "a.py", "line": 9, "text": "    import os"},
+    ]
+    reduced = reduce_tool_output("search_code", json.dumps({"matches": matches, "truncated": True}))
+    assert reduced.splitlines() == ["3 matches in 2 files (truncated)", "a.py:", "  1,9: import os", "b.py:", "  3: x = os.path"]
+
+    files = ["README.md", "rev", "rev-tools/cli.py", "rev/a.py", "rev/b.py", "rev/sub", "rev/sub/c.py"]
+    reduced = reduce_tool_output("list_dir", json.dumps({"count": len(files), "files": files}))
+    assert reduced.splitlines() == ["7 entries", "README.md", "rev/", "  a.py, b.py", "  sub/", "    c.py", "rev-tools/", "  cli.py"]
+
+
+def test_git_diff_keeps_hunks_for_task_paths():
+    task = Task("Fix the default in rev/app.py", "edit")
+    paths = task_paths(task)
+    assert paths == ["rev/app.py"]
+
+    reduced = reduce_tool_output("git_diff", json.dumps({"rc": 0, "diff": DIFF, "stderr": ""}), paths=paths)
+    assert "+x = 2" in reduced and "+new" not in reduced
+    assert reduced.splitlines()[-1] == "other files: docs/notes.md (+1 -1, 1 hunks)"
+
+    unscoped = reduce_tool_output("git_diff", json.dumps({"rc": 0, "diff": DIFF, "stderr": ""}))
+    assert "+x = 2" in unscoped and "+new" in unscoped
+
+
+def test_policy_prefers_reducers_and_can_disable_them(monkeypatch):
+    output = json.dumps({"count": 2, "files": ["a.py", "b.py"]})
+    decision = ToolCompressionPolicy().decide("list_dir", output)
+    assert decision.compress and decision.reason == "reduced"
+    assert decision.reduced_content == "2 entries\na.py, b.py"
+
+    monkeypatch.setenv("REV_TOOL_OUTPUT_REDUCERS", "0")
+    assert ToolCompressionPolicy().decide("list_dir", output).reason == "default_inline"
+
+
+def test_banner_output_from_other_tools_is_not_treated_as_pytest():
+    build_output = "\n".join([
+        "> app@1.0.0 build",
+        "> tsc && vite build",
+        "=============== Build started ===============",
+        "src/main.ts(12,5): error TS2322: Type 'string' is not assignable to type 'number'.",
+        "=============== Build failed ===============",
+    ])
+    payload = {"rc": 1, "stdout": build_output, "stderr": "", "cmd": "npm run build"}
+
+    assert reduce_tool_output("run_cmd", json.dumps(payload), {"cmd": "npm run build"}) is None
@@ -0,0 +1,125 @@
+import threading
+from unittest.mock import patch
+
+import rev.llm.client as client
+from rev import config
+from rev.llm.client import get_token_usage, reset_token_usage
+from rev.tools.registry import get_available_tools
+from rev.tools.tool_selection import (
+    ToolSchemaSelector,
+    get_tool_selector,
+    reset_tool_selector,
+    select_tools_for_action,
+)
+
+
+def _names(tools):
+    return {t["function"]["name"] for t in tools}
+
+
+def test_write_action_subset_is_smaller_than_catalogue():
+    universe = get_available_tools()
+    selector = ToolSchemaSelector(universe)
+    subset = selector.select("edit")
+
+    assert "replace_in_file" in subset.names
+    assert "read_file" in subset.names
+    assert "ssh_connect" not in subset.names
+    assert 0 < subset.tokens < subset.full_tokens
+    assert subset.tokens_saved == subset.full_tokens - subset.tokens
+
+
+def test_unprofiled_action_gets_full_catalogue():
+    universe = get_available_tools()
+    subset = ToolSchemaSelector(universe).select("tool")
+    assert set(subset.names) == _names(universe)
+    assert subset.tokens_saved == 0
+
+
+def test_subsets_are_cached_as_stable_objects():
+    selector = ToolSchemaSelector(get_available_tools())
+    first = selector.select("test", agent_name="executor", query="run pytest")
+    second = selector.select("test", agent_name="executor", query="run pytest")
+    assert first is second
+    assert first.schemas is second.schemas
+
+
+def test_query_extras_add_relevant_tools():
+    selector = ToolSchemaSelector(get_available_tools())
+    subset = selector.select("test", query="scan dependencies for vulnerabilities")
+    assert "check_dependency_vulnerabilities" in subset.names
+
+
+def test_select_respects_disable_flag(monkeypatch):
+    reset_tool_selector()
+    universe = get_available_tools()
+    monkeypatch.setattr(config, "TOOL_SCHEMA_PRUNING_ENABLED", False)
+    assert _names(select_tools_for_action("edit", tool_universe=universe)) == _names(universe)
+
+
+def test_select_falls_back_when_profile_misses_universe():
+    reset_tool_selector()
+    universe = [{"type": "function", "function": {"name": "custom_tool", "parameters": {}}}]
+    assert _names(select_tools_for_action("edit", tool_universe=universe)) == {"custom_tool"}
+
+
+def test_usage_reports_tool_schema_savings():
+    reset_tool_selector()
+    reset_token_usage()
+    cache = client.get_llm_cache()
+    if cache:
+        cache.clear()
+
+    universe = get_available_tools()
+    get_tool_selector(universe)
+    tools = select_tools_for_action("edit", tool_universe=universe)
+    reply = {"message": {"content": "ok"}, "usage": {"prompt": 10, "completion": 2}}
+    with patch("rev.llm.client.get_provider_for_model"), patch(
+        "rev.llm.client._call_with_auto_thinking", return_value=reply
+    ):
+        result = client.ollama_chat([{"role": "user", "content": "schema savings"}], tools=tools)
+
+    usage = get_token_usage()
+    assert result["usage"]["tool_schema_tokens_saved"] > 0
+    assert usage["tool_schema_tokens_saved"] == result["usage"]["tool_schema_tokens_saved"]
+    assert usage["tool_schema_tokens"] == result["usage"]["tool_schema_tokens"]
+
+
+def test_savings_are_measured_against_the_agents_own_tool_set():
+    reset_tool_selector()
+    catalogue = get_available_tools()
+    get_tool_selector(catalogue)
+    agent_tools = [t for t in catalogue if t["function"]["name"] in {"read_file", "list_dir", "run_cmd", "git_log"}]
+    tools = select_tools_for_action("test", tool_universe=agent_tools)
+
+    agent_selector = get_tool_selector(agent_tools)
+    sent, saved = client._tool_schema_usage(tools)
+    assert sent == agent_selector.estimate_tokens(tools)
+    assert saved == agent_selector.full_tokens - sent > 0
+    # Lists that were not pruned by a selector report no savings.
+    assert client._tool_schema_usage(list(agent_tools))[1] == 0
+
+
+def test_corpus_query_runs_outside_the_selector_lock():
+    selector = ToolSchemaSelector(get_available_tools())
+    selector.select("test", query="warm up the corpus")
+    entered, release = threading.Event(), threading.Event()
+    original_query = selector._corpus.query
+
+    def slow_query(*args, **kwargs):
+        entered.set()
+        release.wait(5)
+        return original_query(*args, **kwargs)
+
+    selector._corpus.query = slow_query
+    worker = threading.Thread(target=selector.select, args=("test",), kwargs={"query": "run pytest"})
+    worker.start()
+    try:
+        assert entered.wait(5)
+        # The blocked query must not stall cache inserts from other callers.
+        assert selector._lock.acquire(timeout=1)
+        selector._lock.release()
+        assert "replace_in_file" in selector.select("edit").names
+    finally:
+        release.set()
+        worker.join(5)
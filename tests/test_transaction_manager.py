@@ -567,3 +567,96 @@ class TestRollbackScenarios:
         transaction_manager.abort()
 
         assert nested_file.read_text() == "original"
+
+
+class TestBlobBackups:
+    """Test content-addressed, deduplicated file backups."""
+
+    def test_unchanged_file_is_stored_once_across_transactions(self, transaction_manager, temp_workspace):
+        """Should reuse the blob of an unchanged file in later transactions."""
+        (temp_workspace / "big.bin").write_bytes(b"x" * 100_000)
+
+        for _ in range(2):
+            tx = transaction_manager.begin(rollback_method=RollbackMethod.FILE_RESTORE)
+            transaction_manager.record_action("edit", {}, ["big.bin"])
+            backup_file = Path(tx.rollback_data["backup_dir"]) / "big.bin"
+            assert backup_file.read_bytes() == b"x" * 100_000
+            transaction_manager.commit()
+
+        blobs = list((temp_workspace / ".rev" / "tx_backups" / "blobs").glob("*/*"))
+        assert len(blobs) == 1
+        assert blobs[0].read_bytes() == b"x" * 100_000
+
+    def test_rollback_restores_content_from_before_transaction(self, transaction_manager, temp_workspace):
+        """Should keep the first backup when a file is touched by several actions."""
+        test_file = temp_workspace / "test.txt"
+        test_file.write_text("original")
+
+        transaction_manager.begin(rollback_method=RollbackMethod.FILE_RESTORE)
+        transaction_manager.record_action("edit", {}, ["test.txt"])
+        test_file.write_text("first edit")
+        transaction_manager.record_action("edit", {}, ["test.txt"])
+        test_file.write_text("second edit")
+
+        transaction_manager.abort()
+
+        assert test_file.read_text() == "original"
+
+
+class TestGitRollback:
+    """Test git checkout rollback."""
+
+    def test_rollback_checks_out_files_in_one_command(self, transaction_manager, monkeypatch):
+        """Should restore all affected files with a single git checkout."""
+        import rev.execution.transaction_manager as tm
+
+        calls = []
+
+        def fake_run(cmd, **kwargs):
+            calls.append(cmd)
+            return {"rc": 0, "stdout": "abc123\n"}
+
+        monkeypatch.setattr(tm, "run_command_safe", fake_run)
+        transaction_manager.begin(rollback_method=RollbackMethod.GIT_CHECKOUT)
+        transaction_manager.record_action("edit", {}, ["b.py", "a.py"])
+        transaction_manager.record_action("edit", {}, ["a.py"])
+        transaction_manager.abort()
+
+        assert calls[-1] == ["git", "checkout", "abc123", "--", "a.py", "b.py"]
+        assert len(calls) == 2  # rev-parse + one checkout
+
+
+class TestLogIndex:
+    """Test the offset index over the transaction log."""
+
+    def test_lookup_uses_persisted_index(self, transaction_manager, temp_workspace):
+        """Should find transactions by id from a fresh manager via the index file."""
+        ids = []
+        for i in range(3):
+            ids.append(transaction_manager.begin(task_id=f"task-{i}").tx_id)
+            transaction_manager.commit()
+
+        index_file = transaction_manager.log_file.with_name("transactions.jsonl.idx")
+        assert len(index_file.read_text().splitlines()) == 6
+
+        fresh = TransactionManager(temp_workspace, transaction_manager.log_file)
+        tx = fresh.get_transaction_by_id(ids[1])
+        assert tx.task_id == "task-1"
+        assert tx.status == TransactionStatus.COMMITTED
+        assert [t.tx_id for t in fresh.get_transaction_history(limit=2)] == [ids[2], ids[1]]
+
+    def test_index_catches_up_and_rebuilds(self, transaction_manager, temp_workspace):
+        """Should index records written elsewhere and rebuild a stale index."""
+        tx1 = transaction_manager.begin(task_id="task-001")
+        transaction_manager.commit()
+
+        other = Transaction(tx_id="tx_external", task_id="task-x", status=TransactionStatus.COMMITTED)
+        with open(transaction_manager.log_file, "a") as f:
+            f.write(json.dumps(other.to_dict()) + "\n")
+
+        assert transaction_manager.get_transaction_by_id("tx_external").task_id == "task-x"
+
+        transaction_manager.log_file.write_text(json.dumps(other.to_dict()) + "\n")
+        fresh = TransactionManager(temp_workspace, transaction_manager.log_file)
+        assert [t.tx_id for t in fresh.get_transaction_history()] == ["tx_external"]
+        assert fresh.get_transaction_by_id(tx1.tx_id) is None
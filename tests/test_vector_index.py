@@ -0,0 +1,105 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from rev import config
+from rev.retrieval.vector_index import HashedEmbedder, VectorCodeRetriever, split_identifier, top_indices
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    previous = config.ROOT
+    config.set_workspace_root(tmp_path, allow_external=True)
+    (tmp_path / "billing.py").write_text(
+        "def computeInvoiceTotal(line_items):\n    return sum(item.amount for item in line_items)\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "users.py").write_text(
+        "def load_user_profile(user_id):\n    return database.fetch(user_id)\n", encoding="utf-8"
+    )
+    (tmp_path / "notes.md").write_text("# Notes\nInvoices are generated monthly.\n", encoding="utf-8")
+    yield tmp_path
+    config.set_workspace_root(previous, allow_external=True)
+
+
+def test_split_identifier_and_embedding_shape():
+    assert split_identifier("parseHTTPResponse_body2") == ["parse", "http", "response", "body", "2"]
+    matrix = HashedEmbedder(dim=64).embed(["compute_invoice_total", "computeInvoiceTotal", ""])
+    assert matrix.shape == (3, 64) and matrix.dtype == np.float32
+    assert np.allclose(np.linalg.norm(matrix[:2], axis=1), 1.0)
+    assert not matrix[2].any()
+    # snake_case and camelCase spellings share every word feature.
+    assert float(matrix[0] @ matrix[1]) > 0.9
+
+
+def test_top_indices_orders_and_skips_filtered():
+    scores = np.array([0.1, 0.9, -np.inf, 0.5, 0.7], dtype=np.float32)
+    assert top_indices(scores, 2).tolist() == [1, 4]
+    assert top_indices(scores, 10).tolist() == [1, 4, 3, 0]
+    assert top_indices(scores, 0).tolist() == []
+
+
+def test_vector_retriever_matches_split_words_and_filters(workspace):
+    retriever = VectorCodeRetriever(workspace, chunk_size=10, embedder=HashedEmbedder(dim=256), verbose=False)
+    retriever.build_index()
+
+    # The lexical tokenizer keeps "computeInvoiceTotal" whole, so it finds nothing here.
+    assert retriever.lexical.query("compute invoice total", k=3) == []
+    results = retriever.query("compute invoice total", k=2)
+    assert results[0].path == "billing.py"
+    assert results[0].score > 0
+    assert retriever.chunks[0].score == 0.0  # results are copies
+
+    filtered = retriever.query("invoice", k=3, filters={"language": "python"})
+    assert all(chunk.path.endswith(".py") for chunk in filtered)
+    batch = retriever.search(["user profile", "invoices monthly"], k=1, fusion_weight=1.0)
+    assert [hits[0].path for hits in batch] == ["users.py", "notes.md"]
+
+
+def test_vector_index_is_persisted_and_reopened_as_memmap(workspace):
+    embedder = HashedEmbedder(dim=128)
+    first = VectorCodeRetriever(workspace, chunk_size=10, embedder=embedder, verbose=False)
+    first.build_index()
+    data_path, meta_path = first._cache_paths()
+    assert data_path.stat().st_size == len(first.chunks) * 128 * 4 and meta_path.exists()
+
+    second = VectorCodeRetriever(workspace, chunk_size=10, embedder=embedder, verbose=False)
+    second.build_index()
+    assert isinstance(second._matrix, np.memmap)
+    assert np.array_equal(np.asarray(second._matrix), np.asarray(first._matrix))
+
+    (workspace / "users.py").write_text("def delete_account(account_id):\n    pass\n", encoding="utf-8")
+    third = VectorCodeRetriever(workspace, chunk_size=10, embedder=embedder, verbose=False)
+    third.build_index()
+    assert third.query("delete account", k=1)[0].path == "users.py"
+
+
+def test_retrieval_package_does_not_import_vector_index_eagerly():
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, rev.retrieval as r; r.SimpleCodeRetriever; "
+        "assert 'rev.retrieval.vector_index' not in sys.modules; "
+        "r.VectorCodeRetriever; assert 'rev.retrieval.vector_index' in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_rag_search_uses_fused_vector_retrieval_when_enabled(workspace, monkeypatch):
+    import json
+
+    from rev.retrieval import SimpleCodeRetriever, create_code_retriever
+    from rev.tools.registry import rag_search
+
+    monkeypatch.chdir(workspace)
+    assert type(create_code_retriever(workspace, verbose=False)) is SimpleCodeRetriever
+    monkeypatch.setattr(config, "VECTOR_RETRIEVAL_ENABLED", True)
+    monkeypatch.setattr(config, "VECTOR_FUSION_WEIGHT", 0.5)
+    retriever = create_code_retriever(workspace, verbose=False)
+    assert isinstance(retriever, VectorCodeRetriever) and retriever.fusion_weight == 0.5
+
+    # Only the vector side splits camelCase, so a hit here comes from the fused ranking.
+    result = json.loads(rag_search("compute invoice total", k=2))
+    assert result["success"] is True
+    assert result["results"][0]["location"].startswith("billing.py")
@@ -0,0 +1 @@
+function hello() { return 'hello'; }
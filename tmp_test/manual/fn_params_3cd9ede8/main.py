@@ -0,0 +1,4 @@
+def foo(a, added = None):
+    return a
+
+foo(a=1)
@@ -0,0 +1 @@
+class Breakout: pass
@@ -0,0 +1,8 @@
+def foo(**kwargs):
+    return kwargs
+
+def bar(**kwargs):
+    return kwargs
+
+x = foo(new=1, keep=2)
+y = bar(old=3)
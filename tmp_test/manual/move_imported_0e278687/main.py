@@ -0,0 +1,8 @@
+from old.mod import (
+    B,
+)
+from new.mod import (
+    A,
+    )
+
+A(); B()
@@ -0,0 +1 @@
+API_KEY = 'sk-1234567890abcdef'
@@ -0,0 +1 @@
+x = 1
\ No newline at end of file
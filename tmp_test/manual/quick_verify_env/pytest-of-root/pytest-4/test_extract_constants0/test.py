@@ -0,0 +1,3 @@
+x = 42
+y = 100
+z = 999
@@ -0,0 +1,2 @@
+def fixed_function():
+    return True
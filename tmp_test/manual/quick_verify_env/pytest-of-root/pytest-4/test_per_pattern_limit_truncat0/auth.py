@@ -0,0 +1,4 @@
+import token_store
+class AuthManager:
+    def login(self, user):
+        return token_store.issue(user)
@@ -0,0 +1,4 @@
+from auth import AuthManager
+
+def api_login():
+    pass
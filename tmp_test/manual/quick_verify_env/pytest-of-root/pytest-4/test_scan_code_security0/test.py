@@ -0,0 +1 @@
+password = 'hardcoded123'
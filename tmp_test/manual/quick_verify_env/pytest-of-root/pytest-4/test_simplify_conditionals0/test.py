@@ -0,0 +1,4 @@
+if True:
+    x = 1
+if False:
+    y = 2
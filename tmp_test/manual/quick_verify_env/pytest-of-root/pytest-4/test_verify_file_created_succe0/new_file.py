@@ -0,0 +1 @@
+content
\ No newline at end of file
@@ -0,0 +1,2 @@
+def foo(
+    # Missing closing paren
@@ -0,0 +1,4 @@
+from auth import login
+
+def handler():
+    pass
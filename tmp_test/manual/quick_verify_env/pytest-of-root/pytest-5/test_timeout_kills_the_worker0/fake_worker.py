@@ -0,0 +1,5 @@
+import json, os, sys, time
+spec = json.load(open(sys.argv[1]))
+time.sleep(float(os.environ.get('FAKE_WORKER_SLEEP', '0')))
+open(os.path.join(spec['workspace'], 'greet.py'), 'w').write('def greet(name):\n    return f"Hello, {name}"\n')
+json.dump({'agent_success': True, 'llm_calls': 3, 'features': spec['features'], 'tokens': {'total': 42}}, open(spec['result_path'], 'w'))
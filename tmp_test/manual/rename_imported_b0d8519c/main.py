@@ -0,0 +1,5 @@
+from pkg.mod import New
+from pkg.mod import Aliased as Local
+
+New()
+Local()
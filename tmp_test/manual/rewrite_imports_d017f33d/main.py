@@ -0,0 +1,5 @@
+import lib.analysts  # c1
+import lib.analysts.foo as foo
+from lib.analysts import A, B as Bee  # c2
+from lib.analysts.foo import Bar
+from other import X
@@ -0,0 +1,4 @@
+from lib.analysts import (
+    A,
+    B,  # trailing
+)
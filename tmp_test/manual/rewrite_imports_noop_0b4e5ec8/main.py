@@ -0,0 +1 @@
+from something_else import A
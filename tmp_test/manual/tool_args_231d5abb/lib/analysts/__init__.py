@@ -0,0 +1,8 @@
+
+
+# Auto-generated exports
+from .A import A
+
+__all__ = [
+    'A',
+]
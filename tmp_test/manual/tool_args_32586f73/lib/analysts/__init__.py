@@ -0,0 +1 @@
+# ok
@@ -0,0 +1 @@
+class A: pass
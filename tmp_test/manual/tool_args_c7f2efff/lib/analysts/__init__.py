@@ -0,0 +1,10 @@
+
+
+# Auto-generated exports
+from .A import A
+from .B import B
+
+__all__ = [
+    'A',
+    'B',
+]
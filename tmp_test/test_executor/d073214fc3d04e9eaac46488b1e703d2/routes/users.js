@@ -0,0 +1 @@
+module.exports = {};
\ No newline at end of file
@@ -0,0 +1 @@
+module test
\ No newline at end of file
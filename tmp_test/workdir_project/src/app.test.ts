@@ -0,0 +1 @@
+test
\ No newline at end of file